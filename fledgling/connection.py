@@ -34,6 +34,7 @@ Three configuration modes for `connect()`:
 
 import os
 import re
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -152,6 +153,57 @@ _DEFAULT_MODULES = [
 _DEFAULT_EXTENSIONS = ["read_lines", "sitting_duck", "markdown", "duck_tails", "fts"]
 
 
+# Row type of file_changes; the `_..._for` macros take lists of these.
+_CHANGE_STRUCT = (
+    "STRUCT(file_path VARCHAR, status VARCHAR, old_size BIGINT, new_size BIGINT)"
+)
+
+# Row type of review_query (rebuilt from cached payloads).
+_REVIEW_STRUCT = (
+    f"STRUCT(changed_files {_CHANGE_STRUCT}[], function_summary STRUCT("
+    "file_path VARCHAR, name VARCHAR, kind VARCHAR, lines INTEGER, "
+    "cyclomatic INTEGER, change_status VARCHAR)[])"
+)
+
+# Catalog name of the database file persist_fts() keeps the index in.
+_FTS_STORE = "fledgling_fts_store"
+
+# Files per extraction INSERT in rebuild_fts / refresh_fts: bounds the
+# AST rows materialized at once.
+_FTS_BATCH_FILES = 64
+
+# find_code_ranked parses only the FTS candidate files when there are at
+# most this many and they are at most half of the pattern's files; a
+# broader query runs the macro over the whole pattern.
+_RANKED_PUSHDOWN_FILES = 64
+
+# find_code_ranked's columns, for the empty result when no file can match.
+_RANKED_COLUMNS = (
+    ("file_path", "VARCHAR"), ("start_line", "INTEGER"),
+    ("end_line", "INTEGER"), ("name", "VARCHAR"), ("kind", "VARCHAR"),
+    ("node_type", "VARCHAR"), ("peek", "VARCHAR"), ("score", "DOUBLE"),
+)
+
+# Element type of _structural_diff_range_for's `pairs` list.
+_PAIR_STRUCT = "STRUCT(file_path VARCHAR, from_blob VARCHAR, to_blob VARCHAR)"
+
+
+class _Raw(str):
+    """A pre-rendered SQL expression, passed through `_call_macro` as-is."""
+
+
+def _call_macro(con, name: str, *args, **kwargs) -> duckdb.DuckDBPyRelation:
+    """``SELECT * FROM name(args, key := value)`` as a relation."""
+    from fledgling.tools import _to_sql_literal
+
+    def lit(val):
+        return val if isinstance(val, _Raw) else _to_sql_literal(val)
+
+    sql_args = [lit(v) for v in args]
+    sql_args += [f"{k} := {lit(v)}" for k, v in kwargs.items()]
+    return con.sql(f"SELECT * FROM {name}({', '.join(sql_args)})")
+
+
 # ── Compose helpers (Delta 4) ────────────────────────────────────────
 
 
@@ -488,48 +540,401 @@ class Connection:
         from fledgling.tools import Tools
         self._con = con
         self._tools = Tools(con)
+        self._repos: dict = {}
+        self._blob_cache = None
+        self._ast_cache = None
+        self._diff_cache = None
+        self._result_cache = None
+        self._line_index = None
+        self._fts_store: Optional[str] = None
+        self._status_engines: dict = {}
+        self._blame_engines: dict = {}
+        self._origin: Optional["Connection"] = None
+        self._engine_lock = threading.RLock()
+
+    def cursor(self) -> "Connection":
+        """A Connection on a new DuckDB cursor, for use from another thread.
+
+        The cursor sees the same database (tables, macros, caches) and
+        gets a copy of this connection's session variables, which DuckDB
+        keeps per cursor. Git repositories and the blob, diff and result
+        caches are shared with this connection; engines that hold a
+        DuckDB connection are bound to the cursor. Close it when done.
+        """
+        raw = self._con.cursor()
+        for (name,) in self._con.execute(
+            "SELECT name FROM duckdb_variables()"
+        ).fetchall():
+            value = self._con.execute("SELECT getvariable(?)", [name]).fetchone()[0]
+            raw.execute(f'SET VARIABLE "{name}" = ?', [value])
+        clone = object.__new__(Connection)
+        clone.__dict__.update(self.__dict__)
+        clone._con = raw
+        clone._tools = self._tools.bind(raw)
+        clone._origin = self._origin or self
+        clone._ast_cache = None
+        clone._status_engines = {}
+        clone._blame_engines = {}
+        return clone
+
+    def close(self) -> None:
+        """Close the underlying DuckDB connection (or cursor)."""
+        self._con.close()
+
+    def scan(self, file_pattern: str):
+        """A :class:`~fledgling.scan.Scan`: parse ``file_pattern`` once
+        for several code queries. Use as a context manager."""
+        from fledgling.scan import Scan
+        return Scan(self, file_pattern)
 
     def rebuild_fts(
         self,
         docs_glob: str = "**/*.md",
         code_glob: str = "**/*.py",
-        sql_dir: Optional[Path] = None,
+        *,
+        batch_size: int = _FTS_BATCH_FILES,
     ) -> None:
         """Rebuild the FTS index from scratch.
 
         Wipes and re-populates ``fts.content`` from markdown files and AST
-        nodes matching ``docs_glob`` / ``code_glob``, then (re)creates the
-        BM25 inverted index via ``PRAGMA create_fts_index``.
+        nodes matching ``docs_glob`` / ``code_glob``, records the files in
+        ``fts.files``, then (re)creates the BM25 inverted index via
+        ``PRAGMA create_fts_index``.
+
+        Files are extracted ``batch_size`` at a time (one ``read_ast``
+        pass per batch feeds definitions, comments and strings), so the
+        AST rows held at once are bounded by the batch, not the project.
+        ``sql/fts_rebuild.sql`` is the SQL-only equivalent for the DuckDB
+        CLI: one statement per step below, over the same ``_fts_*``
+        macros, so the two differ only in batching.
 
         The FTS index does not auto-update on INSERT/UPDATE/DELETE — call
-        this after source files change.
+        this (or :meth:`refresh_fts`, which only re-extracts changed
+        files) after source files change.
 
         Args:
             docs_glob: Glob for markdown files, relative to ``session_root``.
                 Default ``'**/*.md'``.
             code_glob: Glob for code files. Default ``'**/*.py'``.
-            sql_dir: Directory containing ``fts_rebuild.sql``. Auto-discovered
-                if None (same logic as ``load_macros``).
-
-        Raises:
-            FileNotFoundError: if ``fts_rebuild.sql`` cannot be located.
+            batch_size: Files per extraction batch.
         """
-        if sql_dir is None:
-            sql_dir = _find_sql_dir()
-        if sql_dir is None or not (sql_dir / "fts_rebuild.sql").exists():
-            raise FileNotFoundError(
-                "fts_rebuild.sql not found; ensure fledgling SQL sources "
-                "are available (pip install fledgling-mcp or dev checkout)."
-            )
-        self._con.execute("SET VARIABLE fts_docs_glob = ?", [docs_glob])
-        self._con.execute("SET VARIABLE fts_code_glob = ?", [code_glob])
-        _load_sql_file(self._con, sql_dir / "fts_rebuild.sql")
+        self._con.execute("DELETE FROM fts.content")
+        self._con.execute("DELETE FROM fts.files")
+        self._con.execute(
+            "INSERT INTO fts.files "
+            "SELECT * FROM _fts_fingerprints(resolve(?), resolve(?))",
+            [docs_glob, code_glob],
+        )
+        self._fts_extract(
+            self._con.execute(
+                "SELECT file_path, extractor FROM fts.files ORDER BY ALL"
+            ).fetchall(),
+            batch_size,
+        )
+        self._fts_reindex()
+        self._fts_save(docs_glob, code_glob)
+
+    def _fts_extract(self, files: list, batch_size: int) -> None:
+        """Insert ``fts.content`` rows for ``(file_path, extractor)`` pairs,
+        ``batch_size`` files per INSERT, numbering ids after the current max."""
+        from fledgling.tools import _to_sql_literal
+
+        for extractor, macro in (
+            ("markdown", "_fts_doc_rows"),
+            ("sitting_duck", "_fts_code_rows"),
+        ):
+            paths = [path for path, ext in files if ext == extractor]
+            for i in range(0, len(paths), batch_size):
+                self._con.execute(
+                    "INSERT INTO fts.content "
+                    "SELECT (SELECT COALESCE(max(id), 0) FROM fts.content) "
+                    "       + row_number() OVER (), * "
+                    f"FROM {macro}({_to_sql_literal(paths[i:i + batch_size])})"
+                )
+
+    def _fts_reindex(self) -> None:
+        """Rebuild the BM25 index and name trigrams over ``fts.content``
+        and note it in ``fts.collections`` (the last steps of
+        ``sql/fts_rebuild.sql``)."""
+        self._con.execute(
+            "PRAGMA create_fts_index('fts.content', 'id', 'text', 'subtokens', "
+            "overwrite = 1)"
+        )
+        self._con.execute("DELETE FROM fts.trigrams")
+        self._con.execute(
+            "INSERT INTO fts.trigrams SELECT * FROM _fts_trigram_rows()"
+        )
         self._con.execute(
             "INSERT INTO fts.collections (name, created_at, rebuilt_at) "
             "VALUES ('content', current_timestamp, current_timestamp) "
             "ON CONFLICT (name) DO UPDATE SET rebuilt_at = excluded.rebuilt_at"
         )
 
+    def refresh_fts(
+        self,
+        docs_glob: str = "**/*.md",
+        code_glob: str = "**/*.py",
+        *,
+        batch_size: int = _FTS_BATCH_FILES,
+    ) -> dict:
+        """Bring the FTS index up to date with the files on disk.
+
+        Compares the files matching ``docs_glob`` / ``code_glob`` with the
+        ``fts.files`` manifest by size and mtime (``_fts_suspects``, which
+        reads no file content), hashes only the files where those differ,
+        and deletes and re-extracts ``fts.content`` rows for added,
+        changed (by content hash, as ``fts_stale``) and removed files
+        only. Touched-but-unchanged files just have their manifest row
+        updated. The BM25 index is rebuilt only if anything changed.
+        Falls back to :meth:`rebuild_fts` when nothing has been indexed
+        with a manifest yet.
+
+        Args:
+            docs_glob, code_glob, batch_size: As for :meth:`rebuild_fts`.
+
+        Returns:
+            Counts of ``added``, ``changed`` and ``removed`` files.
+        """
+        counts = {"added": 0, "changed": 0, "removed": 0}
+        if not self._con.execute("SELECT count(*) FROM fts.files").fetchone()[0]:
+            self.rebuild_fts(docs_glob, code_glob, batch_size=batch_size)
+            counts["added"] = self._con.execute(
+                "SELECT count(*) FROM fts.files"
+            ).fetchone()[0]
+            return counts
+
+        suspects = self._con.execute(
+            "SELECT * FROM _fts_suspects(resolve(?), resolve(?))",
+            [docs_glob, code_glob],
+        ).fetchall()
+        paths = sorted({path for path, _, status, *_ in suspects if status != "removed"})
+        hashes = dict(self._con.execute(
+            "SELECT filename, md5(content) FROM read_blob(?)", [paths],
+        ).fetchall()) if paths else {}
+        stale, touched = [], []
+        for path, ext, status, size, modified, indexed_hash in suspects:
+            if status == "changed" and hashes.get(path) == indexed_hash:
+                touched.append((size, modified, path, ext))
+            else:
+                stale.append((path, ext, status, size, modified, hashes.get(path)))
+        if touched:
+            self._con.executemany(
+                "UPDATE fts.files SET size = ?, modified = ? "
+                "WHERE file_path = ? AND extractor = ?",
+                touched,
+            )
+        if not stale:
+            if touched:
+                self._fts_save(
+                    docs_glob, code_glob,
+                    files=[(path, ext) for _, _, path, ext in touched],
+                )
+            return counts
+        for _, _, status, *_ in stale:
+            counts[status] += 1
+
+        self._con.execute("BEGIN TRANSACTION")
+        try:
+            self._con.execute(
+                "CREATE OR REPLACE TEMP TABLE _fts_stale "
+                "(file_path VARCHAR, extractor VARCHAR, status VARCHAR, "
+                " size BIGINT, modified TIMESTAMP, hash VARCHAR)"
+            )
+            self._con.executemany(
+                "INSERT INTO _fts_stale VALUES (?, ?, ?, ?, ?, ?)", stale,
+            )
+            for table in ("fts.content", "fts.files"):
+                self._con.execute(
+                    f"DELETE FROM {table} t USING _fts_stale s "
+                    "WHERE t.file_path = s.file_path AND t.extractor = s.extractor"
+                )
+            self._fts_extract(
+                [(path, ext) for path, ext, status, *_ in stale
+                 if status != "removed"],
+                batch_size,
+            )
+            self._con.execute(
+                "INSERT INTO fts.files "
+                "SELECT file_path, extractor, size, modified, hash FROM _fts_stale "
+                "WHERE status != 'removed'"
+            )
+            self._con.execute("DROP TABLE _fts_stale")
+            self._con.execute("COMMIT")
+        except Exception:
+            self._con.execute("ROLLBACK")
+            raise
+        self._fts_reindex()
+        self._fts_save(
+            docs_glob, code_glob,
+            files=[(path, ext) for path, ext, *_ in stale]
+            + [(path, ext) for _, _, path, ext in touched],
+        )
+        return counts
+
+    def persist_fts(
+        self,
+        path: Optional[str] = None,
+        docs_glob: str = "**/*.md",
+        code_glob: str = "**/*.py",
+        refresh: bool = True,
+    ) -> dict:
+        """Keep the FTS index in a database file that outlives the connection.
+
+        Attaches ``path`` (default ``.fledgling/cache/fts/index.duckdb``
+        under the session root). If it holds a previous build, its rows
+        and manifest are loaded into ``fts.content`` / ``fts.files`` and
+        the BM25 index is rebuilt over them — no files are parsed, so
+        search works at once. Then, unless ``refresh`` is False, stale
+        files are brought up to date with :meth:`refresh_fts` (a full
+        :meth:`rebuild_fts` if there was no previous build). From then
+        on every rebuild or refresh is saved back to the file.
+
+        Args:
+            path: Index database file.
+            docs_glob, code_glob: As for :meth:`refresh_fts`.
+            refresh: Refresh stale files now.
+
+        Returns:
+            :meth:`refresh_fts`'s counts (all zero if not refreshed).
+        """
+        from fledgling.tools import _to_sql_literal
+
+        if path is None:
+            path = os.path.join(self._cache_dir("fts"), "index.duckdb")
+        store = _FTS_STORE
+        self._con.execute(
+            f"ATTACH IF NOT EXISTS {_to_sql_literal(path)} AS {store}"
+        )
+        for table in ("content", "files"):
+            self._con.execute(
+                f"CREATE TABLE IF NOT EXISTS {store}.{table} AS "
+                f"SELECT * FROM fts.{table} LIMIT 0"
+            )
+        self._con.execute(
+            f"CREATE TABLE IF NOT EXISTS {store}.builds "
+            "(built_at TIMESTAMP, docs_glob VARCHAR, code_glob VARCHAR)"
+        )
+        if self._con.execute(f"SELECT count(*) FROM {store}.files").fetchone()[0]:
+            self._con.execute("BEGIN TRANSACTION")
+            try:
+                for table in ("content", "files"):
+                    self._con.execute(f"DELETE FROM fts.{table}")
+                    self._con.execute(
+                        f"INSERT INTO fts.{table} SELECT * FROM {store}.{table}"
+                    )
+                self._con.execute("COMMIT")
+            except Exception:
+                self._con.execute("ROLLBACK")
+                raise
+            self._fts_reindex()
+        self._fts_store = store
+        if not refresh:
+            return {"added": 0, "changed": 0, "removed": 0}
+        return self.refresh_fts(docs_glob, code_glob)
+
+    def _fts_save(
+        self,
+        docs_glob: str,
+        code_glob: str,
+        files: Optional[list[tuple[str, str]]] = None,
+    ) -> None:
+        """Copy ``fts.content`` / ``fts.files`` to the :meth:`persist_fts`
+        file, if any, recording the build.
+
+        With ``files`` — the ``(file_path, extractor)`` pairs a refresh
+        touched — only their rows are replaced; rows of other files keep
+        their ids in both places, so the store stays a copy.
+        """
+        store = self._fts_store
+        if store is None:
+            return
+        self._con.execute("BEGIN TRANSACTION")
+        try:
+            if files is None:
+                for table in ("content", "files"):
+                    self._con.execute(f"DELETE FROM {store}.{table}")
+                    self._con.execute(
+                        f"INSERT INTO {store}.{table} SELECT * FROM fts.{table}"
+                    )
+            else:
+                self._con.execute(
+                    "CREATE OR REPLACE TEMP TABLE _fts_saved "
+                    "(file_path VARCHAR, extractor VARCHAR)"
+                )
+                self._con.executemany(
+                    "INSERT INTO _fts_saved VALUES (?, ?)", files,
+                )
+                for table in ("content", "files"):
+                    self._con.execute(
+                        f"DELETE FROM {store}.{table} t USING _fts_saved s "
+                        "WHERE t.file_path = s.file_path AND t.extractor = s.extractor"
+                    )
+                    self._con.execute(
+                        f"INSERT INTO {store}.{table} SELECT t.* FROM fts.{table} t "
+                        "SEMI JOIN _fts_saved s "
+                        "ON t.file_path = s.file_path AND t.extractor = s.extractor"
+                    )
+                self._con.execute("DROP TABLE _fts_saved")
+            self._con.execute(f"DELETE FROM {store}.builds")
+            self._con.execute(
+                f"INSERT INTO {store}.builds VALUES (current_timestamp, ?, ?)",
+                [docs_glob, code_glob],
+            )
+            self._con.execute("COMMIT")
+        except Exception:
+            self._con.execute("ROLLBACK")
+            raise
+
+    def find_code_ranked(
+        self,
+        file_pattern: str,
+        selector: str,
+        fts_query: str,
+        lang: Optional[str] = None,
+    ) -> duckdb.DuckDBPyRelation:
+        """``find_code_ranked``, parsing only files that can match.
+
+        Asks the FTS index which files matching ``file_pattern`` contain
+        a term of ``fts_query`` (``_fts_code_files``) before any parsing.
+        When those are few — at most ``_RANKED_PUSHDOWN_FILES`` and at
+        most half of the pattern's files — ``ast_select`` runs on them
+        alone; otherwise the macro runs as is. With no candidates nothing
+        is parsed: the result is empty. Same rows either way.
+        """
+        from fledgling.tools import _to_sql_literal
+
+        total, files = self._con.execute(
+            "SELECT (SELECT count(*) FROM glob(resolve(?))), "
+            "       (SELECT list(file_path ORDER BY file_path) "
+            "        FROM _fts_code_files(?, ?))",
+            [file_pattern, fts_query, file_pattern],
+        ).fetchone()
+        if not files:
+            columns = ", ".join(
+                f"NULL::{type_} AS {name}" for name, type_ in _RANKED_COLUMNS
+            )
+            return self._con.sql(f"SELECT {columns} WHERE false")
+        if len(files) > _RANKED_PUSHDOWN_FILES or 2 * len(files) > total:
+            return _call_macro(
+                self._con, "find_code_ranked",
+                file_pattern, selector, fts_query, lang=lang,
+            )
+        selected = " UNION ALL ".join(
+            f"SELECT * FROM ast_select({_to_sql_literal(path)}, "
+            f"{_to_sql_literal(selector)}, language := {_to_sql_literal(lang)})"
+            for path in files
+        )
+        return self._con.sql(
+            "SELECT a.file_path, a.start_line, a.end_line, a.name, "
+            "       semantic_type_to_string(a.semantic_type) AS kind, "
+            "       a.type AS node_type, a.peek, c.score "
+            f"FROM ({selected}) a "
+            f"JOIN _fts_scores({_to_sql_literal(fts_query)}, "
+            "                  filter_extractor := 'sitting_duck') c "
+            "  ON c.file_path = a.file_path AND c.ordinal = a.node_id "
+            "ORDER BY c.score DESC, a.file_path, a.start_line"
+        )
+
     def create_fts_collection(
         self,
         name: str,
@@ -592,21 +997,682 @@ class Connection:
             List of ``(id, text, metadata, score)`` tuples, empty list if
             no matches.
 
+        Raises:
+            ValueError: if ``name`` contains invalid characters.
+            Exception: if the collection does not exist.
+        """
+        return self.search_collection_many(name, [query], limit)[query]
+
+    def search_collection_many(
+        self,
+        name: str,
+        queries: list[str],
+        limit: int = 20,
+    ) -> dict[str, list]:
+        """:meth:`search_collection` for several queries in one statement.
+
+        The queries are bound as a ``VALUES`` list and scored together
+        against the collection's index: each query's terms are looked up
+        in the index dictionary and only documents in their postings are
+        scored (the same BM25 as ``match_bm25``), with the top ``limit``
+        kept per query. Evaluation and agent pipelines that fire many
+        queries at one collection pay the per-statement overhead once.
+
+        Args:
+            name: Collection name.  Must match ``[a-z_][a-z0-9_]*``.
+            queries: Search query strings; duplicates are searched once.
+            limit: Maximum number of results per query (default 20).
+
+        Returns:
+            Dict mapping each query, in the order given, to its list of
+            ``(id, text, metadata, score)`` tuples, best first (empty if
+            nothing matches).
+
         Raises:
             ValueError: if ``name`` contains invalid characters.
             Exception: if the collection does not exist.
         """
         if not re.match(r'^[a-z_][a-z0-9_]*$', name):
             raise ValueError(f"Invalid collection name: {name!r}")
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+        index = f"fts_fts_{name}"
+        values = ", ".join(f"({i}, ?)" for i in range(len(queries)))
         sql = (
-            f"SELECT c.id, c.text, c.metadata, "
-            f"  fts_fts_{name}.match_bm25(c.id, ?) AS score "
-            f"FROM fts.{name} c "
-            f"WHERE fts_fts_{name}.match_bm25(c.id, ?) IS NOT NULL "
-            f"ORDER BY score DESC "
-            f"LIMIT ?"
-        )
-        return self._con.execute(sql, [query, query, limit]).fetchall()
+            f"WITH queries(qid, query) AS (VALUES {values}), "
+            f"tokens AS ("
+            f"  SELECT DISTINCT qid, "
+            f"    stem(unnest({index}.tokenize(query)), 'porter') AS term "
+            f"  FROM queries), "
+            f"qterms AS ("
+            f"  SELECT t.qid, d.termid, d.df "
+            f"  FROM tokens t JOIN {index}.dict d ON d.term = t.term), "
+            f"hits AS ("
+            f"  SELECT q.qid, p.docid, p.termid, any_value(q.df) AS df, "
+            f"    count(*) AS tf "
+            f"  FROM {index}.terms p JOIN qterms q ON q.termid = p.termid "
+            f"  GROUP BY q.qid, p.docid, p.termid), "
+            f"scores AS ("
+            f"  SELECT h.qid, h.docid, sum("
+            f"    log((s.num_docs - h.df + 0.5) / (h.df + 0.5) + 1) "
+            f"    * (h.tf * (1.2 + 1) "
+            f"       / (h.tf + 1.2 * (1 - 0.75 + 0.75 * (d.len / s.avgdl))))"
+            f"  ) AS score "
+            f"  FROM hits h JOIN {index}.docs d ON d.docid = h.docid "
+            f"  CROSS JOIN {index}.stats s "
+            f"  GROUP BY h.qid, h.docid) "
+            f"SELECT s.qid, c.id, c.text, c.metadata, s.score "
+            f"FROM scores s "
+            f"JOIN {index}.docs d ON d.docid = s.docid "
+            f"JOIN fts.{name} c ON c.id = d.name "
+            f"QUALIFY row_number() OVER ("
+            f"  PARTITION BY s.qid ORDER BY s.score DESC, c.id) <= ? "
+            f"ORDER BY s.qid, s.score DESC, c.id"
+        )
+        results = {query: [] for query in queries}
+        for qid, *row in self._con.execute(sql, [*queries, limit]).fetchall():
+            results[queries[qid]].append(tuple(row))
+        return results
+
+    # ── Git engines ──────────────────────────────────────────────────
+    #
+    # The methods below shadow the SQL macros of the same name (methods
+    # defined on the class win over __getattr__ dispatch). They read git
+    # objects through fledgling.git — tree diffs skip unchanged subtrees,
+    # blob reads go through a shared content-addressed cache, parsed
+    # definitions are cached by blob hash — and hand the results to
+    # internal `_...` macros as literals or paths.
+    # Signatures match the macros.
+
+    def spill_blobs(self, path: Optional[str] = None) -> str:
+        """Spill blobs evicted from the in-memory blob cache to disk.
+
+        Off by default: the cache holds at most ``BlobCache.max_bytes`` in
+        memory and drops what it evicts. Once enabled, evicted blobs are
+        written to ``path`` (default ``.fledgling/cache/blobs`` under the
+        session root) and read back from there, also by later sessions.
+
+        Returns:
+            The spill directory.
+        """
+        if path is None:
+            path = self._cache_dir("blobs")
+        else:
+            os.makedirs(path, exist_ok=True)
+        self._blobs.spill_dir = path
+        return path
+
+    def _session_root(self) -> str:
+        try:
+            row = self._con.execute(
+                "SELECT getvariable('session_root')"
+            ).fetchone()
+        except duckdb.Error:
+            row = None
+        return row[0] if row and row[0] else os.getcwd()
+
+    def _cache_dir(self, name: str) -> str:
+        """``<session_root>/.fledgling/cache/<name>``, created on demand.
+
+        Lives under the session root so locked-down connections (whose
+        ``allowed_directories`` is the root) can read what is cached.
+        """
+        base = os.path.join(self._session_root(), ".fledgling", "cache")
+        path = os.path.join(base, name)
+        os.makedirs(path, exist_ok=True)
+        ignore = os.path.join(base, ".gitignore")
+        if not os.path.exists(ignore):
+            with open(ignore, "w") as f:
+                f.write("*\n")
+        return path
+
+    def _repo(self, repo: str = "."):
+        """Return the shared GitRepo for ``repo``.
+
+        Relative paths resolve against ``session_root`` (falling back to
+        the CWD), matching how the file macros resolve paths.
+        """
+        from fledgling.git import GitRepo
+        path = os.path.normpath(os.path.join(self._session_root(), repo))
+        with self._engine_lock:
+            git_repo = self._repos.get(path)
+            if git_repo is None:
+                git_repo = self._repos[path] = GitRepo(path)
+        return git_repo
+
+    def _engine(self, attr: str, make):
+        """Lazily create a shared engine, once across cursors."""
+        engine = getattr(self, attr)
+        if engine is None:
+            with self._engine_lock:
+                engine = getattr(self, attr)
+                if engine is None:
+                    engine = make()
+                    setattr(self, attr, engine)
+        return engine
+
+    @property
+    def _blobs(self):
+        """The connection's BlobCache (memory only until :meth:`spill_blobs`)."""
+        from fledgling.git import BlobCache
+        if self._origin is not None:
+            return self._engine("_blob_cache", lambda: self._origin._blobs)
+        return self._engine("_blob_cache", BlobCache)
+
+    @property
+    def _asts(self):
+        """The connection's AstCache (tables in the ``ast_cache`` schema)."""
+        from fledgling.git import AstCache
+        if self._origin is not None:
+            return self._engine(
+                "_ast_cache", lambda: self._origin._asts.bind(self._con),
+            )
+        return self._engine("_ast_cache", lambda: AstCache(self._con, self._blobs))
+
+    @property
+    def _results(self):
+        """The connection's ResultCache (``.fledgling/cache/review``)."""
+        from fledgling.git import ResultCache
+        if self._origin is not None:
+            return self._engine("_result_cache", lambda: self._origin._results)
+        return self._engine(
+            "_result_cache", lambda: ResultCache(self._cache_dir("review")),
+        )
+
+    @property
+    def _lines(self):
+        """The connection's LineIndex (file contents by line offset)."""
+        from fledgling.render import LineIndex
+        if self._origin is not None:
+            return self._engine("_line_index", lambda: self._origin._lines)
+        return self._engine("_line_index", LineIndex)
+
+    @property
+    def _diffs(self):
+        """The connection's DiffCache (line diffs keyed by blob pair)."""
+        from fledgling.git import DiffCache
+        if self._origin is not None:
+            return self._engine("_diff_cache", lambda: self._origin._diffs)
+        return self._engine("_diff_cache", lambda: DiffCache(self._blobs))
+
+    def _blob_path(self, file: str, rev: str, repo: str = ".") -> str:
+        """Materialize ``file`` at ``rev`` and return its on-disk path.
+
+        A path absent at ``rev`` materializes as the empty blob, which
+        parses to no definitions. Files go to ``.fledgling/cache/blobs``
+        (git-ignored) so a locked-down connection can read them.
+        """
+        from fledgling.git import EMPTY_BLOB
+        git_repo = self._repo(repo)
+        sha = git_repo.blob_at(rev, file) or EMPTY_BLOB
+        return self._blobs.materialize(
+            git_repo, sha, suffix=os.path.splitext(file)[1],
+            directory=self._cache_dir("blobs"),
+        )
+
+    def _changes_literal(self, from_rev: str, to_rev: str, repo: str) -> str:
+        from fledgling.git import diff_trees
+        from fledgling.tools import _to_sql_literal
+        changes = diff_trees(self._repo(repo), from_rev, to_rev)
+        return _to_sql_literal([c.as_dict() for c in changes])
+
+    def file_changes(self, from_rev: str, to_rev: str, repo: str = "."):
+        """Files changed between two revisions (tree-diff engine).
+
+        Same columns as the ``file_changes`` macro: file_path, status,
+        old_size, new_size. Unchanged subtrees are skipped by hash, so
+        the cost scales with the change, not the repository.
+        """
+        lit = self._changes_literal(from_rev, to_rev, repo)
+        return self._con.sql(
+            "SELECT c.file_path, c.status, c.old_size, c.new_size FROM ("
+            f"SELECT unnest(CAST({lit} AS {_CHANGE_STRUCT}[])) AS c"
+            ") ORDER BY c.file_path"
+        )
+
+    def _changed_entries(
+        self,
+        changes: list,
+        file_pattern: str,
+        repo: str,
+    ) -> list[dict]:
+        """Added/modified files of ``changes`` matching ``file_pattern``.
+
+        Each entry carries the file's new blob, parsed into the AST cache
+        here — only these blobs, never the rest of the pattern's glob.
+        Files whose language isn't mapped by extension (see
+        ``fledgling.git.language_for``) are left out: blobs are parsed
+        from memory, where read_ast can't detect a language.
+        """
+        from fledgling.git import language_for
+        from fledgling.git.pathspec import glob_match, repo_pattern
+        git_repo = self._repo(repo)
+        file_pattern = repo_pattern(file_pattern, git_repo.path)
+        entries = [
+            c for c in changes
+            if c.status in ("added", "modified")
+            and c.new_blob is not None
+            and language_for(c.file_path) is not None
+            and glob_match(c.file_path, file_pattern)
+        ]
+        self._asts.ensure_many(
+            git_repo, ((c.new_blob, language_for(c.file_path)) for c in entries),
+        )
+        return [
+            {"file_path": c.file_path, "status": c.status, "blob_hash": c.new_blob}
+            for c in entries
+        ]
+
+    def changed_function_summary(
+        self,
+        from_rev: str,
+        to_rev: str,
+        file_pattern: str,
+        repo: str = ".",
+    ):
+        """``changed_function_summary`` parsing only the changed files.
+
+        The change list comes from the tree-diff engine; files matching
+        ``file_pattern`` are parsed at ``to_rev`` through the AST cache.
+        Unlike the macro, files whose language isn't mapped by extension
+        are not summarized (see ``_changed_entries``).
+        """
+        from fledgling.git import diff_trees
+        from fledgling.tools import _to_sql_literal
+        changes = diff_trees(self._repo(repo), from_rev, to_rev, sizes=False)
+        entries = self._changed_entries(changes, file_pattern, repo)
+        return _call_macro(
+            self._con, "_changed_function_summary_cached",
+            _Raw(_to_sql_literal(entries)),
+        )
+
+    def review_query(
+        self,
+        from_rev: str = "HEAD~1",
+        to_rev: str = "HEAD",
+        file_pattern: str = "**/*.py",
+        repo: str = ".",
+        top_n: int = 20,
+    ):
+        """``review_query`` over the tree-diff engine and the AST cache.
+
+        Both revisions are resolved to commit SHAs first; the payload for
+        a (from_sha, to_sha, file_pattern, top_n) is computed once and
+        then served from the on-disk result cache.
+        """
+        from fledgling.git import diff_trees
+        from fledgling.tools import _to_sql_literal
+        git_repo = self._repo(repo)
+        from_sha, to_sha = git_repo.resolve(from_rev), git_repo.resolve(to_rev)
+        key = self._results.key(
+            "review_query", from_sha, to_sha,
+            file_pattern=file_pattern, top_n=int(top_n),
+        )
+        payload = self._results.get(key)
+        if payload is None:
+            changes = diff_trees(git_repo, from_sha, to_sha)
+            entries = self._changed_entries(changes, file_pattern, repo)
+            payload = _call_macro(
+                self._con, "_review_query_cached",
+                _Raw(_to_sql_literal([c.as_dict() for c in changes])),
+                _Raw(_to_sql_literal(entries)), int(top_n),
+            ).fetchone()[0]
+            self._results.put(key, payload)
+        return self._con.sql(
+            f"SELECT CAST({_to_sql_literal(payload)} AS {_REVIEW_STRUCT}) AS result"
+        )
+
+    def file_at_version(self, file: str, rev: str, repo: str = "."):
+        """A file as it existed at ``rev``, read through the blob cache.
+
+        Same columns as the ``file_at_version`` macro: file_path, ref,
+        size_bytes, content. Returns no rows if ``file`` is absent.
+        """
+        git_repo = self._repo(repo)
+        sha = git_repo.blob_at(rev, file)
+        data = self._blobs.get(git_repo, sha) if sha is not None else None
+        return self._con.sql(
+            "SELECT ?::VARCHAR AS file_path, ?::VARCHAR AS ref, "
+            "?::BIGINT AS size_bytes, ?::VARCHAR AS content "
+            "WHERE ?::BOOLEAN",
+            params=[
+                file, rev,
+                len(data) if data is not None else None,
+                data.decode("utf-8", errors="replace") if data is not None else None,
+                data is not None,
+            ],
+        )
+
+    def file_diff(self, file: str, from_rev: str, to_rev: str, repo: str = "."):
+        """Hunk-aware line diff of ``file`` (cached per blob pair).
+
+        Same columns as the ``file_diff`` macro: seq, line_type, content,
+        hunk, old_line, new_line. Binary files have no rows.
+        """
+        git_repo = self._repo(repo)
+        result = self._diffs.diff(
+            git_repo,
+            git_repo.blob_at(from_rev, file),
+            git_repo.blob_at(to_rev, file),
+        )
+        rows = result.lines
+        return self._con.sql(
+            "SELECT unnest(?::BIGINT[]) AS seq, "
+            "unnest(?::VARCHAR[]) AS line_type, unnest(?::VARCHAR[]) AS content, "
+            "unnest(?::BIGINT[]) AS hunk, "
+            "unnest(?::BIGINT[]) AS old_line, unnest(?::BIGINT[]) AS new_line",
+            params=[
+                list(range(1, len(rows) + 1)),
+                [r.line_type for r in rows],
+                [r.content for r in rows],
+                [r.hunk for r in rows],
+                [r.old_line for r in rows],
+                [r.new_line for r in rows],
+            ],
+        )
+
+    def file_diff_stats(self, from_rev: str, to_rev: str, repo: str = "."):
+        """Added/removed line counts for every file changed between revisions.
+
+        Same columns as the ``file_diff_stats`` macro. Changed files come
+        from the tree-diff engine; counts for blob pairs already in
+        ``diff_cache.stats`` are reused, the rest are computed by the
+        line-diff engine and stored.
+        """
+        from fledgling.git import EMPTY_BLOB, diff_trees
+        git_repo = self._repo(repo)
+        changes = diff_trees(git_repo, from_rev, to_rev, sizes=False)
+        pairs = [
+            (c.old_blob or EMPTY_BLOB, c.new_blob or EMPTY_BLOB) for c in changes
+        ]
+        known = {
+            (o, n): (a, r, b)
+            for o, n, a, r, b in self._con.execute(
+                "SELECT s.old_blob, s.new_blob, s.lines_added, s.lines_removed, "
+                "s.is_binary FROM diff_cache.stats s "
+                "JOIN (SELECT unnest(?) AS o, unnest(?) AS n) p "
+                "ON s.old_blob = p.o AND s.new_blob = p.n",
+                [[o for o, _ in pairs], [n for _, n in pairs]],
+            ).fetchall()
+        }
+        new = {}
+        for pair in pairs:
+            if pair not in known and pair not in new:
+                new[pair] = self._diffs.stat(git_repo, *pair)
+        if new:
+            self._con.execute(
+                "INSERT INTO diff_cache.stats SELECT unnest(?), unnest(?), "
+                "unnest(?), unnest(?), unnest(?) ON CONFLICT DO NOTHING",
+                [
+                    [o for o, _ in new], [n for _, n in new],
+                    [s[0] for s in new.values()],
+                    [s[1] for s in new.values()],
+                    [s[2] for s in new.values()],
+                ],
+            )
+            known.update(new)
+        stats = [known[p] for p in pairs]
+        return self._con.sql(
+            "SELECT unnest(?::VARCHAR[]) AS file_path, "
+            "unnest(?::VARCHAR[]) AS status, "
+            "unnest(?::INTEGER[]) AS lines_added, "
+            "unnest(?::INTEGER[]) AS lines_removed, "
+            "unnest(?::BOOLEAN[]) AS is_binary",
+            params=[
+                [c.file_path for c in changes],
+                [c.status for c in changes],
+                [s[0] for s in stats],
+                [s[1] for s in stats],
+                [s[2] for s in stats],
+            ],
+        )
+
+    def read_source_text(
+        self,
+        file_path: str,
+        lines: Optional[str] = None,
+        ctx: int = 0,
+        match: Optional[str] = None,
+        commit: Optional[str] = None,
+    ):
+        """``read_source_text``; ``commit`` reads go through the blob cache."""
+        if commit is not None:
+            file_path = self._blob_path(file_path, commit)
+        return _call_macro(
+            self._con, "read_source_text", file_path,
+            lines=lines, ctx=ctx, match=match,
+        )
+
+    def render_selection(
+        self,
+        source: str,
+        selector: str,
+        layout: str = "pss",
+        chunk_size: Optional[int] = None,
+    ):
+        """Markdown for every ``ast_select`` match, full bodies, in chunks.
+
+        A generator: ``ast_select`` rows are streamed and each chunk of
+        ``chunk_size`` matches is rendered as soon as it is read, with
+        bodies sliced from the connection's line-offset index (each file
+        read once, and kept across calls while unchanged). ``layout`` is
+        ``"pss"`` (``pss_render``'s) or ``"ast_select"``
+        (``ast_select_render``'s). See fledgling.render.
+        """
+        from fledgling.render import CHUNK_SIZE, render_chunks
+
+        cur = self.cursor()
+        try:
+            cur._con.execute(
+                "SELECT file_path, start_line, end_line, "
+                "       COALESCE(language, 'text'), "
+                "       COALESCE(ast_qualified_name_as_string(qualified_name), name), "
+                "       peek "
+                "FROM ast_select(?, ?) ORDER BY file_path, start_line",
+                [source, selector],
+            )
+
+            def rows():
+                while True:
+                    batch = cur._con.fetchmany(1000)
+                    if not batch:
+                        return
+                    yield from batch
+
+            yield from render_chunks(
+                rows(), self._lines, layout=layout, selector=selector,
+                chunk_size=chunk_size or CHUNK_SIZE,
+            )
+        finally:
+            cur.close()
+
+    def structural_diff(
+        self,
+        file: str,
+        from_rev: str,
+        to_rev: str,
+        repo: str = ".",
+    ):
+        """``structural_diff`` over blob-hash-cached definition summaries.
+
+        Each blob is parsed at most once per database (see AstCache);
+        unchanged files between the two revisions resolve to the same
+        cache entry. Files whose language isn't mapped by extension fall
+        back to read_ast on materialized blobs.
+        """
+        git_repo = self._repo(repo)
+        from_blob = self._asts.ensure_at(git_repo, from_rev, file)
+        to_blob = self._asts.ensure_at(git_repo, to_rev, file)
+        if from_blob is None or to_blob is None:
+            return _call_macro(
+                self._con, "_structural_diff_for",
+                self._blob_path(file, from_rev, repo),
+                self._blob_path(file, to_rev, repo),
+            )
+        return _call_macro(
+            self._con, "_structural_diff_blobs", from_blob, to_blob,
+        )
+
+    def structural_diff_range(
+        self,
+        from_rev: str,
+        to_rev: str,
+        file_pattern: str,
+        repo: str = ".",
+        max_workers: Optional[int] = None,
+    ):
+        """structural_diff for every changed file matching ``file_pattern``.
+
+        Changed files come from the tree-diff engine; the distinct
+        before/after blobs are parsed in parallel (each at most once,
+        see AstCache.ensure_many) and diffed in one query. Files whose
+        language isn't mapped by extension are skipped.
+        """
+        from fledgling.git import EMPTY_BLOB, diff_trees, language_for
+        from fledgling.git.pathspec import glob_match, repo_pattern
+        git_repo = self._repo(repo)
+        file_pattern = repo_pattern(file_pattern, git_repo.path)
+        pairs = []
+        blobs = []
+        for change in diff_trees(git_repo, from_rev, to_rev, sizes=False):
+            language = language_for(change.file_path)
+            if language is None or not glob_match(change.file_path, file_pattern):
+                continue
+            old = change.old_blob or EMPTY_BLOB
+            new = change.new_blob or EMPTY_BLOB
+            pairs.append({
+                "file_path": change.file_path,
+                "from_blob": old,
+                "to_blob": new,
+            })
+            blobs += [(old, language), (new, language)]
+        self._asts.ensure_many(git_repo, blobs, max_workers=max_workers)
+        from fledgling.tools import _to_sql_literal
+        return _call_macro(
+            self._con, "_structural_diff_range_for",
+            _Raw(f"CAST({_to_sql_literal(pairs)} AS {_PAIR_STRUCT}[])"),
+        )
+
+    def working_tree_status(self, repo: str = "."):
+        """Modified, added, deleted and untracked files (status engine).
+
+        Same columns as the ``working_tree_status`` macro (file_path,
+        status), plus ``modified`` and ``added`` statuses the macro can't
+        detect. Ignored files are excluded. The engine keeps index, HEAD
+        and stat state between calls, so repeat calls only re-examine
+        what changed.
+        """
+        from fledgling.git import StatusEngine
+        from fledgling.tools import _to_sql_literal
+        git_repo = self._repo(repo)
+        engine = self._status_engines.get(git_repo.path)
+        if engine is None:
+            engine = self._status_engines[git_repo.path] = StatusEngine(git_repo)
+        rows = [e.as_dict() for e in engine.status()]
+        return self._con.sql(
+            "SELECT s.file_path, s.status FROM ("
+            f"SELECT unnest(CAST({_to_sql_literal(rows)} AS "
+            "STRUCT(file_path VARCHAR, status VARCHAR)[])) AS s"
+            ") ORDER BY s.status, s.file_path"
+        )
+
+    def file_blame(self, file: str, rev: str = "HEAD", repo: str = "."):
+        """Per-line origin of ``file`` at ``rev`` (incremental blame engine).
+
+        Same columns as the ``file_blame`` macro: line_number, hash,
+        author, date, original_line, content. Results persist in
+        ``blame_cache`` keyed by (path, commit); a later revision of the
+        file only diffs the commits since the last cached one.
+        """
+        from fledgling.git import BlameEngine
+        git_repo = self._repo(repo)
+        engine = self._blame_engines.get(git_repo.path)
+        if engine is None:
+            engine = self._blame_engines[git_repo.path] = BlameEngine(
+                git_repo, self._con, self._blobs,
+            )
+        blob, commit = engine.blame(file, rev)
+        text = None
+        if blob is not None:
+            text = self._blobs.get(git_repo, blob).decode("utf-8", errors="replace")
+        return self._con.sql(
+            "SELECT * FROM _file_blame_for(?, ?, ?)",
+            params=[file, commit, text],
+        )
+
+    def churn_hotspots(
+        self,
+        since_rev: str,
+        file_pattern: str = "**/*.py",
+        n: int = 20,
+        repo: str = ".",
+    ):
+        """Functions ranked by churn since ``since_rev`` × complexity.
+
+        Same columns as the ``churn_hotspots`` macro. The first call for
+        a (since, HEAD, file_pattern) run walks the history once and
+        stores every commit's touches in ``churn_cache``; touched blobs
+        are parsed through AstCache. Later calls for the same run only
+        re-rank the stored touches.
+        """
+        from fledgling.git import language_for
+        from fledgling.git.churn import range_touches
+        from fledgling.git.pathspec import repo_pattern
+        git_repo = self._repo(repo)
+        file_pattern = repo_pattern(file_pattern, git_repo.path)
+        since = git_repo.resolve(since_rev)
+        head = git_repo.resolve("HEAD")
+        key = [since, head, file_pattern]
+        done = self._con.execute(
+            "SELECT 1 FROM churn_cache.runs "
+            "WHERE since_sha = ? AND head_sha = ? AND file_pattern = ?", key,
+        ).fetchone()
+        if done is None:
+            count, touches = range_touches(
+                git_repo, self._blobs, since, head, file_pattern,
+            )
+            head_blobs = {
+                path: git_repo.blob_at(head, path)
+                for path in {t.file_path for t in touches}
+            }
+            parse = [(t.blob, language_for(t.file_path)) for t in touches]
+            parse += [
+                (sha, language_for(path))
+                for path, sha in head_blobs.items() if sha is not None
+            ]
+            self._asts.ensure_many(git_repo, parse)
+            self._con.execute(
+                "DELETE FROM churn_cache.touches "
+                "WHERE since_sha = ? AND head_sha = ? AND file_pattern = ?", key,
+            )
+            if touches:
+                rows = [t.as_dict() for t in touches]
+                self._con.execute(
+                    "INSERT INTO churn_cache.touches SELECT ?, ?, ?, "
+                    "unnest(?), unnest(?), unnest(?), unnest(?), "
+                    "unnest(?), unnest(?), unnest(?), unnest(?)",
+                    key + [
+                        [r["commit_sha"] for r in rows],
+                        [r["file_path"] for r in rows],
+                        [r["blob_hash"] for r in rows],
+                        [head_blobs[r["file_path"]] for r in rows],
+                        [r["lines_added"] for r in rows],
+                        [r["lines_removed"] for r in rows],
+                        [r["hunk_start"] for r in rows],
+                        [r["hunk_end"] for r in rows],
+                    ],
+                )
+            self._con.execute(
+                "INSERT INTO churn_cache.runs "
+                "(since_sha, head_sha, file_pattern, since_rev, commits) "
+                "VALUES (?, ?, ?, ?, ?)",
+                key + [since_rev, count],
+            )
+        return _call_macro(
+            self._con, "_churn_hotspots_for", since, head, file_pattern,
+            n=int(n),
+        )
 
     def __getattr__(self, name: str):
         # First check macros
@@ -0,0 +1,42 @@
+"""fledgling.git: object-level git engines behind the repo macros.
+
+Usage::
+
+    from fledgling.git import GitRepo, diff_trees
+
+    repo = GitRepo("/path/to/repo")
+    for change in diff_trees(repo, "main", "HEAD"):
+        print(change.status, change.file_path)
+
+``fledgling.Connection`` holds one ``GitRepo`` per repository, one
+``BlobCache``, ``AstCache`` and ``DiffCache``, and routes
+``file_changes``, ``changed_function_summary``, ``review_query``,
+``file_at_version``, ``file_diff``, ``file_diff_stats``,
+``read_source_text(commit := ...)``, ``structural_diff``,
+``working_tree_status``, ``file_blame`` and ``churn_hotspots`` through
+these engines; the SQL macros remain the fallback for the DuckDB CLI
+server.
+"""
+
+from fledgling.git.astcache import AstCache, blob_hash, language_for
+from fledgling.git.blame import BlameEngine
+from fledgling.git.blobcache import EMPTY_BLOB, BlobCache
+from fledgling.git.bodyhash import body_hash
+from fledgling.git.churn import Touch, range_touches
+from fledgling.git.index import IndexEntry, read_index
+from fledgling.git.linediff import DiffCache, DiffLine, FileDiff, diff_lines
+from fledgling.git.objects import Commit, GitRepo, TreeEntry
+from fledgling.git.resultcache import ResultCache
+from fledgling.git.status import StatusEngine, StatusEntry
+from fledgling.git.treediff import TreeChange, diff_trees
+
+__all__ = [
+    "GitRepo", "Commit", "TreeEntry",
+    "TreeChange", "diff_trees",
+    "BlobCache", "EMPTY_BLOB",
+    "AstCache", "blob_hash", "language_for", "body_hash",
+    "IndexEntry", "read_index", "StatusEngine", "StatusEntry",
+    "BlameEngine", "Touch", "range_touches",
+    "DiffCache", "DiffLine", "FileDiff", "diff_lines",
+    "ResultCache",
+]
@@ -0,0 +1,231 @@
+"""Blob-hash-keyed AST definition cache.
+
+``structural_diff`` used to run ``read_ast`` on both revisions of a file
+for every call. Across a review session the same old blob is parsed
+again and again, as are identical blobs reachable from different
+commits. This cache parses each blob once — with ``parse_ast`` on the
+content served by :class:`~fledgling.git.blobcache.BlobCache` — and keeps
+the definition summary in ``ast_cache.definitions`` (see
+``sql/structural.sql``) under the blob's hash.
+
+A blob's definition rows and its ``ast_cache.blobs`` row are written
+together in one transaction, under a lock shared by every cursor bound
+to the cache, and only if the blob is not cached yet: parsing runs in
+parallel, storing does not, so no blob's definitions are written twice.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+import duckdb
+
+from fledgling.git.blobcache import EMPTY_BLOB, BlobCache
+from fledgling.git.bodyhash import body_hash
+from fledgling.git.objects import GitRepo
+
+
+# File extension → sitting_duck language name. Extensions missing here
+# fall back to read_ast's own detection on a materialized file.
+LANGUAGES = {
+    ".py": "python", ".pyi": "python",
+    ".js": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript", ".tsx": "tsx",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin", ".kts": "kotlin",
+    ".swift": "swift",
+    ".c": "c", ".h": "c",
+    ".cc": "cpp", ".cpp": "cpp", ".cxx": "cpp", ".hpp": "cpp", ".hh": "cpp",
+    ".cs": "csharp",
+    ".rb": "ruby",
+    ".php": "php",
+    ".lua": "lua",
+    ".r": "r", ".R": "r",
+    ".sh": "bash", ".bash": "bash",
+    ".sql": "sql",
+    ".dart": "dart",
+    ".zig": "zig",
+    ".hcl": "hcl", ".tf": "hcl",
+    ".graphql": "graphql", ".gql": "graphql",
+    ".md": "markdown",
+    ".json": "json",
+    ".yaml": "yaml", ".yml": "yaml",
+    ".toml": "toml",
+    ".html": "html", ".htm": "html",
+    ".css": "css",
+}
+
+
+def language_for(path: str) -> Optional[str]:
+    """sitting_duck language for a path, or None if not mapped."""
+    return LANGUAGES.get(os.path.splitext(path)[1])
+
+
+def blob_hash(data: bytes) -> str:
+    """The git blob SHA of ``data`` (``git hash-object`` without writing)."""
+    h = hashlib.sha1(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+class AstCache:
+    """Parse-once definition summaries keyed by blob hash.
+
+    Args:
+        con: DuckDB connection with sitting_duck loaded and the
+            structural module (which creates the ``ast_cache`` tables).
+        blobs: Blob cache used to read blob content from git.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, blobs: BlobCache):
+        self._con = con
+        self._blobs = blobs
+        self._lock = threading.Lock()
+        self._known: set[str] = set()
+        self.parses = 0
+
+    def bind(self, con: duckdb.DuckDBPyConnection) -> "AstCache":
+        """This cache on another connection (e.g. a cursor for a worker
+        thread), sharing the blob cache and the set of known blobs."""
+        bound = AstCache(con, self._blobs)
+        bound._lock = self._lock
+        bound._known = self._known
+        return bound
+
+    def __contains__(self, sha: str) -> bool:
+        if sha in self._known:
+            return True
+        row = self._con.execute(
+            "SELECT 1 FROM ast_cache.blobs WHERE blob_hash = ?", [sha],
+        ).fetchone()
+        if row:
+            self._known.add(sha)
+        return row is not None
+
+    def ensure_content(self, sha: str, data: bytes, language: str) -> str:
+        """Parse ``data`` into the cache under ``sha`` unless already there."""
+        if sha in self:
+            return sha
+        rows = self._parse(self._con, data, language)
+        self._store(self._con, sha, language, rows)
+        return sha
+
+    @staticmethod
+    def _parse(con, data: bytes, language: str) -> list:
+        """Definition rows of ``data``, each with its body hash appended."""
+        if not data.strip():
+            return []
+        text = data.decode("utf-8", errors="replace")
+        rows = con.execute(
+            "SELECT * FROM _ast_definitions(?, ?)", [text, language],
+        ).fetchall()
+        # Columns: node_id, name, kind, start_line, end_line,
+        # descendant_count, children_count, cyclomatic.
+        lines = text.split("\n")
+        return [
+            (*r, body_hash("\n".join(lines[r[3] - 1:r[4]]), r[1], language))
+            for r in rows
+        ]
+
+    def _store(self, con, sha: str, language: str, rows: list) -> bool:
+        """Insert ``rows`` and the blob row for ``sha`` unless ``sha`` is
+        already cached. Returns whether anything was written."""
+        with self._lock:
+            if sha in self._known:
+                return False
+            con.execute("BEGIN TRANSACTION")
+            try:
+                cached = con.execute(
+                    "SELECT 1 FROM ast_cache.blobs WHERE blob_hash = ?", [sha],
+                ).fetchone()
+                if not cached:
+                    if rows:
+                        columns = [list(c) for c in zip(*rows)]
+                        con.execute(
+                            "INSERT INTO ast_cache.definitions SELECT ?, "
+                            + ", ".join(["unnest(?)"] * len(columns)),
+                            [sha, *columns],
+                        )
+                    con.execute(
+                        "INSERT INTO ast_cache.blobs (blob_hash, language) "
+                        "VALUES (?, ?)",
+                        [sha, language],
+                    )
+                con.execute("COMMIT")
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            self._known.add(sha)
+            if not cached:
+                self.parses += 1
+            return not cached
+
+    def ensure_blob(self, repo: GitRepo, sha: str, language: str) -> str:
+        """Make sure blob ``sha`` is cached; returns ``sha``."""
+        if sha in self:
+            return sha
+        data = b"" if sha == EMPTY_BLOB else self._blobs.get(repo, sha)
+        return self.ensure_content(sha, data, language)
+
+    def ensure_many(
+        self,
+        repo: GitRepo,
+        blobs: Iterable[tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Cache many ``(sha, language)`` blobs, parsing in parallel.
+
+        Duplicates and already-cached blobs are skipped, so each distinct
+        blob is parsed at most once. Each worker parses on its own
+        cursor; storing the result is serialized (see ``_store``).
+        """
+        todo: dict[str, str] = {}
+        for sha, language in blobs:
+            if sha not in todo and sha not in self:
+                todo[sha] = language
+        if not todo:
+            return
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+        if max_workers <= 1 or len(todo) == 1:
+            for sha, language in todo.items():
+                self.ensure_blob(repo, sha, language)
+            return
+
+        local = threading.local()
+        cursors = []
+
+        def parse(item: tuple[str, str]) -> None:
+            sha, language = item
+            cur = getattr(local, "cur", None)
+            if cur is None:
+                cur = local.cur = self._con.cursor()
+                cursors.append(cur)
+            data = b"" if sha == EMPTY_BLOB else self._blobs.get(repo, sha)
+            self._store(cur, sha, language, self._parse(cur, data, language))
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(parse, todo.items()))
+        finally:
+            for cur in cursors:
+                cur.close()
+
+    def ensure_at(self, repo: GitRepo, rev: str, path: str) -> Optional[str]:
+        """Cache ``path`` at ``rev``; returns its blob hash.
+
+        Paths absent at ``rev`` map to the empty blob (no definitions).
+        Returns None when the path's language is not mapped.
+        """
+        language = language_for(path)
+        if language is None:
+            return None
+        sha = repo.blob_at(rev, path) or EMPTY_BLOB
+        return self.ensure_blob(repo, sha, language)
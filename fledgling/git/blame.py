@@ -0,0 +1,202 @@
+"""Incremental per-line blame keyed by blob.
+
+``git blame`` walks a file's history from scratch on every call. This
+engine computes the blame of a file as of a commit from the blame of
+the commit's parents plus one line diff per parent, and persists every
+result in ``blame_cache`` (see ``sql/repo.sql``) under
+``(path, commit_sha)``. Blaming the file again — or at a later
+revision — only diffs the commits that are not cached yet.
+
+History is the path-limited history git uses for ``git log -- <file>``
+(simplified, with parents rewritten to the nearest commit that touched
+the file). Renames and copies are not followed: lines that arrived by
+a rename are attributed to the rename commit.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import duckdb
+
+from fledgling.git.blobcache import BlobCache
+from fledgling.git.linediff import line_matcher, split_lines
+from fledgling.git.objects import GitRepo
+
+# (origin_commit, origin_line) for each line of a blob.
+Origins = list[tuple[str, int]]
+
+
+class BlameEngine:
+    """Blame cache for the files of one repository.
+
+    Args:
+        repo: Repository to blame in.
+        con: DuckDB connection with the repo module loaded (which creates
+            the ``blame_cache`` tables).
+        blobs: Blob cache used to read file contents.
+    """
+
+    def __init__(self, repo: GitRepo, con: duckdb.DuckDBPyConnection, blobs: BlobCache):
+        self.repo = repo
+        self._con = con
+        self._blobs = blobs
+        self._lock = threading.Lock()
+        self.diffs = 0
+
+    def blame(self, path: str, rev: str = "HEAD") -> tuple[Optional[str], Optional[str]]:
+        """Make sure ``path`` at ``rev`` is blamed in the cache.
+
+        Returns ``(blob_hash, commit_sha)``: the file's blob and the last
+        commit at or before ``rev`` that touched it, which together with
+        ``path`` keys the result. Returns ``(None, None)`` if the path is
+        absent.
+        """
+        blob = self.repo.blob_at(rev, path)
+        if blob is None:
+            return None, None
+        history = self.repo.path_history(self.repo.resolve(rev), path)
+        target = history[0][0]
+        with self._lock:
+            if target not in self._cached(path, [target]):
+                self._compute(path, target, history)
+        return blob, target
+
+    # ── Computation ──────────────────────────────────────────────────
+
+    def _compute(
+        self,
+        path: str,
+        target: str,
+        history: list[tuple[str, tuple[str, ...]]],
+    ) -> None:
+        graph = dict(history)
+        cached = self._cached(path, list(graph))
+
+        # Commits to compute: everything reachable from the target
+        # without passing through a cached commit.
+        needed: set[str] = set()
+        stack = [target]
+        while stack:
+            sha = stack.pop()
+            if sha in needed or sha in cached:
+                continue
+            needed.add(sha)
+            stack.extend(p for p in graph.get(sha, ()) if p in graph)
+
+        results: dict[str, tuple[Optional[str], Origins]] = {}
+        for sha, parents in reversed(history):  # parents before children
+            if sha in needed:
+                parents = [p for p in parents if p in graph]
+                results[sha] = self._blame_commit(
+                    path, sha, parents, results, cached,
+                )
+        self._store(path, results)
+
+    def _blame_commit(
+        self,
+        path: str,
+        sha: str,
+        parents: list[str],
+        results: dict[str, tuple[Optional[str], Origins]],
+        cached: dict[str, str],
+    ) -> tuple[Optional[str], Origins]:
+        blob = self.repo.blob_at(sha, path)
+        lines = (
+            split_lines(self._blobs.get(self.repo, blob), keepends=True)
+            if blob else []
+        )
+        origins: list[Optional[tuple[str, int]]] = [None] * len(lines)
+        for parent in parents:
+            parent_blob, parent_origins = (
+                results[parent] if parent in results
+                else self._load(path, parent, cached)
+            )
+            if not parent_origins or None not in origins:
+                continue
+            parent_lines = split_lines(
+                self._blobs.get(self.repo, parent_blob), keepends=True,
+            )
+            self.diffs += 1
+            matcher = line_matcher(parent_lines, lines)
+            for i, j, n in matcher.get_matching_blocks():
+                for k in range(n):
+                    if origins[j + k] is None:
+                        origins[j + k] = parent_origins[i + k]
+        return blob, [
+            o if o is not None else (sha, n)
+            for n, o in enumerate(origins, start=1)
+        ]
+
+    # ── Storage ──────────────────────────────────────────────────────
+
+    def _cached(self, path: str, commits: list[str]) -> dict[str, str]:
+        """``{commit: blob}`` for the ``commits`` whose blame of ``path``
+        is cached."""
+        rows = self._con.execute(
+            "SELECT commit_sha, blob_hash FROM blame_cache.blames "
+            "WHERE path = ? AND list_contains(?, commit_sha)",
+            [path, commits],
+        ).fetchall()
+        return dict(rows)
+
+    def _load(
+        self, path: str, sha: str, cached: dict[str, str],
+    ) -> tuple[Optional[str], Origins]:
+        blob = cached.get(sha)
+        if blob is None:
+            return None, []
+        rows = self._con.execute(
+            "SELECT origin_commit, origin_line FROM blame_cache.lines "
+            "WHERE path = ? AND commit_sha = ? ORDER BY line_number",
+            [path, sha],
+        ).fetchall()
+        return blob, [(c, n) for c, n in rows]
+
+    def _store(
+        self, path: str, results: dict[str, tuple[Optional[str], Origins]],
+    ) -> None:
+        con = self._con
+        origin_commits: set[str] = set()
+        con.execute("BEGIN TRANSACTION")
+        try:
+            for sha, (blob, origins) in results.items():
+                if blob is None:
+                    continue
+                con.execute(
+                    "INSERT OR IGNORE INTO blame_cache.blames "
+                    "(path, commit_sha, blob_hash, line_count) VALUES (?, ?, ?, ?)",
+                    [path, sha, blob, len(origins)],
+                )
+                if origins:
+                    con.execute(
+                        "INSERT OR IGNORE INTO blame_cache.lines "
+                        "SELECT ?, ?, unnest(?), unnest(?), unnest(?)",
+                        [
+                            path, sha,
+                            list(range(1, len(origins) + 1)),
+                            [c for c, _ in origins],
+                            [n for _, n in origins],
+                        ],
+                    )
+                origin_commits.update(c for c, _ in origins if c == sha)
+            for sha in origin_commits:
+                commit = self.repo.read_commit(sha)
+                summary = commit.message.split("\n", 1)[0]
+                con.execute(
+                    "INSERT OR IGNORE INTO blame_cache.commits VALUES "
+                    "(?, ?, ?, make_timestamp(?::BIGINT * 1000000), ?)",
+                    [sha, commit.author_name, commit.author_email,
+                     commit.author_time, summary],
+                )
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        try:
+            con.execute("COMMIT")
+        except duckdb.TransactionException:
+            # Another cursor committed some of the same keys first. Blame
+            # is deterministic, so its rows equal ours; anything of ours it
+            # didn't cover is recomputed on the next call.
+            pass
@@ -0,0 +1,198 @@
+"""Content-addressed blob cache for git-revision reads.
+
+``file_at_version``, ``read_source_text(commit := ...)`` and
+``structural_diff`` all read file contents at a revision. Through
+``git_uri``/``git_read`` every call fetches the blob again, even when a
+workflow has just read the same one. Blob content is addressed by its
+hash and never changes, so a cache keyed on the hash needs no
+invalidation — only a size bound.
+
+``BlobCache`` keeps recently used blobs in memory up to ``max_bytes``.
+With a ``spill_dir`` it also writes blobs to disk: evicted entries are
+spilled there instead of dropped. :meth:`BlobCache.materialize` returns
+a real file path for macros whose readers need one (read_lines,
+read_ast). Spilled and materialized files are named
+``<sha[:2]>/<sha[2:]><suffix>`` so the file extension (and with it
+sitting_duck's language detection) survives.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from fledgling.git.objects import GitRepo
+
+# The empty blob exists in every repository's object namespace but not
+# necessarily in its object store; materializing it stands in for "this
+# path does not exist at this revision".
+EMPTY_BLOB = "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+class BlobCache:
+    """LRU of blob contents keyed by blob SHA, bounded by total bytes.
+
+    Thread-safe. One cache can serve several repositories: a SHA names
+    the same content in every repository.
+
+    Args:
+        max_bytes: Memory budget for cached contents. Blobs larger than
+            the whole budget are never held in memory (they are still
+            spilled when a ``spill_dir`` is set).
+        spill_dir: Directory for on-disk copies, or None for memory only.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._lock = threading.Lock()
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._blobs or self._find_spilled(sha) is not None
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently held in memory."""
+        return self._bytes
+
+    def stats(self) -> dict:
+        """Counters for diagnostics (dr_fledgling, tests)."""
+        return {
+            "entries": len(self._blobs),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # ── Reads ────────────────────────────────────────────────────────
+
+    def get(self, repo: GitRepo, sha: str) -> bytes:
+        """Return a blob's content, reading it from ``repo`` on a miss."""
+        if sha == EMPTY_BLOB:
+            return b""
+        with self._lock:
+            data = self._blobs.get(sha)
+            if data is not None:
+                self._blobs.move_to_end(sha)
+                self.hits += 1
+                return data
+        spilled = self._find_spilled(sha)
+        if spilled is not None:
+            with open(spilled, "rb") as f:
+                data = f.read()
+        else:
+            data = repo.read_blob(sha)
+        with self._lock:
+            if spilled is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self._put(sha, data)
+        return data
+
+    def get_at(self, repo: GitRepo, rev: str, path: str) -> Optional[bytes]:
+        """Content of ``path`` at ``rev``, or None if the path is absent."""
+        sha = repo.blob_at(rev, path)
+        if sha is None:
+            return None
+        return self.get(repo, sha)
+
+    def materialize(
+        self,
+        repo: GitRepo,
+        sha: str,
+        suffix: str = "",
+        directory: Optional[str] = None,
+    ) -> str:
+        """Return a file path holding the blob's content.
+
+        Uses ``spill_dir`` when set, otherwise ``directory``, otherwise a
+        per-process temporary directory. The file is written once and
+        reused by later calls.
+        """
+        path = self._spill_path(sha, suffix, directory)
+        if not os.path.exists(path):
+            self._write(path, self.get(repo, sha))
+        return path
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _put(self, sha: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            self._spill(sha, data)
+            return
+        evicted: list[tuple[str, bytes]] = []
+        with self._lock:
+            if sha in self._blobs:
+                return
+            self._blobs[sha] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                old_sha, old = self._blobs.popitem(last=False)
+                self._bytes -= len(old)
+                evicted.append((old_sha, old))
+        for old_sha, old in evicted:
+            self._spill(old_sha, old)
+
+    def _spill(self, sha: str, data: bytes) -> None:
+        if self.spill_dir is None or self._find_spilled(sha) is not None:
+            return
+        self._write(self._spill_path(sha, ""), data)
+
+    def _base_dir(self, directory: Optional[str] = None) -> str:
+        if self.spill_dir is not None:
+            return self.spill_dir
+        if directory is not None:
+            return directory
+        if not hasattr(self, "_tmpdir"):
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="fledgling-blobs-")
+        return self._tmpdir.name
+
+    def _spill_path(
+        self, sha: str, suffix: str, directory: Optional[str] = None,
+    ) -> str:
+        return os.path.join(self._base_dir(directory), sha[:2], sha[2:] + suffix)
+
+    def _find_spilled(self, sha: str) -> Optional[str]:
+        """Any on-disk copy of ``sha``, whatever suffix it was written with."""
+        if self.spill_dir is None:
+            return None
+        shard = os.path.join(self.spill_dir, sha[:2])
+        try:
+            names = os.listdir(shard)
+        except FileNotFoundError:
+            return None
+        rest = sha[2:]
+        for name in names:
+            if name == rest or name.startswith(rest + "."):
+                return os.path.join(shard, name)
+        return None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        # Write-then-rename so concurrent readers never see a partial file.
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
@@ -0,0 +1,83 @@
+"""Normalized token hashes of definition bodies.
+
+``structural_diff`` used to call a definition modified when its node
+counts changed, which misses edits that keep the tree's shape (a changed
+constant, a swapped operator). Each definition cached in
+``ast_cache.definitions`` now carries a ``body_hash``: a hash of its
+source tokens with whitespace and comments dropped and its own name
+replaced by a placeholder. So:
+
+* reformatting or re-commenting a function leaves its hash unchanged;
+* any token edit changes it;
+* a function renamed or moved without edits keeps its hash, which is
+  how ``structural_diff`` pairs a removed definition with an added one.
+
+Tokenizing is lexical and language-light (string literals, words,
+punctuation; comment syntax by language family) — it doesn't need a
+parse, and the line range of each definition comes from the AST cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+_HASH = ("#",)
+_DASH = ("--",)
+_C = ("//", "/*")
+
+# sitting_duck language → comment openers. Unlisted languages use _C.
+COMMENTS = {
+    "python": _HASH, "ruby": _HASH, "r": _HASH, "bash": _HASH,
+    "toml": _HASH, "yaml": _HASH, "graphql": _HASH,
+    "sql": _DASH, "lua": _DASH,
+    "php": _HASH + _C, "hcl": _HASH + _C,
+    "css": ("/*",),
+    "html": ("<!--",),
+    "markdown": ("<!--",), "json": (),
+}
+
+_STRING = (
+    r'"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\''
+    r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`'
+)
+_COMMENT = {
+    "#": r"#[^\n]*",
+    "--": r"--[^\n]*",
+    "//": r"//[^\n]*",
+    "/*": r"/\*[\s\S]*?(?:\*/|\Z)",
+    "<!--": r"<!--[\s\S]*?(?:-->|\Z)",
+}
+_TOKEN = r"\w+|[^\w\s]"
+_patterns: dict[tuple[str, ...], re.Pattern] = {}
+
+NAME_PLACEHOLDER = "\x00name"
+
+
+def _pattern(openers: tuple[str, ...]) -> re.Pattern:
+    pattern = _patterns.get(openers)
+    if pattern is None:
+        comments = "|".join(_COMMENT[o] for o in openers)
+        parts = [f"(?P<c>{comments})"] if comments else []
+        parts += [f"(?P<t>{_STRING}|{_TOKEN})"]
+        pattern = _patterns[openers] = re.compile("|".join(parts))
+    return pattern
+
+
+def tokens(text: str, language: str) -> list[str]:
+    """Tokens of ``text`` without whitespace and comments."""
+    pattern = _pattern(COMMENTS.get(language, _C))
+    return [m.group("t") for m in pattern.finditer(text) if m.group("t") is not None]
+
+
+def body_hash(text: str, name: str, language: str) -> str:
+    """Normalized hash of one definition's source.
+
+    Occurrences of ``name`` (the definition itself, recursive calls)
+    hash as a placeholder, so a rename alone keeps the hash.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for tok in tokens(text, language):
+        h.update((NAME_PLACEHOLDER if tok == name else tok).encode())
+        h.update(b"\0")
+    return h.hexdigest()
@@ -0,0 +1,117 @@
+"""Per-commit churn over a revision range, in one pass.
+
+``churn_hotspots`` needs, for every commit since a revision, which files
+it touched and which lines of each file changed. This module walks the
+range once: each non-merge commit is tree-diffed against its first
+parent (unchanged subtrees are skipped, see :mod:`fledgling.git.treediff`)
+and each matching changed file is line-diffed with blob contents served
+by the shared :class:`~fledgling.git.blobcache.BlobCache`.
+
+The result is a flat list of :class:`Touch` rows — ready to be stored in
+``churn_cache.touches`` (see ``sql/structural.sql``), where ranking
+against parsed definitions happens in SQL.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from fledgling.git.astcache import language_for
+from fledgling.git.linediff import line_matcher, split_lines
+from fledgling.git.blobcache import BlobCache
+from fledgling.git.objects import GitRepo
+from fledgling.git.pathspec import glob_match
+from fledgling.git.treediff import diff_trees
+
+
+@dataclass(frozen=True)
+class Touch:
+    """One file changed by one commit.
+
+    ``hunks`` are the changed line ranges of ``blob`` (1-based,
+    inclusive). A pure deletion is recorded as the two lines around
+    the removed text, so a function that lost lines still counts as
+    touched.
+    """
+    commit: str
+    file_path: str
+    blob: str
+    added: int
+    removed: int
+    hunks: tuple[tuple[int, int], ...]
+
+    def as_dict(self) -> dict:
+        return {
+            "commit_sha": self.commit,
+            "file_path": self.file_path,
+            "blob_hash": self.blob,
+            "lines_added": self.added,
+            "lines_removed": self.removed,
+            "hunk_start": [lo for lo, _ in self.hunks],
+            "hunk_end": [hi for _, hi in self.hunks],
+        }
+
+
+def line_changes(
+    old: list[str], new: list[str],
+) -> tuple[int, int, tuple[tuple[int, int], ...]]:
+    """``(added, removed, hunks)`` between two line lists.
+
+    ``hunks`` are changed ranges in ``new`` as in :class:`Touch`.
+    """
+    added = removed = 0
+    hunks = []
+    matcher = line_matcher(old, new)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        removed += i2 - i1
+        added += j2 - j1
+        if j2 > j1:
+            hunks.append((j1 + 1, j2))
+        else:
+            hunks.append((max(j1, 1), j1 + 1))
+    return added, removed, tuple(hunks)
+
+
+def range_touches(
+    repo: GitRepo,
+    blobs: BlobCache,
+    since: str,
+    head: str,
+    file_pattern: str,
+) -> tuple[int, list[Touch]]:
+    """Touches of files matching ``file_pattern`` in ``since..head``.
+
+    Merge commits are skipped (their changes are counted on the branch
+    commits that made them); root commits are diffed against the empty
+    tree. Deleted files produce no touch, and neither do files whose
+    language isn't mapped by extension (see
+    :func:`~fledgling.git.astcache.language_for`): they have no
+    definitions to rank.
+
+    Returns ``(commit_count, touches)``.
+    """
+    commits = repo.rev_list(f"{since}..{head}", no_merges=True)
+    touches: list[Touch] = []
+    for sha, parents in commits:
+        parent: Optional[str] = parents[0] if parents else None
+        for change in diff_trees(repo, parent, sha, sizes=False):
+            if change.new_blob is None:
+                continue
+            if not glob_match(change.file_path, file_pattern):
+                continue
+            if language_for(change.file_path) is None:
+                continue
+            old = (
+                split_lines(blobs.get(repo, change.old_blob), keepends=True)
+                if change.old_blob else []
+            )
+            new = split_lines(blobs.get(repo, change.new_blob), keepends=True)
+            added, removed, hunks = line_changes(old, new)
+            if hunks:
+                touches.append(Touch(
+                    sha, change.file_path, change.new_blob, added, removed, hunks,
+                ))
+    return len(commits), touches
@@ -0,0 +1,123 @@
+"""Reader for git's index file (``.git/index``).
+
+The index records, for every tracked path, the blob SHA that is staged
+and the ``stat`` data the file had when it was last staged or refreshed.
+Comparing that stat data with the working tree is how ``git status``
+finds modified files without hashing them, and it is what
+:mod:`fledgling.git.status` does too.
+
+Supports index versions 2, 3 and 4 (v4 prefix-compresses paths).
+Extensions (cache-tree, untracked cache, ...) are skipped.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+# Entry flag bits.
+_ASSUME_VALID = 0x8000
+_EXTENDED = 0x4000
+_STAGE_MASK = 0x3000
+_NAME_MASK = 0x0FFF
+# Extended flag bits (v3+).
+_SKIP_WORKTREE = 0x4000
+_INTENT_TO_ADD = 0x2000
+
+_HEADER = struct.Struct(">4sLL")
+_ENTRY = struct.Struct(">LLLLLLLLLL20sH")
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """One index entry with the stat fields git compares."""
+    path: str
+    sha: str
+    mode: int
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    ino: int
+    stage: int = 0
+    assume_valid: bool = False
+    skip_worktree: bool = False
+    intent_to_add: bool = False
+
+    @property
+    def is_gitlink(self) -> bool:
+        """Submodule entry (mode 160000)."""
+        return self.mode & 0o170000 == 0o160000
+
+    @property
+    def is_symlink(self) -> bool:
+        return self.mode & 0o170000 == 0o120000
+
+
+def read_index(path: str) -> list[IndexEntry]:
+    """Parse an index file into its entries (in index order).
+
+    Raises:
+        ValueError: if the file is not a git index or uses an
+            unsupported version.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return parse_index(data)
+
+
+def parse_index(data: bytes) -> list[IndexEntry]:
+    """Parse raw index bytes. See :func:`read_index`."""
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC":
+        raise ValueError("not a git index file")
+    if version not in (2, 3, 4):
+        raise ValueError(f"unsupported index version {version}")
+    entries: list[IndexEntry] = []
+    pos = _HEADER.size
+    prev_name = b""
+    for _ in range(count):
+        start = pos
+        (ctime_s, ctime_n, mtime_s, mtime_n, _dev, ino, mode,
+         _uid, _gid, size, sha, flags) = _ENTRY.unpack_from(data, pos)
+        pos += _ENTRY.size
+        extended = 0
+        if flags & _EXTENDED:
+            (extended,) = struct.unpack_from(">H", data, pos)
+            pos += 2
+        if version == 4:
+            strip, pos = _varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = prev_name[:len(prev_name) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b"\0", pos)
+            name = data[pos:end]
+            # Entries are NUL-padded to a multiple of 8 bytes.
+            pos = start + ((end - start + 8) & ~7)
+        prev_name = name
+        entries.append(IndexEntry(
+            path=name.decode("utf-8", errors="surrogateescape"),
+            sha=sha.hex(),
+            mode=mode,
+            size=size,
+            mtime_ns=mtime_s * 1_000_000_000 + mtime_n,
+            ctime_ns=ctime_s * 1_000_000_000 + ctime_n,
+            ino=ino,
+            stage=(flags & _STAGE_MASK) >> 12,
+            assume_valid=bool(flags & _ASSUME_VALID),
+            skip_worktree=bool(extended & _SKIP_WORKTREE),
+            intent_to_add=bool(extended & _INTENT_TO_ADD),
+        ))
+    return entries
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Decode git's offset varint (used by index v4 path compression)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
@@ -0,0 +1,193 @@
+"""Hunk-aware line diff between blobs, cached by blob pair.
+
+The ``file_diff`` macro splits ``read_git_diff`` text into lines and has
+to re-diff on every call. This engine diffs blob contents with
+:mod:`difflib` and returns rows that carry the hunk number and the old
+and new line numbers of every line, so callers can jump straight to the
+change. A diff is a pure function of its two blobs, so results are
+cached by ``(old_blob, new_blob)``; :class:`DiffCache` also keeps the
+added/removed counts of every pair it has seen, which is all a diffstat
+needs.
+"""
+
+from __future__ import annotations
+
+import difflib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fledgling.git.blobcache import EMPTY_BLOB, BlobCache
+from fledgling.git.objects import GitRepo
+
+CONTEXT_LINES = 3
+
+# SequenceMatcher(autojunk=False) finds exact longest matches but is
+# quadratic in the line counts, which shows on long files full of
+# repeated lines. Pairs above this many old × new lines fall back to
+# difflib's autojunk heuristic (lines making up over 1% of the new side
+# are not used to anchor matches).
+EXACT_MATCH_LIMIT = 4_000_000
+
+
+def split_lines(data: bytes, keepends: bool = False) -> list[str]:
+    """Lines of a blob, split the way ``_file_blame_for`` splits them.
+
+    A trailing newline ends the last line instead of starting an empty
+    one. With ``keepends`` each line keeps its ``\\n``, so a last line
+    with and without a newline compare unequal, as they do for git.
+    """
+    if not data:
+        return []
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    last = lines.pop()  # "" when the blob ends with a newline
+    if keepends:
+        lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def line_matcher(old: list[str], new: list[str]) -> difflib.SequenceMatcher:
+    """SequenceMatcher over two line lists, exact up to EXACT_MATCH_LIMIT."""
+    exact = len(old) * len(new) <= EXACT_MATCH_LIMIT
+    return difflib.SequenceMatcher(None, old, new, autojunk=not exact)
+
+
+@dataclass(frozen=True)
+class DiffLine:
+    """One row of ``file_diff``.
+
+    ``old_line`` is None for added lines, ``new_line`` for removed ones.
+    A last line whose newline was added or removed shows as removed and
+    re-added with the same content, as in git's diff.
+    """
+    hunk: int
+    line_type: str  # 'ADDED', 'REMOVED' or 'CONTEXT'
+    old_line: Optional[int]
+    new_line: Optional[int]
+    content: str
+
+
+@dataclass(frozen=True)
+class FileDiff:
+    """Diff of one blob pair.
+
+    Binary pairs (either side has a NUL byte in its first 8000 bytes,
+    git's heuristic) have no lines and zero counts.
+    """
+    lines: tuple[DiffLine, ...]
+    added: int
+    removed: int
+    binary: bool = False
+
+
+def is_binary(data: bytes) -> bool:
+    """git's binary heuristic: a NUL byte in the first 8000 bytes."""
+    return b"\0" in data[:8000]
+
+
+def _text(line: str) -> str:
+    return line[:-1] if line.endswith("\n") else line
+
+
+def diff_lines(old: list[str], new: list[str], context: int = CONTEXT_LINES) -> FileDiff:
+    """Unified-diff rows between two line lists, grouped into hunks.
+
+    Lines may keep their newlines (``split_lines(keepends=True)``); row
+    content never includes them.
+    """
+    rows: list[DiffLine] = []
+    added = removed = 0
+    matcher = line_matcher(old, new)
+    for hunk, group in enumerate(matcher.get_grouped_opcodes(context), start=1):
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for k in range(i2 - i1):
+                    rows.append(DiffLine(
+                        hunk, "CONTEXT", i1 + k + 1, j1 + k + 1, _text(old[i1 + k]),
+                    ))
+                continue
+            for i in range(i1, i2):
+                rows.append(DiffLine(hunk, "REMOVED", i + 1, None, _text(old[i])))
+            for j in range(j1, j2):
+                rows.append(DiffLine(hunk, "ADDED", None, j + 1, _text(new[j])))
+            removed += i2 - i1
+            added += j2 - j1
+    return FileDiff(tuple(rows), added, removed)
+
+
+class DiffCache:
+    """LRU of :class:`FileDiff` results keyed by blob pair.
+
+    Thread-safe. Counts are kept for every pair ever diffed (they are
+    two integers), so :meth:`stat` for a pair evicted from the LRU
+    doesn't re-diff.
+
+    Args:
+        blobs: Blob cache used to read contents.
+        max_entries: Number of full diffs kept in memory.
+    """
+
+    def __init__(self, blobs: BlobCache, max_entries: int = 512):
+        self._blobs = blobs
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._diffs: OrderedDict[tuple, FileDiff] = OrderedDict()
+        self._stats: dict[tuple[str, str], tuple[int, int, bool]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def diff(
+        self,
+        repo: GitRepo,
+        old_blob: Optional[str],
+        new_blob: Optional[str],
+        context: int = CONTEXT_LINES,
+    ) -> FileDiff:
+        """Diff two blobs; None stands for an absent file."""
+        old_blob = old_blob or EMPTY_BLOB
+        new_blob = new_blob or EMPTY_BLOB
+        key = (old_blob, new_blob, context)
+        with self._lock:
+            cached = self._diffs.get(key)
+            if cached is not None:
+                self._diffs.move_to_end(key)
+                self.hits += 1
+                return cached
+        old = self._blobs.get(repo, old_blob)
+        new = self._blobs.get(repo, new_blob)
+        if is_binary(old) or is_binary(new):
+            result = FileDiff((), 0, 0, binary=True)
+        else:
+            result = diff_lines(
+                split_lines(old, keepends=True),
+                split_lines(new, keepends=True),
+                context,
+            )
+        with self._lock:
+            self.misses += 1
+            self._stats[(old_blob, new_blob)] = (
+                result.added, result.removed, result.binary,
+            )
+            self._diffs[key] = result
+            while len(self._diffs) > self.max_entries:
+                self._diffs.popitem(last=False)
+        return result
+
+    def stat(
+        self,
+        repo: GitRepo,
+        old_blob: Optional[str],
+        new_blob: Optional[str],
+    ) -> tuple[int, int, bool]:
+        """``(added, removed, binary)`` for a blob pair."""
+        pair = (old_blob or EMPTY_BLOB, new_blob or EMPTY_BLOB)
+        with self._lock:
+            cached = self._stats.get(pair)
+            if cached is not None:
+                self.hits += 1
+                return cached
+        result = self.diff(repo, *pair)
+        return result.added, result.removed, result.binary
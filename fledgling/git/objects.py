@@ -0,0 +1,342 @@
+"""Direct access to git objects through long-lived plumbing processes.
+
+duck_tails exposes git state as whole-tree table functions, which is the
+right shape for SQL but the wrong shape for engines that want to touch a
+handful of objects: every `git_tree()` call enumerates the full tree. This
+module talks to ``git cat-file --batch`` instead, so callers can read one
+tree, one commit, or one blob at a time.
+
+Objects are addressed by SHA and never change, so anything read here can
+be cached forever by the caller. Revision names (``HEAD``, branches) are
+mutable — always go through :meth:`GitRepo.resolve` first and key caches
+on the resulting SHA.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$")
+
+# Tree entry modes (octal strings as stored in tree objects).
+_MODE_TREE = "40000"
+_MODE_SUBMODULE = "160000"
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    """One entry of a git tree object."""
+    mode: str
+    name: str
+    sha: str
+
+    @property
+    def is_tree(self) -> bool:
+        return self.mode == _MODE_TREE
+
+    @property
+    def is_submodule(self) -> bool:
+        return self.mode == _MODE_SUBMODULE
+
+
+@dataclass(frozen=True)
+class Commit:
+    """The fields of a commit object that fledgling engines use."""
+    sha: str
+    tree: str
+    parents: tuple[str, ...]
+    author_name: str
+    author_email: str
+    author_time: int
+    message: str
+
+
+class GitRepo:
+    """Object-level reader for one git repository.
+
+    Keeps a ``git cat-file --batch`` and ``--batch-check`` process open
+    for the lifetime of the instance. Thread-safe: object reads are
+    serialized on an internal lock, so one ``GitRepo`` can be shared by
+    workflow sections running on a thread pool.
+
+    Parsed trees are kept in a small LRU (``tree_cache_size`` entries);
+    trees are immutable and hot during tree diffs.
+    """
+
+    def __init__(self, path: str = ".", tree_cache_size: int = 4096):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._batch: Optional[subprocess.Popen] = None
+        self._check: Optional[subprocess.Popen] = None
+        self._trees: OrderedDict[str, tuple[TreeEntry, ...]] = OrderedDict()
+        self._tree_cache_size = tree_cache_size
+        self._git_dir: Optional[str] = None
+
+    # ── Plumbing ─────────────────────────────────────────────────────
+
+    def _run(self, *args: str) -> str:
+        """Run a one-shot git command in the repo and return stdout."""
+        result = subprocess.run(
+            ["git", "-C", self.path, *args],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr,
+            )
+        return result.stdout
+
+    def _spawn(self, mode: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "-C", self.path, "cat-file", mode],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _request(self, proc: subprocess.Popen, sha: str) -> bytes:
+        """Send one object name to a batch process, return the header line."""
+        proc.stdin.write(sha.encode() + b"\n")
+        proc.stdin.flush()
+        header = proc.stdout.readline()
+        if not header:
+            raise RuntimeError(f"git cat-file exited while reading {sha}")
+        return header.rstrip(b"\n")
+
+    def close(self) -> None:
+        """Terminate the batch processes. Safe to call more than once."""
+        with self._lock:
+            for proc in (self._batch, self._check):
+                if proc is not None and proc.poll() is None:
+                    proc.stdin.close()
+                    proc.wait()
+            self._batch = None
+            self._check = None
+
+    def __enter__(self) -> "GitRepo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def git_dir(self) -> str:
+        """Absolute path of the repository's git directory.
+
+        Usually ``<path>/.git``; differs for linked worktrees and
+        submodules, where ``.git`` is a file pointing elsewhere.
+        """
+        if self._git_dir is None:
+            out = self._run("rev-parse", "--absolute-git-dir").strip()
+            self._git_dir = out
+        return self._git_dir
+
+    def config(self, key: str) -> Optional[str]:
+        """Value of a git config key, or None if unset."""
+        try:
+            return self._run("config", "--get", key).strip() or None
+        except subprocess.CalledProcessError:
+            return None
+
+    # ── Revisions ────────────────────────────────────────────────────
+
+    def resolve(self, rev: str) -> str:
+        """Resolve a revision expression to a full commit SHA.
+
+        Full 40-hex SHAs are returned as-is without a subprocess call.
+
+        Raises:
+            ValueError: if ``rev`` does not name a commit.
+        """
+        if _SHA_RE.match(rev):
+            return rev
+        if not rev or rev.startswith("-"):
+            raise ValueError(f"Invalid revision: {rev!r}")
+        try:
+            out = self._run("rev-parse", "--verify", "-q", f"{rev}^{{commit}}")
+        except subprocess.CalledProcessError:
+            raise ValueError(f"Unknown revision: {rev!r}") from None
+        return out.strip()
+
+    def rev_list(
+        self,
+        *revs: str,
+        paths: tuple[str, ...] = (),
+        no_merges: bool = False,
+        max_count: Optional[int] = None,
+    ) -> list[tuple[str, tuple[str, ...]]]:
+        """``(sha, parents)`` pairs from ``git rev-list --topo-order``.
+
+        Newest first. With ``paths``, history is simplified to commits
+        that touched them and parents are rewritten accordingly.
+        """
+        args = ["rev-list", "--topo-order", "--parents"]
+        if no_merges:
+            args.append("--no-merges")
+        if max_count is not None:
+            args.append(f"--max-count={int(max_count)}")
+        out = self._run(*args, *revs, "--", *paths)
+        history = []
+        for line in out.splitlines():
+            sha, *parents = line.split()
+            history.append((sha, tuple(parents)))
+        return history
+
+    def path_history(self, rev: str, path: str) -> list[tuple[str, tuple[str, ...]]]:
+        """Commits at or before ``rev`` that touched ``path``.
+
+        Returns ``(sha, parents)`` pairs in topological order, newest
+        first, with parents rewritten to the nearest commit that touched
+        ``path`` (the history ``git log -- <path>`` shows).
+        """
+        return self.rev_list(rev, paths=(path,))
+
+    # ── Objects ──────────────────────────────────────────────────────
+
+    def read_object(self, sha: str) -> tuple[str, bytes]:
+        """Return ``(type, content)`` for an object.
+
+        Raises:
+            KeyError: if the object does not exist.
+        """
+        with self._lock:
+            if self._batch is None or self._batch.poll() is not None:
+                self._batch = self._spawn("--batch")
+            header = self._request(self._batch, sha)
+            parts = header.split(b" ")
+            if len(parts) != 3:
+                raise KeyError(sha)
+            obj_type, size = parts[1].decode(), int(parts[2])
+            data = self._batch.stdout.read(size)
+            self._batch.stdout.read(1)  # trailing newline
+        return obj_type, data
+
+    def object_size(self, sha: str) -> int:
+        """Return the size in bytes of an object without reading it.
+
+        Raises:
+            KeyError: if the object does not exist.
+        """
+        with self._lock:
+            if self._check is None or self._check.poll() is not None:
+                self._check = self._spawn("--batch-check")
+            parts = self._request(self._check, sha).split(b" ")
+        if len(parts) != 3:
+            raise KeyError(sha)
+        return int(parts[2])
+
+    def read_tree(self, sha: str) -> tuple[TreeEntry, ...]:
+        """Parse a tree object into its entries (in git's stored order)."""
+        with self._lock:
+            entries = self._trees.get(sha)
+            if entries is not None:
+                self._trees.move_to_end(sha)
+                return entries
+        obj_type, data = self.read_object(sha)
+        if obj_type != "tree":
+            raise ValueError(f"{sha} is a {obj_type}, not a tree")
+        entries = tuple(_parse_tree(data))
+        with self._lock:
+            self._trees[sha] = entries
+            if len(self._trees) > self._tree_cache_size:
+                self._trees.popitem(last=False)
+        return entries
+
+    def read_commit(self, sha: str) -> Commit:
+        """Parse a commit object."""
+        obj_type, data = self.read_object(sha)
+        if obj_type != "commit":
+            raise ValueError(f"{sha} is a {obj_type}, not a commit")
+        return _parse_commit(sha, data)
+
+    def read_blob(self, sha: str) -> bytes:
+        """Return the raw content of a blob."""
+        obj_type, data = self.read_object(sha)
+        if obj_type != "blob":
+            raise ValueError(f"{sha} is a {obj_type}, not a blob")
+        return data
+
+    def commit_tree(self, rev: str) -> str:
+        """Return the root tree SHA of a revision."""
+        return self.read_commit(self.resolve(rev)).tree
+
+    def path_entry(self, tree_sha: str, path: str) -> Optional[TreeEntry]:
+        """Walk ``path`` from a root tree, returning its entry or None."""
+        entry: Optional[TreeEntry] = None
+        current = tree_sha
+        for part in [p for p in path.split("/") if p]:
+            if current is None:
+                return None
+            entry = next((e for e in self.read_tree(current) if e.name == part), None)
+            if entry is None:
+                return None
+            current = entry.sha if entry.is_tree else None
+        return entry
+
+    def blob_at(self, rev: str, path: str) -> Optional[str]:
+        """Return the blob SHA of ``path`` at ``rev``, or None if absent."""
+        entry = self.path_entry(self.commit_tree(rev), path)
+        if entry is None or entry.is_tree or entry.is_submodule:
+            return None
+        return entry.sha
+
+
+def _parse_tree(data: bytes):
+    """Yield TreeEntry objects from raw tree object bytes.
+
+    Format: repeated ``<mode> <name>\\0<20-byte binary sha>``.
+    """
+    i = 0
+    n = len(data)
+    while i < n:
+        space = data.index(b" ", i)
+        nul = data.index(b"\0", space)
+        mode = data[i:space].decode()
+        name = data[space + 1:nul].decode("utf-8", errors="surrogateescape")
+        sha = data[nul + 1:nul + 21].hex()
+        yield TreeEntry(mode=mode, name=name, sha=sha)
+        i = nul + 21
+
+
+_AUTHOR_RE = re.compile(rb"^(.*) <(.*)> (\d+) [+-]\d{4}$")
+
+
+def _parse_commit(sha: str, data: bytes) -> Commit:
+    headers, _, message = data.partition(b"\n\n")
+    tree = ""
+    parents: list[str] = []
+    author_name = author_email = ""
+    author_time = 0
+    for line in headers.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key == b"tree":
+            tree = value.decode()
+        elif key == b"parent":
+            parents.append(value.decode())
+        elif key == b"author":
+            m = _AUTHOR_RE.match(value)
+            if m:
+                author_name = m.group(1).decode("utf-8", errors="replace")
+                author_email = m.group(2).decode("utf-8", errors="replace")
+                author_time = int(m.group(3))
+    return Commit(
+        sha=sha,
+        tree=tree,
+        parents=tuple(parents),
+        author_name=author_name,
+        author_email=author_email,
+        author_time=author_time,
+        message=message.decode("utf-8", errors="replace"),
+    )
@@ -0,0 +1,162 @@
+"""Glob and gitignore matching for repo-relative paths.
+
+Macros take file patterns in read_ast/glob syntax (``**/*.py``,
+``src/**/*.ts``). Engines that work from git trees instead of the
+filesystem use :func:`glob_match` to apply the same patterns to
+repo-relative paths: ``*`` and ``?`` stay within one path segment,
+``**`` spans any number of segments (including none).
+:class:`IgnoreRules` applies the same matcher with gitignore(5)
+semantics.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+
+
+@functools.lru_cache(maxsize=256)
+def glob_regex(pattern: str) -> re.Pattern:
+    """Compile a glob pattern to an anchored regex."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def glob_match(path: str, pattern: str) -> bool:
+    """True if repo-relative ``path`` matches ``pattern``.
+
+    A leading ``./`` on the pattern is ignored.
+    """
+    if pattern.startswith("./"):
+        pattern = pattern[2:]
+    return glob_regex(pattern).match(path) is not None
+
+
+def repo_pattern(pattern: str, root: str) -> str:
+    """``pattern`` made relative to the repository at ``root``.
+
+    Macros glob the filesystem, so they accept absolute patterns too;
+    engines matching repo-relative paths rebase those first.
+    """
+    if os.path.isabs(pattern):
+        return os.path.relpath(pattern, root)
+    return pattern
+
+
+class IgnoreRules:
+    """gitignore matching for one repository.
+
+    Rules come from ``.git/info/exclude``, ``core.excludesFile`` (passed
+    in as ``extra_files``) and the ``.gitignore`` of every directory the
+    caller descends into (:meth:`load_dir`). Semantics follow
+    gitignore(5): last match wins, ``!`` re-includes, a trailing ``/``
+    matches directories only, and a pattern containing a ``/`` anywhere
+    but the end is anchored to the directory of its ``.gitignore``.
+
+    Callers walking the tree should not descend into ignored
+    directories; files inside them can't be re-included (git behaves
+    the same way).
+    """
+
+    def __init__(self, root: str, extra_files: tuple[str, ...] = ()):
+        self.root = root
+        # (base_dir, regex, negate, dir_only, match_basename)
+        self._rules: list[tuple[str, re.Pattern, bool, bool, bool]] = []
+        self._loaded: set[str] = set()
+        for path in extra_files:
+            self._load_file(path, "")
+
+    def load_dir(self, rel_dir: str) -> None:
+        """Add the ``.gitignore`` rules of ``rel_dir`` ('' for the root)."""
+        if rel_dir in self._loaded:
+            return
+        self._loaded.add(rel_dir)
+        self._load_file(os.path.join(self.root, rel_dir, ".gitignore"), rel_dir)
+
+    def _load_file(self, path: str, base: str) -> None:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            rule = _parse_ignore_line(line)
+            if rule is not None:
+                pattern, negate, dir_only, anchored = rule
+                self._rules.append(
+                    (base, glob_regex(pattern), negate, dir_only, not anchored)
+                )
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """True if repo-relative ``rel_path`` is ignored."""
+        name = rel_path.rsplit("/", 1)[-1]
+        ignored = False
+        for base, regex, negate, dir_only, basename in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                local = rel_path[len(base) + 1:]
+            else:
+                local = rel_path
+            target = name if basename else local
+            if regex.match(target):
+                ignored = not negate
+        return ignored
+
+
+def _parse_ignore_line(line: str):
+    """Return ``(pattern, negate, dir_only, anchored)`` or None for no rule."""
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped with a backslash.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line:
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    return line.replace("\\ ", " "), negate, dir_only, anchored
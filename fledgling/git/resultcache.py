@@ -0,0 +1,79 @@
+"""On-disk cache for results that are a pure function of commit SHAs.
+
+A review of ``main..HEAD`` depends only on the two commits (and the
+tool's own parameters), and commits never change: once the revision
+arguments are resolved to full SHAs, the result can be kept forever.
+``review_query`` and the ``review`` workflow store their payloads here,
+so repeated reviews of the same pair — by several agents, or across
+server restarts — skip the tree diff, the parses and the line diffs.
+
+Entries are JSON files named by a hash of the key, written atomically
+(temporary file + rename) so concurrent writers never expose a partial
+entry. Keys include :data:`FORMAT_VERSION` and the fledgling version:
+a release that changes what a payload contains starts a fresh cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+# Bump when the shape of a cached payload changes.
+FORMAT_VERSION = 1
+
+
+class ResultCache:
+    """JSON payloads keyed by ``(kind, from_sha, to_sha, params)``.
+
+    Args:
+        directory: Where entries are stored (created on demand).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(kind: str, from_sha: str, to_sha: str, **params: Any) -> str:
+        """Entry name for a result; ``params`` must be JSON-serializable."""
+        from fledgling import __version__
+        blob = json.dumps(
+            [FORMAT_VERSION, __version__, kind, from_sha, to_sha, params],
+            sort_keys=True,
+        )
+        digest = hashlib.sha1(blob.encode()).hexdigest()[:16]
+        return f"{kind}-{from_sha[:12]}-{to_sha[:12]}-{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """The stored payload, or None on a miss (or unreadable entry)."""
+        try:
+            with open(self._path(key)) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value``; the first complete write for a key wins."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,254 @@
+"""Working-tree status engine: modified, added, deleted and untracked files.
+
+The ``working_tree_status`` macro globs the whole checkout (ignored
+trees included) and joins it against ``git_tree(repo, 'HEAD')``, so it
+can only see files appear or disappear. This engine works the way
+``git status`` does:
+
+* tracked files are compared against the **index** by ``stat`` data
+  (size, mtime, inode, exec bit); only files whose stat data disagrees
+  — or is too recent to trust ("racily clean") — are hashed;
+* the index is compared against ``HEAD`` by blob SHA to find staged
+  additions, modifications and deletions;
+* untracked files come from a directory walk that honours
+  ``.gitignore``/``info/exclude``/``core.excludesFile`` and never
+  descends into ignored directories.
+
+State is kept between calls: the parsed index (until the index file
+changes), the flattened ``HEAD`` tree (per tree SHA), hashes of files
+whose stat data didn't match (until their stat data changes), and
+directory listings (until the directory's mtime changes — the same
+idea as git's untracked cache).
+"""
+
+from __future__ import annotations
+
+import os
+import stat as stat_mod
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fledgling.git.astcache import blob_hash
+from fledgling.git.index import IndexEntry, read_index
+from fledgling.git.objects import GitRepo
+from fledgling.git.pathspec import IgnoreRules
+
+# A cached observation is trusted only if the file or directory was
+# last modified at least this long before the observation was made;
+# otherwise a same-tick modification could go unnoticed.
+_RACY_NS = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class StatusEntry:
+    """One row of working_tree_status."""
+    file_path: str
+    status: str
+
+    def as_dict(self) -> dict:
+        return {"file_path": self.file_path, "status": self.status}
+
+
+class StatusEngine:
+    """Incremental ``git status`` for one repository.
+
+    Not thread-safe; the owner (``fledgling.Connection``) calls it from
+    one thread at a time.
+    """
+
+    def __init__(self, repo: GitRepo):
+        self.repo = repo
+        self.root = repo.path
+        self._index_sig: Optional[tuple] = None
+        self._index: list[IndexEntry] = []
+        self._index_mtime_ns = 0
+        self._head_tree: Optional[str] = None
+        self._head: dict[str, str] = {}
+        self._hashed: dict[str, tuple[tuple, str]] = {}
+        self._dirs: dict[str, tuple[int, int, list[tuple[str, bool]]]] = {}
+        self._exclude_files: Optional[tuple[str, ...]] = None
+        self.hashes = 0
+        self.listings = 0
+
+    # ── Public ───────────────────────────────────────────────────────
+
+    def status(self) -> list[StatusEntry]:
+        """Current status, sorted by (status, file_path)."""
+        index = self._load_index()
+        head = self._load_head()
+        result: dict[str, str] = {}
+
+        tracked: set[str] = set()
+        gitlinks: set[str] = set()
+        for e in index:
+            tracked.add(e.path)
+            if e.is_gitlink:
+                gitlinks.add(e.path)
+            if e.stage:
+                result[e.path] = "modified"  # unmerged
+                continue
+            if e.intent_to_add or e.path not in head:
+                staged = "added"
+            elif head[e.path] != e.sha:
+                staged = "modified"
+            else:
+                staged = None
+            worktree = self._worktree_status(e)
+            status = "deleted" if worktree == "deleted" else staged or worktree
+            if status:
+                result[e.path] = status
+
+        for path in head.keys() - tracked:
+            result[path] = "deleted"
+
+        for path in self._untracked(tracked, gitlinks):
+            # A path removed from the index but kept on disk is both a
+            # staged deletion and untracked; report the deletion.
+            result.setdefault(path, "untracked")
+
+        return sorted(
+            (StatusEntry(p, s) for p, s in result.items()),
+            key=lambda r: (r.status, r.file_path),
+        )
+
+    # ── Index and HEAD ───────────────────────────────────────────────
+
+    def _load_index(self) -> list[IndexEntry]:
+        path = os.path.join(self.repo.git_dir, "index")
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._index_sig, self._index = None, []
+            return []
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if sig != self._index_sig:
+            self._index = read_index(path)
+            self._index_sig = sig
+            self._index_mtime_ns = st.st_mtime_ns
+        return self._index
+
+    def _load_head(self) -> dict[str, str]:
+        try:
+            tree = self.repo.commit_tree("HEAD")
+        except ValueError:
+            return {}  # unborn branch
+        if tree != self._head_tree:
+            flat: dict[str, str] = {}
+            self._flatten(tree, "", flat)
+            self._head_tree, self._head = tree, flat
+        return self._head
+
+    def _flatten(self, tree: str, prefix: str, out: dict[str, str]) -> None:
+        for entry in self.repo.read_tree(tree):
+            if entry.is_tree:
+                self._flatten(entry.sha, prefix + entry.name + "/", out)
+            else:
+                out[prefix + entry.name] = entry.sha
+
+    # ── Tracked files ────────────────────────────────────────────────
+
+    def _worktree_status(self, e: IndexEntry) -> Optional[str]:
+        """'modified', 'deleted' or None (clean) for one index entry."""
+        if e.assume_valid or e.skip_worktree:
+            return None
+        full = os.path.join(self.root, e.path)
+        try:
+            st = os.lstat(full)
+        except (FileNotFoundError, NotADirectoryError):
+            return "deleted"
+        if e.is_gitlink:
+            return None if stat_mod.S_ISDIR(st.st_mode) else "modified"
+        if stat_mod.S_ISLNK(st.st_mode) != e.is_symlink:
+            return "modified"
+        if not e.is_symlink and bool(st.st_mode & 0o100) != bool(e.mode & 0o100):
+            return "modified"
+        if st.st_size & 0xFFFFFFFF != e.size:
+            return "modified"
+        racy = st.st_mtime_ns >= self._index_mtime_ns
+        if not racy and self._stat_matches(e, st):
+            return None
+        return None if self._hash(e.path, full, st) == e.sha else "modified"
+
+    @staticmethod
+    def _stat_matches(e: IndexEntry, st: os.stat_result) -> bool:
+        if e.mtime_ns % 1_000_000_000 == 0:
+            # Index written without nanoseconds: compare whole seconds.
+            if st.st_mtime_ns // 1_000_000_000 != e.mtime_ns // 1_000_000_000:
+                return False
+        elif st.st_mtime_ns != e.mtime_ns:
+            return False
+        return e.ino == 0 or st.st_ino & 0xFFFFFFFF == e.ino
+
+    def _hash(self, path: str, full: str, st: os.stat_result) -> str:
+        sig = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+        cached = self._hashed.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+        if stat_mod.S_ISLNK(st.st_mode):
+            data = os.fsencode(os.readlink(full))
+        else:
+            with open(full, "rb") as f:
+                data = f.read()
+        sha = blob_hash(data)
+        self.hashes += 1
+        if time.time_ns() - st.st_mtime_ns > _RACY_NS:
+            self._hashed[path] = (sig, sha)
+        return sha
+
+    # ── Untracked files ──────────────────────────────────────────────
+
+    def _ignore_rules(self) -> IgnoreRules:
+        if self._exclude_files is None:
+            files = [os.path.join(self.repo.git_dir, "info", "exclude")]
+            configured = self.repo.config("core.excludesFile")
+            if configured:
+                files.append(os.path.expanduser(configured))
+            else:
+                xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+                files.append(os.path.join(xdg, "git", "ignore"))
+            self._exclude_files = tuple(files)
+        return IgnoreRules(self.root, self._exclude_files)
+
+    def _listing(self, rel_dir: str) -> list[tuple[str, bool]]:
+        """``(name, is_dir)`` pairs of a directory, cached by its mtime."""
+        full = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        try:
+            mtime = os.stat(full).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._dirs.get(rel_dir)
+        if cached is not None and cached[0] == mtime and cached[1] - mtime > _RACY_NS:
+            return cached[2]
+        entries = []
+        try:
+            with os.scandir(full) as it:
+                for d in it:
+                    entries.append((d.name, d.is_dir(follow_symlinks=False)))
+        except OSError:
+            return []
+        self.listings += 1
+        self._dirs[rel_dir] = (mtime, time.time_ns(), entries)
+        return entries
+
+    def _untracked(self, tracked: set[str], gitlinks: set[str]) -> list[str]:
+        rules = self._ignore_rules()
+        out: list[str] = []
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            rules.load_dir(rel_dir)
+            for name, is_dir in self._listing(rel_dir):
+                rel = f"{rel_dir}/{name}" if rel_dir else name
+                if is_dir:
+                    if name == ".git" or rel in gitlinks:
+                        continue
+                    if rules.is_ignored(rel, is_dir=True):
+                        continue
+                    if os.path.exists(os.path.join(self.root, rel, ".git")):
+                        out.append(rel + "/")  # nested repository
+                        continue
+                    stack.append(rel)
+                elif rel not in tracked and not rules.is_ignored(rel):
+                    out.append(rel)
+        return out
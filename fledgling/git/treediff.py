@@ -0,0 +1,119 @@
+"""Tree diff engine: changed files between two revisions.
+
+The SQL ``file_changes`` macro joins two complete ``git_tree`` listings,
+so its cost is proportional to repository size. This engine compares
+tree objects instead: when two subtrees have the same SHA their contents
+are identical and the walk skips them entirely. Cost is proportional to
+the number of directories on the paths to changed files.
+
+Status semantics match ``file_changes``: a path is ``modified`` when its
+blob SHA differs (mode-only changes are ignored), ``added``/``deleted``
+when it exists on one side only. Submodule entries (gitlinks) name
+commits in another repository and are not reported.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from fledgling.git.objects import GitRepo, TreeEntry
+
+
+@dataclass(frozen=True)
+class TreeChange:
+    """One changed file between two trees."""
+    file_path: str
+    status: str
+    old_blob: Optional[str] = None
+    new_blob: Optional[str] = None
+    old_size: Optional[int] = None
+    new_size: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        """The ``file_changes`` row shape (file_path, status, sizes)."""
+        return {
+            "file_path": self.file_path,
+            "status": self.status,
+            "old_size": self.old_size,
+            "new_size": self.new_size,
+        }
+
+
+def diff_trees(
+    repo: GitRepo,
+    from_rev: Optional[str],
+    to_rev: str,
+    sizes: bool = True,
+) -> list[TreeChange]:
+    """Compare two revisions and return the changed files, sorted by path.
+
+    Args:
+        repo: Repository to read objects from.
+        from_rev: Base revision (any rev expression or SHA), or None
+            for the empty tree (every file of ``to_rev`` is added).
+        to_rev: Target revision.
+        sizes: Look up blob sizes for changed files (one ``--batch-check``
+            round trip per changed blob). Set False when only paths and
+            blob SHAs are needed.
+    """
+    old_tree = repo.commit_tree(from_rev) if from_rev is not None else None
+    new_tree = repo.commit_tree(to_rev)
+    changes: list[TreeChange] = []
+    _diff(repo, old_tree, new_tree, "", changes)
+    if sizes:
+        changes = [
+            TreeChange(
+                file_path=c.file_path,
+                status=c.status,
+                old_blob=c.old_blob,
+                new_blob=c.new_blob,
+                old_size=repo.object_size(c.old_blob) if c.old_blob else None,
+                new_size=repo.object_size(c.new_blob) if c.new_blob else None,
+            )
+            for c in changes
+        ]
+    changes.sort(key=lambda c: c.file_path)
+    return changes
+
+
+def _entries(repo: GitRepo, tree_sha: Optional[str]) -> dict[str, TreeEntry]:
+    if tree_sha is None:
+        return {}
+    return {e.name: e for e in repo.read_tree(tree_sha)}
+
+
+def _is_blob(entry: Optional[TreeEntry]) -> bool:
+    return entry is not None and not entry.is_tree and not entry.is_submodule
+
+
+def _diff(
+    repo: GitRepo,
+    old_sha: Optional[str],
+    new_sha: Optional[str],
+    prefix: str,
+    out: list[TreeChange],
+) -> None:
+    """Recursively diff two trees (either may be None for a missing side)."""
+    if old_sha == new_sha:
+        return
+    old = _entries(repo, old_sha)
+    new = _entries(repo, new_sha)
+    for name in old.keys() | new.keys():
+        a = old.get(name)
+        b = new.get(name)
+        if a is not None and b is not None and a.sha == b.sha:
+            continue
+        path = prefix + name
+        a_tree = a.sha if a is not None and a.is_tree else None
+        b_tree = b.sha if b is not None and b.is_tree else None
+        if a_tree or b_tree:
+            _diff(repo, a_tree, b_tree, path + "/", out)
+        a_blob = a.sha if _is_blob(a) else None
+        b_blob = b.sha if _is_blob(b) else None
+        if a_blob and b_blob:
+            out.append(TreeChange(path, "modified", a_blob, b_blob))
+        elif a_blob:
+            out.append(TreeChange(path, "deleted", old_blob=a_blob))
+        elif b_blob:
+            out.append(TreeChange(path, "added", new_blob=b_blob))
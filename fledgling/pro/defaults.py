@@ -70,6 +70,75 @@ def load_config(root: str | Path) -> dict[str, str]:
     return dict(data.get("defaults", {}))
 
 
+def load_workspace(root: str | Path) -> dict[str, str]:
+    """Read workspace repositories from .fledgling-python/config.toml.
+
+    The [workspace] section maps repo names to roots; relative roots
+    resolve against ``root``. Returns {} if there is no such section.
+
+    Example::
+
+        [workspace]
+        api = "../api"
+        billing = "/src/billing"
+    """
+    config_path = Path(root) / ".fledgling-python" / "config.toml"
+    if not config_path.is_file():
+        return {}
+    with open(config_path, "rb") as f:
+        data = tomllib.load(f)
+    return {
+        name: str((Path(root) / path).resolve())
+        for name, path in data.get("workspace", {}).items()
+    }
+
+
+def load_fts_config(root: str | Path) -> dict:
+    """Read the persistent FTS index settings from .fledgling-python/config.toml.
+
+    Returns the [fts] section, or {} if there is none. ``index`` is true
+    (default location) or a path relative to ``root``; ``docs_glob`` and
+    ``code_glob`` override the globs indexed.
+
+    Example::
+
+        [fts]
+        index = true
+        code_glob = "src/**/*.py"
+    """
+    config_path = Path(root) / ".fledgling-python" / "config.toml"
+    if not config_path.is_file():
+        return {}
+    with open(config_path, "rb") as f:
+        data = tomllib.load(f)
+    fts = dict(data.get("fts", {}))
+    if isinstance(fts.get("index"), str):
+        fts["index"] = str((Path(root) / fts["index"]).resolve())
+    return fts
+
+
+def load_cache_config(root: str | Path) -> dict:
+    """Read cache settings from .fledgling-python/config.toml.
+
+    Returns the [cache] section, or {} if there is none. ``blob_spill``
+    is true (default location) or a path relative to ``root``.
+
+    Example::
+
+        [cache]
+        blob_spill = true
+    """
+    config_path = Path(root) / ".fledgling-python" / "config.toml"
+    if not config_path.is_file():
+        return {}
+    with open(config_path, "rb") as f:
+        data = tomllib.load(f)
+    cache = dict(data.get("cache", {}))
+    if isinstance(cache.get("blob_spill"), str):
+        cache["blob_spill"] = str((Path(root) / cache["blob_spill"]).resolve())
+    return cache
+
+
 # Tool name → {param_name: defaults_field_name}
 TOOL_DEFAULTS: dict[str, dict[str, str]] = {
     "find_definitions":         {"file_pattern": "code_pattern"},
@@ -80,6 +149,7 @@ TOOL_DEFAULTS: dict[str, dict[str, str]] = {
     "doc_outline":              {"file_pattern": "doc_pattern"},
     "file_changes":             {"from_rev": "from_rev", "to_rev": "to_rev"},
     "file_diff":                {"from_rev": "from_rev", "to_rev": "to_rev"},
+    "file_diff_stats":          {"from_rev": "from_rev", "to_rev": "to_rev"},
     "structural_diff":          {"from_rev": "from_rev", "to_rev": "to_rev"},
 }
 
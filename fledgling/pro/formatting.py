@@ -24,6 +24,7 @@ _MAX_ROWS = {
     "list_files": 100,
     "doc_outline": 50,
     "file_changes": 25,
+    "file_diff_stats": 50,
     "recent_changes": 20,
 }
 
@@ -37,6 +38,7 @@ _HINTS = {
     "list_files": "Use a more specific glob pattern.",
     "doc_outline": "Use search='keyword' to filter.",
     "file_changes": "Use a narrower revision range.",
+    "file_diff_stats": "Use a narrower revision range.",
     "recent_changes": "Use a smaller count.",
 }
 
@@ -27,7 +27,8 @@ from typing import Optional
 import fledgling
 from fledgling.connection import Connection
 from fledgling.pro.defaults import (
-    ProjectDefaults, apply_defaults, infer_defaults, load_config,
+    ProjectDefaults, apply_defaults, infer_defaults, load_cache_config,
+    load_config, load_fts_config, load_workspace,
 )
 import time as _time
 
@@ -59,14 +60,22 @@ _DESCRIPTIONS = {
     "read_doc_section": "Read a specific markdown section by ID.",
     "recent_changes": "Git commit history.",
     "file_changes": "Files changed between two git revisions.",
-    "file_diff": "Line-level unified diff between revisions.",
+    "file_diff": "Line-level diff between revisions with hunk and old/new line numbers.",
+    "file_diff_stats": "Added/removed line counts per changed file between revisions.",
     "file_at_version": "File content at a specific git revision.",
     "branch_list": "List git branches.",
     "tag_list": "List git tags.",
     "working_tree_status": "Untracked and modified files.",
-    "structural_diff": "Semantic diff: added/removed/modified definitions between revisions.",
+    "file_blame": "Per-line last-change commit, author and date for a file.",
+    "structural_diff": "Semantic diff: added/removed/modified/renamed definitions between revisions.",
+    "structural_diff_range": "Semantic diff for every changed file in a revision range, in one call.",
     "changed_function_summary": "Changed functions ranked by complexity between revisions.",
     "complexity_hotspots": "Most complex functions in the codebase.",
+    "churn_hotspots": "Functions ranked by change frequency since a revision times complexity.",
+    "workspace_definitions": "Find definitions across every repository of the workspace; filter with repo_filter.",
+    "workspace_search": "BM25 search over definitions and commit summaries of every workspace repository.",
+    "workspace_commits": "Recent commits across workspace repositories.",
+    "workspace_repos": "Repositories indexed in the workspace, with their HEAD.",
     "sessions": "Claude Code conversation sessions.",
     "messages": "Flattened conversation messages.",
     "tool_calls": "Tool usage from conversations.",
@@ -150,6 +159,9 @@ def create_server(
     init: Optional[str | bool] = None,
     modules: Optional[list[str]] = None,
     profile: str = "analyst",
+    workspace: Optional[dict[str, str] | list[str]] = None,
+    fts_index: Optional[str | bool] = None,
+    blob_spill: Optional[str | bool] = None,
 ) -> FastMCP:
     """Create a FastMCP server with fledgling tools.
 
@@ -159,17 +171,62 @@ def create_server(
         init: Init file path, False for sources, None for auto-discover.
         modules: SQL modules to load (when using sources).
         profile: Security profile.
+        workspace: Repositories to index into one shared database
+            (``{name: root}`` or a list of roots). Defaults to the
+            [workspace] section of the config file; when non-empty, the
+            workspace module is loaded and indexed at startup, and the
+            ``workspace_*`` tools answer across all of them. The index is
+            kept under ``.fledgling/cache/workspace`` (see
+            ``Workspace.persist``), so a restart re-reads only
+            repositories whose HEAD moved.
+        fts_index: Keep the full-text index in a file across restarts
+            (see ``Connection.persist_fts``): True for the default
+            location, or a path. Defaults to ``index`` in the [fts]
+            section of the config file; off if unset.
+        blob_spill: Spill blobs evicted from the blob cache to disk
+            (see ``Connection.spill_blobs``): True for the default
+            location, or a path. Defaults to ``blob_spill`` in the
+            [cache] section of the config file; off if unset.
 
     Returns:
         A FastMCP server instance ready to .run().
     """
     from fastmcp import FastMCP
+    from fledgling.connection import _DEFAULT_MODULES
+
+    project_root = root or os.getcwd()
+    if workspace is None:
+        workspace = load_workspace(project_root)
+    if workspace:
+        modules = list(modules or _DEFAULT_MODULES)
+        if "workspace" not in modules:
+            modules.append("workspace")
 
     con = fledgling.connect(init=init, root=root, modules=modules, profile=profile)
     mcp = FastMCP(name)
 
+    if blob_spill is None:
+        blob_spill = load_cache_config(project_root).get("blob_spill")
+    if blob_spill:
+        con.spill_blobs(None if blob_spill is True else blob_spill)
+
+    if workspace:
+        from fledgling.workspace import Workspace
+        mcp.workspace = Workspace(con, workspace)
+        mcp.workspace.persist()
+        mcp.workspace.index()
+
+    fts_config = load_fts_config(project_root)
+    if fts_index is None:
+        fts_index = fts_config.get("index")
+    if fts_index and "fts" in (modules or _DEFAULT_MODULES):
+        con.persist_fts(
+            None if fts_index is True else fts_index,
+            docs_glob=fts_config.get("docs_glob", "**/*.md"),
+            code_glob=fts_config.get("code_glob", "**/*.py"),
+        )
+
     # Infer smart defaults, merge with config file overrides
-    project_root = root or os.getcwd()
     overrides = load_config(project_root)
     defaults = infer_defaults(con, overrides=overrides, root=project_root)
     mcp._defaults = defaults
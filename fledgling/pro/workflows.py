@@ -3,15 +3,24 @@
 Orchestrate multiple fledgling SQL macros in a single call, returning
 formatted markdown briefings. Supplements individual tools — shortcuts
 for common multi-step patterns.
+
+A briefing's sections are independent queries, so they run concurrently
+(see :class:`_Sections`), each on its own cursor of the connection.
 """
 
 from __future__ import annotations
 
 import inspect
 import logging
-from typing import Optional, TYPE_CHECKING
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Callable, Optional, TYPE_CHECKING
 
 from fledgling.pro.formatting import _format_markdown_table, _truncate_rows
+from fledgling.scan import Scan
+from fledgling.tools import _to_sql_literal
 
 if TYPE_CHECKING:
     from fledgling.connection import Connection
@@ -19,6 +28,12 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Content of a section that did not finish within its briefing's budget.
+TIMED_OUT = "(timed out)"
+
+# Content of a section whose query raised.
+COULD_NOT_LOAD = "(could not load)"
+
 
 # ── Helpers ────────────────────────────────────────────────────────
 
@@ -44,7 +59,150 @@ def _section(heading: str, fn):
         return (heading, content)
     except Exception:
         log.debug("section %s failed", heading, exc_info=True)
-        return (heading, "(could not load)")
+        return (heading, COULD_NOT_LOAD)
+
+
+class _Sections:
+    """The sections of one briefing, run concurrently.
+
+    Each section function takes the connection to query. With a
+    :class:`~fledgling.connection.Connection` every section gets its own
+    :meth:`~fledgling.connection.Connection.cursor` — DuckDB runs queries
+    on separate cursors in parallel — and they all start at once, except
+    those declared ``after`` another section, which wait for it. Other
+    connections run the sections one by one, in order.
+
+    Results keep the order sections were added in. Per-section wall
+    times (seconds) are recorded in ``timings`` and logged at debug
+    level.
+
+    With a ``budget`` (seconds), sections still running when it runs out
+    read ``"(timed out)"``: their cursors are interrupted and the
+    briefing is returned without waiting for them. Run sequentially,
+    sections not yet started when it runs out are skipped the same way.
+    Cleanup of anything late sections may still be using goes through
+    :meth:`after_all`.
+    """
+
+    def __init__(self, con, timings: Optional[dict] = None,
+                 budget: Optional[float] = None):
+        self._con = con
+        self._added: list[tuple[str, Callable, tuple[str, ...]]] = []
+        self.timings = timings if timings is not None else {}
+        self.budget = budget
+        self._late: set[str] = set()
+        self._started: dict[str, float] = {}
+        self._pending: list = []
+
+    def add(self, heading: str, fn: Callable, after: tuple[str, ...] = ()):
+        """Add a section; it starts once the ``after`` sections are done."""
+        known = {h for h, _, _ in self._added}
+        missing = [a for a in after if a not in known]
+        if missing:
+            raise ValueError(f"Section {heading!r} depends on unknown {missing}")
+        self._added.append((heading, fn, tuple(after)))
+
+    def _run_one(self, heading, fn, con, waits=()):
+        for future in waits:
+            future.result()
+        start = self._started[heading] = time.perf_counter()
+        result = _section(heading, lambda: fn(con))
+        elapsed = time.perf_counter() - start
+        if heading not in self._late:
+            self.timings[heading] = elapsed
+        log.debug("section %s took %.1f ms", heading, elapsed * 1000)
+        return result
+
+    def _timed_out(self, heading: str) -> tuple[str, str]:
+        # Timed from when the section itself started (after any sections
+        # it waits for); one that never started took no time.
+        self._late.add(heading)
+        start = self._started.get(heading)
+        elapsed = 0.0 if start is None else time.perf_counter() - start
+        self.timings[heading] = elapsed
+        log.debug("section %s timed out after %.1f ms", heading, elapsed * 1000)
+        return (heading, TIMED_OUT)
+
+    def after_all(self, fn: Callable) -> None:
+        """Call ``fn(con)`` once every section has finished, late ones included.
+
+        With none still running, ``fn`` gets the briefing's connection and
+        runs right away. Otherwise it runs in the thread of the last late
+        section to finish, on a cursor of its own.
+        """
+        pending = [f for f in self._pending if not f.done()]
+        if not pending:
+            fn(self._con)
+            return
+        cur = self._con.cursor()
+        lock = threading.Lock()
+        remaining = [len(pending)]
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                try:
+                    fn(cur)
+                except Exception:
+                    log.debug("cleanup after late sections failed", exc_info=True)
+                finally:
+                    cur.close()
+
+        for future in pending:
+            future.add_done_callback(done)
+
+    def run(self) -> list[tuple[str, str]]:
+        from fledgling.connection import Connection
+
+        start = time.perf_counter()
+        deadline = None if self.budget is None else start + self.budget
+        if len(self._added) < 2 or not isinstance(self._con, Connection):
+            return [
+                self._timed_out(heading)
+                if deadline is not None and time.perf_counter() >= deadline
+                else self._run_one(heading, fn, self._con)
+                for heading, fn, _ in self._added
+            ]
+
+        # Cursors are made here: the parent connection must not be used
+        # from several threads at once.
+        cursors = []
+        futures = {}
+        pool = None
+        try:
+            for _ in self._added:
+                cursors.append(self._con.cursor())
+            # One thread per section: a dependent blocks its thread while
+            # it waits, which must not starve what it waits for.
+            pool = ThreadPoolExecutor(max_workers=len(self._added))
+            for (heading, fn, after), cur in zip(self._added, cursors):
+                futures[heading] = pool.submit(
+                    self._run_one, heading, fn, cur,
+                    [futures[a] for a in after],
+                )
+            results = []
+            for (heading, _, _), cur in zip(self._added, cursors):
+                remaining = (
+                    None if deadline is None
+                    else max(0.0, deadline - time.perf_counter())
+                )
+                try:
+                    results.append(futures[heading].result(timeout=remaining))
+                except FuturesTimeout:
+                    cur.interrupt()
+                    self._pending.append(futures[heading])
+                    results.append(self._timed_out(heading))
+            return results
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            # A late section's cursor is closed when it finishes.
+            for cur, future in zip(cursors, futures.values()):
+                future.add_done_callback(lambda _, cur=cur: cur.close())
+            for cur in cursors[len(futures):]:
+                cur.close()
 
 
 def _has_module(con, module_name: str) -> bool:
@@ -60,9 +218,16 @@ def _has_module(con, module_name: str) -> bool:
 
 def _table(con, macro_name, kwargs, max_rows=0):
     """Call a macro and format as a markdown table with optional truncation."""
-    rel = getattr(con, macro_name)(**kwargs)
-    cols = rel.columns
-    rows = rel.fetchall()
+    return _rel_table(getattr(con, macro_name)(**kwargs), macro_name, max_rows)
+
+
+def _rel_table(rel, macro_name, max_rows=0):
+    """Format a relation as a markdown table with optional truncation."""
+    return _rows_table(rel.columns, rel.fetchall(), macro_name, max_rows)
+
+
+def _rows_table(cols, rows, macro_name, max_rows=0):
+    """Format rows as a markdown table with optional truncation."""
     if not rows:
         return ""
     if max_rows > 0:
@@ -91,61 +256,163 @@ def _sorted_table(con, macro_name, kwargs, sort_col, max_rows, descending=True):
 # ── Compound tools ─────────────────────────────────────────────────
 
 
-def explore(con, defaults, path=None):
-    """First-contact codebase briefing."""
+def explore(con, defaults, path=None, timings=None):
+    """First-contact codebase briefing.
+
+    ``timings``, if given, receives each section's wall time in seconds.
+    """
     # Scope patterns to path if provided
     code_pattern = defaults.scoped_code_pattern(path) if path else defaults.code_pattern
     doc_pattern = f"{path}/**/*.md" if path else defaults.doc_pattern
 
-    sections = []
+    sections = _Sections(con, timings)
 
-    sections.append(_section("Languages", lambda: _table(
-        con, "project_overview", {},
-    )))
+    sections.add("Languages", lambda c: _table(
+        c, "project_overview", {},
+    ))
 
-    sections.append(_section("Key Definitions (top 20 by complexity)", lambda: _sorted_table(
-        con, "code_structure",
+    sections.add("Key Definitions (top 20 by complexity)", lambda c: _sorted_table(
+        c, "code_structure",
         {"file_pattern": code_pattern},
         sort_col="cyclomatic_complexity",
         max_rows=20,
-    )))
+    ))
 
-    sections.append(_section("Documentation", lambda: _table(
-        con, "doc_outline",
+    sections.add("Documentation", lambda c: _table(
+        c, "doc_outline",
         {"file_pattern": doc_pattern},
         max_rows=15,
-    )))
+    ))
 
-    sections.append(_section("Recent Activity", lambda: _table(
-        con, "recent_changes", {"n": 5},
-    )))
+    sections.add("Recent Activity", lambda c: _table(
+        c, "recent_changes", {"n": 5},
+    ))
 
     title = f"Project: {path}" if path else "Explore"
-    return _format_briefing(title, sections)
+    return _format_briefing(title, sections.run())
+
+
+def investigate(con, defaults, name, file_pattern=None, timings=None):
+    """Deep dive on a specific function or symbol.
+
+    The definition lookup runs first (every other section needs it);
+    ``timings`` as for :func:`explore`. The files are parsed once, into
+    a :class:`~fledgling.scan.Scan` every section reads from.
+    """
+    file_pattern = file_pattern or defaults.code_pattern
+    with Scan(con, file_pattern) as scan:
+        # 1. Find definitions matching the name
+        def_cols, defs = _lookup(con, scan, name)
+        if not defs:
+            return f"No definition found for '{name}'. Try a broader pattern or check spelling."
+
+        sections = _Sections(con, timings)
+        _add_symbol_sections(
+            sections, "", def_cols, defs,
+            callers=lambda c: _fetch(scan.callers(c, name)),
+            calls=lambda c, def_file: _fetch(scan.in_ast(c, "calls").filter(
+                f"file_path = {_to_sql_literal(def_file)}"
+            )),
+        )
+        return _format_briefing(f"Investigating: {name}", sections.run())
+
 
+def investigate_many(con, defaults, names, file_pattern=None, timings=None):
+    """:func:`investigate` for several symbols, in one briefing.
 
-def investigate(con, defaults, name, file_pattern=None):
-    """Deep dive on a specific function or symbol."""
+    One scan serves every name, and the shared queries run once: the
+    callers of all the names, and the calls in all their definitions'
+    files, are each fetched in a single query and split per symbol.
+    Sections are headed ``name: Definition`` and so on.
+    """
     file_pattern = file_pattern or defaults.code_pattern
+    names = list(dict.fromkeys(names))
+    with Scan(con, file_pattern) as scan:
+        found = {}
+        for name in names:
+            def_cols, defs = _lookup(con, scan, name)
+            if defs:
+                found[name] = (def_cols, defs)
+        if not found:
+            listed = ", ".join(f"'{n}'" for n in names)
+            return f"No definition found for {listed}. Try a broader pattern or check spelling."
+
+        files = sorted({
+            defs[0][cols.index("file_path")] for cols, defs in found.values()
+        })
+        all_callers = _once(lambda c: _fetch(scan.callers_of(c, list(found))))
+        all_calls = _once(lambda c: _fetch(scan.in_ast(c, "calls").filter(
+            f"list_contains({_to_sql_literal(files)}, file_path)"
+        )))
+
+        def callers(name):
+            def fetch(c):
+                cols, rows = all_callers(c)
+                # _scan_callers_of columns: file_path, call_line,
+                # caller_name, callee
+                return cols[:-1], [r[:-1] for r in rows if r[-1] == name]
+            return fetch
+
+        def calls(c, def_file):
+            cols, rows = all_calls(c)
+            fp_i = cols.index("file_path")
+            return cols, [r for r in rows if r[fp_i] == def_file]
+
+        sections = _Sections(con, timings)
+        for name in names:
+            if name not in found:
+                sections.add(f"{name}: Definition", lambda c: "")
+                continue
+            def_cols, defs = found[name]
+            _add_symbol_sections(
+                sections, f"{name}: ", def_cols, defs,
+                callers=callers(name), calls=calls,
+            )
+        return _format_briefing(f"Investigating: {', '.join(names)}", sections.run())
+
+
+def _fetch(rel):
+    """``(columns, rows)`` of a relation."""
+    return rel.columns, rel.fetchall()
+
+
+def _once(fn):
+    """``fn(con)`` computed by the first section that asks, shared by the rest."""
+    lock = threading.Lock()
+    state = {}
+
+    def get(con):
+        with lock:
+            if not state:
+                try:
+                    state["value"] = fn(con)
+                except Exception as e:
+                    state["error"] = e
+        if "error" in state:
+            raise state["error"]
+        return state["value"]
 
-    # 1. Find definitions matching the name
+    return get
+
+
+def _lookup(con, scan, name):
+    """``(columns, rows)`` of the definitions matching ``%name%``."""
     try:
-        rel = con.find_definitions(
-            file_pattern=file_pattern, name_pattern=f"%{name}%",
-        )
-        defs = rel.fetchall()
-        def_cols = rel.columns
+        return _fetch(scan.definitions(con, name_pattern=f"%{name}%"))
     except Exception:
-        defs = []
-        def_cols = []
+        log.debug("definition lookup failed for %s", name, exc_info=True)
+        return [], []
 
-    if not defs:
-        return f"No definition found for '{name}'. Try a broader pattern or check spelling."
 
-    sections = []
+def _add_symbol_sections(sections, prefix, def_cols, defs, callers, calls):
+    """Add the Definition, Source, Called by and Calls sections of a symbol.
 
+    ``callers(con)`` returns the ``(columns, rows)`` of its callers and
+    ``calls(con, file_path)`` those of every call in a file.
+    """
     # Definition table
-    sections.append(("Definition", _format_markdown_table(def_cols, defs[:10])))
+    definition = _format_markdown_table(def_cols, defs[:10])
+    sections.add(f"{prefix}Definition", lambda c: definition)
 
     # 2. Read source of first definition
     first = defs[0]
@@ -157,8 +424,8 @@ def investigate(con, defaults, name, file_pattern=None):
     start_line = first[sl_idx]
     end_line = first[el_idx]
 
-    def _source():
-        rel = con.read_source(
+    def _source(c):
+        rel = c.read_source(
             file_path=def_file,
             lines=f"{start_line}-{end_line}",
         )
@@ -171,55 +438,84 @@ def investigate(con, defaults, name, file_pattern=None):
         lines = [f"{r[ln_idx]:4d}  {r[ct_idx]}" for r in rows[:50]]
         return "\n".join(lines)
 
-    sections.append(_section("Source", _source))
+    sections.add(f"{prefix}Source", _source)
 
     # 3. Who calls this function
-    sections.append(_section("Called by", lambda: _table(
-        con, "function_callers",
-        {"file_pattern": file_pattern, "func_name": name},
-        max_rows=15,
-    )))
-
-    # 4. What this function calls — scoped to the definition's file
-    # to avoid scanning the entire codebase, then filtered to the
-    # function's line range since we need calls *made by* it.
-    def _calls():
-        rel = con.find_in_ast(
-            file_pattern=def_file, kind="calls",
-        )
-        rows = rel.fetchall()
+    sections.add(f"{prefix}Called by", lambda c: _rows_table(
+        *callers(c), "function_callers", max_rows=15,
+    ))
+
+    # 4. What this function calls — the calls in the definition's file,
+    # filtered to the function's line range since we need calls *made
+    # by* it.
+    def _calls(c):
+        cols, rows = calls(c, def_file)
         if not rows:
             return ""
-        cols = rel.columns
         sl_i = cols.index("start_line")
-        filtered = [
-            r for r in rows
-            if start_line <= r[sl_i] <= end_line
-        ]
+        filtered = sorted(
+            (r for r in rows if start_line <= r[sl_i] <= end_line),
+            key=lambda r: r[sl_i],
+        )
         if not filtered:
             return ""
         return _format_markdown_table(cols, filtered[:10])
 
-    sections.append(_section("Calls", _calls))
+    sections.add(f"{prefix}Calls", _calls)
 
-    return _format_briefing(f"Investigating: {name}", sections)
 
+def _review_cache(con, from_rev, to_rev, file_pattern):
+    """``(cache, key, from_sha, to_sha)`` for a review, or Nones.
 
-def review(con, defaults, from_rev=None, to_rev=None, file_pattern=None):
-    """Code review prep for a revision range."""
+    Reviews are a pure function of the two commits, so they are cached
+    on disk under the resolved SHAs (see fledgling.git.resultcache).
+    Connections without git engines, or revisions that don't resolve,
+    are reviewed uncached.
+    """
+    try:
+        repo = con._repo(".")
+        from_sha, to_sha = repo.resolve(from_rev), repo.resolve(to_rev)
+        cache = con._results
+    except Exception:
+        log.debug("review cache unavailable", exc_info=True)
+        return None, None, None, None
+    key = cache.key("review", from_sha, to_sha, file_pattern=file_pattern)
+    return cache, key, from_sha, to_sha
+
+
+def review(con, defaults, from_rev=None, to_rev=None, file_pattern=None,
+           timings=None):
+    """Code review prep for a revision range.
+
+    Diffs wait for the changed-files list; ``timings`` as for
+    :func:`explore`.
+    """
     from_rev = from_rev or defaults.from_rev
     to_rev = to_rev or defaults.to_rev
     file_pattern = file_pattern or defaults.code_pattern
-
-    sections = []
+    title = f"Review: {from_rev}..{to_rev}"
+
+    cache, key, from_sha, to_sha = _review_cache(con, from_rev, to_rev, file_pattern)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return _format_briefing(title, [tuple(s) for s in cached])
+        # Review exactly the commits the key names, even if a branch
+        # moves while the sections run.
+        from_rev, to_rev = from_sha, to_sha
+
+    sections = _Sections(con, timings)
+    # Parts that failed inside a section which still returned content;
+    # a review with any is shown but not cached.
+    degraded = []
 
     # 1. Changed files
     # Also capture rows for diff section
     change_rows = []
 
-    def _changes():
+    def _changes(c):
         nonlocal change_rows
-        rel = con.file_changes(from_rev=from_rev, to_rev=to_rev)
+        rel = c.file_changes(from_rev=from_rev, to_rev=to_rev)
         cols = rel.columns
         rows = rel.fetchall()
         change_rows = rows
@@ -231,99 +527,279 @@ def review(con, defaults, from_rev=None, to_rev=None, file_pattern=None):
             result += "\n" + omission
         return result
 
-    sections.append(_section("Changed Files", _changes))
+    sections.add("Changed Files", _changes)
 
     # 2. Changed functions by complexity
-    sections.append(_section("Changed Functions", lambda: _table(
-        con, "changed_function_summary",
+    sections.add("Changed Functions", lambda c: _table(
+        c, "changed_function_summary",
         {"from_rev": from_rev, "to_rev": to_rev, "file_pattern": file_pattern},
         max_rows=20,
-    )))
+    ))
 
     # 3. Diffs for top 3 most-changed files
-    def _diffs():
+    def _line_counts(c):
+        """{file_path: added + removed} from file_diff_stats, or None."""
+        try:
+            rel = c.file_diff_stats(from_rev=from_rev, to_rev=to_rev)
+            cols = rel.columns
+            fp_i = cols.index("file_path")
+            add_i = cols.index("lines_added")
+            rem_i = cols.index("lines_removed")
+            return {
+                r[fp_i]: (r[add_i] or 0) + (r[rem_i] or 0)
+                for r in rel.fetchall()
+            }
+        except Exception:
+            log.debug("file_diff_stats failed", exc_info=True)
+            degraded.append("file_diff_stats")
+            return None
+
+    def _diffs(c):
         if not change_rows:
             return ""
-        # Sort by size delta, skip deleted files (new_size is None)
+        # Rank by changed lines when diffstats are available, else by
+        # size delta; skip deleted files (new_size is None).
         # file_changes columns: file_path, status, old_size, new_size
         candidates = [
             r for r in change_rows if r[1] != "deleted"
         ]
-        candidates.sort(
-            key=lambda r: abs((r[3] or 0) - (r[2] or 0)),
-            reverse=True,
-        )
+        counts = _line_counts(c)
+        if counts is not None:
+            candidates.sort(key=lambda r: counts.get(r[0], 0), reverse=True)
+        else:
+            candidates.sort(
+                key=lambda r: abs((r[3] or 0) - (r[2] or 0)),
+                reverse=True,
+            )
         top_files = [r[0] for r in candidates[:3]]
 
         parts = []
         for fp in top_files:
             try:
-                rel = con.file_diff(
+                rel = c.file_diff(
                     file=fp, from_rev=from_rev, to_rev=to_rev,
                 )
                 rows = rel.fetchall()
                 if not rows:
                     continue
                 cols = rel.columns
-                # file_diff columns: seq, line_type, content
+                # file_diff columns: seq, line_type, content, hunk,
+                # old_line, new_line
                 ct_idx = cols.index("content")
                 lt_idx = cols.index("line_type")
+                has_hunks = "hunk" in cols
+                if has_hunks:
+                    hk_idx = cols.index("hunk")
+                    ol_idx = cols.index("old_line")
+                    nl_idx = cols.index("new_line")
                 lines = []
+                hunk = None
                 for r in rows[:100]:
-                    prefix = {"add": "+", "del": "-", "ctx": " "}.get(
-                        r[lt_idx], " "
-                    )
+                    if has_hunks and r[hk_idx] is not None and r[hk_idx] != hunk:
+                        hunk = r[hk_idx]
+                        lines.append(
+                            f"@@ -{r[ol_idx] or ''} +{r[nl_idx] or ''} @@"
+                        )
+                    prefix = {"ADDED": "+", "REMOVED": "-"}.get(r[lt_idx], " ")
                     lines.append(f"{prefix} {r[ct_idx]}")
                 if len(rows) > 100:
                     lines.append(f"--- omitted {len(rows) - 100} of {len(rows)} lines ---")
                 parts.append(f"**{fp}**\n```\n" + "\n".join(lines) + "\n```")
             except Exception:
                 log.debug("diff failed for %s", fp, exc_info=True)
+                degraded.append(fp)
                 continue
         return "\n\n".join(parts) if parts else ""
 
-    sections.append(_section("Diffs", _diffs))
+    sections.add("Diffs", _diffs, after=("Changed Files",))
 
-    return _format_briefing(f"Review: {from_rev}..{to_rev}", sections)
+    results = sections.run()
+    # Failures may be transient; only complete reviews are kept.
+    complete = not degraded and all(
+        c not in (COULD_NOT_LOAD, TIMED_OUT) for _, c in results
+    )
+    if cache is not None and complete:
+        cache.put(key, results)
+    return _format_briefing(title, results)
+
+
+# Reciprocal rank fusion: a hit ranked r (from 1) by one source adds
+# 1 / (RRF_K + r) to its fused score. 60 is the usual constant.
+RRF_K = 60
+
+# Hits taken from each search source, and fused results shown.
+SOURCE_LIMIT = 50
+SEARCH_LIMIT = 20
+
+# Seconds search waits for its sources before answering without the rest.
+SEARCH_BUDGET = 10.0
 
 
-def search(con, defaults, query, file_pattern=None):
-    """Multi-source search across code, docs, and git."""
+def _fuse(ranked: dict[str, list[dict]], k: int = RRF_K) -> list[dict]:
+    """Reciprocal rank fusion of per-source ranked hits.
+
+    ``ranked`` maps a source to its hits, best first. A hit is a dict
+    with a ``key`` naming what was found: hits sharing a key are one
+    result, whose other fields come from the first source that found it.
+    Returns results best first, each with its fused ``score`` and the
+    ``sources`` that found it.
+    """
+    fused: dict = {}
+    for source, hits in ranked.items():
+        rank = 0
+        for hit in hits:
+            entry = fused.get(hit["key"])
+            if entry is not None and source in entry["sources"]:
+                continue
+            rank += 1
+            if entry is None:
+                entry = fused[hit["key"]] = {**hit, "score": 0.0, "sources": []}
+            entry["score"] += 1.0 / (k + rank)
+            entry["sources"].append(source)
+    # sorted() is stable: ties keep first-found order.
+    return sorted(fused.values(), key=lambda e: -e["score"])
+
+
+def _code_hits(rel, kind=None, limit=SOURCE_LIMIT):
+    """Name-matched code rows ranked closest match (shortest name) first."""
+    rows = rel.order("length(name), file_path, start_line").limit(limit)
+    hits = []
+    for row in rows.fetchall():
+        r = dict(zip(rows.columns, row))
+        hits.append({
+            "key": (r["file_path"], r["start_line"]),
+            "kind": kind or r["kind"],
+            "name": r["name"],
+            "location": f"{r['file_path']}:{r['start_line']}",
+        })
+    return hits
+
+
+def _snippet(text, width=60) -> str:
+    line = (text or "").strip().split("\n", 1)[0]
+    return line if len(line) <= width else line[:width - 1] + "…"
+
+
+def search(con, defaults, query, file_pattern=None, timings=None,
+           budget=SEARCH_BUDGET):
+    """Multi-source search across code, docs, and conversations.
+
+    Definitions, call sites, documentation, the full-text index and
+    conversations are searched concurrently and their ranked hits fused
+    by reciprocal rank (:func:`_fuse`) into one result list. Sources not
+    done within ``budget`` seconds are left out (and noted) rather than
+    holding up the rest; ``None`` waits for all.
+
+    ``timings`` as for :func:`explore`. Definitions and call sites come
+    from one :class:`~fledgling.scan.Scan` of the code files.
+    """
     file_pattern = file_pattern or defaults.code_pattern
+    scan = Scan(con, file_pattern)
+    sections = _Sections(con, timings, budget)
+    try:
+        return _search(con, defaults, scan, sections, query)
+    finally:
+        # Sources cut off by the budget may still be reading the scan.
+        sections.after_all(scan.close)
+
+
+def _search(con, defaults, scan, sections, query):
+    ranked: dict[str, list[dict]] = {}
+    like = f"%{query}%"
+
+    def source(heading, fetch):
+        def run(c):
+            ranked[heading] = hits = fetch(c)
+            return f"{len(hits)} hits" if hits else ""
+        sections.add(heading, run)
+
+    # 1. Definitions whose name contains the query
+    source("Definitions", lambda c: _code_hits(
+        scan.definitions(c, name_pattern=like),
+    ))
+
+    # 2. Call sites whose callee contains the query
+    source("Call Sites", lambda c: _code_hits(
+        scan.in_ast(c, "calls", name_pattern=like), kind="call",
+    ))
+
+    # 3. Documentation sections, title matches before body matches
+    def docs(c):
+        rel = c.doc_outline(file_pattern=defaults.doc_pattern, search=query)
+        rel = rel.order(
+            f"title NOT ILIKE {_to_sql_literal(like)}, level, file_path, start_line"
+        ).limit(SOURCE_LIMIT)
+        return [
+            {
+                "key": (fp, line),
+                "kind": "doc_section",
+                "name": title,
+                "location": f"{fp}:{line}",
+            }
+            for fp, title, line in rel.select("file_path, title, start_line").fetchall()
+        ]
+
+    source("Documentation", docs)
+
+    # 4. BM25 over the full-text index (only if the fts module is loaded)
+    if _has_module(con, "fts"):
+        source("Full Text", lambda c: [
+            {
+                "key": (fp, line),
+                "kind": kind,
+                "name": name or _snippet(text),
+                "location": f"{fp}:{line}",
+            }
+            for fp, line, kind, name, text in c.search_content(
+                query=query, limit_n=SOURCE_LIMIT,
+            ).select("file_path, start_line, kind, name, text").fetchall()
+        ])
 
-    sections = []
-
-    # 1. Definitions matching the query
-    sections.append(_section("Definitions", lambda: _table(
-        con, "find_definitions",
-        {"file_pattern": file_pattern, "name_pattern": f"%{query}%"},
-        max_rows=10,
-    )))
-
-    # 2. Call sites matching the query
-    sections.append(_section("Call Sites", lambda: _table(
-        con, "find_in_ast",
-        {"file_pattern": file_pattern, "kind": "calls",
-         "name_pattern": f"%{query}%"},
-        max_rows=10,
-    )))
-
-    # 3. Documentation sections matching the query
-    sections.append(_section("Documentation", lambda: _table(
-        con, "doc_outline",
-        {"file_pattern": defaults.doc_pattern, "search": query},
-        max_rows=10,
-    )))
-
-    # 4. Conversation search (only if conversations module loaded)
+    # 5. Conversation messages, most recent first (if conversations loaded)
     if _has_module(con, "conversations"):
-        sections.append(_section("Conversations", lambda: _table(
-            con, "search_messages",
-            {"search_term": query},
-            max_rows=10,
-        )))
+        source("Conversations", lambda c: [
+            {
+                "key": ("conversation", message_id),
+                "kind": role,
+                "name": _snippet(content),
+                "location": f"session {slug or session_id}",
+            }
+            for message_id, session_id, slug, role, content in c.search_messages(
+                search_term=query,
+            ).order("created_at DESC").limit(SOURCE_LIMIT).select(
+                "message_id, session_id, slug, role, content"
+            ).fetchall()
+        ])
 
-    return _format_briefing(f'Search: "{query}"', sections)
+    results = sections.run()
+    fused = _fuse({
+        heading: ranked[heading]
+        for heading, content in results
+        if content != TIMED_OUT and heading in ranked
+    })
+    rows = [
+        (round(e["score"], 4), e["kind"], e["name"], e["location"],
+         ", ".join(e["sources"]))
+        for e in fused
+    ]
+    sources = [
+        (heading, len(ranked.get(heading, ())) if content != TIMED_OUT else None,
+         round(sections.timings.get(heading, 0.0) * 1000),
+         content if content.startswith("(") else "ok")
+        for heading, content in results
+    ]
+    results_table = _rows_table(
+        ["score", "kind", "name", "location", "sources"], rows[:SEARCH_LIMIT],
+        "search",
+    )
+    if len(rows) > SEARCH_LIMIT:
+        results_table += f"\n--- {len(rows) - SEARCH_LIMIT} lower-ranked results omitted ---"
+    return _format_briefing(f'Search: "{query}"', [
+        ("Results", results_table or "(no data)"),
+        ("Sources", _format_markdown_table(
+            ["source", "hits", "ms", "status"], sources,
+        )),
+    ])
 
 
 # ── Registration ───────────────────────────────────────────────────
@@ -383,6 +859,18 @@ def register_workflows(mcp, con, defaults):
             ("file_pattern", Optional[str], None),
         ])
 
+    async def investigate_many_tool(*, names, file_pattern=None):
+        return investigate_many(con, defaults, names=names,
+                                file_pattern=file_pattern)
+
+    _add_workflow_tool(mcp, "investigate_many",
+        "Investigate several related symbols in one call: the files are parsed once "
+        "and callers and callees are computed for all names together.",
+        investigate_many_tool, [
+            ("names", list[str], _empty),
+            ("file_pattern", Optional[str], None),
+        ])
+
     async def review_tool(*, from_rev=None, to_rev=None, file_pattern=None):
         return review(con, defaults, from_rev=from_rev, to_rev=to_rev,
                        file_pattern=file_pattern)
@@ -399,7 +887,8 @@ def register_workflows(mcp, con, defaults):
         return search(con, defaults, query=query, file_pattern=file_pattern)
 
     _add_workflow_tool(mcp, "search",
-        "Multi-source search across definitions, call sites, documentation, and conversations.",
+        "Multi-source search across definitions, call sites, documentation, the "
+        "full-text index and conversations, fused into one ranked list.",
         search_tool, [
             ("query", str, _empty),
             ("file_pattern", Optional[str], None),
@@ -0,0 +1,158 @@
+"""Full-body rendering of selector matches, streamed in markdown chunks.
+
+The SQL renderers (``pss_render``, ``ast_select_render``) read each
+matched file once per query and fold the result into ``duck_blocks_to_md``
+aggregates; ``pss_render_chunks`` splits that into one row per chunk. From
+Python the files needn't be read again at all between calls.
+
+:class:`LineIndex` keeps each file's content with the byte offsets of its
+line starts, so a body is a single slice however many matches share the
+file. Entries are validated against the file's size and mtime, and the
+index is bounded by total bytes (LRU). :func:`render_chunks` turns match
+rows into markdown a chunk at a time, in either layout:
+
+* ``"pss"`` — ``# file:start-end`` heading and a fenced block per match
+  (``pss_render``);
+* ``"ast_select"`` — one ``# `selector``` heading, then
+  ``## symbol — file:start-end`` and a fenced block per match
+  (``ast_select_render``).
+
+``Connection.render_selection`` streams ``ast_select`` rows through both;
+SQL callers get the chunked layout from ``pss_render_chunks``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional
+
+# Matches per markdown chunk.
+CHUNK_SIZE = 100
+
+_BACKTICKS = re.compile(r"`+")
+
+
+class LineIndex:
+    """LRU of file contents with line-start offsets, bounded by total bytes.
+
+    Thread-safe.
+
+    Args:
+        max_bytes: Memory budget for cached contents. Files larger than
+            the whole budget are indexed per call and not kept.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # path -> (size, mtime_ns, content, line starts)
+        self._files: OrderedDict[str, tuple[int, int, bytes, array]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def stats(self) -> dict:
+        """Counters for diagnostics (dr_fledgling, tests)."""
+        return {
+            "entries": len(self._files),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _entry(self, path: str) -> tuple[bytes, array]:
+        st = os.stat(path)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+                self._files.move_to_end(path)
+                self.hits += 1
+                return entry[2], entry[3]
+            self.misses += 1
+        with open(path, "rb") as f:
+            content = f.read()
+        starts = array("q", [0])
+        pos = content.find(b"\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = content.find(b"\n", pos + 1)
+        with self._lock:
+            old = self._files.pop(path, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            if len(content) <= self.max_bytes:
+                self._files[path] = (st.st_size, st.st_mtime_ns, content, starts)
+                self._bytes += len(content)
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._files.popitem(last=False)
+                    self._bytes -= len(evicted[2])
+        return content, starts
+
+    def lines(self, path: str, start_line: int, end_line: int) -> str:
+        """Lines ``start_line..end_line`` (1-based, inclusive) of ``path``."""
+        content, starts = self._entry(path)
+        n = len(starts)
+        if start_line > n or end_line < start_line:
+            return ""
+        begin = starts[max(start_line, 1) - 1]
+        end = starts[end_line] if end_line < n else len(content)
+        return content[begin:end].decode("utf-8", errors="replace").rstrip("\n")
+
+
+def _fence(body: str) -> str:
+    """A backtick fence longer than any backtick run in ``body``."""
+    if "```" not in body:
+        return "```"
+    return "`" * (max(len(run) for run in _BACKTICKS.findall(body)) + 1)
+
+
+def _code_block(body: str, language: str) -> str:
+    fence = _fence(body)
+    return f"{fence}{language}\n{body}\n{fence}\n\n"
+
+
+def render_chunks(
+    matches: Iterable[tuple],
+    index: LineIndex,
+    layout: str = "pss",
+    selector: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Markdown for ``matches``, ``chunk_size`` matches per yielded string.
+
+    ``matches`` are ``(file_path, start_line, end_line, language, symbol,
+    peek)`` rows in output order; ``symbol`` (the qualified name, as in
+    ``ast_select_render``) is used by the ``"ast_select"`` layout only. A body whose file can't be read falls
+    back to ``peek``. The chunks concatenate into the whole document.
+    """
+    if layout not in ("pss", "ast_select"):
+        raise ValueError(f"Unknown layout: {layout!r}")
+    parts: list[str] = []
+    if layout == "ast_select":
+        parts.append(f"# `{selector}`\n\n")
+    count = 0
+    for file_path, start_line, end_line, language, symbol, peek in matches:
+        try:
+            body = index.lines(file_path, start_line, end_line)
+        except OSError:
+            body = peek or ""
+        where = f"{file_path}:{start_line}-{end_line}"
+        if layout == "pss":
+            parts.append(f"# {where}\n\n")
+        else:
+            parts.append(f"## {symbol or '(anonymous)'} — {where}\n\n")
+        parts.append(_code_block(body, language or "text"))
+        count += 1
+        if count % chunk_size == 0:
+            yield "".join(parts)
+            parts = []
+    if parts:
+        yield "".join(parts)
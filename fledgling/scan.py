@@ -0,0 +1,101 @@
+"""Shared AST scans: parse a workflow's files once, query them many times.
+
+``investigate`` looks up definitions, then callers, then the calls made
+by one function — each of ``find_definitions``, ``function_callers`` and
+``find_in_ast`` reads and parses the same files again. A :class:`Scan`
+runs ``read_ast`` over the file pattern once, materializes the rows into
+a table in the ``_scan`` schema, and answers every section from that
+table through the ``_scan_*`` macros in ``sql/code.sql`` (the same
+macros the public ones delegate to, so results match).
+
+The table lives in the database rather than as a TEMP table so that the
+cursors of a concurrent briefing (see ``fledgling.pro.workflows``) all
+see it. It is created by whichever query needs it first and dropped by
+:meth:`Scan.close`.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from typing import Optional
+
+import duckdb
+
+SCHEMA = "_scan"
+
+
+class Scan:
+    """One ``read_ast`` pass over ``file_pattern``, shared by several queries.
+
+    Query methods take the connection (or cursor) to run on; the scan
+    itself is read through whichever connection first needs it.
+
+    Args:
+        con: Connection that owns the scan table (used to drop it).
+        file_pattern: Files to parse, as passed to ``read_ast``.
+    """
+
+    def __init__(self, con, file_pattern: str):
+        self._con = con
+        self.file_pattern = file_pattern
+        self.table: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Scan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _table(self, con) -> str:
+        with self._lock:
+            if self.table is None:
+                from fledgling.tools import _to_sql_literal
+                name = f"{SCHEMA}.ast_{uuid.uuid4().hex[:12]}"
+                con.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+                con.execute(
+                    f"CREATE TABLE {name} AS "
+                    f"SELECT * FROM read_ast({_to_sql_literal(self.file_pattern)})"
+                )
+                self.table = name
+        return self.table
+
+    def _query(self, con, macro: str, *args, **kwargs) -> duckdb.DuckDBPyRelation:
+        from fledgling.connection import _call_macro
+        return _call_macro(con, macro, self._table(con), *args, **kwargs)
+
+    def definitions(self, con, name_pattern: str = "%") -> duckdb.DuckDBPyRelation:
+        """``find_definitions`` over the scanned files."""
+        return self._query(con, "_scan_definitions", name_pattern=name_pattern)
+
+    def calls(self, con, name_pattern: str = "%") -> duckdb.DuckDBPyRelation:
+        """``find_calls`` over the scanned files."""
+        return self._query(con, "_scan_calls", name_pattern=name_pattern)
+
+    def in_ast(self, con, kind: str, name_pattern: str = "%") -> duckdb.DuckDBPyRelation:
+        """``find_in_ast`` over the scanned files."""
+        return self._query(con, "_scan_in_ast", kind, name_pattern=name_pattern)
+
+    def structure(self, con) -> duckdb.DuckDBPyRelation:
+        """``code_structure`` over the scanned files."""
+        return self._query(con, "_scan_structure")
+
+    def callers(self, con, func_name: str) -> duckdb.DuckDBPyRelation:
+        """``function_callers`` over the scanned files."""
+        return self._query(con, "_scan_callers", func_name)
+
+    def callers_of(self, con, func_names: list[str]) -> duckdb.DuckDBPyRelation:
+        """Callers of several functions in one pass, with a ``callee`` column."""
+        return self._query(con, "_scan_callers_of", list(func_names))
+
+    def close(self, con=None) -> None:
+        """Drop the scan table, if it was created.
+
+        ``con`` is the connection to drop it on; defaults to the owner's
+        (pass a cursor when closing from another thread).
+        """
+        with self._lock:
+            if self.table is not None:
+                (con or self._con).execute(f"DROP TABLE IF EXISTS {self.table}")
+                self.table = None
@@ -45,6 +45,7 @@ Usage::
 
 from __future__ import annotations
 
+import copy
 import json
 import re
 from dataclasses import dataclass, field
@@ -252,6 +253,13 @@ class Tools:
         ).fetchall()
         return {name: params for name, params in rows}
 
+    def bind(self, con: duckdb.DuckDBPyConnection) -> "Tools":
+        """The same tools calling through another connection (e.g. a
+        cursor), without rediscovering the catalog."""
+        bound = copy.copy(self)
+        bound._con = con
+        return bound
+
     # ── Attribute access ─────────────────────────────────────────────
 
     def __getattr__(self, name: str) -> _MacroCall:
@@ -383,6 +391,12 @@ def _to_sql_literal(val: Any) -> str:
     if isinstance(val, (list, tuple)):
         items = ", ".join(_to_sql_literal(v) for v in val)
         return f"[{items}]"
+    if isinstance(val, dict):
+        fields = ", ".join(
+            f"{_to_sql_literal(str(k))}: {_to_sql_literal(v)}"
+            for k, v in val.items()
+        )
+        return "{" + fields + "}"
     return f"'{val}'"
 
 
@@ -0,0 +1,363 @@
+"""Workspace mode: several repositories indexed into one database.
+
+A :class:`Workspace` indexes a set of named repository roots into the
+``workspace`` tables (see ``sql/workspace.sql``), where every row
+carries the repository's name in a ``repo`` column. One connection — and
+so one MCP server — then answers ``workspace_definitions``,
+``workspace_search`` and ``workspace_commits`` across all of them.
+
+Indexing runs in three phases:
+
+1. **Snapshot** (parallel, one task per repository): resolve ``HEAD``,
+   flatten its tree to the files with a mapped language and read the
+   most recent commits. Repositories whose ``HEAD`` matches the indexed
+   one are skipped.
+2. **Parse**: every snapshot's blobs go through the connection's
+   :class:`~fledgling.git.astcache.AstCache`. Definitions are keyed by
+   blob hash, so a file shared by several repositories (vendored code,
+   generated stubs, a common ``setup.py``) is parsed once.
+3. **Store**: each repository's rows are replaced in one transaction,
+   then the BM25 index over ``workspace.content`` is rebuilt once.
+
+With :meth:`Workspace.persist` the index also lives in a database file:
+a restart loads it instead of re-reading every repository, and
+:meth:`Workspace.index` then re-reads only those whose ``HEAD`` moved.
+
+Everything is read from git objects — not from the checkouts — so
+repositories outside the session root index the same way under a
+locked-down connection. That is also why workspace mode has its own
+``workspace_*`` macros instead of a ``repo`` column on ``fts.content``
+and the single-repo ``find_definitions`` / ``search_*``: those read and
+refresh from the session root's files (see ``sql/workspace.sql``).
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional, Union
+
+from fledgling.git.astcache import language_for
+from fledgling.git.objects import Commit, GitRepo
+
+if TYPE_CHECKING:
+    from fledgling.connection import Connection
+
+# Commits per repository kept in workspace.commits.
+MAX_COMMITS = 200
+
+# Alias of the database file attached by Workspace.persist.
+_STORE = "fledgling_workspace_store"
+
+# Workspace tables kept in the persist file. workspace.content is
+# derived from them (and ast_cache) on load, which also keeps its ids
+# in step with the in-memory sequence.
+_TABLES = ("repos", "files", "commits")
+
+
+@dataclass(frozen=True)
+class RepoSnapshot:
+    """What one repository contributes to the workspace at its ``HEAD``.
+
+    ``files`` are ``(file_path, blob_hash, language)`` triples.
+    """
+    name: str
+    root: str
+    head: str
+    files: tuple[tuple[str, str, str], ...]
+    commits: tuple[Commit, ...]
+
+
+def normalize_roots(
+    roots: Union[Mapping[str, str], Iterable[str]],
+) -> dict[str, str]:
+    """``{name: absolute_root}`` from a mapping or a list of paths.
+
+    Unnamed roots are named after their directory.
+
+    Raises:
+        ValueError: if two roots end up with the same name, or a name
+            is empty.
+    """
+    if isinstance(roots, Mapping):
+        pairs = list(roots.items())
+    else:
+        pairs = [
+            (os.path.basename(os.path.normpath(os.path.abspath(r))), r)
+            for r in roots
+        ]
+    out: dict[str, str] = {}
+    for name, root in pairs:
+        if not name:
+            raise ValueError(f"Workspace root {root!r} needs a name")
+        if name in out:
+            raise ValueError(f"Duplicate workspace repo name: {name!r}")
+        out[name] = os.path.abspath(os.path.expanduser(root))
+    return out
+
+
+def snapshot(
+    name: str,
+    root: str,
+    repo: GitRepo,
+    max_commits: int = MAX_COMMITS,
+) -> RepoSnapshot:
+    """Read ``HEAD``'s files and recent commits from ``repo``.
+
+    Submodules and files whose language isn't mapped by extension (see
+    :func:`~fledgling.git.astcache.language_for`) are left out.
+    """
+    head = repo.resolve("HEAD")
+    files: list[tuple[str, str, str]] = []
+    stack = [(repo.read_commit(head).tree, "")]
+    while stack:
+        tree, prefix = stack.pop()
+        for entry in repo.read_tree(tree):
+            path = prefix + entry.name
+            if entry.is_tree:
+                stack.append((entry.sha, path + "/"))
+            elif not entry.is_submodule:
+                language = language_for(path)
+                if language is not None:
+                    files.append((path, entry.sha, language))
+    commits = tuple(
+        repo.read_commit(sha)
+        for sha, _ in repo.rev_list(head, max_count=max_commits)
+    )
+    return RepoSnapshot(name, root, head, tuple(sorted(files)), commits)
+
+
+class Workspace:
+    """A set of repositories indexed into one fledgling connection.
+
+    Args:
+        con: Connection with the structural and workspace modules loaded.
+        roots: ``{name: path}`` mapping, or paths named after their
+            directory (see :func:`normalize_roots`).
+        max_commits: Recent commits indexed per repository.
+    """
+
+    def __init__(
+        self,
+        con: "Connection",
+        roots: Union[Mapping[str, str], Iterable[str]],
+        max_commits: int = MAX_COMMITS,
+    ):
+        self._con = con
+        self.roots = normalize_roots(roots)
+        self.max_commits = max_commits
+        self._store: Optional[str] = None
+
+    def persist(self, path: Optional[str] = None) -> list[str]:
+        """Keep the workspace index in a database file across restarts.
+
+        Attaches ``path`` (default ``.fledgling/cache/workspace/index.duckdb``
+        under the session root). If it holds a previous index, its
+        repositories, files and commits — and the ``ast_cache`` rows of
+        their blobs — are loaded and the BM25 index is rebuilt over them:
+        nothing is parsed, and a following :meth:`index` re-reads only
+        repositories whose ``HEAD`` moved. From then on every
+        :meth:`store` is saved back to the file.
+
+        Returns the names of the repositories loaded.
+        """
+        from fledgling.tools import _to_sql_literal
+
+        raw = self._con._con
+        if path is None:
+            path = os.path.join(self._con._cache_dir("workspace"), "index.duckdb")
+        raw.execute(f"ATTACH IF NOT EXISTS {_to_sql_literal(path)} AS {_STORE}")
+        for table in _TABLES:
+            raw.execute(
+                f"CREATE TABLE IF NOT EXISTS {_STORE}.{table} AS "
+                f"SELECT * FROM workspace.{table} LIMIT 0"
+            )
+        for table in ("blobs", "definitions"):
+            raw.execute(
+                f"CREATE TABLE IF NOT EXISTS {_STORE}.ast_{table} AS "
+                f"SELECT * FROM ast_cache.{table} LIMIT 0"
+            )
+        self._store = _STORE
+        names = [name for (name,) in raw.execute(
+            f"SELECT repo FROM {_STORE}.repos ORDER BY repo"
+        ).fetchall()]
+        if not names:
+            return []
+        raw.execute("BEGIN TRANSACTION")
+        try:
+            for name in names:
+                self._delete(raw, name)
+            for table in _TABLES:
+                raw.execute(
+                    f"INSERT INTO workspace.{table} SELECT * FROM {_STORE}.{table}"
+                )
+            # Definitions first: both inserts skip blobs already cached.
+            for table in ("definitions", "blobs"):
+                raw.execute(
+                    f"INSERT INTO ast_cache.{table} SELECT * FROM {_STORE}.ast_{table} "
+                    "WHERE blob_hash NOT IN (SELECT blob_hash FROM ast_cache.blobs)"
+                )
+            for name in names:
+                self._derive_content(raw, name)
+            raw.execute("COMMIT")
+        except Exception:
+            raw.execute("ROLLBACK")
+            raise
+        self._reindex(raw)
+        return names
+
+    def index(self, max_workers: Optional[int] = None) -> list[str]:
+        """Bring the workspace tables up to date with every root's ``HEAD``.
+
+        Repositories no longer in ``roots`` are dropped. Returns the
+        names of the repositories that were (re)indexed.
+        """
+        raw = self._con._con
+        indexed = dict(raw.execute(
+            "SELECT repo, head_sha FROM workspace.repos"
+        ).fetchall())
+        removed = [name for name in indexed if name not in self.roots]
+        for name in removed:
+            self._delete(raw, name)
+        self._save(raw, removed)
+
+        # GitRepo instances are created up front: the connection's repo
+        # map is not shared with the worker threads.
+        repos = {name: self._con._repo(root) for name, root in self.roots.items()}
+        stale = [
+            name for name in self.roots
+            if indexed.get(name) != repos[name].resolve("HEAD")
+        ]
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            snapshots = list(pool.map(
+                lambda name: snapshot(
+                    name, self.roots[name], repos[name], self.max_commits,
+                ),
+                stale,
+            ))
+
+        for snap in snapshots:
+            self._con._asts.ensure_many(
+                repos[snap.name],
+                ((sha, language) for _, sha, language in snap.files),
+                max_workers=max_workers,
+            )
+            self.store(snap)
+        if snapshots or removed:
+            self._reindex(raw)
+        return [snap.name for snap in snapshots]
+
+    def store(self, snap: RepoSnapshot) -> None:
+        """Replace one repository's rows with ``snap``.
+
+        The snapshot's blobs must already be in ``ast_cache``; search
+        rows are derived from their definitions. Saved to the
+        :meth:`persist` file, if any. Does not rebuild the BM25 index.
+        """
+        raw = self._con._con
+        raw.execute("BEGIN TRANSACTION")
+        try:
+            self._delete(raw, snap.name)
+            raw.execute(
+                "INSERT INTO workspace.repos (repo, root, head_sha, file_count) "
+                "VALUES (?, ?, ?, ?)",
+                [snap.name, snap.root, snap.head, len(snap.files)],
+            )
+            if snap.files:
+                raw.execute(
+                    "INSERT INTO workspace.files "
+                    "SELECT ?, unnest(?), unnest(?), unnest(?)",
+                    [
+                        snap.name,
+                        [p for p, _, _ in snap.files],
+                        [b for _, b, _ in snap.files],
+                        [lang for _, _, lang in snap.files],
+                    ],
+                )
+            if snap.commits:
+                raw.execute(
+                    "INSERT INTO workspace.commits "
+                    "SELECT ?, unnest(?), unnest(?), unnest(?), "
+                    "make_timestamp(unnest(?)::BIGINT * 1000000), unnest(?)",
+                    [
+                        snap.name,
+                        [c.sha for c in snap.commits],
+                        [c.author_name for c in snap.commits],
+                        [c.author_email for c in snap.commits],
+                        [c.author_time for c in snap.commits],
+                        [c.message.split("\n", 1)[0] for c in snap.commits],
+                    ],
+                )
+            self._derive_content(raw, snap.name)
+            raw.execute("COMMIT")
+        except Exception:
+            raw.execute("ROLLBACK")
+            raise
+        self._save(raw, [snap.name])
+
+    def _save(self, raw, names: list[str]) -> None:
+        """Copy repositories ``names`` — stored or deleted — to the
+        :meth:`persist` file, if any, with the AST rows of their blobs."""
+        store = self._store
+        if store is None or not names:
+            return
+        raw.execute("BEGIN TRANSACTION")
+        try:
+            for table in _TABLES:
+                raw.execute(
+                    f"DELETE FROM {store}.{table} WHERE list_contains(?, repo)",
+                    [names],
+                )
+                raw.execute(
+                    f"INSERT INTO {store}.{table} SELECT * FROM workspace.{table} "
+                    "WHERE list_contains(?, repo)",
+                    [names],
+                )
+            # Definitions before blobs: both copy only blobs not yet stored.
+            for table in ("definitions", "blobs"):
+                raw.execute(
+                    f"INSERT INTO {store}.ast_{table} SELECT * FROM ast_cache.{table} "
+                    f"WHERE blob_hash IN (SELECT blob_hash FROM {store}.files) "
+                    f"  AND blob_hash NOT IN (SELECT blob_hash FROM {store}.ast_blobs)"
+                )
+                raw.execute(
+                    f"DELETE FROM {store}.ast_{table} "
+                    f"WHERE blob_hash NOT IN (SELECT blob_hash FROM {store}.files)"
+                )
+            raw.execute("COMMIT")
+        except Exception:
+            raw.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _derive_content(raw, name: str) -> None:
+        """Search rows for one repository from its files' definitions and
+        its commits."""
+        raw.execute(
+            "INSERT INTO workspace.content "
+            "(repo, file_path, start_line, end_line, kind, name, text) "
+            "SELECT f.repo, f.file_path, d.start_line, d.end_line, d.kind, "
+            "       d.name, d.name || ' ' || d.kind || ' ' || f.file_path "
+            "FROM workspace.files f "
+            "JOIN ast_cache.definitions d ON d.blob_hash = f.blob_hash "
+            "WHERE f.repo = ? AND d.name IS NOT NULL "
+            "UNION ALL "
+            "SELECT repo, NULL, NULL, NULL, 'commit', commit_sha[:8], summary "
+            "FROM workspace.commits WHERE repo = ?",
+            [name, name],
+        )
+
+    @staticmethod
+    def _reindex(raw) -> None:
+        raw.execute(
+            "PRAGMA create_fts_index('workspace.content', 'id', 'text', "
+            "overwrite = 1)"
+        )
+
+    @staticmethod
+    def _delete(raw, name: str) -> None:
+        for table in ("repos", "files", "commits", "content"):
+            raw.execute(f"DELETE FROM workspace.{table} WHERE repo = ?", [name])
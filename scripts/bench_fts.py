@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark search_content against per-row match_bm25 scoring.
+
+Fills fts.content with a synthetic corpus (Zipf-ish vocabulary, random
+kinds and paths), builds the BM25 index, then times each query both ways:
+
+    scan      match_bm25(id, query) for every row, filter, sort (the
+              pre-candidate search_content)
+    topk      search_content: postings -> filtered candidates -> top-k
+
+and checks that the two return the same ids.
+
+Usage:
+    python scripts/bench_fts.py [rows] [repeats]
+
+Examples:
+    python scripts/bench_fts.py              # 1,000,000 rows
+    python scripts/bench_fts.py 100000 5
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import fledgling  # noqa: E402
+
+VOCABULARY = 50_000
+LIMIT = 20
+
+QUERIES = [
+    ("common term", "t1", {}),
+    ("rare term", "t40000", {}),
+    ("two terms", "t3 t500", {}),
+    ("conjunctive", "t3 t500", {"conjunctive": True}),
+    ("kind filter", "t3 t500", {"filter_kind": "comment"}),
+    ("path filter", "t3 t500", {"file_pattern": "src/pkg3/**/*.py"}),
+]
+
+SCAN = """
+    SELECT id FROM (
+        SELECT c.*, fts_fts_content.match_bm25(c.id, $query,
+                   conjunctive := $conjunctive::INTEGER) AS score
+        FROM fts.content c
+    ) scored
+    WHERE score IS NOT NULL
+      AND ($filter_kind IS NULL OR kind = $filter_kind)
+      AND ($file_pattern IS NULL
+           OR _glob_match(file_path, resolve($file_pattern)))
+    ORDER BY score DESC, id
+    LIMIT $limit
+"""
+
+TOPK = """
+    SELECT id FROM search_content($query,
+        filter_kind := $filter_kind,
+        file_pattern := $file_pattern,
+        conjunctive := $conjunctive,
+        limit_n := $limit)
+"""
+
+
+def populate(con, rows):
+    """Synthetic fts.content: ``rows`` chunks of 5-40 terms each."""
+    con.execute(f"""
+        INSERT INTO fts.content
+        SELECT
+            i AS id,
+            session_root || '/src/pkg' || (i % 20) || '/m' || (i % 997) || '.py',
+            1, 10,
+            'sitting_duck',
+            ['definition', 'comment', 'string'][1 + i % 3],
+            NULL, 0, NULL,
+            (SELECT string_agg('t' || CAST(floor(pow({VOCABULARY}, random())) AS BIGINT), ' ')
+             FROM range(5 + i % 36) w(j) WHERE i >= 0)
+        FROM range({rows}) r(i), (SELECT getvariable('session_root') AS session_root)
+    """)
+
+
+def timed(con, sql, params, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ids = [r[0] for r in con.execute(sql, params).fetchall()]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, ids
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    root = tempfile.mkdtemp(prefix="fledgling-bench-")
+    con = fledgling.connect(root=root, init=False,
+                            modules=["sandbox", "code", "docs", "fts"])
+
+    start = time.perf_counter()
+    populate(con, rows)
+    print(f"populate  {rows:,} rows: {time.perf_counter() - start:.1f} s")
+    start = time.perf_counter()
+    con._fts_reindex()
+    print(f"index     {time.perf_counter() - start:.1f} s\n")
+
+    print(f"{'query':<14} {'scan ms':>10} {'topk ms':>10} {'speedup':>8}  same")
+    for label, query, options in QUERIES:
+        params = {
+            "query": query,
+            "filter_kind": options.get("filter_kind"),
+            "file_pattern": options.get("file_pattern"),
+            "conjunctive": options.get("conjunctive", False),
+            "limit": LIMIT,
+        }
+        scan, scan_ids = timed(con, SCAN, params, repeats)
+        topk, topk_ids = timed(con, TOPK, params, repeats)
+        print(f"{label:<14} {scan * 1000:>10.1f} {topk * 1000:>10.1f} "
+              f"{scan / topk:>7.1f}x  {scan_ids == topk_ids}")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
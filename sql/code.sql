@@ -2,19 +2,16 @@
 --
 -- Semantic code analysis powered by sitting_duck's AST parsing.
 -- Replaces grep-based code search with structure-aware queries.
-
--- find_definitions: Find function, class, or variable definitions.
--- The core code search tool — replaces grep for "where is X defined?"
---
--- Default behavior (no name_pattern): returns only function, class, and module
--- definitions at depth <= 2, filtering out inner variable assignments.
--- When name_pattern is provided (not '%'): also includes variable definitions,
--- allowing targeted search for specific named variables.
 --
--- Examples:
---   SELECT * FROM find_definitions('**/*.py');
---   SELECT * FROM find_definitions('src/**/*.py', 'parse%');
-CREATE OR REPLACE MACRO find_definitions(file_pattern, name_pattern := '%') AS TABLE
+-- Scan macros (_scan_*) hold the query logic over an already-read AST:
+-- `scan` names a table or CTE of read_ast rows, read via query_table().
+-- The public macros read the files once and delegate; a workflow that
+-- runs several of them over the same files materializes one read_ast
+-- pass (fledgling.scan.Scan, or a MATERIALIZED CTE in workflows.sql)
+-- and feeds every section from it, so each file is parsed once.
+
+-- _scan_definitions: find_definitions over read_ast rows.
+CREATE OR REPLACE MACRO _scan_definitions(scan, name_pattern := '%') AS TABLE
     SELECT
         file_path,
         name,
@@ -22,7 +19,7 @@ CREATE OR REPLACE MACRO find_definitions(file_pattern, name_pattern := '%') AS T
         start_line,
         end_line,
         peek AS signature
-    FROM read_ast(file_pattern)
+    FROM query_table(scan)
     WHERE name != ''
       AND name LIKE name_pattern
       AND (
@@ -39,23 +36,150 @@ CREATE OR REPLACE MACRO find_definitions(file_pattern, name_pattern := '%') AS T
       )
     ORDER BY file_path, start_line;
 
--- find_calls: Find function/method call sites.
--- Answers "where is this function called?"
---
--- Examples:
---   SELECT * FROM find_calls('**/*.py');
---   SELECT * FROM find_calls('src/**/*.py', 'connect%');
-CREATE OR REPLACE MACRO find_calls(file_pattern, name_pattern := '%') AS TABLE
+-- _scan_calls: find_calls over read_ast rows.
+CREATE OR REPLACE MACRO _scan_calls(scan, name_pattern := '%') AS TABLE
     SELECT
         file_path,
         name,
         start_line,
         peek AS call_expression
-    FROM read_ast(file_pattern)
+    FROM query_table(scan)
     WHERE is_call(semantic_type)
       AND name LIKE name_pattern
     ORDER BY file_path, start_line;
 
+-- _scan_in_ast: find_in_ast over read_ast rows.
+CREATE OR REPLACE MACRO _scan_in_ast(scan, kind, name_pattern := '%') AS TABLE
+    SELECT
+        file_path,
+        name,
+        start_line,
+        peek AS context
+    FROM query_table(scan)
+    WHERE name LIKE name_pattern
+      AND CASE kind
+          WHEN 'calls' THEN is_call(semantic_type)
+          WHEN 'imports' THEN is_import(semantic_type)
+          WHEN 'definitions' THEN is_definition(semantic_type)
+          WHEN 'loops' THEN is_loop(semantic_type)
+          WHEN 'conditionals' THEN is_conditional(semantic_type)
+          WHEN 'strings' THEN is_string_literal(semantic_type)
+          WHEN 'comments' THEN is_comment(semantic_type)
+          ELSE false
+      END
+    ORDER BY file_path, start_line;
+
+-- _scan_structure: code_structure over read_ast rows.
+CREATE OR REPLACE MACRO _scan_structure(scan) AS TABLE
+    WITH defs AS (
+        SELECT
+            file_path,
+            name,
+            node_id,
+            semantic_type,
+            start_line,
+            end_line,
+            descendant_count,
+            children_count
+        FROM query_table(scan)
+        WHERE is_definition(semantic_type)
+          AND name != ''
+          AND depth <= 2
+    ),
+    func_complexity AS (
+        SELECT
+            d.node_id,
+            count(CASE WHEN is_conditional(n.semantic_type)
+                AND (n.type LIKE '%_statement' OR n.type LIKE '%_clause'
+                     OR n.type LIKE '%_expression' OR n.type LIKE '%_arm'
+                     OR n.type LIKE '%_case' OR n.type LIKE '%_branch')
+                THEN 1 END) AS conditionals,
+            count(CASE WHEN is_loop(n.semantic_type)
+                AND (n.type LIKE '%_statement' OR n.type LIKE '%_expression'
+                     OR n.type LIKE '%_loop')
+                THEN 1 END) AS loops
+        FROM defs d
+        JOIN query_table(scan) n ON n.node_id > d.node_id
+                                AND n.node_id <= d.node_id + d.descendant_count
+        WHERE is_function_definition(d.semantic_type)
+        GROUP BY d.node_id
+    )
+    SELECT
+        d.file_path,
+        d.name,
+        semantic_type_to_string(d.semantic_type) AS kind,
+        d.start_line,
+        d.end_line,
+        d.end_line - d.start_line + 1 AS line_count,
+        d.descendant_count,
+        d.children_count,
+        CASE WHEN is_function_definition(d.semantic_type)
+             THEN fc.conditionals + fc.loops + 1
+             ELSE NULL END AS cyclomatic_complexity
+    FROM defs d
+    LEFT JOIN func_complexity fc ON d.node_id = fc.node_id
+    ORDER BY d.file_path, d.start_line;
+
+-- _scan_callers_of: Callers of each of func_names over read_ast rows.
+-- Each call is attributed to its innermost enclosing function
+-- (caller_name is NULL for module-level calls) — the same answer as
+-- ast_callers, without re-reading the files. One pass serves any
+-- number of callees.
+CREATE OR REPLACE MACRO _scan_callers_of(scan, func_names) AS TABLE
+    WITH calls AS (
+        SELECT file_path, node_id, start_line, name
+        FROM query_table(scan)
+        WHERE is_call(semantic_type)
+          AND list_contains(func_names, name)
+    )
+    SELECT
+        c.file_path,
+        c.start_line AS call_line,
+        f.name AS caller_name,
+        c.name AS callee
+    FROM calls c
+    LEFT JOIN query_table(scan) f
+        ON f.file_path = c.file_path
+       AND is_function_definition(f.semantic_type)
+       AND c.node_id > f.node_id
+       AND c.node_id <= f.node_id + f.descendant_count
+    QUALIFY row_number() OVER (
+        PARTITION BY c.file_path, c.node_id
+        ORDER BY f.node_id DESC NULLS LAST
+    ) = 1
+    ORDER BY c.file_path, call_line;
+
+-- _scan_callers: function_callers over read_ast rows.
+CREATE OR REPLACE MACRO _scan_callers(scan, func_name) AS TABLE
+    SELECT file_path, call_line, caller_name
+    FROM _scan_callers_of(scan, [func_name])
+    ORDER BY file_path, call_line;
+
+-- find_definitions: Find function, class, or variable definitions.
+-- The core code search tool — replaces grep for "where is X defined?"
+--
+-- Default behavior (no name_pattern): returns only function, class, and module
+-- definitions at depth <= 2, filtering out inner variable assignments.
+-- When name_pattern is provided (not '%'): also includes variable definitions,
+-- allowing targeted search for specific named variables.
+--
+-- Examples:
+--   SELECT * FROM find_definitions('**/*.py');
+--   SELECT * FROM find_definitions('src/**/*.py', 'parse%');
+CREATE OR REPLACE MACRO find_definitions(file_pattern, name_pattern := '%') AS TABLE
+    WITH ast AS (SELECT * FROM read_ast(file_pattern))
+    SELECT * FROM _scan_definitions('ast', name_pattern := name_pattern);
+
+-- find_calls: Find function/method call sites.
+-- Answers "where is this function called?"
+--
+-- Examples:
+--   SELECT * FROM find_calls('**/*.py');
+--   SELECT * FROM find_calls('src/**/*.py', 'connect%');
+CREATE OR REPLACE MACRO find_calls(file_pattern, name_pattern := '%') AS TABLE
+    WITH ast AS (SELECT * FROM read_ast(file_pattern))
+    SELECT * FROM _scan_calls('ast', name_pattern := name_pattern);
+
 -- find_imports: Find import/include statements.
 -- Answers "what does this file depend on?"
 --
@@ -125,24 +249,8 @@ CREATE OR REPLACE MACRO find_exports(file_pattern) AS TABLE
 --   SELECT * FROM find_in_ast('src/**/*.py', 'calls', 'connect%');
 --   SELECT * FROM find_in_ast('src/**/*.py', 'imports');
 CREATE OR REPLACE MACRO find_in_ast(file_pattern, kind, name_pattern := '%') AS TABLE
-    SELECT
-        file_path,
-        name,
-        start_line,
-        peek AS context
-    FROM read_ast(file_pattern)
-    WHERE name LIKE name_pattern
-      AND CASE kind
-          WHEN 'calls' THEN is_call(semantic_type)
-          WHEN 'imports' THEN is_import(semantic_type)
-          WHEN 'definitions' THEN is_definition(semantic_type)
-          WHEN 'loops' THEN is_loop(semantic_type)
-          WHEN 'conditionals' THEN is_conditional(semantic_type)
-          WHEN 'strings' THEN is_string_literal(semantic_type)
-          WHEN 'comments' THEN is_comment(semantic_type)
-          ELSE false
-      END
-    ORDER BY file_path, start_line;
+    WITH ast AS (SELECT * FROM read_ast(file_pattern))
+    SELECT * FROM _scan_in_ast('ast', kind, name_pattern := name_pattern);
 
 -- find_code: Search code using CSS selector syntax (via ast_select).
 -- NOTE: Requires sitting_duck with ast_select support (not yet in community extensions).
@@ -232,57 +340,9 @@ CREATE OR REPLACE MACRO view_code_text(file_pattern, selector, lang := NULL, ctx
 --   SELECT * FROM code_structure('src/main.py');
 --   SELECT * FROM code_structure('src/**/*.py');
 CREATE OR REPLACE MACRO code_structure(file_pattern) AS TABLE
-    WITH ast AS (
-        SELECT * FROM read_ast(file_pattern)
-    ),
-    defs AS (
-        SELECT
-            file_path,
-            name,
-            node_id,
-            semantic_type,
-            start_line,
-            end_line,
-            descendant_count,
-            children_count
-        FROM ast
-        WHERE is_definition(semantic_type)
-          AND name != ''
-          AND depth <= 2
-    ),
-    func_complexity AS (
-        SELECT
-            d.node_id,
-            count(CASE WHEN is_conditional(n.semantic_type)
-                AND (n.type LIKE '%_statement' OR n.type LIKE '%_clause'
-                     OR n.type LIKE '%_expression' OR n.type LIKE '%_arm'
-                     OR n.type LIKE '%_case' OR n.type LIKE '%_branch')
-                THEN 1 END) AS conditionals,
-            count(CASE WHEN is_loop(n.semantic_type)
-                AND (n.type LIKE '%_statement' OR n.type LIKE '%_expression'
-                     OR n.type LIKE '%_loop')
-                THEN 1 END) AS loops
-        FROM defs d
-        JOIN ast n ON n.node_id > d.node_id
-                  AND n.node_id <= d.node_id + d.descendant_count
-        WHERE is_function_definition(d.semantic_type)
-        GROUP BY d.node_id
-    )
-    SELECT
-        d.file_path,
-        d.name,
-        semantic_type_to_string(d.semantic_type) AS kind,
-        d.start_line,
-        d.end_line,
-        d.end_line - d.start_line + 1 AS line_count,
-        d.descendant_count,
-        d.children_count,
-        CASE WHEN is_function_definition(d.semantic_type)
-             THEN fc.conditionals + fc.loops + 1
-             ELSE NULL END AS cyclomatic_complexity
-    FROM defs d
-    LEFT JOIN func_complexity fc ON d.node_id = fc.node_id
-    ORDER BY d.file_path, d.start_line;
+    -- Scanned twice (definitions, then their descendants): read once.
+    WITH ast AS MATERIALIZED (SELECT * FROM read_ast(file_pattern))
+    SELECT * FROM _scan_structure('ast');
 
 -- find_class_members: List direct members of a class node.
 -- Returns function/method definitions, class-level assignments, nested
@@ -25,6 +25,8 @@
 --   ordinal    INTEGER    — extractor-defined opaque int (see conventions below)
 --   attrs      JSON       — extractor-defined extras
 --   text       VARCHAR    — FTS target column
+--   subtokens  VARCHAR    — extra index terms for identifiers in text
+--                           (see _fts_subtokens); indexed with text
 --
 -- Per-extractor conventions for opaque fields (not enforced):
 --   markdown/doc_section:
@@ -49,6 +51,21 @@
 --     text    = string literal (peek) — includes Python docstrings,
 --               URLs, SQL, error messages. Filtered to length >= 8.
 --
+-- Fuzzy symbol lookup: fts.trigrams holds the trigrams of every
+-- definition name (see _fts_trigrams), rebuilt with the BM25 index.
+-- search_symbols() ranks names by trigram similarity to a query, so a
+-- misspelt or differently-cased identifier is found without parsing.
+--
+-- Manifest: fts.files records, per indexed file and extractor, the size,
+-- modification time and content hash (md5) the file had when its rows
+-- were extracted. The hash decides staleness: a touched-but-unchanged
+-- file needn't be re-extracted. fts_stale() hashes every file and
+-- compares; the Python Connection.refresh_fts() first compares size and
+-- mtime (_fts_suspects, no file reads) and hashes only the files where
+-- they differ, then re-extracts those whose hash changed. mtimes only
+-- have second resolution, so one recorded within a second or two of
+-- being written is kept as NULL (see _fts_mtime) and always rechecked.
+--
 -- Rebuild is triggered externally (via sql/fts_rebuild.sql). This file
 -- installs only the schema, table, and search-side macros. Macros are
 -- lazy, so defining them is safe even before the index exists — but
@@ -73,59 +90,368 @@ CREATE TABLE IF NOT EXISTS fts.content (
     name       VARCHAR,
     ordinal    INTEGER,
     attrs      JSON,
-    text       VARCHAR
+    text       VARCHAR,
+    subtokens  VARCHAR
+);
+
+-- Tables created before subtokens existed.
+ALTER TABLE fts.content ADD COLUMN IF NOT EXISTS subtokens VARCHAR;
+
+CREATE TABLE IF NOT EXISTS fts.trigrams (
+    gram VARCHAR,
+    id   BIGINT
 );
 
+CREATE TABLE IF NOT EXISTS fts.files (
+    file_path VARCHAR,
+    extractor VARCHAR,
+    size      BIGINT,
+    modified  TIMESTAMP,
+    hash      VARCHAR
+);
+
+-- _fts_subtokens: Extra index terms for the identifiers in `s`. The BM25
+-- tokenizer lowercases and splits on anything but letters, so
+-- 'parse_config' indexes as 'parse config' and 'parseConfig' as
+-- 'parseconfig' — neither matches the other. This adds each camelCase /
+-- PascalCase identifier split into its words ('parse Config',
+-- 'HTTP Server') and each snake_case identifier joined into one
+-- ('parseconfig'), so all three spellings meet.
+--
+-- Examples:
+--   SELECT _fts_subtokens('def parseConfig(retry_policy): ...');
+--   -- the terms parse, Config and retrypolicy, in no particular order
+CREATE OR REPLACE MACRO _fts_subtokens(s) AS
+    array_to_string(list_transform(
+        list_distinct(list_filter(
+            regexp_extract_all(s, '[A-Za-z0-9_]+'),
+            w -> regexp_matches(w, '[a-z0-9][A-Z]|[A-Z][A-Z][a-z]|[A-Za-z0-9]_+[A-Za-z0-9]')
+        )),
+        w -> concat_ws(' ',
+            CASE WHEN regexp_matches(w, '[a-z0-9][A-Z]|[A-Z][A-Z][a-z]')
+                 THEN regexp_replace(
+                          regexp_replace(w, '([a-z0-9])([A-Z])', '\1 \2', 'g'),
+                          '([A-Z]+)([A-Z][a-z])', '\1 \2', 'g')
+            END,
+            CASE WHEN regexp_matches(w, '[A-Za-z0-9]_+[A-Za-z0-9]')
+                 THEN lower(replace(w, '_', ''))
+            END)
+    ), ' ');
+
+-- _fts_trigrams: Distinct trigrams of an identifier, for fuzzy matching.
+-- Case and separators are dropped first ('Retry_Policy' and
+-- 'retrypolicy' are the same), and the name is padded ('  x ') so short
+-- names and word starts weigh in.
+CREATE OR REPLACE MACRO _fts_trigrams(s) AS
+    list_distinct(list_transform(
+        range(1, length(regexp_replace(lower(s), '[^a-z0-9]', '', 'g')) + 2),
+        i -> ('  ' || regexp_replace(lower(s), '[^a-z0-9]', '', 'g') || ' ')[i:i + 2]
+    ));
+
+-- _fts_trigram_rows: fts.trigrams rows for the definitions in fts.content.
+CREATE OR REPLACE MACRO _fts_trigram_rows() AS TABLE
+    SELECT unnest(_fts_trigrams(name)) AS gram, id
+    FROM fts.content
+    WHERE kind = 'definition' AND name IS NOT NULL;
+
+-- _fts_doc_rows / _fts_code_rows: fts.content rows (without id) for the
+-- markdown / code files matching `files` — a glob or a list of paths.
+-- Shared by fts_rebuild.sql and Connection.rebuild_fts()/refresh_fts(),
+-- which call them a batch of files at a time.
+CREATE OR REPLACE MACRO _fts_doc_rows(files) AS TABLE
+    SELECT
+        file_path,
+        start_line,
+        end_line,
+        'markdown'::VARCHAR     AS extractor,
+        'doc_section'::VARCHAR  AS kind,
+        title                   AS name,
+        CAST(level AS INTEGER)  AS ordinal,
+        json_object(
+            'section_id',   section_id,
+            'section_path', section_path,
+            'level',        level
+        )                       AS attrs,
+        COALESCE(title, '') || chr(10) || COALESCE(content, '') AS text,
+        NULL::VARCHAR           AS subtokens
+    FROM read_markdown_sections(
+        files,
+        include_content := true,
+        include_filepath := true
+    )
+    WHERE (title IS NOT NULL AND title != '')
+       OR (content IS NOT NULL AND content != '');
+
+-- One read_ast pass feeds all three code extractors; each node is
+-- classified by `kind`:
+--   definition — functions, classes, modules: high-signal named nodes;
+--                text = name || ' ' || peek.
+--   comment    — tree-sitter comment nodes only (not docstrings, which
+--                are string literals in Python; see 'string').
+--   string     — string literals: Python docstrings, URLs, SQL, error
+--                messages, etc. Length filter (>= 8) trims trivial noise
+--                like 'x', '/'; meaningful short strings like 'auth' are
+--                covered by definition names already.
+-- is_string_literal matches both the outer string node ("foo") and the
+-- inner string_content (foo). QUALIFY keeps the longest peek per
+-- (file, line span), which is the outer — preserves quoting context and
+-- avoids duplicate hits for the same literal.
+CREATE OR REPLACE MACRO _fts_code_rows(files) AS TABLE
+    WITH nodes AS (
+        SELECT
+            file_path,
+            start_line,
+            end_line,
+            node_id,
+            name,
+            semantic_type,
+            depth,
+            parent_id,
+            peek,
+            CASE
+                WHEN name IS NOT NULL AND name != ''
+                 AND (is_function_definition(semantic_type)
+                   OR is_class_definition(semantic_type)
+                   OR is_module_definition(semantic_type))
+                    THEN 'definition'
+                WHEN is_comment(semantic_type)
+                 AND peek IS NOT NULL AND peek != ''
+                    THEN 'comment'
+                WHEN is_string_literal(semantic_type)
+                 AND peek IS NOT NULL AND length(peek) >= 8
+                    THEN 'string'
+            END AS kind
+        FROM read_ast(files)
+    )
+    SELECT
+        file_path,
+        start_line,
+        end_line,
+        'sitting_duck'::VARCHAR AS extractor,
+        kind::VARCHAR           AS kind,
+        CASE WHEN kind = 'definition' THEN name END AS name,
+        CAST(node_id AS INTEGER) AS ordinal,
+        json_object(
+            'semantic_type', semantic_type_to_string(semantic_type),
+            'depth',         depth,
+            'parent_id',     parent_id
+        )                       AS attrs,
+        CASE
+            WHEN kind = 'definition' THEN name || ' ' || COALESCE(peek, '')
+            ELSE peek
+        END                     AS text,
+        _fts_subtokens(text)    AS subtokens
+    FROM nodes
+    WHERE kind IS NOT NULL
+    QUALIFY kind != 'string'
+         OR row_number() OVER (
+                PARTITION BY file_path, start_line, end_line, kind
+                ORDER BY length(peek) DESC
+            ) = 1;
+
+-- _fts_mtime: A file's modification time as recorded in fts.files — NULL
+-- when it is under two seconds old. With one-second resolution, a file
+-- written again in the second it was recorded keeps its mtime; a NULL
+-- makes the next refresh hash it instead of trusting the mtime.
+CREATE OR REPLACE MACRO _fts_mtime(last_modified) AS
+    CASE WHEN epoch(last_modified) > epoch(now()) - 2 THEN NULL
+         ELSE CAST(last_modified AS TIMESTAMP)
+    END;
+
+-- _fts_fingerprints: fts.files rows for the files on disk matching the
+-- docs and code globs. Reads (and hashes) the files but parses nothing.
+CREATE OR REPLACE MACRO _fts_fingerprints(docs_glob, code_glob) AS TABLE
+    SELECT filename AS file_path, 'markdown' AS extractor,
+           size, _fts_mtime(last_modified) AS modified, md5(content) AS hash
+    FROM read_blob(docs_glob)
+    UNION ALL
+    SELECT filename, 'sitting_duck',
+           size, _fts_mtime(last_modified), md5(content)
+    FROM read_blob(code_glob);
+
+-- _fts_suspects: fts_stale's candidates from file metadata alone — files
+-- not in fts.files (`added`), gone from disk (`removed`), or whose size
+-- or mtime differs from it (`changed`, possibly only touched). Reads no
+-- file content. `indexed_hash` is the manifest's hash, to compare with
+-- the file's current one.
+CREATE OR REPLACE MACRO _fts_suspects(docs_glob, code_glob) AS TABLE
+    WITH disk AS (
+        SELECT filename AS file_path, 'markdown' AS extractor,
+               size, _fts_mtime(last_modified) AS modified
+        FROM read_blob(docs_glob)
+        UNION ALL
+        SELECT filename, 'sitting_duck', size, _fts_mtime(last_modified)
+        FROM read_blob(code_glob)
+    )
+    SELECT
+        COALESCE(d.file_path, f.file_path) AS file_path,
+        COALESCE(d.extractor, f.extractor) AS extractor,
+        CASE
+            WHEN f.file_path IS NULL THEN 'added'
+            WHEN d.file_path IS NULL THEN 'removed'
+            ELSE 'changed'
+        END AS status,
+        d.size,
+        d.modified,
+        f.hash AS indexed_hash
+    FROM disk d
+    FULL OUTER JOIN fts.files f
+      ON f.file_path = d.file_path AND f.extractor = d.extractor
+    WHERE d.file_path IS NULL
+       OR f.file_path IS NULL
+       OR d.size IS DISTINCT FROM f.size
+       OR d.modified IS NULL
+       OR d.modified IS DISTINCT FROM f.modified
+    ORDER BY file_path, extractor;
+
+-- fts_stale: Indexed files that are out of date with the disk — `added`
+-- (matches a glob, not indexed), `changed` (content hash differs from
+-- fts.files) or `removed` (indexed, no longer matches). The size,
+-- modified and hash columns are the file's current fingerprint (NULL if
+-- removed).
+-- Globs are resolved by the caller, as for fts_rebuild.sql.
+--
+-- Examples:
+--   SELECT * FROM fts_stale(resolve('**/*.md'), resolve('**/*.py'));
+CREATE OR REPLACE MACRO fts_stale(docs_glob, code_glob) AS TABLE
+    SELECT
+        COALESCE(d.file_path, f.file_path) AS file_path,
+        COALESCE(d.extractor, f.extractor) AS extractor,
+        CASE
+            WHEN f.file_path IS NULL THEN 'added'
+            WHEN d.file_path IS NULL THEN 'removed'
+            ELSE 'changed'
+        END AS status,
+        d.size,
+        d.modified,
+        d.hash
+    FROM _fts_fingerprints(docs_glob, code_glob) d
+    FULL OUTER JOIN fts.files f
+      ON f.file_path = d.file_path AND f.extractor = d.extractor
+    WHERE d.file_path IS NULL
+       OR f.file_path IS NULL
+       OR d.hash IS DISTINCT FROM f.hash
+    ORDER BY file_path, extractor;
+
 -- Create a stub BM25 index so fts_fts_content.match_bm25 exists when
 -- the search macros below are parsed. DuckDB validates function refs
 -- at macro-definition time, so the target has to exist already.
 -- overwrite = 1 makes this idempotent across reloads; the rebuild
 -- script replaces this with a real index over the populated table.
-PRAGMA create_fts_index('fts.content', 'id', 'text', overwrite = 1);
+PRAGMA create_fts_index('fts.content', 'id', 'text', 'subtokens', overwrite = 1);
+
+-- _fts_scores: BM25 scores of the fts.content rows matching `query`,
+-- unordered: the rows' columns plus `score`. The same scores as
+-- match_bm25 (k = 1.2, b = 0.75), but computed for the candidates only
+-- rather than calling match_bm25 once per row of fts.content: the
+-- query's terms are looked up in the index dictionary, their postings
+-- give the candidate documents, and the filters (kind, extractor, file
+-- path glob) are applied to those before any scoring. Cost follows the
+-- postings of the query terms, not the corpus size. conjunctive := true
+-- requires every query term.
+CREATE OR REPLACE MACRO _fts_scores(
+    query,
+    filter_kind := NULL,
+    filter_extractor := NULL,
+    file_pattern := NULL,
+    conjunctive := false
+) AS TABLE
+    WITH tokens AS (
+        SELECT DISTINCT stem(unnest(fts_fts_content.tokenize(query)), 'porter') AS term
+    ),
+    qterms AS (
+        SELECT d.termid, d.df
+        FROM fts_fts_content.dict d
+        JOIN tokens t ON d.term = t.term
+    ),
+    hits AS (
+        SELECT p.docid, p.termid, count(*) AS tf
+        FROM fts_fts_content.terms p
+        WHERE p.termid IN (SELECT termid FROM qterms)
+        GROUP BY p.docid, p.termid
+    ),
+    candidates AS (
+        SELECT doc.docid, doc.len, c.*
+        FROM fts_fts_content.docs doc
+        JOIN fts.content c ON c.id = doc.name
+        WHERE doc.docid IN (SELECT docid FROM hits)
+          AND (filter_kind IS NULL OR c.kind = filter_kind)
+          AND (filter_extractor IS NULL OR c.extractor = filter_extractor)
+          AND (file_pattern IS NULL
+               OR _glob_match(c.file_path, resolve(file_pattern)))
+    ),
+    scores AS (
+        SELECT
+            h.docid,
+            sum(
+                log((s.num_docs - q.df + 0.5) / (q.df + 0.5) + 1)
+                * (h.tf * (1.2 + 1)
+                   / (h.tf + 1.2 * (1 - 0.75 + 0.75 * (c.len / s.avgdl))))
+            ) AS score
+        FROM hits h
+        JOIN candidates c ON c.docid = h.docid
+        JOIN qterms q ON q.termid = h.termid
+        CROSS JOIN fts_fts_content.stats s
+        GROUP BY h.docid
+        HAVING NOT conjunctive OR count(*) = (SELECT count(*) FROM tokens)
+    )
+    SELECT c.* EXCLUDE (docid, len), s.score
+    FROM scores s
+    JOIN candidates c ON c.docid = s.docid;
 
 -- search_content: BM25 search across all indexed content.
--- Optional filters narrow by kind and/or extractor.
+-- Optional filters narrow by kind, extractor and file path (a glob,
+-- resolved like other file_pattern arguments); conjunctive := true
+-- requires every query term.
+--
+-- Scored by _fts_scores, so only rows containing a query term are
+-- scored, and the filters apply before scoring; ORDER BY ... LIMIT
+-- keeps a top-k heap instead of sorting every score.
 --
 -- Examples:
 --   SELECT * FROM search_content('authentication');
 --   SELECT * FROM search_content('auth', filter_kind := 'doc_section');
 --   SELECT * FROM search_content('login', filter_extractor := 'sitting_duck');
+--   SELECT * FROM search_content('retry', file_pattern := 'src/**/*.py');
 CREATE OR REPLACE MACRO search_content(
     query,
     filter_kind := NULL,
     filter_extractor := NULL,
-    limit_n := 20
+    limit_n := 20,
+    file_pattern := NULL,
+    conjunctive := false
 ) AS TABLE
-    SELECT *
-    FROM (
-        SELECT
-            c.id,
-            c.file_path,
-            c.start_line,
-            c.end_line,
-            c.extractor,
-            c.kind,
-            c.name,
-            c.ordinal,
-            c.attrs,
-            c.text,
-            fts_fts_content.match_bm25(c.id, query) AS score
-        FROM fts.content c
-    ) scored
-    WHERE scored.score IS NOT NULL
-      AND (filter_kind IS NULL OR scored.kind = filter_kind)
-      AND (filter_extractor IS NULL OR scored.extractor = filter_extractor)
-    ORDER BY scored.score DESC
+    SELECT
+        id,
+        file_path,
+        start_line,
+        end_line,
+        extractor,
+        kind,
+        name,
+        ordinal,
+        attrs,
+        text,
+        score
+    FROM _fts_scores(
+        query,
+        filter_kind := filter_kind,
+        filter_extractor := filter_extractor,
+        file_pattern := file_pattern,
+        conjunctive := conjunctive
+    )
+    ORDER BY score DESC, id
     LIMIT limit_n;
 
 -- search_docs: FTS over markdown sections.
 --
 -- Examples:
 --   SELECT * FROM search_docs('installation');
-CREATE OR REPLACE MACRO search_docs(query, limit_n := 20) AS TABLE
+CREATE OR REPLACE MACRO search_docs(query, limit_n := 20, file_pattern := NULL) AS TABLE
     SELECT * FROM search_content(
         query,
         filter_kind := 'doc_section',
+        file_pattern := file_pattern,
         limit_n := limit_n
     );
 
@@ -135,14 +461,150 @@ CREATE OR REPLACE MACRO search_docs(query, limit_n := 20) AS TABLE
 -- Examples:
 --   SELECT * FROM search_code('auth');
 --   SELECT * FROM search_code('auth', filter_kind := 'comment');
-CREATE OR REPLACE MACRO search_code(query, filter_kind := NULL, limit_n := 20) AS TABLE
+CREATE OR REPLACE MACRO search_code(
+    query, filter_kind := NULL, limit_n := 20, file_pattern := NULL
+) AS TABLE
     SELECT * FROM search_content(
         query,
         filter_kind := filter_kind,
         filter_extractor := 'sitting_duck',
+        file_pattern := file_pattern,
         limit_n := limit_n
     );
 
+-- search_symbols: Definitions whose names are like `query`, ranked by
+-- trigram similarity (Jaccard over _fts_trigrams). Tolerates typos,
+-- case and separator differences ('retrypolicy', 'RetryPolicy' and
+-- 'retry_polcy' all find retry_policy) without parsing anything: the
+-- query's trigrams are looked up in fts.trigrams and only names sharing
+-- one are scored. Optional file_pattern as for search_content.
+--
+-- Examples:
+--   SELECT * FROM search_symbols('parseconfg');
+--   SELECT * FROM search_symbols('HttpClient', file_pattern := 'src/**/*.py');
+CREATE OR REPLACE MACRO search_symbols(
+    query,
+    limit_n := 20,
+    file_pattern := NULL,
+    min_similarity := 0.3
+) AS TABLE
+    WITH grams AS (
+        SELECT unnest(_fts_trigrams(query)) AS gram
+    ),
+    shared AS (
+        SELECT t.id, count(*) AS n
+        FROM fts.trigrams t
+        JOIN grams g ON g.gram = t.gram
+        GROUP BY t.id
+    ),
+    scored AS (
+        SELECT
+            c.id,
+            c.file_path,
+            c.start_line,
+            c.end_line,
+            c.name,
+            c.text,
+            s.n / (len(_fts_trigrams(query)) + len(_fts_trigrams(c.name)) - s.n)
+                AS similarity
+        FROM shared s
+        JOIN fts.content c ON c.id = s.id
+        WHERE file_pattern IS NULL
+           OR _glob_match(c.file_path, resolve(file_pattern))
+    )
+    SELECT *
+    FROM scored
+    WHERE similarity >= min_similarity
+    ORDER BY similarity DESC, id
+    LIMIT limit_n;
+
+-- fts_snippet: The part of `text` that best matches `query` — a window
+-- of `width` words placed to hold the most query-term hits, with those
+-- hits centred and wrapped in `mark` ('' for none). Words are compared
+-- with the content index's tokenizer and stemmer, so 'connections'
+-- marks for a query of 'connection'; stopwords never mark. Falls back to
+-- the first `width` words when nothing matches. '…' marks cut text.
+--
+-- Term positions are not stored in the index (it would add a row per
+-- token of the corpus); they are recomputed here, for the handful of
+-- rows a search returns. Apply it to search results, not to
+-- fts.content at large.
+--
+-- Examples:
+--   SELECT name, fts_snippet(text, 'retry backoff') FROM search_code('retry backoff');
+--   SELECT fts_snippet(text, 'sandbox', width := 8, mark := '') FROM search_docs('sandbox');
+CREATE OR REPLACE MACRO fts_snippet(text, query, width := 16, mark := '**') AS (
+    WITH terms AS (
+        SELECT coalesce(list(d.term), []) AS terms
+        FROM fts_fts_content.dict d
+        WHERE d.term IN (
+            SELECT stem(unnest(fts_fts_content.tokenize(query)), 'porter')
+        )
+    ),
+    words AS (
+        SELECT
+            w.words,
+            list_transform(w.words, x ->
+                CASE WHEN len(list_intersect(
+                    list_transform(
+                        fts_fts_content.tokenize(concat_ws(' ', x, _fts_subtokens(x))),
+                        t -> stem(t, 'porter')),
+                    terms.terms)) > 0 THEN 1 ELSE 0 END
+            ) AS hits
+        FROM (SELECT string_split_regex(trim(text), '\s+') AS words) w, terms
+    ),
+    best AS (
+        SELECT
+            words,
+            hits,
+            list_position(
+                windows,
+                list_max(windows)
+            ) AS start
+        FROM (
+            SELECT words, hits,
+                   list_transform(
+                       range(1, greatest(len(words) - width + 1, 1) + 1),
+                       i -> list_sum(hits[i:i + width - 1])
+                   ) AS windows
+            FROM words
+        )
+    ),
+    span AS (
+        SELECT
+            words,
+            hits,
+            start,
+            start - 1 + list_position(hits[start:start + width - 1], 1) AS first_hit,
+            start - 1 + len(hits[start:start + width - 1])
+              - list_position(list_reverse(hits[start:start + width - 1]), 1) + 1
+              AS last_hit
+        FROM best
+    ),
+    centred AS (
+        SELECT
+            words,
+            hits,
+            CASE WHEN first_hit IS NULL THEN 1
+                 ELSE greatest(1, least(
+                     first_hit - (width - (last_hit - first_hit + 1)) // 2,
+                     len(words) - width + 1))
+            END AS start
+        FROM span
+    )
+    SELECT
+        CASE WHEN start > 1 THEN '… ' ELSE '' END
+        || array_to_string(list_transform(
+               range(start, least(start + width, len(words) + 1)),
+               i -> CASE WHEN hits[i] = 1
+                         THEN regexp_replace(words[i], '^(\W*)(.*?)(\W*)$',
+                                             '\1' || mark || '\2' || mark || '\3')
+                         ELSE words[i] END
+           ), ' ')
+        || CASE WHEN start + width <= len(words) THEN ' …' ELSE '' END
+    FROM centred
+);
+
 -- find_code_ranked: Structural search (via ast_select) with BM25 relevance
 -- ranking layered on top. Pass a structural selector AND a BM25 query;
 -- results are joined against fts.content on (file_path, ordinal=node_id)
@@ -152,6 +614,12 @@ CREATE OR REPLACE MACRO search_code(query, filter_kind := NULL, limit_n := 20) A
 -- — find_code alone returns everything unranked; search_code alone has
 -- no structural filter; this combination gives you both.
 --
+-- Scores come from _fts_scores (candidate postings, not match_bm25 per
+-- joined row). The macro still parses every file matching
+-- file_pattern; Connection.find_code_ranked first asks the index which
+-- files contain a query term (_fts_code_files) and, when that is a small
+-- share of the pattern, runs ast_select on those files only.
+--
 -- Only returns rows that appear in fts.content (definition, comment, or
 -- string). Selectors matching other kinds (.loop, .if, .call) will have
 -- no join partners and return nothing. Requires rebuild_fts() first.
@@ -177,12 +645,20 @@ CREATE OR REPLACE MACRO find_code_ranked(
         semantic_type_to_string(a.semantic_type) AS kind,
         a.type AS node_type,
         a.peek,
-        fts_fts_content.match_bm25(c.id, fts_query) AS score
+        c.score
     FROM ast_select(file_pattern, selector, language := lang) a
-    JOIN fts.content c
+    JOIN _fts_scores(fts_query, filter_extractor := 'sitting_duck') c
         ON c.file_path = a.file_path AND c.ordinal = a.node_id
-    WHERE fts_fts_content.match_bm25(c.id, fts_query) IS NOT NULL
-    ORDER BY score DESC, a.file_path, a.start_line;
+    ORDER BY c.score DESC, a.file_path, a.start_line;
+
+-- _fts_code_files: The files matching `file_pattern` (resolved against
+-- the session root, like search_content's) with an indexed code row
+-- containing a term of `query` — the only files whose nodes
+-- find_code_ranked can return.
+CREATE OR REPLACE MACRO _fts_code_files(query, file_pattern) AS TABLE
+    SELECT DISTINCT s.file_path
+    FROM _fts_scores(query, filter_extractor := 'sitting_duck') s
+    WHERE s.file_path IN (SELECT file FROM glob(resolve(file_pattern)));
 
 -- fts_stats: Row counts per extractor/kind. Diagnostic view of what's
 -- currently in the index. Does NOT require the FTS index to exist —
@@ -1,7 +1,13 @@
 -- Fledgling: FTS Rebuild Script
 --
--- Fully rebuilds fts.content from markdown files and AST nodes, then
--- (re)creates the BM25 inverted index.
+-- Fully rebuilds fts.content from markdown files and AST nodes, records
+-- the indexed files in fts.files, then (re)creates the BM25 inverted
+-- index. Connection.refresh_fts() updates it incrementally afterwards.
+--
+-- Each code file is parsed once (_fts_code_rows classifies every node
+-- in a single read_ast pass). Connection.rebuild_fts() runs these same
+-- steps over the same macros, extracting in per-file batches to bound
+-- memory on large trees; keep the two in step.
 --
 -- Assumes sql/fts.sql has been loaded (schema + table + search macros
 -- exist) and that resolve() + session_root are set (init-fledgling-base
@@ -19,117 +25,18 @@
 SET VARIABLE fts_docs_glob = COALESCE(getvariable('fts_docs_glob'), '**/*.md');
 SET VARIABLE fts_code_glob = COALESCE(getvariable('fts_code_glob'), '**/*.py');
 
--- Wipe existing content.
+-- Wipe existing content and manifest.
 DELETE FROM fts.content;
+DELETE FROM fts.files;
 
--- Populate from all three sources in one INSERT (monotonic row_number
--- across the union gives a clean, gap-free PK).
+-- Populate from all sources in one INSERT (monotonic row_number
+-- across the union gives a clean, gap-free PK). The extractors are
+-- the _fts_*_rows macros in fts.sql.
 INSERT INTO fts.content
 WITH all_rows AS (
-    -- Markdown sections
-    SELECT
-        file_path,
-        start_line,
-        end_line,
-        'markdown'::VARCHAR     AS extractor,
-        'doc_section'::VARCHAR  AS kind,
-        title                   AS name,
-        CAST(level AS INTEGER)  AS ordinal,
-        json_object(
-            'section_id',   section_id,
-            'section_path', section_path,
-            'level',        level
-        )                       AS attrs,
-        COALESCE(title, '') || chr(10) || COALESCE(content, '') AS text
-    FROM read_markdown_sections(
-        resolve(getvariable('fts_docs_glob')),
-        include_content := true,
-        include_filepath := true
-    )
-    WHERE (title IS NOT NULL AND title != '')
-       OR (content IS NOT NULL AND content != '')
-
-    UNION ALL
-
-    -- Code definitions (functions, classes, modules) — high-signal named nodes
-    SELECT
-        file_path,
-        start_line,
-        end_line,
-        'sitting_duck'::VARCHAR AS extractor,
-        'definition'::VARCHAR   AS kind,
-        name,
-        CAST(node_id AS INTEGER) AS ordinal,
-        json_object(
-            'semantic_type', semantic_type_to_string(semantic_type),
-            'depth',         depth,
-            'parent_id',     parent_id
-        )                       AS attrs,
-        COALESCE(name, '') || ' ' || COALESCE(peek, '') AS text
-    FROM read_ast(resolve(getvariable('fts_code_glob')))
-    WHERE name IS NOT NULL
-      AND name != ''
-      AND (is_function_definition(semantic_type)
-        OR is_class_definition(semantic_type)
-        OR is_module_definition(semantic_type))
-
-    UNION ALL
-
-    -- Code comments — tree-sitter comment nodes only (not docstrings,
-    -- which are string literals in Python). See 'string' branch below.
-    SELECT
-        file_path,
-        start_line,
-        end_line,
-        'sitting_duck'::VARCHAR AS extractor,
-        'comment'::VARCHAR      AS kind,
-        NULL                    AS name,
-        CAST(node_id AS INTEGER) AS ordinal,
-        json_object(
-            'semantic_type', semantic_type_to_string(semantic_type),
-            'depth',         depth,
-            'parent_id',     parent_id
-        )                       AS attrs,
-        peek                    AS text
-    FROM read_ast(resolve(getvariable('fts_code_glob')))
-    WHERE is_comment(semantic_type)
-      AND peek IS NOT NULL
-      AND peek != ''
-
+    SELECT * FROM _fts_doc_rows(resolve(getvariable('fts_docs_glob')))
     UNION ALL
-
-    -- Code string literals — includes Python docstrings (which tree-sitter
-    -- classifies as string nodes, not comment nodes), URLs, SQL queries,
-    -- error messages, etc. Length filter (>= 8) trims trivial noise like
-    -- 'x', '/', single-char constants; meaningful short strings like 'auth'
-    -- are covered by definition names already.
-    --
-    -- is_string_literal matches both the outer string node ("foo") and the
-    -- inner string_content (foo). QUALIFY keeps the longest peek per
-    -- (file, line span), which is the outer — preserves quoting context
-    -- and avoids duplicate hits for the same literal.
-    SELECT
-        file_path,
-        start_line,
-        end_line,
-        'sitting_duck'::VARCHAR AS extractor,
-        'string'::VARCHAR       AS kind,
-        NULL                    AS name,
-        CAST(node_id AS INTEGER) AS ordinal,
-        json_object(
-            'semantic_type', semantic_type_to_string(semantic_type),
-            'depth',         depth,
-            'parent_id',     parent_id
-        )                       AS attrs,
-        peek                    AS text
-    FROM read_ast(resolve(getvariable('fts_code_glob')))
-    WHERE is_string_literal(semantic_type)
-      AND peek IS NOT NULL
-      AND length(peek) >= 8
-    QUALIFY row_number() OVER (
-        PARTITION BY file_path, start_line, end_line
-        ORDER BY length(peek) DESC
-    ) = 1
+    SELECT * FROM _fts_code_rows(resolve(getvariable('fts_code_glob')))
 )
 SELECT
     row_number() OVER () AS id,
@@ -141,9 +48,26 @@ SELECT
     name,
     ordinal,
     attrs,
-    text
+    text,
+    subtokens
 FROM all_rows;
 
+-- Name trigrams for search_symbols.
+DELETE FROM fts.trigrams;
+INSERT INTO fts.trigrams SELECT * FROM _fts_trigram_rows();
+
+-- Record what was indexed, for incremental refresh (fts_stale).
+INSERT INTO fts.files
+SELECT * FROM _fts_fingerprints(
+    resolve(getvariable('fts_docs_glob')),
+    resolve(getvariable('fts_code_glob'))
+);
+
 -- (Re)create BM25 index. overwrite = 1 replaces any existing index
 -- with the same target, so this works for both first-build and rebuild.
-PRAGMA create_fts_index('fts.content', 'id', 'text', overwrite = 1);
+PRAGMA create_fts_index('fts.content', 'id', 'text', 'subtokens', overwrite = 1);
+
+-- Note the rebuild in the collection catalog.
+INSERT INTO fts.collections (name, created_at, rebuilt_at)
+VALUES ('content', current_timestamp, current_timestamp)
+ON CONFLICT (name) DO UPDATE SET rebuilt_at = excluded.rebuilt_at;
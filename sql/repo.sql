@@ -106,7 +106,13 @@ CREATE OR REPLACE MACRO file_changes(from_rev, to_rev, repo := '.') AS TABLE
     ORDER BY file_path;
 
 -- file_diff: Line-level diff for a specific file between two revisions.
--- Parses diff content lines from read_git_diff into typed rows.
+-- Parses diff content lines from read_git_diff into typed rows. Hunk
+-- headers (`@@ -a,b +c,d @@`) number the hunks and anchor old_line /
+-- new_line; old_line is NULL for added lines, new_line for removed ones.
+-- Output without hunk headers is passed through with NULL positions.
+--
+-- fledgling.Connection overrides this macro with a difflib engine whose
+-- results are cached per blob pair (fledgling/git/linediff.py).
 --
 -- Examples:
 --   SELECT * FROM file_diff('README.md', 'HEAD~1', 'HEAD');
@@ -120,19 +126,56 @@ CREATE OR REPLACE MACRO file_diff(file, from_rev, to_rev, repo := '.') AS TABLE
         )
     ),
     lines AS (
-        SELECT unnest(string_split(diff_text, chr(10))) AS line
-        FROM raw_diff
+        SELECT generate_subscripts(parts, 1) AS idx, unnest(parts) AS line
+        FROM (SELECT string_split(diff_text, chr(10)) AS parts FROM raw_diff)
+    ),
+    marked AS (
+        SELECT
+            idx,
+            line,
+            starts_with(line, '@@') AS is_header,
+            count(*) FILTER (WHERE starts_with(line, '@@'))
+                OVER (ORDER BY idx) AS hunk,
+            CASE
+                WHEN starts_with(line, '+') THEN 'ADDED'
+                WHEN starts_with(line, '-') THEN 'REMOVED'
+                ELSE 'CONTEXT'
+            END AS line_type
+        FROM lines
+        WHERE length(line) > 0
+    ),
+    positioned AS (
+        SELECT
+            *,
+            max(hunk) OVER () AS hunks,
+            max(CASE WHEN is_header
+                     THEN TRY_CAST(regexp_extract(line, '^@@ -(\d+)', 1) AS INTEGER)
+                END) OVER (PARTITION BY hunk) AS old_start,
+            max(CASE WHEN is_header
+                     THEN TRY_CAST(regexp_extract(line, '^@@ -\d+(?:,\d+)? \+(\d+)', 1) AS INTEGER)
+                END) OVER (PARTITION BY hunk) AS new_start,
+            count(*) FILTER (WHERE NOT is_header AND line_type != 'ADDED') OVER (
+                PARTITION BY hunk ORDER BY idx
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ) AS old_offset,
+            count(*) FILTER (WHERE NOT is_header AND line_type != 'REMOVED') OVER (
+                PARTITION BY hunk ORDER BY idx
+                ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            ) AS new_offset
+        FROM marked
     )
     SELECT
-        row_number() OVER () AS seq,
-        CASE
-            WHEN starts_with(line, '+') THEN 'ADDED'
-            WHEN starts_with(line, '-') THEN 'REMOVED'
-            ELSE 'CONTEXT'
-        END AS line_type,
-        line[2:] AS content
-    FROM lines
-    WHERE length(line) > 0;
+        row_number() OVER (ORDER BY idx) AS seq,
+        line_type,
+        line[2:] AS content,
+        CASE WHEN hunks > 0 THEN hunk END AS hunk,
+        CASE WHEN hunks > 0 AND line_type != 'ADDED'
+             THEN old_start + old_offset END AS old_line,
+        CASE WHEN hunks > 0 AND line_type != 'REMOVED'
+             THEN new_start + new_offset END AS new_line
+    FROM positioned
+    WHERE hunks = 0 OR (hunk > 0 AND NOT is_header)
+    ORDER BY idx;
 
 -- file_diff_text: Unified diff format for file_diff results.
 -- Prefixes each line with +/- /space. Used by GitDiffFile tool publication.
@@ -147,6 +190,10 @@ CREATE OR REPLACE MACRO file_diff_text(file, from_rev, to_rev, repo := '.') AS T
 -- content modifications — only structural changes (files present or absent).
 -- Note: gitignored files will appear as 'untracked'.
 --
+-- fledgling.Connection overrides this macro with an index-based engine
+-- (fledgling/git/status.py) that also reports 'modified' and 'added'
+-- and honours .gitignore; this macro is the DuckDB CLI fallback.
+--
 -- Examples:
 --   SELECT * FROM working_tree_status();
 --   SELECT * FROM working_tree_status('/path/to/repo');
@@ -174,3 +221,154 @@ CREATE OR REPLACE MACRO working_tree_status(repo := '.') AS TABLE
         ON t.file_path = d.file_path
     WHERE t.file_path IS NULL OR d.file_path IS NULL
     ORDER BY status, file_path;
+
+-- ── Blame cache ───────────────────────────────────────────────────
+--
+-- Per-line origins keyed by (path, commit_sha): the blame of `path` as
+-- of `commit_sha`, the latest commit at or before the requested revision
+-- that touched the file. The path is part of the key because identical
+-- content at two paths has two histories; blob_hash records the content
+-- the origins belong to. Populated by the Python blame engine
+-- (fledgling/git/blame.py), which computes each revision from its
+-- parents' cached blame plus one line diff instead of re-walking
+-- history. Persistence follows the database, like fts.content.
+--
+--   blame_cache.blames   — one row per computed (path, commit)
+--   blame_cache.lines    — origin commit and line for each line
+--   blame_cache.commits  — author metadata for origin commits
+
+CREATE SCHEMA IF NOT EXISTS blame_cache;
+
+CREATE TABLE IF NOT EXISTS blame_cache.blames (
+    path        VARCHAR,
+    commit_sha  VARCHAR,
+    blob_hash   VARCHAR,
+    line_count  INTEGER,
+    computed_at TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (path, commit_sha)
+);
+
+CREATE TABLE IF NOT EXISTS blame_cache.lines (
+    path          VARCHAR,
+    commit_sha    VARCHAR,
+    line_number   INTEGER,
+    origin_commit VARCHAR,
+    origin_line   INTEGER,
+    PRIMARY KEY (path, commit_sha, line_number)
+);
+
+CREATE TABLE IF NOT EXISTS blame_cache.commits (
+    commit_sha   VARCHAR PRIMARY KEY,
+    author_name  VARCHAR,
+    author_email VARCHAR,
+    author_time  TIMESTAMP,
+    summary      VARCHAR
+);
+
+-- _file_blame_for: Blame rows for file text `blame_text` from the cached
+-- blame of (blame_path, blame_commit). Lines without a cached origin
+-- have NULL hash/author/date.
+CREATE OR REPLACE MACRO _file_blame_for(blame_path, blame_commit, blame_text) AS TABLE
+    WITH src AS (
+        SELECT
+            generate_subscripts(parts, 1) AS line_number,
+            unnest(parts) AS content
+        FROM (
+            SELECT string_split(regexp_replace(blame_text, '\n$', ''), chr(10)) AS parts
+            WHERE blame_text IS NOT NULL AND blame_text != ''
+        )
+    )
+    SELECT
+        s.line_number,
+        l.origin_commit[:8] AS hash,
+        c.author_name AS author,
+        c.author_time AS date,
+        l.origin_line AS original_line,
+        s.content
+    FROM src s
+    LEFT JOIN blame_cache.lines l
+        ON l.path = blame_path
+       AND l.commit_sha = blame_commit
+       AND l.line_number = s.line_number
+    LEFT JOIN blame_cache.commits c
+        ON c.commit_sha = l.origin_commit
+    ORDER BY s.line_number;
+
+-- file_blame: Per-line origin (commit, author, date) of a file at a
+-- revision. Replaces `git blame`.
+--
+-- fledgling.Connection overrides this macro with the incremental blame
+-- engine, which fills blame_cache as needed. Called directly in SQL
+-- (DuckDB CLI), it reads whatever blame_cache holds for the file's path
+-- and blob, and leaves origins NULL when nothing has been computed.
+--
+-- Examples:
+--   SELECT * FROM file_blame('src/main.py');
+--   SELECT * FROM file_blame('README.md', 'v1.0');
+CREATE OR REPLACE MACRO file_blame(file, rev := 'HEAD', repo := '.') AS TABLE
+    SELECT * FROM _file_blame_for(
+        file,
+        (SELECT max_by(b.commit_sha, b.computed_at)
+         FROM blame_cache.blames b
+         WHERE b.path = file
+           AND b.blob_hash = (SELECT blob_hash FROM git_tree(repo, rev) WHERE file_path = file)),
+        (SELECT text FROM git_read(git_uri(repo, file, rev)))
+    );
+
+-- ── Diff cache ────────────────────────────────────────────────────
+--
+-- Added/removed line counts per (old_blob, new_blob) pair. A diff is a
+-- pure function of its two blobs, so entries never go stale. Populated
+-- by fledgling.Connection.file_diff_stats from the line-diff engine
+-- (fledgling/git/linediff.py); absent sides are the empty blob.
+
+CREATE SCHEMA IF NOT EXISTS diff_cache;
+
+CREATE TABLE IF NOT EXISTS diff_cache.stats (
+    old_blob      VARCHAR,
+    new_blob      VARCHAR,
+    lines_added   INTEGER,
+    lines_removed INTEGER,
+    is_binary     BOOLEAN,
+    PRIMARY KEY (old_blob, new_blob)
+);
+
+-- file_diff_stats: Per-file added/removed line counts between two
+-- revisions. Replaces `git diff --numstat`.
+--
+-- fledgling.Connection overrides this macro: counts come from the
+-- cached line-diff engine and are stored in diff_cache.stats. Called
+-- directly in SQL (DuckDB CLI), it lists the changed files with the
+-- counts diff_cache already holds (NULL otherwise).
+--
+-- Examples:
+--   SELECT * FROM file_diff_stats('HEAD~1', 'HEAD');
+--   SELECT * FROM file_diff_stats('main', 'feature', '/path/to/repo');
+CREATE OR REPLACE MACRO file_diff_stats(from_rev, to_rev, repo := '.') AS TABLE
+    WITH changes AS (
+        SELECT
+            COALESCE(a.file_path, b.file_path) AS file_path,
+            CASE
+                WHEN a.file_path IS NULL THEN 'added'
+                WHEN b.file_path IS NULL THEN 'deleted'
+                ELSE 'modified'
+            END AS status,
+            COALESCE(a.blob_hash, 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391') AS old_blob,
+            COALESCE(b.blob_hash, 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391') AS new_blob
+        FROM git_tree(repo, from_rev) a
+        FULL OUTER JOIN git_tree(repo, to_rev) b
+            ON a.file_path = b.file_path
+        WHERE a.file_path IS NULL
+           OR b.file_path IS NULL
+           OR a.blob_hash != b.blob_hash
+    )
+    SELECT
+        c.file_path,
+        c.status,
+        s.lines_added,
+        s.lines_removed,
+        s.is_binary
+    FROM changes c
+    LEFT JOIN diff_cache.stats s
+        ON s.old_blob = c.old_blob AND s.new_blob = c.new_blob
+    ORDER BY c.file_path;
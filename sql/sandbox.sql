@@ -12,6 +12,9 @@
 --   _session_root() — returns the bare session root literal. Use in tool
 --                      templates that need the root path directly.
 --
+-- Also defines _glob_match(path, pattern) for matching glob patterns
+-- against stored paths (see below).
+--
 -- resolve() is defined here. _resolve() and _session_root() must be created
 -- BEFORE this file loads, with the session root baked into the macro body:
 --   - bin/fledgling creates them via duckdb -cmd (bash variable expansion)
@@ -54,3 +57,30 @@ CREATE OR REPLACE MACRO resolve(p) AS
          WHEN p[1] = '/' THEN p
          ELSE getvariable('session_root') || '/' || p
     END;
+
+-- _glob_regex / _glob_match: read_ast/glob() pattern matching on path
+-- strings, for filtering paths that come from tables or git trees rather
+-- than the filesystem. Same semantics as fledgling.git.pathspec.glob_match:
+-- '*' and '?' stay within one segment, '**/' matches zero or more leading
+-- directories, '**' anything, '[...]' / '[!...]' character classes. A
+-- leading './' on the pattern is ignored. Match is anchored at both ends.
+--
+-- Examples:
+--   _glob_match('src/a/test_b.py', 'src/**/test_*.py')  -- true
+--   _glob_match('src/test_b.py', 'src/**/test_*.py')    -- true
+--   _glob_match('src/a/b.py', 'src/*.py')               -- false
+CREATE OR REPLACE MACRO _glob_regex(pattern) AS
+    replace(replace(replace(replace(replace(replace(replace(
+        regexp_replace(
+            regexp_replace(pattern, '^\./', ''),
+            '([.+^$(){}|\\])', '\\\1', 'g'),
+        '[!', '[^'),
+        '**/', chr(1)),
+        '**', chr(2)),
+        '*', '[^/]*'),
+        '?', '[^/]'),
+        chr(1), '(.*/)?'),
+        chr(2), '.*');
+
+CREATE OR REPLACE MACRO _glob_match(path, pattern) AS
+    regexp_full_match(path, _glob_regex(pattern));
@@ -3,22 +3,179 @@
 -- Cross-tier macros combining AST analysis with git repository state.
 -- Must load AFTER both sitting_duck and duck_tails extensions.
 
--- structural_diff: Compare definitions between two revisions of a file.
--- Shows which functions/classes were added, removed, or modified, with
--- complexity change signals (descendant_count, children_count).
---
--- Uses read_ast with git:// URIs to parse both revisions. Identity is
--- (name, semantic_type) — line number shifts from unrelated edits do not
--- count as modifications. Change detection uses descendant_count and
--- children_count from the AST, which reflect structural complexity
--- independent of formatting.
+-- ── AST cache ─────────────────────────────────────────────────────
 --
--- Requires: sitting_duck with git:// URI support (sitting_duck#48).
+-- Definition summaries keyed by git blob hash. A blob's content never
+-- changes, so a summary parsed once serves every revision with the
+-- same content. Only git blobs are cached; working-tree files are parsed
+-- directly. Populated by the Python
+-- AstCache (fledgling/git/astcache.py); like fts.content, persistence
+-- follows the database: in-memory connections get a session cache.
 --
--- Examples:
---   SELECT * FROM structural_diff('src/main.py', 'HEAD~1', 'HEAD');
---   SELECT * FROM structural_diff('lib/parser.py', 'main', 'feature-branch');
-CREATE OR REPLACE MACRO structural_diff(file, from_rev, to_rev, repo := '.') AS TABLE
+--   ast_cache.blobs        — one row per parsed blob (including blobs
+--                            with no definitions, so they aren't reparsed)
+--   ast_cache.definitions  — _ast_definitions rows per blob, plus
+--                            body_hash: a whitespace- and comment-
+--                            insensitive token hash of the definition
+--                            with its own name masked
+--                            (fledgling/git/bodyhash.py)
+
+CREATE SCHEMA IF NOT EXISTS ast_cache;
+
+CREATE TABLE IF NOT EXISTS ast_cache.blobs (
+    blob_hash  VARCHAR PRIMARY KEY,
+    language   VARCHAR,
+    parsed_at  TIMESTAMP DEFAULT current_timestamp
+);
+
+CREATE TABLE IF NOT EXISTS ast_cache.definitions (
+    blob_hash        VARCHAR,
+    node_id          BIGINT,
+    name             VARCHAR,
+    kind             VARCHAR,
+    start_line       INTEGER,
+    end_line         INTEGER,
+    descendant_count BIGINT,
+    children_count   BIGINT,
+    cyclomatic       INTEGER,
+    body_hash        VARCHAR
+);
+
+-- _ast_definitions: Definition summary of in-memory source content.
+-- Same definition filter and cyclomatic calculation as
+-- changed_function_summary; cyclomatic is 0 for non-function definitions.
+CREATE OR REPLACE MACRO _ast_definitions(content, language) AS TABLE
+    WITH ast AS (
+        SELECT * FROM parse_ast(content, language)
+    ),
+    defs AS (
+        SELECT
+            name,
+            node_id,
+            semantic_type,
+            start_line,
+            end_line,
+            descendant_count,
+            children_count
+        FROM ast
+        WHERE is_definition(semantic_type)
+          AND depth <= 2
+          AND name != ''
+    ),
+    func_complexity AS (
+        SELECT
+            d.node_id,
+            count(CASE WHEN is_conditional(n.semantic_type)
+                AND (n.type LIKE '%_statement' OR n.type LIKE '%_clause'
+                     OR n.type LIKE '%_expression' OR n.type LIKE '%_arm'
+                     OR n.type LIKE '%_case' OR n.type LIKE '%_branch')
+                THEN 1 END) AS conditionals,
+            count(CASE WHEN is_loop(n.semantic_type)
+                AND (n.type LIKE '%_statement' OR n.type LIKE '%_expression'
+                     OR n.type LIKE '%_loop')
+                THEN 1 END) AS loops
+        FROM defs d
+        JOIN ast n ON n.node_id > d.node_id
+                  AND n.node_id <= d.node_id + d.descendant_count
+        WHERE is_function_definition(d.semantic_type)
+        GROUP BY d.node_id
+    )
+    SELECT
+        d.node_id,
+        d.name,
+        semantic_type_to_string(d.semantic_type) AS kind,
+        d.start_line,
+        d.end_line,
+        d.descendant_count,
+        d.children_count,
+        CASE WHEN is_function_definition(d.semantic_type)
+             THEN COALESCE(fc.conditionals + fc.loops + 1, 1)
+             ELSE 0 END AS cyclomatic
+    FROM defs d
+    LEFT JOIN func_complexity fc ON d.node_id = fc.node_id;
+
+-- _structural_diff_blobs: structural_diff between two cached blobs.
+-- Both blobs must already be in ast_cache (AstCache.ensure_blob).
+-- Identity is (name, kind), which is semantic_type as a string. A
+-- definition is modified when its body_hash differs (node counts are the
+-- fallback for rows cached without a hash). An added and a removed
+-- definition of the same kind with the same body_hash — and no other
+-- candidate sharing it — are one definition renamed: reported once as
+-- 'renamed', with old_name set.
+CREATE OR REPLACE MACRO _structural_diff_blobs(from_blob, to_blob) AS TABLE
+    WITH from_defs AS (
+        SELECT name, kind, end_line - start_line + 1 AS line_count,
+               descendant_count, children_count, body_hash
+        FROM ast_cache.definitions
+        WHERE blob_hash = from_blob
+    ),
+    to_defs AS (
+        SELECT name, kind, end_line - start_line + 1 AS line_count,
+               descendant_count, children_count, body_hash
+        FROM ast_cache.definitions
+        WHERE blob_hash = to_blob
+    ),
+    joined AS (
+        SELECT
+            COALESCE(t.name, f.name) AS name,
+            COALESCE(t.kind, f.kind) AS kind,
+            CASE
+                WHEN f.name IS NULL THEN 'added'
+                WHEN t.name IS NULL THEN 'removed'
+                WHEN t.body_hash IS NOT NULL AND f.body_hash IS NOT NULL
+                    THEN CASE WHEN t.body_hash != f.body_hash
+                              THEN 'modified' ELSE 'unchanged' END
+                WHEN t.descendant_count != f.descendant_count
+                  OR t.children_count != f.children_count THEN 'modified'
+                ELSE 'unchanged'
+            END AS change,
+            f.line_count AS old_lines,
+            t.line_count AS new_lines,
+            f.descendant_count AS old_complexity,
+            t.descendant_count AS new_complexity,
+            f.body_hash AS old_hash,
+            t.body_hash AS new_hash
+        FROM to_defs t
+        FULL OUTER JOIN from_defs f
+            ON t.name = f.name AND t.kind = f.kind
+    ),
+    renamed AS (
+        SELECT a.name, a.kind, r.name AS old_name,
+               r.old_lines, a.new_lines, r.old_complexity, a.new_complexity
+        FROM joined a
+        JOIN joined r
+            ON a.change = 'added' AND r.change = 'removed'
+           AND a.kind = r.kind AND a.new_hash = r.old_hash
+        QUALIFY count(*) OVER (PARTITION BY a.kind, a.new_hash) = 1
+    )
+    SELECT
+        name, kind, change, old_lines, new_lines, old_complexity, new_complexity,
+        COALESCE(new_complexity::INT, 0)
+            - COALESCE(old_complexity::INT, 0) AS complexity_delta,
+        old_name
+    FROM (
+        SELECT j.name, j.kind, j.change, j.old_lines, j.new_lines,
+               j.old_complexity, j.new_complexity, NULL::VARCHAR AS old_name
+        FROM joined j
+        WHERE j.change != 'unchanged'
+          AND NOT EXISTS (
+              SELECT 1 FROM renamed x
+              WHERE x.kind = j.kind
+                AND ((j.change = 'added' AND x.name = j.name)
+                  OR (j.change = 'removed' AND x.old_name = j.name))
+          )
+        UNION ALL
+        SELECT name, kind, 'renamed', old_lines, new_lines,
+               old_complexity, new_complexity, old_name
+        FROM renamed
+    )
+    ORDER BY change, name;
+
+-- _structural_diff_for: structural_diff between two readable sources
+-- (paths or git:// URIs). fledgling.Connection passes paths of blobs
+-- materialized by its blob cache (fledgling/git/blobcache.py), so a blob
+-- already read by another call is not fetched from git again.
+CREATE OR REPLACE MACRO _structural_diff_for(from_source, to_source) AS TABLE
     WITH from_defs AS (
         SELECT
             name,
@@ -27,7 +184,7 @@ CREATE OR REPLACE MACRO structural_diff(file, from_rev, to_rev, repo := '.') AS
             end_line - start_line + 1 AS line_count,
             descendant_count,
             children_count
-        FROM read_ast(git_uri(repo, file, from_rev))
+        FROM read_ast(from_source)
         WHERE is_definition(semantic_type)
           AND depth <= 2
           AND name != ''
@@ -40,7 +197,7 @@ CREATE OR REPLACE MACRO structural_diff(file, from_rev, to_rev, repo := '.') AS
             end_line - start_line + 1 AS line_count,
             descendant_count,
             children_count
-        FROM read_ast(git_uri(repo, file, to_rev))
+        FROM read_ast(to_source)
         WHERE is_definition(semantic_type)
           AND depth <= 2
           AND name != ''
@@ -60,34 +217,172 @@ CREATE OR REPLACE MACRO structural_diff(file, from_rev, to_rev, repo := '.') AS
         f.descendant_count AS old_complexity,
         t.descendant_count AS new_complexity,
         COALESCE(t.descendant_count::INT, 0)
-            - COALESCE(f.descendant_count::INT, 0) AS complexity_delta
+            - COALESCE(f.descendant_count::INT, 0) AS complexity_delta,
+        NULL::VARCHAR AS old_name
     FROM to_defs t
     FULL OUTER JOIN from_defs f
         ON t.name = f.name AND t.semantic_type = f.semantic_type
     WHERE change != 'unchanged'
     ORDER BY change, name;
 
--- changed_function_summary: Functions in files that changed between two revisions,
--- with complexity metrics. Answers "what functions should I review for this change?"
+-- structural_diff: Compare definitions between two revisions of a file.
+-- Shows which functions/classes were added, removed, or modified, with
+-- complexity change signals (descendant_count, children_count).
 --
--- Uses file_changes (duck_tails) to identify modified/added files, then
--- read_ast to parse their current content and extract function metrics.
--- Sorted by cyclomatic complexity so the riskiest functions surface first.
+-- Uses read_ast with git:// URIs to parse both revisions. Identity is
+-- (name, semantic_type) — line number shifts from unrelated edits do not
+-- count as modifications. Change detection uses descendant_count and
+-- children_count from the AST, which reflect structural complexity
+-- independent of formatting. fledgling.Connection overrides this with
+-- _structural_diff_blobs, which compares normalized body hashes (catching
+-- same-shape edits) and reports renames; here old_name is always NULL.
 --
--- Unlike structural_diff (which shows what changed within a function),
--- this shows all functions in changed files — a broader review surface.
+-- Requires: sitting_duck with git:// URI support (sitting_duck#48).
 --
--- The file_pattern parameter scopes which files to AST-parse (e.g. '**/*.py').
--- Only files matching BOTH the pattern AND the changed file list are included.
+-- Examples:
+--   SELECT * FROM structural_diff('src/main.py', 'HEAD~1', 'HEAD');
+--   SELECT * FROM structural_diff('lib/parser.py', 'main', 'feature-branch');
+CREATE OR REPLACE MACRO structural_diff(file, from_rev, to_rev, repo := '.') AS TABLE
+    SELECT * FROM _structural_diff_for(
+        git_uri(repo, file, from_rev),
+        git_uri(repo, file, to_rev)
+    );
+
+-- _structural_diff_range_for: structural_diff over many files at once.
+-- `pairs` is a list of {file_path, from_blob, to_blob} structs; every blob
+-- must already be in ast_cache. A side that doesn't exist uses the empty
+-- blob (e69de29...), which has no definitions. Change detection and
+-- rename pairing follow _structural_diff_blobs, across files: an
+-- unchanged body that changed file keeps its name ('moved') or not
+-- ('renamed'); old_file_path and old_name point at its previous place.
+CREATE OR REPLACE MACRO _structural_diff_range_for(pairs) AS TABLE
+    WITH p AS (
+        SELECT x.file_path, x.from_blob, x.to_blob
+        FROM (
+            SELECT unnest(CAST(pairs AS STRUCT(
+                file_path VARCHAR, from_blob VARCHAR, to_blob VARCHAR
+            )[])) AS x
+        )
+    ),
+    from_defs AS (
+        SELECT p.file_path, d.name, d.kind,
+               d.end_line - d.start_line + 1 AS line_count,
+               d.descendant_count, d.children_count, d.body_hash
+        FROM p JOIN ast_cache.definitions d ON d.blob_hash = p.from_blob
+    ),
+    to_defs AS (
+        SELECT p.file_path, d.name, d.kind,
+               d.end_line - d.start_line + 1 AS line_count,
+               d.descendant_count, d.children_count, d.body_hash
+        FROM p JOIN ast_cache.definitions d ON d.blob_hash = p.to_blob
+    ),
+    joined AS (
+        SELECT
+            COALESCE(t.file_path, f.file_path) AS file_path,
+            COALESCE(t.name, f.name) AS name,
+            COALESCE(t.kind, f.kind) AS kind,
+            CASE
+                WHEN f.name IS NULL THEN 'added'
+                WHEN t.name IS NULL THEN 'removed'
+                WHEN t.body_hash IS NOT NULL AND f.body_hash IS NOT NULL
+                    THEN CASE WHEN t.body_hash != f.body_hash
+                              THEN 'modified' ELSE 'unchanged' END
+                WHEN t.descendant_count != f.descendant_count
+                  OR t.children_count != f.children_count THEN 'modified'
+                ELSE 'unchanged'
+            END AS change,
+            f.line_count AS old_lines,
+            t.line_count AS new_lines,
+            f.descendant_count AS old_complexity,
+            t.descendant_count AS new_complexity,
+            f.body_hash AS old_hash,
+            t.body_hash AS new_hash
+        FROM to_defs t
+        FULL OUTER JOIN from_defs f
+            ON t.file_path = f.file_path AND t.name = f.name AND t.kind = f.kind
+    ),
+    renamed AS (
+        SELECT a.file_path, a.name, a.kind,
+               r.file_path AS old_file_path, r.name AS old_name,
+               r.old_lines, a.new_lines, r.old_complexity, a.new_complexity
+        FROM joined a
+        JOIN joined r
+            ON a.change = 'added' AND r.change = 'removed'
+           AND a.kind = r.kind AND a.new_hash = r.old_hash
+        QUALIFY count(*) OVER (PARTITION BY a.kind, a.new_hash) = 1
+    )
+    SELECT
+        file_path, name, kind, change, old_lines, new_lines,
+        old_complexity, new_complexity,
+        COALESCE(new_complexity::INT, 0)
+            - COALESCE(old_complexity::INT, 0) AS complexity_delta,
+        old_file_path, old_name
+    FROM (
+        SELECT j.file_path, j.name, j.kind, j.change, j.old_lines, j.new_lines,
+               j.old_complexity, j.new_complexity,
+               NULL::VARCHAR AS old_file_path, NULL::VARCHAR AS old_name
+        FROM joined j
+        WHERE j.change != 'unchanged'
+          AND NOT EXISTS (
+              SELECT 1 FROM renamed x
+              WHERE x.kind = j.kind
+                AND ((j.change = 'added'
+                      AND x.file_path = j.file_path AND x.name = j.name)
+                  OR (j.change = 'removed'
+                      AND x.old_file_path = j.file_path AND x.old_name = j.name))
+          )
+        UNION ALL
+        SELECT file_path, name, kind,
+               CASE WHEN name = old_name THEN 'moved' ELSE 'renamed' END,
+               old_lines, new_lines, old_complexity, new_complexity,
+               old_file_path, old_name
+        FROM renamed
+    )
+    ORDER BY file_path, change, name;
+
+-- structural_diff_range: structural_diff for every changed file in a
+-- revision range, in one result. file_pattern scopes the files
+-- (e.g. '**/*.py').
+--
+-- fledgling.Connection overrides this macro: it takes the changed-file
+-- set from the tree-diff engine and parses the distinct before/after
+-- blobs in parallel into ast_cache before querying. Called directly in
+-- SQL (DuckDB CLI), blob pairs come from git_tree but only blobs already
+-- present in ast_cache contribute definitions — SQL cannot parse one
+-- blob per row (table-function arguments must be constants).
 --
 -- Examples:
---   SELECT * FROM changed_function_summary('HEAD~1', 'HEAD', '**/*.py');
---   SELECT * FROM changed_function_summary('main', 'feature', 'src/**/*.py');
-CREATE OR REPLACE MACRO changed_function_summary(from_rev, to_rev, file_pattern, repo := '.') AS TABLE
+--   SELECT * FROM structural_diff_range('HEAD~5', 'HEAD', '**/*.py');
+--   SELECT * FROM structural_diff_range('main', 'feature', 'src/**/*.ts');
+CREATE OR REPLACE MACRO structural_diff_range(from_rev, to_rev, file_pattern, repo := '.') AS TABLE
+    SELECT * FROM _structural_diff_range_for(
+        (SELECT list({
+            file_path: COALESCE(b.file_path, a.file_path),
+            from_blob: COALESCE(a.blob_hash, 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'),
+            to_blob: COALESCE(b.blob_hash, 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391')
+        })
+        FROM git_tree(repo, from_rev) a
+        FULL OUTER JOIN git_tree(repo, to_rev) b
+            ON a.file_path = b.file_path
+        WHERE (a.blob_hash IS DISTINCT FROM b.blob_hash)
+          AND _glob_match(COALESCE(b.file_path, a.file_path), file_pattern))
+    );
+
+-- _changed_function_summary_for: changed_function_summary over an explicit
+-- change list instead of a revision pair. `changes` is a list of
+-- {file_path, status, old_size, new_size} structs — the file_changes row
+-- shape. fledgling.Connection computes the list with the tree-diff engine
+-- (fledgling/git/treediff.py) and passes it here as a literal; the public
+-- macro below passes the file_changes result as a scalar subquery.
+CREATE OR REPLACE MACRO _changed_function_summary_for(changes, file_pattern) AS TABLE
     WITH changed AS (
-        SELECT file_path, status
-        FROM file_changes(from_rev, to_rev, repo)
-        WHERE status IN ('added', 'modified')
+        SELECT c.file_path, c.status
+        FROM (
+            SELECT unnest(CAST(changes AS STRUCT(
+                file_path VARCHAR, status VARCHAR, old_size BIGINT, new_size BIGINT
+            )[])) AS c
+        )
+        WHERE c.status IN ('added', 'modified')
     ),
     ast AS (
         SELECT * FROM read_ast(file_pattern)
@@ -145,3 +440,191 @@ CREATE OR REPLACE MACRO changed_function_summary(from_rev, to_rev, file_pattern,
                    OR d.file_path = c.file_path
     LEFT JOIN func_complexity fc ON d.node_id = fc.node_id
     ORDER BY cyclomatic DESC, d.file_path, d.start_line;
+
+-- _changed_function_summary_cached: changed_function_summary from the AST
+-- cache. `entries` is a list of {file_path, status, blob_hash} structs:
+-- the added/modified files already intersected with the file pattern,
+-- each with its blob at the target revision. fledgling.Connection parses
+-- only those blobs (once per blob, see fledgling/git/astcache.py), so the
+-- cost scales with the change rather than with the pattern's glob. Files
+-- whose language isn't mapped by extension (language_for) are not in
+-- `entries`.
+CREATE OR REPLACE MACRO _changed_function_summary_cached(entries) AS TABLE
+    WITH changed AS (
+        SELECT e.file_path, e.status, e.blob_hash
+        FROM (
+            SELECT unnest(CAST(entries AS STRUCT(
+                file_path VARCHAR, status VARCHAR, blob_hash VARCHAR
+            )[])) AS e
+        )
+    )
+    SELECT
+        c.file_path,
+        d.name,
+        d.kind,
+        d.end_line - d.start_line + 1 AS lines,
+        d.cyclomatic,
+        c.status AS change_status
+    FROM changed c
+    JOIN ast_cache.definitions d ON d.blob_hash = c.blob_hash
+    ORDER BY d.cyclomatic DESC, c.file_path, d.start_line;
+
+-- changed_function_summary: Functions in files that changed between two revisions,
+-- with complexity metrics. Answers "what functions should I review for this change?"
+--
+-- Uses file_changes (duck_tails) to identify modified/added files, then
+-- read_ast to parse their current content and extract function metrics.
+-- Sorted by cyclomatic complexity so the riskiest functions surface first.
+--
+-- Unlike structural_diff (which shows what changed within a function),
+-- this shows all functions in changed files — a broader review surface.
+--
+-- The file_pattern parameter scopes which files to AST-parse (e.g. '**/*.py').
+-- Only files matching BOTH the pattern AND the changed file list are included.
+--
+-- Examples:
+--   SELECT * FROM changed_function_summary('HEAD~1', 'HEAD', '**/*.py');
+--   SELECT * FROM changed_function_summary('main', 'feature', 'src/**/*.py');
+CREATE OR REPLACE MACRO changed_function_summary(from_rev, to_rev, file_pattern, repo := '.') AS TABLE
+    SELECT * FROM _changed_function_summary_for(
+        (SELECT list({
+            file_path: fc.file_path,
+            status: fc.status,
+            old_size: fc.old_size,
+            new_size: fc.new_size
+        }) FROM file_changes(from_rev, to_rev, repo) AS fc),
+        file_pattern
+    );
+
+-- ── Churn cache ───────────────────────────────────────────────────
+--
+-- Per-commit file touches for a (since, HEAD, file_pattern) run, written
+-- by fledgling.Connection.churn_hotspots: the history since..HEAD is
+-- walked once (tree diff + line diff per commit) and every touch is
+-- stored with the changed line ranges of the new blob. Ranking is then
+-- a join against ast_cache.definitions, so reruns for the same pair
+-- do no git work at all.
+--
+--   churn_cache.runs     — one row per computed run
+--   churn_cache.touches  — one row per (commit, file) in a run;
+--                          hunk_start/hunk_end are the changed line
+--                          ranges in blob_hash, head_blob is the file's
+--                          blob at HEAD (NULL if since deleted)
+
+CREATE SCHEMA IF NOT EXISTS churn_cache;
+
+CREATE TABLE IF NOT EXISTS churn_cache.runs (
+    since_sha    VARCHAR,
+    head_sha     VARCHAR,
+    file_pattern VARCHAR,
+    since_rev    VARCHAR,
+    commits      INTEGER,
+    computed_at  TIMESTAMP DEFAULT current_timestamp,
+    PRIMARY KEY (since_sha, head_sha, file_pattern)
+);
+
+CREATE TABLE IF NOT EXISTS churn_cache.touches (
+    since_sha     VARCHAR,
+    head_sha      VARCHAR,
+    file_pattern  VARCHAR,
+    commit_sha    VARCHAR,
+    file_path     VARCHAR,
+    blob_hash     VARCHAR,
+    head_blob     VARCHAR,
+    lines_added   INTEGER,
+    lines_removed INTEGER,
+    hunk_start    INTEGER[],
+    hunk_end      INTEGER[]
+);
+
+-- _churn_hotspots_for: Rank functions of a cached churn run by
+-- churn × complexity. A function is churned by a commit when one of the
+-- commit's changed line ranges overlaps its definition in that commit's
+-- blob; functions are matched across revisions by (file, name, kind)
+-- and reported with their HEAD line span and cyclomatic complexity.
+-- File columns aggregate every touch of the file in the run.
+CREATE OR REPLACE MACRO _churn_hotspots_for(run_since, run_head, run_pattern, n := 20) AS TABLE
+    WITH t AS (
+        SELECT *
+        FROM churn_cache.touches
+        WHERE since_sha = run_since
+          AND head_sha = run_head
+          AND file_pattern = run_pattern
+    ),
+    files AS (
+        SELECT
+            file_path,
+            any_value(head_blob) AS head_blob,
+            count(DISTINCT commit_sha) AS file_commits,
+            sum(lines_added) AS lines_added,
+            sum(lines_removed) AS lines_removed
+        FROM t
+        GROUP BY file_path
+    ),
+    hunks AS (
+        SELECT commit_sha, file_path, blob_hash,
+               unnest(hunk_start) AS lo, unnest(hunk_end) AS hi
+        FROM t
+    ),
+    touched AS (
+        SELECT DISTINCT h.commit_sha, h.file_path, d.name, d.kind
+        FROM hunks h
+        JOIN ast_cache.definitions d
+          ON d.blob_hash = h.blob_hash
+         AND d.cyclomatic > 0
+         AND d.start_line <= h.hi
+         AND d.end_line >= h.lo
+    ),
+    fn_churn AS (
+        SELECT file_path, name, kind, count(*) AS commits
+        FROM touched
+        GROUP BY file_path, name, kind
+    )
+    SELECT
+        f.file_path,
+        d.name,
+        d.kind,
+        d.start_line,
+        d.end_line,
+        d.cyclomatic,
+        c.commits AS function_commits,
+        f.file_commits,
+        f.lines_added,
+        f.lines_removed,
+        c.commits * d.cyclomatic AS risk
+    FROM files f
+    JOIN ast_cache.definitions d
+      ON d.blob_hash = f.head_blob
+     AND d.cyclomatic > 0
+    JOIN fn_churn c
+      ON c.file_path = f.file_path
+     AND c.name = d.name
+     AND c.kind = d.kind
+    ORDER BY risk DESC, function_commits DESC, f.file_path, d.start_line
+    LIMIT n;
+
+-- churn_hotspots: Functions ranked by how often they changed since a
+-- revision times their cyclomatic complexity. Answers "where is the
+-- risky code — complex and frequently edited?" (complexity_hotspots
+-- sees only the current tree).
+--
+-- fledgling.Connection overrides this macro: it walks since_rev..HEAD
+-- once (non-merge commits), parses touched blobs into ast_cache and
+-- caches the run per (since, HEAD, file_pattern). Called directly in
+-- SQL (DuckDB CLI), it ranks the most recent cached run for since_rev
+-- at the current HEAD and returns no rows if none exists.
+--
+-- Examples:
+--   SELECT * FROM churn_hotspots('HEAD~50', '**/*.py');
+--   SELECT * FROM churn_hotspots('v1.0', 'src/**/*.py', 10);
+CREATE OR REPLACE MACRO churn_hotspots(since_rev, file_pattern := '**/*.py', n := 20, repo := '.') AS TABLE
+    SELECT * FROM _churn_hotspots_for(
+        (SELECT max_by(r.since_sha, r.computed_at)
+         FROM churn_cache.runs r
+         WHERE r.since_rev = since_rev
+           AND r.file_pattern = file_pattern
+           AND r.head_sha = (SELECT commit_hash FROM git_log(repo) LIMIT 1)),
+        (SELECT commit_hash FROM git_log(repo) LIMIT 1),
+        file_pattern,
+        n := n
+    );
@@ -6,9 +6,9 @@
 
 SELECT mcp_publish_tool(
     'SearchContent',
-    'BM25 full-text search across all indexed content (markdown sections, code definitions, code comments, code string literals). Requires a populated FTS index — call the rebuild script first. Optional filters: kind (doc_section/definition/comment/string), extractor (markdown/sitting_duck).',
+    'BM25 full-text search across all indexed content (markdown sections, code definitions, code comments, code string literals). Requires a populated FTS index — call the rebuild script first. Optional filters: kind (doc_section/definition/comment/string), extractor (markdown/sitting_duck). Each hit shows a snippet around the matched terms.',
     'SELECT file_path || '':'' || start_line || ''-'' || end_line AS location,
-            extractor, kind, name, score, text
+            extractor, kind, name, score, fts_snippet(text, $query) AS snippet
      FROM search_content(
          $query,
          filter_kind := NULLIF($kind, ''null''),
@@ -29,7 +29,7 @@ SELECT mcp_publish_tool(
     'SearchDocs',
     'BM25 search over markdown documentation sections. Requires a populated FTS index.',
     'SELECT file_path || '':'' || start_line || ''-'' || end_line AS location,
-            name AS heading, score, text
+            name AS heading, score, fts_snippet(text, $query) AS snippet
      FROM search_docs(
          $query,
          limit_n := COALESCE(TRY_CAST(NULLIF($limit, ''null'') AS INT), 20)
@@ -46,7 +46,7 @@ SELECT mcp_publish_tool(
     'SearchCode',
     'BM25 search over code (definitions, comments, string literals including docstrings). Requires a populated FTS index. Optional kind filter: definition, comment, or string.',
     'SELECT file_path || '':'' || start_line || ''-'' || end_line AS location,
-            kind, name, score, text
+            kind, name, score, fts_snippet(text, $query) AS snippet
      FROM search_code(
          $query,
          filter_kind := NULLIF($kind, ''null''),
@@ -61,6 +61,25 @@ SELECT mcp_publish_tool(
     'markdown'
 );
 
+SELECT mcp_publish_tool(
+    'SearchSymbols',
+    'Fuzzy lookup of definitions by name: tolerates typos, case and snake_case/camelCase differences (retrypolicy finds retry_policy and RetryPolicy). Uses the trigram index built with the FTS index — nothing is parsed. Prefer this over find_definitions with %term% patterns.',
+    'SELECT file_path || '':'' || start_line || ''-'' || end_line AS location,
+            name, round(similarity, 2) AS similarity
+     FROM search_symbols(
+         $query,
+         limit_n := COALESCE(TRY_CAST(NULLIF($limit, ''null'') AS INT), 20),
+         file_pattern := NULLIF($file_pattern, ''null'')
+     )',
+    '{
+        "query": {"type": "string", "description": "Symbol name, roughly spelled"},
+        "file_pattern": {"type": "string", "description": "Only definitions in files matching this glob"},
+        "limit": {"type": "integer", "description": "Max rows (default 20)"}
+    }',
+    '["query"]',
+    'markdown'
+);
+
 SELECT mcp_publish_tool(
     'FtsStats',
     'Counts per extractor/kind of what is currently in the FTS index. Useful for checking whether the index is populated before searching.',
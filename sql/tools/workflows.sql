@@ -38,6 +38,18 @@ PRAGMA mcp_publish_tool(
     'json'
 );
 
+PRAGMA mcp_publish_tool(
+    'InvestigateSymbols',
+    'InvestigateSymbol for several related symbols in one call: the files are parsed once and callers and call sites are computed for all names together. Returns one entry per symbol. Use when tracing a bug across a handful of functions instead of calling InvestigateSymbol repeatedly.',
+    'SELECT * FROM investigate_many_query(
+        list_transform(string_split($names, '',''), n -> trim(n)),
+        file_pattern := COALESCE(_resolve(NULLIF($file_pattern, ''null'')), ''**/*.py'')
+    )',
+    '{"names": {"type": "string", "description": "Comma-separated symbol names. Each supports SQL LIKE wildcards (e.g. parse%,Config,%Handler)"}, "file_pattern": {"type": "string", "description": "Glob for files to search (e.g. src/**/*.py). Default: **/*.py"}}',
+    '["names"]',
+    'json'
+);
+
 PRAGMA mcp_publish_tool(
     'ReviewChanges',
     'Change review briefing between two git revisions. Returns changed files and the functions ranked by complexity that were affected. Use to prep for code review or understand what a branch introduces.',
@@ -10,7 +10,9 @@
 -- publications use the 'json' output format for nested data.
 --
 -- All macros depend only on macros already defined in source.sql, code.sql,
--- docs.sql, repo.sql, and structural.sql — no new primitives.
+-- docs.sql, repo.sql, and structural.sql — no new primitives. Sections
+-- that query the same code files share one MATERIALIZED read_ast CTE
+-- through code.sql's _scan_* macros, so each file is parsed once.
 
 -- explore_query: First-contact project briefing.
 -- Bundles project_overview + code_structure (top N by complexity)
@@ -86,7 +88,7 @@ CREATE OR REPLACE MACRO explore_query(
 
 -- investigate_query: Deep dive on a named symbol.
 -- Returns definitions + callers + call sites for `name` within `file_pattern`.
--- The callers list is enclosing-function-level (from function_callers);
+-- The callers list is enclosing-function-level (function_callers' shape);
 -- the call_sites list is individual call expressions (from find_calls).
 --
 -- Examples:
@@ -97,6 +99,9 @@ CREATE OR REPLACE MACRO investigate_query(
     file_pattern := '**/*.py'
 ) AS TABLE
     WITH
+        ast AS MATERIALIZED (
+            SELECT * FROM read_ast(file_pattern)
+        ),
         defs AS (
             SELECT LIST({
                 file_path: fd.file_path,
@@ -106,7 +111,7 @@ CREATE OR REPLACE MACRO investigate_query(
                 end_line: fd.end_line,
                 signature: fd.signature
             }) AS items
-            FROM find_definitions(file_pattern, name_pattern := name) AS fd
+            FROM _scan_definitions('ast', name_pattern := name) AS fd
         ),
         callers AS (
             SELECT LIST({
@@ -114,7 +119,7 @@ CREATE OR REPLACE MACRO investigate_query(
                 call_line: fc.call_line,
                 caller_name: fc.caller_name
             }) AS items
-            FROM function_callers(file_pattern, name) AS fc
+            FROM _scan_callers('ast', name) AS fc
         ),
         call_sites AS (
             SELECT LIST({
@@ -123,7 +128,7 @@ CREATE OR REPLACE MACRO investigate_query(
                 start_line: cs.start_line,
                 call_expression: cs.call_expression
             }) AS items
-            FROM find_calls(file_pattern, name_pattern := name) AS cs
+            FROM _scan_calls('ast', name_pattern := name) AS cs
         )
     SELECT {
         definitions: defs.items,
@@ -132,32 +137,122 @@ CREATE OR REPLACE MACRO investigate_query(
     } AS result
     FROM defs, callers, call_sites;
 
--- review_query: Change review briefing between two git revisions.
--- Bundles file_changes + changed_function_summary (top N by complexity)
--- into one struct. The Python workflow layer adds file_diff output for
--- top-ranked files; this macro returns only the summary data.
+-- investigate_many_query: investigate_query for several symbols at once.
+-- One read_ast pass serves every name: definitions, enclosing-function
+-- callers and call sites are each computed once for all of them and
+-- grouped per symbol. `symbols` keeps the order of `names` (duplicates
+-- dropped); each entry has investigate_query's three sections.
 --
 -- Examples:
---   SELECT * FROM review_query();                          -- HEAD~1..HEAD
---   SELECT * FROM review_query('main', 'HEAD');
---   SELECT * FROM review_query('v1.0', 'v1.1', 'src/**/*.py');
-CREATE OR REPLACE MACRO review_query(
-    from_rev := 'HEAD~1',
-    to_rev := 'HEAD',
-    file_pattern := '**/*.py',
-    repo := '.',
-    top_n := 20
+--   SELECT * FROM investigate_many_query(['load_sql', 'load_sql_matching']);
+--   SELECT * FROM investigate_many_query(['parse%', 'Config'], 'src/**/*.py');
+CREATE OR REPLACE MACRO investigate_many_query(
+    names,
+    file_pattern := '**/*.py'
 ) AS TABLE
     WITH
-        changes AS (
-            SELECT LIST({
+        ast AS MATERIALIZED (
+            SELECT * FROM read_ast(file_pattern)
+        ),
+        wanted AS (
+            SELECT symbol, min(pos) AS pos
+            FROM (
+                SELECT unnest(names) AS symbol,
+                       generate_subscripts(names, 1) AS pos
+            )
+            GROUP BY symbol
+        ),
+        defs AS (
+            SELECT w.symbol, LIST({
+                file_path: fd.file_path,
+                name: fd.name,
+                kind: fd.kind,
+                start_line: fd.start_line,
+                end_line: fd.end_line,
+                signature: fd.signature
+            } ORDER BY fd.file_path, fd.start_line) AS items
+            -- '_%' matches every named definition (variables included,
+            -- as for any explicit name_pattern); joined per symbol below.
+            FROM _scan_definitions('ast', name_pattern := '_%') AS fd
+            JOIN wanted w ON fd.name LIKE w.symbol
+            GROUP BY w.symbol
+        ),
+        -- Called names matching any symbol: _scan_callers_of matches
+        -- exactly, so LIKE patterns are expanded to names first.
+        callees AS (
+            SELECT list(DISTINCT cs.name) AS called
+            FROM _scan_calls('ast') AS cs
+            JOIN wanted w ON cs.name LIKE w.symbol
+        ),
+        callers AS (
+            SELECT w.symbol, LIST({
                 file_path: fc.file_path,
-                status: fc.status,
-                old_size: fc.old_size,
-                new_size: fc.new_size
-            }) AS items
-            FROM file_changes(from_rev, to_rev, repo) AS fc
+                call_line: fc.call_line,
+                caller_name: fc.caller_name
+            } ORDER BY fc.file_path, fc.call_line) AS items
+            FROM _scan_callers_of('ast', (SELECT called FROM callees)) AS fc
+            JOIN wanted w ON fc.callee LIKE w.symbol
+            GROUP BY w.symbol
         ),
+        call_sites AS (
+            SELECT w.symbol, LIST({
+                file_path: cs.file_path,
+                name: cs.name,
+                start_line: cs.start_line,
+                call_expression: cs.call_expression
+            } ORDER BY cs.file_path, cs.start_line) AS items
+            FROM _scan_calls('ast') AS cs
+            JOIN wanted w ON cs.name LIKE w.symbol
+            GROUP BY w.symbol
+        )
+    SELECT {
+        symbols: LIST({
+            name: w.symbol,
+            definitions: defs.items,
+            callers: callers.items,
+            call_sites: call_sites.items
+        } ORDER BY w.pos)
+    } AS result
+    FROM wanted w
+    LEFT JOIN defs ON defs.symbol = w.symbol
+    LEFT JOIN callers ON callers.symbol = w.symbol
+    LEFT JOIN call_sites ON call_sites.symbol = w.symbol;
+
+-- _review_query_for: review_query over an explicit change list.
+-- `changes` is a list of {file_path, status, old_size, new_size} structs
+-- (the file_changes row shape). fledgling.Connection passes the tree-diff
+-- engine's result here as a literal; review_query passes file_changes.
+CREATE OR REPLACE MACRO _review_query_for(changes, file_pattern, top_n) AS TABLE
+    WITH
+        functions AS (
+            SELECT LIST({
+                file_path: f.file_path,
+                name: f.name,
+                kind: f.kind,
+                lines: f.lines,
+                cyclomatic: f.cyclomatic,
+                change_status: f.change_status
+            }) AS items
+            FROM (
+                SELECT *
+                FROM _changed_function_summary_for(changes, file_pattern)
+                ORDER BY cyclomatic DESC, file_path, name
+                LIMIT top_n
+            ) f
+        )
+    SELECT {
+        changed_files: CAST(changes AS STRUCT(
+            file_path VARCHAR, status VARCHAR, old_size BIGINT, new_size BIGINT
+        )[]),
+        function_summary: functions.items
+    } AS result
+    FROM functions;
+
+-- _review_query_cached: _review_query_for with the function summary read
+-- from the AST cache (see _changed_function_summary_cached); `entries`
+-- are the changed files that match the pattern, with their target blobs.
+CREATE OR REPLACE MACRO _review_query_cached(changes, entries, top_n) AS TABLE
+    WITH
         functions AS (
             SELECT LIST({
                 file_path: f.file_path,
@@ -169,16 +264,45 @@ CREATE OR REPLACE MACRO review_query(
             }) AS items
             FROM (
                 SELECT *
-                FROM changed_function_summary(from_rev, to_rev, file_pattern, repo)
+                FROM _changed_function_summary_cached(entries)
                 ORDER BY cyclomatic DESC, file_path, name
                 LIMIT top_n
             ) f
         )
     SELECT {
-        changed_files: changes.items,
+        changed_files: CAST(changes AS STRUCT(
+            file_path VARCHAR, status VARCHAR, old_size BIGINT, new_size BIGINT
+        )[]),
         function_summary: functions.items
     } AS result
-    FROM changes, functions;
+    FROM functions;
+
+-- review_query: Change review briefing between two git revisions.
+-- Bundles file_changes + changed_function_summary (top N by complexity)
+-- into one struct. The Python workflow layer adds file_diff output for
+-- top-ranked files; this macro returns only the summary data.
+--
+-- Examples:
+--   SELECT * FROM review_query();                          -- HEAD~1..HEAD
+--   SELECT * FROM review_query('main', 'HEAD');
+--   SELECT * FROM review_query('v1.0', 'v1.1', 'src/**/*.py');
+CREATE OR REPLACE MACRO review_query(
+    from_rev := 'HEAD~1',
+    to_rev := 'HEAD',
+    file_pattern := '**/*.py',
+    repo := '.',
+    top_n := 20
+) AS TABLE
+    SELECT * FROM _review_query_for(
+        (SELECT LIST({
+            file_path: fc.file_path,
+            status: fc.status,
+            old_size: fc.old_size,
+            new_size: fc.new_size
+        }) FROM file_changes(from_rev, to_rev, repo) AS fc),
+        file_pattern,
+        top_n
+    );
 
 -- search_query: Multi-source search over definitions, call sites, and docs.
 -- For each source, the `pattern` is used as a LIKE pattern against names
@@ -195,6 +319,9 @@ CREATE OR REPLACE MACRO search_query(
     top_n := 50
 ) AS TABLE
     WITH
+        ast AS MATERIALIZED (
+            SELECT * FROM read_ast(file_pattern)
+        ),
         defs AS (
             SELECT LIST({
                 file_path: fd.file_path,
@@ -204,7 +331,7 @@ CREATE OR REPLACE MACRO search_query(
             }) AS items
             FROM (
                 SELECT *
-                FROM find_definitions(file_pattern, name_pattern := pattern)
+                FROM _scan_definitions('ast', name_pattern := pattern)
                 LIMIT top_n
             ) fd
         ),
@@ -217,7 +344,7 @@ CREATE OR REPLACE MACRO search_query(
             }) AS items
             FROM (
                 SELECT *
-                FROM find_calls(file_pattern, name_pattern := pattern)
+                FROM _scan_calls('ast', name_pattern := pattern)
                 LIMIT top_n
             ) fc
         ),
@@ -242,75 +369,188 @@ CREATE OR REPLACE MACRO search_query(
     } AS result
     FROM defs, calls, docs;
 
--- pss_render: Render selector query results as markdown.
--- For each match from ast_select(source, selector), emits two blocks:
--- a level-1 heading with file:start-end, and a fenced code block with
--- the match's peek (AST preview — typically the signature/declaration
--- line for function and class definitions).
---
--- Depends on: sitting_duck (ast_select), markdown (duck_blocks_to_md).
+-- search_ranked: search_query's sources fused into one ranked list.
+-- Definitions and call sites (closest name — shortest — first) and doc
+-- sections (title matches before body matches) are each ranked, and a
+-- result's score is the reciprocal rank fusion sum of 1 / (k + rank)
+-- over the sources that found it. Results are keyed by file and line, so
+-- a definition that is also a doc heading's anchor line counts once.
 --
--- NOTE on code content: this macro uses the `peek` column from ast_select
--- rather than ast_get_source(file_path, start_line, end_line). The latter
--- wraps read_text() (a C++ table function) which rejects column-reference
--- arguments due to DuckDB's lateral-join constraint (CLAUDE.md quirk #10).
--- Passing per-row file_path to ast_get_source fails with
--- "Table function read_text does not support lateral join column parameters".
--- A future Python-side helper or a DuckDB/sitting_duck upgrade is needed
--- for full-body extraction. peek is a reasonable MVP for signature-level
--- rendering (function declarations, class headers, etc.).
+-- The Python `search` workflow fuses the same way, adding the full-text
+-- index and conversations, with a time budget per source.
 --
 -- Examples:
---   SELECT * FROM pss_render('**/*.py', '.func');
---   SELECT * FROM pss_render('src/main.py', '.class:has(.func#validate)');
-CREATE OR REPLACE MACRO pss_render(source, selector) AS TABLE
-    WITH raw_matches AS (
+--   SELECT * FROM search_ranked('parse');
+--   SELECT * FROM search_ranked('%connect%', file_pattern := 'src/**/*.py');
+CREATE OR REPLACE MACRO search_ranked(
+    pattern,
+    file_pattern := '**/*.py',
+    doc_pattern := 'docs/**/*.md',
+    top_n := 50,
+    k := 60
+) AS TABLE
+    WITH
+        ast AS MATERIALIZED (
+            SELECT * FROM read_ast(file_pattern)
+        ),
+        hits AS (
+            SELECT 'definitions' AS source, file_path, start_line AS line,
+                   name, kind,
+                   row_number() OVER (ORDER BY length(name), file_path, start_line) AS rank
+            FROM _scan_definitions('ast', name_pattern := pattern)
+            UNION ALL
+            SELECT 'call_sites', file_path, start_line, name, 'call',
+                   row_number() OVER (ORDER BY length(name), file_path, start_line)
+            FROM _scan_calls('ast', name_pattern := pattern)
+            UNION ALL
+            SELECT 'doc_sections', file_path, start_line, title, 'doc_section',
+                   row_number() OVER (
+                       ORDER BY title NOT ILIKE '%' || pattern || '%',
+                                level, file_path, start_line)
+            FROM doc_outline(doc_pattern, search := pattern)
+        ),
+        -- One hit per source and location: its best rank.
+        best AS (
+            SELECT source, file_path, line,
+                   arg_min(name, rank) AS name,
+                   arg_min(kind, rank) AS kind,
+                   min(rank) AS rank
+            FROM hits
+            WHERE rank <= top_n
+            GROUP BY source, file_path, line
+        ),
+        reranked AS (
+            SELECT *, row_number() OVER (PARTITION BY source ORDER BY rank) AS r
+            FROM best
+        )
+    SELECT
+        file_path,
+        line,
+        arg_min(name, r) AS name,
+        arg_min(kind, r) AS kind,
+        sum(1.0 / (k + r)) AS score,
+        list(source ORDER BY source) AS sources
+    FROM reranked
+    GROUP BY file_path, line
+    ORDER BY score DESC, file_path, line
+    LIMIT top_n;
+
+-- _select_bodies: ast_select matches with their full source text.
+-- Internal helper for pss_render / pss_render_chunks / ast_select_render.
+--
+-- Each distinct file is read once through read_lines_lateral and its lines
+-- are range-joined to the matches in it, rather than re-reading the file
+-- for every match. A match whose lines can't be read falls back to peek.
+-- `ord` numbers the matches in output order (file_path, start_line).
+CREATE OR REPLACE MACRO _select_bodies(source, selector) AS TABLE
+    WITH raw_matches AS MATERIALIZED (
         SELECT
             file_path,
             start_line,
             end_line,
-            COALESCE(language, 'text') AS language
+            COALESCE(language, 'text') AS language,
+            name,
+            qualified_name,
+            peek,
+            row_number() OVER (ORDER BY file_path, start_line) AS ord
         FROM ast_select(source, selector)
     ),
-    matches AS (
-        SELECT
-            m.file_path,
-            m.start_line,
-            m.end_line,
-            m.language,
-            string_agg(rl.content, chr(10) ORDER BY rl.line_number) AS source_text,
-            row_number() OVER (ORDER BY m.file_path, m.start_line) AS ord
-        FROM raw_matches m, read_lines_lateral(m.file_path) rl
-        WHERE rl.line_number BETWEEN m.start_line AND m.end_line
-        GROUP BY m.file_path, m.start_line, m.end_line, m.language
+    files AS (
+        SELECT DISTINCT file_path FROM raw_matches
     ),
-    blocks AS (
-        SELECT
-            {
-                'kind': 'heading',
-                'element_type': 'heading',
-                'content': m.file_path || ':' || m.start_line || '-' || m.end_line,
-                'level': 1,
-                'encoding': 'plain',
-                'attributes': MAP(),
-                'element_order': CAST(m.ord AS INTEGER) * 2 - 1
-            }::STRUCT(kind VARCHAR, element_type VARCHAR, "content" VARCHAR, "level" INTEGER, "encoding" VARCHAR, attributes MAP(VARCHAR, VARCHAR), element_order INTEGER) AS block
-        FROM matches m
-        UNION ALL
+    lines AS (
+        SELECT f.file_path, rl.line_number, rl.content
+        FROM files f, read_lines_lateral(f.file_path) rl
+    ),
+    bodies AS (
         SELECT
-            {
-                'kind': 'code',
-                'element_type': 'code',
-                'content': m.source_text,
-                'level': 0,
-                'encoding': 'plain',
-                'attributes': MAP{'language': m.language},
-                'element_order': CAST(m.ord AS INTEGER) * 2
-            }::STRUCT(kind VARCHAR, element_type VARCHAR, "content" VARCHAR, "level" INTEGER, "encoding" VARCHAR, attributes MAP(VARCHAR, VARCHAR), element_order INTEGER)
-        FROM matches m
+            m.ord,
+            string_agg(l.content, chr(10) ORDER BY l.line_number) AS body
+        FROM raw_matches m
+        JOIN lines l
+          ON l.file_path = m.file_path
+         AND l.line_number BETWEEN m.start_line AND m.end_line
+        GROUP BY m.ord
+    )
+    SELECT
+        m.file_path,
+        m.start_line,
+        m.end_line,
+        m.language,
+        m.name,
+        m.qualified_name,
+        m.peek,
+        COALESCE(b.body, m.peek) AS source_text,
+        m.ord
+    FROM raw_matches m
+    LEFT JOIN bodies b ON b.ord = m.ord;
+
+-- _pss_blocks: pss_render's markdown blocks, one heading + one code block
+-- per match, tagged with the match's `ord`.
+CREATE OR REPLACE MACRO _pss_blocks(source, selector) AS TABLE
+    WITH matches AS (
+        SELECT * FROM _select_bodies(source, selector)
     )
+    SELECT
+        m.ord,
+        {
+            'kind': 'heading',
+            'element_type': 'heading',
+            'content': m.file_path || ':' || m.start_line || '-' || m.end_line,
+            'level': 1,
+            'encoding': 'plain',
+            'attributes': MAP(),
+            'element_order': CAST(m.ord AS INTEGER) * 2 - 1
+        }::STRUCT(kind VARCHAR, element_type VARCHAR, "content" VARCHAR, "level" INTEGER, "encoding" VARCHAR, attributes MAP(VARCHAR, VARCHAR), element_order INTEGER) AS block
+    FROM matches m
+    UNION ALL
+    SELECT
+        m.ord,
+        {
+            'kind': 'code',
+            'element_type': 'code',
+            'content': m.source_text,
+            'level': 0,
+            'encoding': 'plain',
+            'attributes': MAP{'language': m.language},
+            'element_order': CAST(m.ord AS INTEGER) * 2
+        }::STRUCT(kind VARCHAR, element_type VARCHAR, "content" VARCHAR, "level" INTEGER, "encoding" VARCHAR, attributes MAP(VARCHAR, VARCHAR), element_order INTEGER)
+    FROM matches m;
+
+-- pss_render: Render selector query results as markdown.
+-- For each match from ast_select(source, selector), emits two blocks:
+-- a level-1 heading with file:start-end, and a fenced code block with
+-- the match's full source text (peek if the file can't be read).
+--
+-- Depends on: sitting_duck (ast_select), markdown (duck_blocks_to_md),
+-- read_lines (read_lines_lateral).
+--
+-- Bodies come from _select_bodies, which reads each matched file once.
+-- The whole result is one duck_blocks_to_md aggregate; for selectors
+-- matching thousands of nodes use pss_render_chunks, or
+-- Connection.render_selection from Python, which streams the chunks.
+--
+-- Examples:
+--   SELECT * FROM pss_render('**/*.py', '.func');
+--   SELECT * FROM pss_render('src/main.py', '.class:has(.func#validate)');
+CREATE OR REPLACE MACRO pss_render(source, selector) AS TABLE
     SELECT duck_blocks_to_md(ARRAY_AGG(block ORDER BY block.element_order)) AS result
-    FROM blocks;
+    FROM _pss_blocks(source, selector);
+
+-- pss_render_chunks: pss_render's markdown, one row per chunk of
+-- `chunk_size` matches, so no single aggregate holds the whole document.
+-- Concatenating `result` in `chunk` order gives pss_render's output.
+--
+-- Examples:
+--   SELECT result FROM pss_render_chunks('**/*.py', '.func') ORDER BY chunk;
+--   SELECT * FROM pss_render_chunks('src/**/*.py', '.class', chunk_size := 20);
+CREATE OR REPLACE MACRO pss_render_chunks(source, selector, chunk_size := 100) AS TABLE
+    SELECT
+        CAST((ord - 1) // chunk_size AS INTEGER) AS chunk,
+        duck_blocks_to_md(ARRAY_AGG(block ORDER BY block.element_order)) AS result
+    FROM _pss_blocks(source, selector)
+    GROUP BY ALL
+    ORDER BY chunk;
 
 -- ast_select_render: Render selector query results grouped under a
 -- selector heading with per-match sub-headings.
@@ -319,7 +559,7 @@ CREATE OR REPLACE MACRO pss_render(source, selector) AS TABLE
 --   # `<selector>`
 --   ## <qualified_name or name> — file:start-end
 --   ```<language>
---   <peek>
+--   <source text>
 --   ```
 --   (repeated per match)
 --
@@ -329,9 +569,9 @@ CREATE OR REPLACE MACRO pss_render(source, selector) AS TABLE
 --
 -- Depends on: sitting_duck (ast_select), markdown (duck_blocks_to_md).
 --
--- Same peek-vs-ast_get_source constraint as pss_render. See its comment
--- for the full explanation of DuckDB quirk #10 and the future path to
--- full-body extraction.
+-- Bodies come from _select_bodies (each file read once), as for
+-- pss_render; Connection.render_selection(layout="ast_select") streams
+-- the same layout in chunks from Python.
 --
 -- Examples:
 --   SELECT * FROM ast_select_render('**/*.py', '.func#validate');
@@ -342,11 +582,11 @@ CREATE OR REPLACE MACRO ast_select_render(source, selector) AS TABLE
             file_path,
             start_line,
             end_line,
-            COALESCE(language, 'text') AS language,
+            language,
             COALESCE(ast_qualified_name_as_string(qualified_name), name, '(anonymous)') AS symbol,
-            peek AS source_text,
-            row_number() OVER (ORDER BY file_path, start_line) AS ord
-        FROM ast_select(source, selector)
+            source_text,
+            ord
+        FROM _select_bodies(source, selector)
     ),
     blocks AS (
         -- Selector heading at element_order 0 (sorts first)
@@ -0,0 +1,151 @@
+-- Fledgling: Workspace Macros (multi-repository index)
+--
+-- One database indexing several repositories. Every table carries a
+-- `repo` column (the repository's workspace name), so one server answers
+-- cross-repo definition, search and history queries. Populated by the
+-- Python Workspace indexer (fledgling/workspace.py), which indexes the
+-- repositories in parallel and skips those whose HEAD is unchanged.
+--
+-- Definitions are not copied per repository: workspace.files maps each
+-- (repo, file_path) at HEAD to its blob, and the blob's definitions live
+-- once in ast_cache (sql/structural.sql) — a file vendored into twenty
+-- repositories is parsed once. Must load after structural; needs the
+-- fts extension.
+--
+-- Why workspace_* macros rather than a `repo` column on fts.content and
+-- a cross-repo find_definitions / search_content: those read the
+-- session root. find_definitions parses files on disk (read_ast over a
+-- pattern resolved against session_root), which a locked-down
+-- connection cannot do outside the root; fts.content is rebuilt and
+-- refreshed from the session root's files, so rows of other repos would
+-- be dropped as stale by every refresh. The workspace tables are filled
+-- from git objects instead and share only what is repo-independent: the
+-- blob-keyed ast_cache. The single-repo macros keep their signatures and
+-- behaviour.
+--
+--   workspace.repos    — one row per indexed repository
+--   workspace.files    — HEAD files with a mapped language, by blob
+--   workspace.commits  — recent commits per repository
+--   workspace.content  — BM25 search rows: definitions (kind from
+--                        ast_cache) and commit summaries (kind 'commit')
+
+CREATE SCHEMA IF NOT EXISTS workspace;
+
+CREATE TABLE IF NOT EXISTS workspace.repos (
+    repo       VARCHAR PRIMARY KEY,
+    root       VARCHAR,
+    head_sha   VARCHAR,
+    file_count INTEGER,
+    indexed_at TIMESTAMP DEFAULT current_timestamp
+);
+
+CREATE TABLE IF NOT EXISTS workspace.files (
+    repo      VARCHAR,
+    file_path VARCHAR,
+    blob_hash VARCHAR,
+    language  VARCHAR
+);
+
+CREATE TABLE IF NOT EXISTS workspace.commits (
+    repo         VARCHAR,
+    commit_sha   VARCHAR,
+    author_name  VARCHAR,
+    author_email VARCHAR,
+    author_time  TIMESTAMP,
+    summary      VARCHAR
+);
+
+CREATE SEQUENCE IF NOT EXISTS workspace.content_id;
+
+CREATE TABLE IF NOT EXISTS workspace.content (
+    id         BIGINT PRIMARY KEY DEFAULT nextval('workspace.content_id'),
+    repo       VARCHAR,
+    file_path  VARCHAR,
+    start_line INTEGER,
+    end_line   INTEGER,
+    kind       VARCHAR,
+    name       VARCHAR,
+    text       VARCHAR
+);
+
+-- Stub BM25 index so fts_workspace_content.match_bm25 exists when
+-- workspace_search is defined (same reason as in fts.sql); the indexer
+-- rebuilds it after loading content.
+PRAGMA create_fts_index('workspace.content', 'id', 'text', overwrite = 1);
+
+-- workspace_repos: Indexed repositories with their HEAD and file count.
+--
+-- Examples:
+--   SELECT * FROM workspace_repos();
+CREATE OR REPLACE MACRO workspace_repos() AS TABLE
+    SELECT repo, root, head_sha[:8] AS head, file_count, indexed_at
+    FROM workspace.repos
+    ORDER BY repo;
+
+-- workspace_definitions: find_definitions across every indexed
+-- repository. file_pattern is matched against repo-relative paths.
+--
+-- Examples:
+--   SELECT * FROM workspace_definitions(name_pattern := 'parse%');
+--   SELECT * FROM workspace_definitions('**/*.go', 'New%', repo_filter := 'billing');
+CREATE OR REPLACE MACRO workspace_definitions(
+    file_pattern := '**',
+    name_pattern := '%',
+    repo_filter := NULL
+) AS TABLE
+    SELECT
+        f.repo,
+        f.file_path,
+        d.name,
+        d.kind,
+        d.start_line,
+        d.end_line,
+        d.cyclomatic
+    FROM workspace.files f
+    JOIN ast_cache.definitions d ON d.blob_hash = f.blob_hash
+    WHERE d.name LIKE name_pattern
+      AND _glob_match(f.file_path, file_pattern)
+      AND (repo_filter IS NULL OR f.repo = repo_filter)
+    ORDER BY f.repo, f.file_path, d.start_line;
+
+-- workspace_search: BM25 search over the definitions and commit
+-- summaries of every indexed repository.
+--
+-- Examples:
+--   SELECT * FROM workspace_search('retry backoff');
+--   SELECT * FROM workspace_search('auth token', repo_filter := 'gateway');
+CREATE OR REPLACE MACRO workspace_search(query, repo_filter := NULL, limit_n := 20) AS TABLE
+    SELECT *
+    FROM (
+        SELECT
+            c.repo,
+            c.file_path,
+            c.start_line,
+            c.end_line,
+            c.kind,
+            c.name,
+            fts_workspace_content.match_bm25(c.id, query) AS score
+        FROM workspace.content c
+    ) scored
+    WHERE scored.score IS NOT NULL
+      AND (repo_filter IS NULL OR scored.repo = repo_filter)
+    ORDER BY scored.score DESC
+    LIMIT limit_n;
+
+-- workspace_commits: Recent commits across indexed repositories,
+-- newest first.
+--
+-- Examples:
+--   SELECT * FROM workspace_commits();
+--   SELECT * FROM workspace_commits(50, repo_filter := 'billing');
+CREATE OR REPLACE MACRO workspace_commits(n := 20, repo_filter := NULL) AS TABLE
+    SELECT
+        repo,
+        commit_sha[:8] AS hash,
+        author_name AS author,
+        author_time AS date,
+        summary
+    FROM workspace.commits
+    WHERE repo_filter IS NULL OR repo = repo_filter
+    ORDER BY author_time DESC
+    LIMIT n;
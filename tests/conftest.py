@@ -38,6 +38,21 @@ def load_sql(con, filename):
             con.execute(stmt + ";")
 
 
+def load_sql_matching(con, filename, needle):
+    """Load only the statements of a SQL file that mention ``needle``.
+
+    For cache schemas and internal macros that don't need the file's
+    extensions: statements calling git_* table functions are skipped.
+    """
+    path = os.path.join(SQL_DIR, filename)
+    with open(path) as f:
+        sql = f.read()
+    lines = [l for l in sql.split("\n") if not l.strip().startswith("--")]
+    for stmt in "\n".join(lines).split(";"):
+        if needle in stmt and "git_" not in stmt:
+            con.execute(stmt)
+
+
 
 
 def create_resolve_macros(con, root=PROJECT_ROOT):
@@ -125,6 +140,7 @@ def all_macros(con):
     con.execute("SET VARIABLE fledgling_version = '0.8.2'")
     con.execute("SET VARIABLE fledgling_profile = 'test'")
     con.execute("SET VARIABLE fledgling_modules = ['source', 'code', 'docs', 'repo', 'structural']")
+    load_sql(con, "sandbox.sql")
     load_sql(con, "dr_fledgling.sql")
     load_sql(con, "source.sql")
     load_sql(con, "code.sql")
@@ -141,6 +157,7 @@ def structural_macros(con):
     """Connection with sitting_duck + duck_tails + structural macros."""
     con.execute("LOAD sitting_duck")
     con.execute("LOAD duck_tails")
+    load_sql(con, "sandbox.sql")
     load_sql(con, "code.sql")
     load_sql(con, "repo.sql")
     load_sql(con, "structural.sql")
@@ -190,6 +207,7 @@ def workflows_macros(con):
     con.execute("LOAD sitting_duck")
     con.execute("LOAD markdown")
     con.execute("LOAD duck_tails")
+    load_sql(con, "sandbox.sql")
     load_sql(con, "source.sql")
     load_sql(con, "code.sql")
     load_sql(con, "docs.sql")
@@ -219,6 +237,7 @@ V1_TOOLS = [
     "ChatDetail",
     "ExploreProject",
     "InvestigateSymbol",
+    "InvestigateSymbols",
     "ReviewChanges",
     "SearchProject",
     "SelectCode",
@@ -644,3 +663,52 @@ def conversation_macros(con, tmp_path):
     con.execute(f"SET VARIABLE conversations_root = '{tmp_path / '.claude' / 'projects'}'")
     load_sql(con, "conversations.sql")
     return con
+
+
+# ── Scratch git repositories ─────────────────────────────────────────
+
+
+class ScratchRepo:
+    """A throwaway git repository for engine tests (fledgling.git)."""
+
+    def __init__(self, path):
+        import subprocess
+        self.path = str(path)
+        self._subprocess = subprocess
+        os.makedirs(self.path, exist_ok=True)
+        self.git("init", "-q", "-b", "main")
+        self.git("config", "user.name", "Test")
+        self.git("config", "user.email", "test@example.com")
+        self.git("config", "commit.gpgsign", "false")
+
+    def git(self, *args):
+        result = self._subprocess.run(
+            ["git", "-C", self.path, *args],
+            capture_output=True, text=True, check=True,
+        )
+        return result.stdout.strip()
+
+    def write(self, relpath, content):
+        full = os.path.join(self.path, relpath)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "w") as f:
+            f.write(content)
+
+    def remove(self, relpath):
+        os.remove(os.path.join(self.path, relpath))
+
+    def commit(self, message="commit", files=None, remove=()):
+        """Write `files`, delete `remove`, commit everything; return the SHA."""
+        for relpath, content in (files or {}).items():
+            self.write(relpath, content)
+        for relpath in remove:
+            self.remove(relpath)
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def scratch_repo(tmp_path):
+    """Empty git repository in tmp_path (see ScratchRepo)."""
+    return ScratchRepo(tmp_path / "repo")
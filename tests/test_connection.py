@@ -567,6 +567,48 @@ class TestAttach:
         assert val == "ok"
 
 
+class TestCursor:
+    """Connection.cursor() gives a worker-thread connection to the same database."""
+
+    @pytest.fixture
+    def con(self, tmp_path):
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [str(tmp_path)])
+        raw.execute("SET VARIABLE fledgling_modules = ['source', 'code']")
+        raw.execute("CREATE TABLE t (x INT)")
+        raw.execute("INSERT INTO t VALUES (1), (2)")
+        raw.execute("CREATE MACRO t_rows(m := 1) AS TABLE SELECT x * m AS x FROM t")
+        con = fledgling.Connection(raw)
+        yield con
+        raw.close()
+
+    def test_session_variables_copied(self, con, tmp_path):
+        cur = con.cursor()
+        assert cur.execute("SELECT getvariable('session_root')").fetchone()[0] == str(tmp_path)
+        assert cur.execute(
+            "SELECT getvariable('fledgling_modules')"
+        ).fetchone()[0] == ["source", "code"]
+        cur.close()
+
+    def test_macros_run_on_cursor(self, con):
+        cur = con.cursor()
+        assert cur._con is not con._con
+        assert sorted(cur.t_rows(m=10).fetchall()) == [(10,), (20,)]
+        cur.close()
+        # The parent connection stays open.
+        assert con.execute("SELECT count(*) FROM t").fetchone()[0] == 2
+
+    def test_engines_shared(self, con):
+        cur = con.cursor()
+        assert cur._repo(".") is con._repo(".")
+        assert cur._blobs is con._blobs
+        assert cur._diffs is con._diffs
+        assert cur._asts is not con._asts
+        assert cur._asts._known is con._asts._known
+        assert cur.cursor()._blobs is con._blobs
+        cur.close()
+
+
 # ── lockdown() (Delta 3) ─────────────────────────────────────────────
 
 
@@ -1,5 +1,7 @@
 """Tests for full-text search macros (fts tier)."""
 
+import os
+
 import pytest
 from conftest import PROJECT_ROOT, load_sql
 
@@ -63,6 +65,160 @@ class TestFtsRebuild:
         assert count1 > 0
 
 
+# ── Incremental refresh ──────────────────────────────────────────────
+
+
+class TestFtsRefresh:
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "README.md").write_text("# Intro\n\nAbout widgets.\n")
+        (tmp_path / "a.py").write_text("def alpha():\n    return 1\n")
+        (tmp_path / "b.py").write_text("def beta():\n    return 2\n")
+        return tmp_path
+
+    @pytest.fixture
+    def fledgling_con(self, project):
+        from fledgling.connection import connect
+        con = connect(root=str(project), init=False,
+                      modules=["sandbox", "code", "docs", "fts"])
+        con.rebuild_fts()
+        return con
+
+    def _names(self, con):
+        return {n for (n,) in con.execute(
+            "SELECT name FROM fts.content WHERE kind = 'definition'"
+        ).fetchall()}
+
+    def test_batched_rebuild_matches_script(self, fledgling_con, project):
+        fledgling_con.rebuild_fts(batch_size=1)
+        batched = fledgling_con.execute(
+            "SELECT file_path, kind, name, text FROM fts.content ORDER BY ALL"
+        ).fetchall()
+        total, unique = fledgling_con.execute(
+            "SELECT count(*), count(DISTINCT id) FROM fts.content"
+        ).fetchone()
+        assert total == unique
+        load_sql(fledgling_con, "fts_rebuild.sql")
+        assert fledgling_con.execute(
+            "SELECT file_path, kind, name, text FROM fts.content ORDER BY ALL"
+        ).fetchall() == batched
+
+    def test_rebuild_records_manifest(self, fledgling_con, project):
+        files = {f for (f,) in fledgling_con.execute(
+            "SELECT file_path FROM fts.files"
+        ).fetchall()}
+        assert files == {str(project / n) for n in ("README.md", "a.py", "b.py")}
+        assert fledgling_con.execute(
+            "SELECT * FROM fts_stale(resolve('**/*.md'), resolve('**/*.py'))"
+        ).fetchall() == []
+
+    def test_unchanged_is_noop(self, fledgling_con):
+        ids = fledgling_con.execute("SELECT id FROM fts.content ORDER BY id").fetchall()
+        assert fledgling_con.refresh_fts() == {"added": 0, "changed": 0, "removed": 0}
+        assert fledgling_con.execute(
+            "SELECT id FROM fts.content ORDER BY id"
+        ).fetchall() == ids
+
+    def test_touched_file_updates_manifest_only(self, fledgling_con, project):
+        ids = fledgling_con.execute("SELECT id FROM fts.content ORDER BY id").fetchall()
+        os.utime(project / "a.py", (1_000_000_000, 1_000_000_000))
+        assert fledgling_con.refresh_fts() == {"added": 0, "changed": 0, "removed": 0}
+        assert fledgling_con.execute(
+            "SELECT id FROM fts.content ORDER BY id"
+        ).fetchall() == ids
+        assert fledgling_con.execute(
+            "SELECT * FROM _fts_suspects(resolve('**/*.md'), resolve('**/*.py'))"
+            " WHERE file_path LIKE '%a.py'"
+        ).fetchall() == []
+
+    def test_reextracts_only_stale_files(self, fledgling_con, project):
+        (project / "a.py").write_text("def gamma():\n    return 3\n")
+        (project / "b.py").unlink()
+        (project / "c.py").write_text("def delta():\n    return 4\n")
+        untouched = fledgling_con.execute(
+            "SELECT id FROM fts.content WHERE extractor = 'markdown'"
+        ).fetchall()
+        assert fledgling_con.refresh_fts() == {"added": 1, "changed": 1, "removed": 1}
+        assert self._names(fledgling_con) == {"gamma", "delta"}
+        assert fledgling_con.execute(
+            "SELECT id FROM fts.content WHERE extractor = 'markdown'"
+        ).fetchall() == untouched
+        hits = fledgling_con.execute(
+            "SELECT name FROM search_code('gamma')"
+        ).fetchall()
+        assert ("gamma",) in hits
+        assert fledgling_con.execute(
+            "SELECT name FROM search_symbols('gama')"
+        ).fetchall() == [("gamma",)]
+
+    def test_matches_full_rebuild(self, fledgling_con, project):
+        (project / "a.py").write_text("def alpha():\n    return 10\n# note\n")
+        fledgling_con.refresh_fts()
+        refreshed = fledgling_con.execute(
+            "SELECT file_path, kind, name, text FROM fts.content ORDER BY ALL"
+        ).fetchall()
+        fledgling_con.rebuild_fts()
+        assert fledgling_con.execute(
+            "SELECT file_path, kind, name, text FROM fts.content ORDER BY ALL"
+        ).fetchall() == refreshed
+
+
+class TestPersistFts:
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "README.md").write_text("# Intro\n\nAbout widgets.\n")
+        (tmp_path / "a.py").write_text("def alpha():\n    return 1\n")
+        return tmp_path
+
+    def _connect(self, project):
+        from fledgling.connection import connect
+        return connect(root=str(project), init=False,
+                       modules=["sandbox", "code", "docs", "fts"])
+
+    def test_first_use_builds_and_saves(self, project):
+        con = self._connect(project)
+        assert con.persist_fts() == {"added": 2, "changed": 0, "removed": 0}
+        assert (project / ".fledgling" / "cache" / "fts" / "index.duckdb").exists()
+        assert con.execute(
+            "SELECT count(*) FROM fledgling_fts_store.content"
+        ).fetchone()[0] == con.execute("SELECT count(*) FROM fts.content").fetchone()[0]
+        con.close()
+
+    def test_restart_searches_before_refresh(self, project):
+        con = self._connect(project)
+        con.persist_fts()
+        con.close()
+        (project / "a.py").write_text("def omega():\n    return 1\n")
+        con = self._connect(project)
+        assert con.persist_fts(refresh=False) == {"added": 0, "changed": 0, "removed": 0}
+        assert ("alpha",) in con.execute("SELECT name FROM search_code('alpha')").fetchall()
+        assert con.refresh_fts() == {"added": 0, "changed": 1, "removed": 0}
+        con.close()
+        con = self._connect(project)
+        con.persist_fts(refresh=False)
+        assert ("omega",) in con.execute("SELECT name FROM search_code('omega')").fetchall()
+        con.close()
+
+    def test_refresh_saves_only_changed_files(self, project):
+        con = self._connect(project)
+        con.persist_fts()
+        # Mark the unchanged file's saved rows: a full rewrite would lose it.
+        con.execute(
+            "UPDATE fledgling_fts_store.content SET text = 'kept' "
+            "WHERE file_path LIKE '%README.md'"
+        )
+        (project / "a.py").write_text("def omega():\n    return 1\n")
+        assert con.refresh_fts() == {"added": 0, "changed": 1, "removed": 0}
+        assert con.execute(
+            "SELECT count(*) FROM fledgling_fts_store.content "
+            "WHERE file_path LIKE '%README.md' AND text IS DISTINCT FROM 'kept'"
+        ).fetchone()[0] == 0
+        code = "SELECT id, name FROM {} WHERE file_path LIKE '%a.py' ORDER BY id"
+        assert con.execute(code.format("fledgling_fts_store.content")).fetchall() \
+            == con.execute(code.format("fts.content")).fetchall()
+        con.close()
+
+
 # ── fts_stats ────────────────────────────────────────────────────────
 
 
@@ -148,6 +304,44 @@ class TestSearchContent:
         ).fetchall()
         assert rows == []
 
+    def test_scores_match_match_bm25(self, fts_populated):
+        rows = fts_populated.execute(
+            "SELECT id, score FROM search_content('sandbox root', limit_n := 50)"
+        ).fetchall()
+        expected = fts_populated.execute(
+            "SELECT id, score FROM ("
+            "  SELECT id, fts_fts_content.match_bm25(id, 'sandbox root') AS score"
+            "  FROM fts.content"
+            ") WHERE score IS NOT NULL ORDER BY score DESC, id LIMIT 50"
+        ).fetchall()
+        assert [r[0] for r in rows] == [r[0] for r in expected]
+        assert [r[1] for r in rows] == pytest.approx([r[1] for r in expected])
+
+    def test_filter_by_file_pattern(self, fts_populated):
+        paths = fts_populated.execute(
+            "SELECT DISTINCT file_path FROM search_content("
+            "'connect', file_pattern := 'fledgling/**/*.py')"
+        ).fetchall()
+        assert paths
+        assert all("/fledgling/" in p and p.endswith(".py") for (p,) in paths)
+
+    def test_file_pattern_literal_after_globstar(self, fts_populated):
+        paths = fts_populated.execute(
+            "SELECT DISTINCT file_path FROM search_content("
+            "'blob', file_pattern := 'fledgling/**/objects.py')"
+        ).fetchall()
+        assert [p for (p,) in paths] == [
+            PROJECT_ROOT + "/fledgling/git/objects.py"
+        ]
+
+    def test_conjunctive_requires_every_term(self, fts_populated):
+        rows = fts_populated.execute(
+            "SELECT lower(text) FROM search_content("
+            "'sandbox lockdown', conjunctive := true, limit_n := 100)"
+        ).fetchall()
+        assert rows
+        assert all("sandbox" in t and "lockdown" in t for (t,) in rows)
+
     def test_score_column_present(self, fts_populated):
         desc = fts_populated.execute(
             "DESCRIBE SELECT * FROM search_content('test')"
@@ -158,6 +352,121 @@ class TestSearchContent:
         assert "file_path" in col_names
 
 
+class TestFtsSnippet:
+    def test_window_around_hits(self, fts_populated):
+        (snippet,) = fts_populated.execute(
+            "SELECT fts_snippet("
+            "  'one two three four five six seven eight nine ten sandbox "
+            "   eleven twelve thirteen fourteen fifteen', 'sandbox', width := 5)"
+        ).fetchone()
+        assert snippet == "… nine ten **sandbox** eleven twelve …"
+
+    def test_stemmed_match_and_no_mark(self, fts_populated):
+        (snippet,) = fts_populated.execute(
+            "SELECT fts_snippet('Open connections, then close them.', "
+            "'connection', mark := '')"
+        ).fetchone()
+        assert snippet == "Open connections, then close them."
+        (marked,) = fts_populated.execute(
+            "SELECT fts_snippet('Open connections, then close them.', 'connection')"
+        ).fetchone()
+        assert marked == "Open **connections**, then close them."
+
+    def test_no_match_leads_with_start(self, fts_populated):
+        (snippet,) = fts_populated.execute(
+            "SELECT fts_snippet('alpha beta gamma delta', ?, width := 2)",
+            ["q" * 25],
+        ).fetchone()
+        assert snippet == "alpha beta …"
+
+    def test_bounded_on_search_results(self, fts_populated):
+        rows = fts_populated.execute(
+            "SELECT text, fts_snippet(text, 'sandbox', width := 10) "
+            "FROM search_docs('sandbox', limit_n := 5)"
+        ).fetchall()
+        assert rows
+        for text, snippet in rows:
+            assert "**" in snippet
+            assert len(snippet.replace("… ", "").split()) <= 10
+
+
+class TestSubtokens:
+    def test_camel_split_and_snake_joined(self, fts_macros):
+        (terms,) = fts_macros.execute(
+            "SELECT _fts_subtokens('def parseConfig(retry_policy, HTTPServer):')"
+        ).fetchone()
+        assert sorted(terms.split()) == sorted(
+            ["parse", "Config", "retrypolicy", "HTTP", "Server"]
+        )
+
+    def test_plain_words_add_nothing(self, fts_macros):
+        assert fts_macros.execute(
+            "SELECT _fts_subtokens('plain words __init__ here')"
+        ).fetchone() == ("",)
+
+    def test_indexed_for_code_rows(self, fts_populated):
+        (subtokens,) = fts_populated.execute(
+            "SELECT subtokens FROM fts.content "
+            "WHERE kind = 'definition' AND name = 'load_sql_matching' LIMIT 1"
+        ).fetchone()
+        assert "loadsqlmatching" in subtokens.split()
+        assert fts_populated.execute(
+            "SELECT count(*) FROM fts.content "
+            "WHERE extractor = 'markdown' AND subtokens IS NOT NULL"
+        ).fetchone()[0] == 0
+
+    def test_other_spelling_finds_definition(self, fts_populated):
+        names = [n for (n,) in fts_populated.execute(
+            "SELECT name FROM search_code('loadSqlMatching', "
+            "filter_kind := 'definition')"
+        ).fetchall()]
+        assert "load_sql_matching" in names
+
+
+class TestSearchSymbols:
+    def test_tolerates_typos(self, fts_populated):
+        rows = fts_populated.execute(
+            "SELECT name, similarity FROM search_symbols('load_sql_matchng')"
+        ).fetchall()
+        assert rows[0][0] == "load_sql_matching"
+        assert 0.3 <= rows[0][1] < 1
+
+    def test_ignores_case_and_separators(self, fts_populated):
+        (name, similarity), *_ = fts_populated.execute(
+            "SELECT name, similarity FROM search_symbols('LoadSqlMatching')"
+        ).fetchall()
+        assert (name, similarity) == ("load_sql_matching", 1)
+
+    def test_ordered_and_thresholded(self, fts_populated):
+        scores = [s for (s,) in fts_populated.execute(
+            "SELECT similarity FROM search_symbols('connect', min_similarity := 0.5)"
+        ).fetchall()]
+        assert scores == sorted(scores, reverse=True)
+        assert all(s >= 0.5 for s in scores)
+
+    def test_file_pattern(self, fts_populated):
+        paths = fts_populated.execute(
+            "SELECT file_path FROM search_symbols('load_sql', "
+            "file_pattern := 'tests/**/*.py')"
+        ).fetchall()
+        assert paths
+        assert all("/tests/" in p for (p,) in paths)
+
+    def test_file_pattern_literal_after_globstar(self, fts_populated):
+        paths = fts_populated.execute(
+            "SELECT DISTINCT file_path FROM search_symbols('read_blob', "
+            "file_pattern := 'fledgling/**/objects.py')"
+        ).fetchall()
+        assert [p for (p,) in paths] == [
+            PROJECT_ROOT + "/fledgling/git/objects.py"
+        ]
+
+    def test_no_match(self, fts_populated):
+        assert fts_populated.execute(
+            "SELECT * FROM search_symbols(?)", ["q" * 25]
+        ).fetchall() == []
+
+
 # ── search_docs ──────────────────────────────────────────────────────
 
 
@@ -273,3 +582,77 @@ class TestFindCodeRanked:
         assert "name" in cols
         assert "kind" in cols
         assert "score" in cols
+
+    def test_scores_match_match_bm25(self, fts_populated):
+        rows = fts_populated.execute(
+            "SELECT r.score, fts_fts_content.match_bm25(c.id, 'function callers') "
+            "FROM find_code_ranked(?, '.func', 'function callers') r "
+            "JOIN fts.content c ON c.file_path = r.file_path "
+            "  AND c.start_line = r.start_line AND c.name = r.name",
+            [self.PY_GLOB],
+        ).fetchall()
+        assert rows
+        for score, expected in rows:
+            assert score == pytest.approx(expected)
+
+
+class TestFindCodeRankedPushdown:
+    @pytest.fixture
+    def project(self, tmp_path):
+        for i in range(6):
+            (tmp_path / f"m{i}.py").write_text(
+                f"def alpha_{i}():\n    return {i}\n"
+            )
+        (tmp_path / "m3.py").write_text(
+            "def zebra_handler():\n    return 3\n\n\ndef alpha_3():\n    return 3\n"
+        )
+        return tmp_path
+
+    @pytest.fixture
+    def fledgling_con(self, project):
+        from fledgling.connection import connect
+        con = connect(root=str(project), init=False,
+                      modules=["sandbox", "code", "docs", "fts"])
+        con.rebuild_fts()
+        return con
+
+    def _macro(self, con, pattern, query):
+        return con.execute(
+            "SELECT * FROM find_code_ranked(?, '.func', ?)", [pattern, query]
+        ).fetchall()
+
+    def test_selective_query_parses_candidates_only(self, fledgling_con, project):
+        pattern = str(project) + "/**/*.py"
+        rel = fledgling_con.find_code_ranked(pattern, ".func", "zebra")
+        assert "find_code_ranked(" not in rel.sql_query()
+        assert str(project / "m3.py") in rel.sql_query()
+        rows = rel.fetchall()
+        assert [r[3] for r in rows] == ["zebra_handler"]
+        assert rows == self._macro(fledgling_con, pattern, "zebra")
+
+    def test_broad_query_falls_back(self, fledgling_con, project):
+        pattern = str(project) + "/**/*.py"
+        rel = fledgling_con.find_code_ranked(pattern, ".func", "alpha")
+        assert "find_code_ranked(" in rel.sql_query()
+        rows = rel.fetchall()
+        assert len(rows) == 6
+        assert rows == self._macro(fledgling_con, pattern, "alpha")
+
+    def test_no_candidates(self, fledgling_con, project):
+        pattern = str(project) + "/**/*.py"
+        rel = fledgling_con.find_code_ranked(pattern, ".func", "q" * 25)
+        assert "find_code_ranked(" not in rel.sql_query()
+        assert rel.fetchall() == []
+        assert rel.columns == [
+            "file_path", "start_line", "end_line", "name",
+            "kind", "node_type", "peek", "score",
+        ]
+        assert rel.types == [
+            "VARCHAR", "INTEGER", "INTEGER", "VARCHAR",
+            "VARCHAR", "VARCHAR", "VARCHAR", "DOUBLE",
+        ]
+
+    def test_relative_pattern_resolves_against_root(self, fledgling_con, project):
+        rel = fledgling_con.find_code_ranked("**/*.py", ".func", "zebra")
+        assert str(project / "m3.py") in rel.sql_query()
+        assert [r[3] for r in rel.fetchall()] == ["zebra_handler"]
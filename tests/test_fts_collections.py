@@ -141,6 +141,59 @@ class TestSearchCollection:
             fledgling_con.search_collection("nonexistent", "query")
 
 
+class TestSearchCollectionMany:
+    @pytest.fixture
+    def collection(self, fledgling_con):
+        fledgling_con.create_fts_collection("many_test", """
+            SELECT '1' AS id, 'the quick brown fox' AS text, map{} AS metadata
+            UNION ALL
+            SELECT '2', 'lazy dog sleeping', map{}
+            UNION ALL
+            SELECT '3', 'quick fox jumping over the lazy dog', map{}
+        """)
+        return fledgling_con
+
+    def test_matches_single_searches(self, collection):
+        queries = ["quick fox", "lazy dog", "sleeping"]
+        results = collection.search_collection_many("many_test", queries)
+        assert list(results) == queries
+        for query in queries:
+            single = collection.search_collection("many_test", query)
+            assert [r[0] for r in results[query]] == [r[0] for r in single]
+            assert results[query] == single
+
+    def test_scores_match_match_bm25(self, collection):
+        (row,) = collection.search_collection_many(
+            "many_test", ["sleeping"]
+        )["sleeping"]
+        expected = collection.execute(
+            "SELECT fts_fts_many_test.match_bm25('2', 'sleeping')"
+        ).fetchone()[0]
+        assert row[0] == "2"
+        assert row[3] == pytest.approx(expected)
+
+    def test_limit_per_query(self, collection):
+        results = collection.search_collection_many(
+            "many_test", ["quick", "lazy dog"], limit=1
+        )
+        assert [len(rows) for rows in results.values()] == [1, 1]
+
+    def test_unmatched_and_duplicate_queries(self, collection):
+        fake = "q" * 25
+        results = collection.search_collection_many(
+            "many_test", [fake, "quick", fake]
+        )
+        assert list(results) == [fake, "quick"]
+        assert results[fake] == []
+
+    def test_no_queries(self, collection):
+        assert collection.search_collection_many("many_test", []) == {}
+
+    def test_invalid_name(self, fledgling_con):
+        with pytest.raises(ValueError):
+            fledgling_con.search_collection_many("bad-name", ["x"])
+
+
 class TestContentCollectionCatalog:
     def test_rebuild_registers_content_in_catalog(self, fledgling_con):
         fledgling_con.rebuild_fts(
@@ -0,0 +1,245 @@
+"""Tests for the blob-hash-keyed AST cache (fledgling.git.astcache)."""
+
+import os
+
+import pytest
+
+from conftest import load_sql_matching
+from fledgling.git import AstCache, BlobCache, GitRepo, blob_hash, language_for
+
+
+class TestBlobHash:
+
+    def test_matches_git_hash_object(self, scratch_repo):
+        scratch_repo.write("x.py", "print('hi')\n")
+        expected = scratch_repo.git("hash-object", "x.py")
+        assert blob_hash(b"print('hi')\n") == expected
+
+    def test_empty(self):
+        assert blob_hash(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+class TestLanguageFor:
+
+    def test_known_extensions(self):
+        assert language_for("src/app.py") == "python"
+        assert language_for("web/index.tsx") == "tsx"
+
+    def test_unknown_extension(self):
+        assert language_for("Makefile") is None
+
+
+V1 = "def keep():\n    return 1\n\ndef change():\n    return 1\n"
+V2 = ("def keep():\n    return 1\n\ndef change():\n"
+      "    if True:\n        return 2\n    return 1\n\ndef new():\n    pass\n")
+
+
+@pytest.fixture
+def ast_env(structural_macros, scratch_repo):
+    """(con, repo, cache, base, head) with app.py changed and lib.py not."""
+    r = scratch_repo
+    base = r.commit("v1", files={"app.py": V1, "lib.py": "def util():\n    pass\n"})
+    head = r.commit("v2", files={"app.py": V2})
+    repo = GitRepo(r.path)
+    cache = AstCache(structural_macros, BlobCache())
+    yield structural_macros, r, repo, cache, base, head
+    repo.close()
+
+
+class TestStore:
+
+    @pytest.fixture
+    def cache(self):
+        import duckdb
+        con = duckdb.connect(":memory:")
+        load_sql_matching(con, "structural.sql", "SCHEMA IF NOT EXISTS ast_cache")
+        load_sql_matching(con, "structural.sql", "TABLE IF NOT EXISTS ast_cache")
+        yield AstCache(con, BlobCache())
+        con.close()
+
+    ROWS = [(1, "f", "function", 1, 2, 3, 1, 1, "h1"),
+            (5, "g", "function", 4, 5, 3, 1, 1, "h2")]
+
+    def count(self, cache, table):
+        return cache._con.execute(
+            f"SELECT count(*) FROM ast_cache.{table}").fetchone()[0]
+
+    def test_stores_once(self, cache):
+        assert cache._store(cache._con, "abc", "python", self.ROWS)
+        assert not cache._store(cache._con, "abc", "python", self.ROWS)
+        assert self.count(cache, "definitions") == 2
+        assert cache.parses == 1
+
+    def test_concurrent_cursors_store_once(self, cache):
+        import threading
+        cursors = [cache._con.cursor() for _ in range(8)]
+        threads = [
+            threading.Thread(
+                target=cache._store, args=(cur, "abc", "python", self.ROWS),
+            )
+            for cur in cursors
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert self.count(cache, "definitions") == 2
+        assert self.count(cache, "blobs") == 1
+        assert cache.parses == 1
+
+
+class TestChangedEntries:
+    """Pattern handling shared by the engine-backed structural methods."""
+
+    @pytest.fixture
+    def entries_con(self, scratch_repo):
+        import duckdb
+        from fledgling.connection import Connection
+        r = scratch_repo
+        base = r.commit("v1", files={"src/pkg/a.py": "x = 1\n", "Makefile": "all:\n"})
+        r.commit("v2", files={"src/pkg/a.py": "x = 2\n", "Makefile": "all: a\n"})
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        load_sql_matching(raw, "structural.sql", "SCHEMA IF NOT EXISTS ast_cache")
+        load_sql_matching(raw, "structural.sql", "TABLE IF NOT EXISTS ast_cache")
+        con = Connection(raw)
+        # Pre-cache the new blob so no parse (and no sitting_duck) is needed.
+        new_blob = con._repo(".").blob_at("HEAD", "src/pkg/a.py")
+        raw.execute("INSERT INTO ast_cache.blobs (blob_hash, language) "
+                    "VALUES (?, 'python')", [new_blob])
+        yield con, r, base
+        raw.close()
+
+    def entries(self, con, base, pattern):
+        from fledgling.git import diff_trees
+        changes = diff_trees(con._repo("."), base, "HEAD", sizes=False)
+        return [e["file_path"] for e in con._changed_entries(changes, pattern, ".")]
+
+    def test_absolute_pattern_rebased(self, entries_con):
+        con, r, base = entries_con
+        pattern = os.path.join(r.path, "src", "**", "*.py")
+        assert self.entries(con, base, pattern) == ["src/pkg/a.py"]
+        assert self.entries(con, base, "src/**/*.py") == ["src/pkg/a.py"]
+
+    def test_unmapped_language_skipped(self, entries_con):
+        con, _, base = entries_con
+        assert self.entries(con, base, "**") == ["src/pkg/a.py"]
+        assert con._asts.parses == 0
+
+
+class TestAstCache:
+
+    def test_unchanged_file_parsed_once(self, ast_env):
+        _, _, repo, cache, base, head = ast_env
+        a = cache.ensure_at(repo, base, "lib.py")
+        b = cache.ensure_at(repo, head, "lib.py")
+        assert a == b
+        assert cache.parses == 1
+
+    def test_definitions_stored(self, ast_env):
+        con, _, repo, cache, _, head = ast_env
+        sha = cache.ensure_at(repo, head, "app.py")
+        names = {r[0] for r in con.execute(
+            "SELECT name FROM ast_cache.definitions WHERE blob_hash = ?", [sha],
+        ).fetchall()}
+        assert {"keep", "change", "new"} <= names
+
+    def test_structural_diff_blobs(self, ast_env):
+        con, _, repo, cache, base, head = ast_env
+        old = cache.ensure_at(repo, base, "app.py")
+        new = cache.ensure_at(repo, head, "app.py")
+        rows = {r[0]: r[2] for r in con.execute(
+            "SELECT * FROM _structural_diff_blobs(?, ?)", [old, new],
+        ).fetchall()}
+        assert rows.get("new") == "added"
+        assert rows.get("change") == "modified"
+        assert "keep" not in rows
+
+    def test_missing_path_is_empty_blob(self, ast_env):
+        con, _, repo, cache, base, head = ast_env
+        old = cache.ensure_at(repo, base, "gone.py")
+        new = cache.ensure_at(repo, head, "app.py")
+        kinds = {r[2] for r in con.execute(
+            "SELECT * FROM _structural_diff_blobs(?, ?)", [old, new],
+        ).fetchall()}
+        assert kinds == {"added"}
+
+    def test_same_shape_edit_is_modified(self, ast_env):
+        con, r, repo, cache, _, head = ast_env
+        edited = r.commit("v3", files={"app.py": V2.replace("return 2", "return 3")})
+        old = cache.ensure_at(repo, head, "app.py")
+        new = cache.ensure_at(repo, edited, "app.py")
+        rows = {row[0]: row[2] for row in con.execute(
+            "SELECT * FROM _structural_diff_blobs(?, ?)", [old, new],
+        ).fetchall()}
+        assert rows == {"change": "modified"}
+
+    def test_rename_detected(self, ast_env):
+        con, r, repo, cache, _, head = ast_env
+        renamed = r.commit("v3", files={"app.py": V2.replace("def change", "def altered")})
+        old = cache.ensure_at(repo, head, "app.py")
+        new = cache.ensure_at(repo, renamed, "app.py")
+        rows = con.execute(
+            "SELECT name, change, old_name FROM _structural_diff_blobs(?, ?)",
+            [old, new],
+        ).fetchall()
+        assert rows == [("altered", "renamed", "change")]
+
+
+class TestStructuralDiffRange:
+
+    @pytest.fixture
+    def range_con(self, ast_env):
+        from fledgling.connection import Connection
+        con, r, _, _, base, head = ast_env
+        con.execute("SET VARIABLE session_root = ?", [r.path])
+        return Connection(con), base, head
+
+    def test_covers_all_changed_files(self, range_con):
+        con, base, head = range_con
+        rows = con.structural_diff_range(base, head, "**/*.py").fetchall()
+        by_name = {(r[0], r[1]): r[3] for r in rows}
+        assert by_name[("app.py", "new")] == "added"
+        assert by_name[("app.py", "change")] == "modified"
+        assert not any(r[0] == "lib.py" for r in rows)
+
+    def test_pattern_filters_files(self, range_con):
+        con, base, head = range_con
+        assert con.structural_diff_range(base, head, "src/**/*.py").fetchall() == []
+
+    def test_blobs_parsed_once(self, range_con):
+        con, base, head = range_con
+        con.structural_diff_range(base, head, "**/*.py", max_workers=4).fetchall()
+        parses = con._asts.parses
+        con.structural_diff_range(base, head, "**/*.py", max_workers=4).fetchall()
+        assert con._asts.parses == parses == 2
+
+
+class TestChangedFunctionSummary:
+
+    @pytest.fixture
+    def summary_con(self, ast_env):
+        from fledgling.connection import Connection
+        con, r, _, _, base, head = ast_env
+        con.execute("SET VARIABLE session_root = ?", [r.path])
+        load_sql_matching(con, "workflows.sql", "_review_query_cached")
+        return Connection(con), base, head
+
+    def test_parses_only_changed_files(self, summary_con):
+        con, base, head = summary_con
+        rows = con.changed_function_summary(base, head, "**/*.py").fetchall()
+        assert {r[0] for r in rows} == {"app.py"}
+        assert {"keep", "change", "new"} <= {r[1] for r in rows}
+        assert con._asts.parses == 1  # lib.py untouched
+
+    def test_pattern_intersected_before_parsing(self, summary_con):
+        con, base, head = summary_con
+        assert con.changed_function_summary(base, head, "src/**/*.py").fetchall() == []
+        assert con._asts.parses == 0
+
+    def test_review_query_uses_cache(self, summary_con):
+        con, base, head = summary_con
+        (result,) = con.review_query(base, head, "**/*.py").fetchone()
+        assert [c["file_path"] for c in result["changed_files"]] == ["app.py"]
+        assert {f["name"] for f in result["function_summary"]} >= {"change", "new"}
+        assert con._asts.parses == 1
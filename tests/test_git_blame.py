@@ -0,0 +1,170 @@
+"""Tests for the incremental blame engine (fledgling.git.blame)."""
+
+import subprocess
+
+import duckdb
+import pytest
+
+from conftest import load_sql_matching
+from fledgling.git import BlameEngine, BlobCache, GitRepo
+from fledgling.git.blame import split_lines
+
+
+@pytest.fixture
+def blame(scratch_repo):
+    con = duckdb.connect()
+    load_sql_matching(con, "repo.sql", "blame_cache")
+    repo = GitRepo(scratch_repo.path)
+    engine = BlameEngine(repo, con, BlobCache())
+    yield scratch_repo, engine, con
+    repo.close()
+    con.close()
+
+
+def _rows(con, path, commit, text):
+    return con.execute(
+        "SELECT line_number, hash, author, original_line, content "
+        "FROM _file_blame_for(?, ?, ?)", [path, commit, text],
+    ).fetchall()
+
+
+def _git_blame(r, path, rev="HEAD"):
+    """{line_number: (commit, original_line)} from git blame --porcelain."""
+    out = subprocess.run(
+        ["git", "-C", r.path, "blame", "--porcelain", rev, "--", path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = {}
+    for line in out.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and len(parts[0]) == 40 and parts[1].isdigit():
+            result[int(parts[2])] = (parts[0], int(parts[1]))
+    return result
+
+
+def _origins(con, path, commit):
+    return {
+        n: (c, o) for n, c, o in con.execute(
+            "SELECT line_number, origin_commit, origin_line "
+            "FROM blame_cache.lines WHERE path = ? AND commit_sha = ?",
+            [path, commit],
+        ).fetchall()
+    }
+
+
+class TestSplitLines:
+    def test_trailing_newline(self):
+        assert split_lines(b"a\nb\n") == ["a", "b"]
+
+    def test_no_trailing_newline(self):
+        assert split_lines(b"a\nb") == ["a", "b"]
+
+    def test_empty(self):
+        assert split_lines(b"") == []
+
+
+class TestBlameEngine:
+    def test_matches_git_blame(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\nb\nc\n"})
+        r.commit("two", files={"f.py": "a\nB\nc\nd\n"})
+        r.commit("other", files={"g.py": "x\n"})
+        r.commit("three", files={"f.py": "z\na\nB\nd\n"})
+        _, commit = engine.blame("f.py")
+        assert _origins(con, "f.py", commit) == _git_blame(r, "f.py")
+
+    def test_dropped_trailing_newline(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\nb\n"})
+        r.commit("two", files={"f.py": "a\nb"})
+        _, commit = engine.blame("f.py")
+        assert _origins(con, "f.py", commit) == _git_blame(r, "f.py")
+
+    def test_target_is_last_touching_commit(self, blame):
+        r, engine, _ = blame
+        r.commit("one", files={"f.py": "a\n"})
+        touched = r.git("rev-parse", "HEAD").strip()
+        r.commit("other", files={"g.py": "x\n"})
+        _, commit = engine.blame("f.py")
+        assert commit == touched
+
+    def test_later_revision_only_diffs_new_commits(self, blame):
+        r, engine, con = blame
+        for i in range(5):
+            r.commit(f"c{i}", files={"f.py": "".join(f"{j}\n" for j in range(i + 1))})
+        engine.blame("f.py", "HEAD~1")
+        first = engine.diffs
+        assert first == 3
+        _, commit = engine.blame("f.py")
+        assert engine.diffs == first + 1
+        assert _origins(con, "f.py", commit) == _git_blame(r, "f.py")
+
+    def test_repeat_is_cache_hit(self, blame):
+        r, engine, _ = blame
+        r.commit("one", files={"f.py": "a\n"})
+        r.commit("two", files={"f.py": "a\nb\n"})
+        engine.blame("f.py")
+        diffs = engine.diffs
+        engine.blame("f.py")
+        assert engine.diffs == diffs
+
+    def test_merge(self, blame):
+        r, engine, con = blame
+        r.commit("base", files={"f.py": "a\nb\nc\n"})
+        r.git("checkout", "-q", "-b", "side")
+        r.commit("side", files={"f.py": "a\nb\nc\nside\n"})
+        r.git("checkout", "-q", "-")
+        r.commit("main", files={"f.py": "main\na\nb\nc\n"})
+        r.git("merge", "-q", "--no-edit", "side")
+        _, commit = engine.blame("f.py")
+        assert _origins(con, "f.py", commit) == _git_blame(r, "f.py")
+
+    def test_deleted_and_readded(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\n"})
+        r.commit("gone", remove=["f.py"])
+        r.commit("back", files={"f.py": "a\n"})
+        _, commit = engine.blame("f.py")
+        assert _origins(con, "f.py", commit) == {1: (commit, 1)}
+
+    def test_absent_path(self, blame):
+        r, engine, _ = blame
+        r.commit("one", files={"f.py": "a\n"})
+        assert engine.blame("missing.py") == (None, None)
+
+    def test_rows(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\n"})
+        r.commit("two", files={"f.py": "a\nb\n"})
+        head = r.git("rev-parse", "HEAD").strip()
+        _, commit = engine.blame("f.py")
+        rows = _rows(con, "f.py", commit, "a\nb\n")
+        assert [(n, o, c) for n, _, _, o, c in rows] == [(1, 1, "a"), (2, 2, "b")]
+        assert rows[1][1] == head[:8]
+        assert rows[1][2] is not None
+
+    def test_per_path_keys(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\n", "g.py": "b\n"})
+        engine.blame("f.py")
+        _, commit = engine.blame("g.py")
+        assert _origins(con, "g.py", commit) == {1: (commit, 1)}
+
+    def test_same_blob_different_history(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\n"})
+        one = r.git("rev-parse", "HEAD").strip()
+        r.commit("two", files={"f.py": "a\nb\n", "g.py": "a\nb\n"})
+        f_blob, f_commit = engine.blame("f.py")
+        g_blob, g_commit = engine.blame("g.py")
+        assert (f_blob, f_commit) == (g_blob, g_commit)
+        assert _origins(con, "f.py", f_commit)[1] == (one, 1)
+        assert _origins(con, "g.py", g_commit)[1] == (g_commit, 1)
+
+    def test_store_is_idempotent(self, blame):
+        r, engine, con = blame
+        r.commit("one", files={"f.py": "a\nb\n"})
+        _, commit = engine.blame("f.py")
+        engine._store("f.py", {commit: engine._load("f.py", commit, {commit: "x"})})
+        (n,) = con.execute("SELECT count(*) FROM blame_cache.lines").fetchone()
+        assert n == 2
@@ -0,0 +1,150 @@
+"""Tests for the content-addressed blob cache (fledgling.git.blobcache)."""
+
+import os
+
+import duckdb
+import pytest
+
+from fledgling.git import EMPTY_BLOB, BlobCache, GitRepo
+
+
+@pytest.fixture
+def blobs(scratch_repo):
+    """A repo with three blobs of known size; yields (repo, {path: sha})."""
+    r = scratch_repo
+    r.commit("files", files={
+        "a.py": "a" * 100,
+        "b.py": "b" * 100,
+        "c.py": "c" * 100,
+    })
+    with GitRepo(r.path) as repo:
+        shas = {p: repo.blob_at("HEAD", p) for p in ("a.py", "b.py", "c.py")}
+        yield repo, shas
+
+
+class TestMemoryCache:
+
+    def test_hit_after_miss(self, blobs):
+        repo, shas = blobs
+        cache = BlobCache()
+        assert cache.get(repo, shas["a.py"]) == b"a" * 100
+        assert cache.get(repo, shas["a.py"]) == b"a" * 100
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_counters_under_concurrency(self, blobs):
+        from concurrent.futures import ThreadPoolExecutor
+        repo, shas = blobs
+        cache = BlobCache(max_bytes=150)
+        reads = list(shas.values()) * 100
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda sha: cache.get(repo, sha), reads))
+        assert cache.hits + cache.misses == len(reads)
+
+    def test_byte_budget_evicts_lru(self, blobs):
+        repo, shas = blobs
+        cache = BlobCache(max_bytes=250)
+        cache.get(repo, shas["a.py"])
+        cache.get(repo, shas["b.py"])
+        cache.get(repo, shas["a.py"])  # a is now most recent
+        cache.get(repo, shas["c.py"])
+        assert shas["b.py"] not in cache
+        assert shas["a.py"] in cache
+        assert cache.size_bytes == 200
+
+    def test_oversized_blob_not_held(self, blobs):
+        repo, shas = blobs
+        cache = BlobCache(max_bytes=50)
+        assert cache.get(repo, shas["a.py"]) == b"a" * 100
+        assert len(cache) == 0
+
+    def test_get_at(self, blobs):
+        repo, _ = blobs
+        cache = BlobCache()
+        assert cache.get_at(repo, "HEAD", "b.py") == b"b" * 100
+        assert cache.get_at(repo, "HEAD", "missing.py") is None
+
+    def test_empty_blob_needs_no_object(self, blobs):
+        repo, _ = blobs
+        assert BlobCache().get(repo, EMPTY_BLOB) == b""
+
+
+class TestSpill:
+
+    def test_evicted_blob_spilled_and_reloaded(self, blobs, tmp_path):
+        repo, shas = blobs
+        cache = BlobCache(max_bytes=150, spill_dir=str(tmp_path / "spill"))
+        cache.get(repo, shas["a.py"])
+        cache.get(repo, shas["b.py"])  # evicts a → disk
+        sha = shas["a.py"]
+        assert os.path.exists(tmp_path / "spill" / sha[:2] / sha[2:])
+        assert cache.get(repo, sha) == b"a" * 100
+        assert cache.misses == 2
+
+    def test_materialize_keeps_suffix(self, blobs, tmp_path):
+        repo, shas = blobs
+        cache = BlobCache(spill_dir=str(tmp_path / "spill"))
+        path = cache.materialize(repo, shas["c.py"], suffix=".py")
+        assert path.endswith(".py")
+        with open(path, "rb") as f:
+            assert f.read() == b"c" * 100
+        assert cache.materialize(repo, shas["c.py"], suffix=".py") == path
+
+    def test_materialize_directory_without_spill(self, blobs, tmp_path):
+        repo, shas = blobs
+        cache = BlobCache()
+        path = cache.materialize(repo, shas["a.py"], ".py", directory=str(tmp_path))
+        assert path.startswith(str(tmp_path))
+        assert cache._find_spilled(shas["a.py"]) is None
+
+    def test_spilled_copy_shared_across_instances(self, blobs, tmp_path):
+        repo, shas = blobs
+        spill = str(tmp_path / "spill")
+        BlobCache(spill_dir=spill).materialize(repo, shas["a.py"], ".py")
+        fresh = BlobCache(spill_dir=spill)
+        assert fresh.get(repo, shas["a.py"]) == b"a" * 100
+        assert fresh.misses == 0
+
+
+class TestConnectionFileAtVersion:
+
+    @pytest.fixture
+    def fcon(self, scratch_repo):
+        from fledgling.connection import Connection
+        r = scratch_repo
+        old = r.commit("v1", files={"notes.txt": "first\n"})
+        r.commit("v2", files={"notes.txt": "second\n"})
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        yield Connection(raw), r, old
+        raw.close()
+
+    def test_reads_old_revision(self, fcon):
+        con, _, old = fcon
+        rows = con.file_at_version("notes.txt", old).fetchall()
+        assert rows == [("notes.txt", old, 6, "first\n")]
+
+    def test_missing_file_no_rows(self, fcon):
+        con, _, _ = fcon
+        assert con.file_at_version("nope.txt", "HEAD").fetchall() == []
+
+    def test_repeat_reads_hit_cache(self, fcon):
+        con, _, _ = fcon
+        con.file_at_version("notes.txt", "HEAD").fetchall()
+        con.file_at_version("notes.txt", "HEAD").fetchall()
+        assert con._blobs.stats()["hits"] == 1
+
+    def test_no_spill_by_default(self, fcon):
+        con, r, _ = fcon
+        con.file_at_version("notes.txt", "HEAD").fetchall()
+        assert con._blobs.spill_dir is None
+        assert not os.path.exists(os.path.join(r.path, ".fledgling"))
+
+    def test_spill_blobs_dir_is_ignored_by_git(self, fcon):
+        con, r, _ = fcon
+        path = con.spill_blobs()
+        assert path == os.path.join(r.path, ".fledgling", "cache", "blobs")
+        assert con._blobs.spill_dir == path
+        con._blobs.max_bytes = 0
+        con.file_at_version("notes.txt", "HEAD").fetchall()
+        assert os.listdir(path)
+        assert r.git("status", "--porcelain") == ""
@@ -0,0 +1,46 @@
+"""Tests for normalized definition body hashes (fledgling.git.bodyhash)."""
+
+from fledgling.git import body_hash
+from fledgling.git.bodyhash import tokens
+
+F = "def f(x):\n    return x + 1\n"
+
+
+class TestTokens:
+    def test_whitespace_and_comments_dropped(self):
+        assert tokens("a  =  b # note\n", "python") == ["a", "=", "b"]
+
+    def test_comment_marker_inside_string_kept(self):
+        assert tokens('s = "a # b"', "python") == ["s", "=", '"a # b"']
+
+    def test_c_family_comments(self):
+        src = "int f() { /* block\n */ return 1; // line\n}"
+        assert tokens(src, "c") == ["int", "f", "(", ")", "{", "return", "1", ";", "}"]
+
+    def test_sql_comments(self):
+        assert tokens("SELECT 1 -- one\n", "sql") == ["SELECT", "1"]
+
+    def test_triple_quoted_string_is_one_token(self):
+        assert tokens('"""doc\n# not a comment"""', "python") == ['"""doc\n# not a comment"""']
+
+
+class TestBodyHash:
+    def test_reformat_and_comments_keep_hash(self):
+        reformatted = "def f( x ):\n\n    # add one\n    return x+1\n"
+        assert body_hash(F, "f", "python") == body_hash(reformatted, "f", "python")
+
+    def test_token_edit_changes_hash(self):
+        edited = "def f(x):\n    return x - 1\n"
+        assert body_hash(F, "f", "python") != body_hash(edited, "f", "python")
+
+    def test_rename_keeps_hash(self):
+        renamed = "def g(x):\n    return x + 1\n"
+        assert body_hash(F, "f", "python") == body_hash(renamed, "g", "python")
+
+    def test_recursive_rename_keeps_hash(self):
+        a = "def fact(n):\n    return 1 if n < 2 else n * fact(n - 1)\n"
+        b = "def factorial(n):\n    return 1 if n < 2 else n * factorial(n - 1)\n"
+        assert body_hash(a, "fact", "python") == body_hash(b, "factorial", "python")
+
+    def test_string_whitespace_matters(self):
+        assert body_hash('x = "a b"', "x", "python") != body_hash('x = "a  b"', "x", "python")
@@ -0,0 +1,93 @@
+"""Tests for the single-pass churn walk (fledgling.git.churn)."""
+
+import pytest
+
+from fledgling.git import BlobCache, GitRepo, range_touches
+from fledgling.git.churn import line_changes
+
+
+@pytest.fixture
+def history(scratch_repo):
+    r = scratch_repo
+    r.commit("base", files={"src/a.py": "def f():\n    return 1\n", "notes.txt": "x\n"})
+    since = r.git("rev-parse", "HEAD").strip()
+    r.commit("edit f", files={"src/a.py": "def f():\n    return 2\n"})
+    r.commit("add g", files={
+        "src/a.py": "def f():\n    return 2\n\ndef g():\n    pass\n",
+        "src/b.py": "X = 1\n",
+        "notes.txt": "y\n",
+    })
+    r.commit("drop b", remove=["src/b.py"])
+    repo = GitRepo(r.path)
+    yield r, repo, since
+    repo.close()
+
+
+class TestLineChanges:
+    def test_replace(self):
+        assert line_changes(["a", "b", "c"], ["a", "B", "c"]) == (1, 1, ((2, 2),))
+
+    def test_insert(self):
+        assert line_changes(["a"], ["a", "b", "c"]) == (2, 0, ((2, 3),))
+
+    def test_delete_marks_neighbours(self):
+        assert line_changes(["a", "b", "c"], ["a", "c"]) == (0, 1, ((1, 2),))
+
+    def test_delete_at_start(self):
+        assert line_changes(["a", "b"], ["b"]) == (0, 1, ((1, 1),))
+
+    def test_new_file(self):
+        assert line_changes([], ["a", "b"]) == (2, 0, ((1, 2),))
+
+    def test_unchanged(self):
+        assert line_changes(["a"], ["a"]) == (0, 0, ())
+
+
+class TestRangeTouches:
+    def test_touches_since(self, history):
+        _, repo, since = history
+        count, touches = range_touches(repo, BlobCache(), since, "HEAD", "**/*.py")
+        assert count == 3
+        assert sorted((t.file_path, t.added, t.removed) for t in touches) == [
+            ("src/a.py", 1, 1),
+            ("src/a.py", 3, 0),
+            ("src/b.py", 1, 0),
+        ]
+
+    def test_pattern_and_language_filter(self, history):
+        _, repo, since = history
+        _, touches = range_touches(repo, BlobCache(), since, "HEAD", "**/*")
+        assert "notes.txt" not in {t.file_path for t in touches}
+        _, touches = range_touches(repo, BlobCache(), since, "HEAD", "src/b.py")
+        assert {t.file_path for t in touches} == {"src/b.py"}
+
+    def test_root_commit_diffs_against_empty_tree(self, history):
+        r, repo, _ = history
+        # An unrelated orphan commit as `since` puts the root in range.
+        branch = r.git("rev-parse", "--abbrev-ref", "HEAD").strip()
+        r.git("checkout", "-q", "--orphan", "other")
+        r.git("rm", "-q", "-rf", ".")
+        r.commit("orphan", files={"o.py": "O = 1\n"})
+        orphan = r.git("rev-parse", "HEAD").strip()
+        r.git("checkout", "-q", "-f", branch)
+        count, touches = range_touches(repo, BlobCache(), orphan, "HEAD", "src/a.py")
+        assert count == 4
+        assert min(t.added for t in touches) == 1
+        assert ("src/a.py", 2, 0) in {(t.file_path, t.added, t.removed) for t in touches}
+
+    def test_merges_skipped(self, history):
+        r, repo, since = history
+        r.git("checkout", "-q", "-b", "side")
+        r.commit("side", files={"src/c.py": "Y = 1\n"})
+        r.git("checkout", "-q", "-")
+        r.commit("main", files={"src/d.py": "Z = 1\n"})
+        r.git("merge", "-q", "--no-edit", "side")
+        count, touches = range_touches(repo, BlobCache(), since, "HEAD", "**/*.py")
+        assert count == 5
+        assert [t.file_path for t in touches].count("src/c.py") == 1
+
+    def test_as_dict(self, history):
+        _, repo, since = history
+        _, touches = range_touches(repo, BlobCache(), since, "HEAD", "src/a.py")
+        row = next(t.as_dict() for t in touches if t.added == 3)
+        assert row["hunk_start"] == [3] and row["hunk_end"] == [5]
@@ -0,0 +1,169 @@
+"""Tests for the hunk-aware line diff engine (fledgling.git.linediff)."""
+
+import duckdb
+import pytest
+
+from conftest import load_sql_matching
+from fledgling.git import BlobCache, DiffCache, GitRepo, diff_lines
+from fledgling.git.linediff import line_matcher, split_lines
+
+OLD = [f"line {i}" for i in range(1, 21)]
+
+
+class TestDiffLines:
+
+    def test_counts(self):
+        new = OLD[:4] + ["changed"] + OLD[5:] + ["tail"]
+        result = diff_lines(OLD, new)
+        assert (result.added, result.removed) == (2, 1)
+
+    def test_line_numbers(self):
+        new = OLD[:4] + ["changed"] + OLD[5:]
+        rows = diff_lines(OLD, new).lines
+        removed = next(r for r in rows if r.line_type == "REMOVED")
+        added = next(r for r in rows if r.line_type == "ADDED")
+        assert (removed.old_line, removed.new_line, removed.content) == (5, None, "line 5")
+        assert (added.old_line, added.new_line, added.content) == (None, 5, "changed")
+        context = [r for r in rows if r.line_type == "CONTEXT"]
+        assert [(r.old_line, r.new_line) for r in context] == [
+            (2, 2), (3, 3), (4, 4), (6, 6), (7, 7), (8, 8),
+        ]
+
+    def test_hunks_split_by_distance(self):
+        new = ["first"] + OLD[1:18] + ["last"] + OLD[19:]
+        rows = diff_lines(OLD, new).lines
+        assert {r.hunk for r in rows} == {1, 2}
+        second = [r for r in rows if r.hunk == 2 and r.line_type == "ADDED"]
+        assert second[0].new_line == 19
+
+    def test_context_width(self):
+        new = OLD[:10] + ["x"] + OLD[11:]
+        rows = diff_lines(OLD, new, context=1).lines
+        assert len(rows) == 4
+
+    def test_identical(self):
+        result = diff_lines(OLD, OLD)
+        assert result.lines == () and result.added == result.removed == 0
+
+    def test_trailing_newline_is_a_change(self):
+        old = split_lines(b"a\nb\n", keepends=True)
+        new = split_lines(b"a\nb", keepends=True)
+        result = diff_lines(old, new)
+        assert (result.added, result.removed) == (1, 1)
+        assert [(r.line_type, r.content) for r in result.lines] == [
+            ("CONTEXT", "a"), ("REMOVED", "b"), ("ADDED", "b"),
+        ]
+
+    def test_large_pairs_use_autojunk(self):
+        small = ["x"] * 100
+        large = ["}"] * 3000
+        assert not line_matcher(small, small).autojunk
+        assert line_matcher(large, large + ["y"]).autojunk
+        assert diff_lines(large, large + ["y"]).added == 1
+
+
+class TestSplitLines:
+
+    def test_keepends(self):
+        assert split_lines(b"a\nb\n", keepends=True) == ["a\n", "b\n"]
+        assert split_lines(b"a\nb", keepends=True) == ["a\n", "b"]
+
+    def test_blank_last_line(self):
+        assert split_lines(b"a\n\n") == ["a", ""]
+        assert split_lines(b"\n", keepends=True) == ["\n"]
+
+
+@pytest.fixture
+def pair(scratch_repo):
+    r = scratch_repo
+    base = r.commit("v1", files={"a.py": "\n".join(OLD) + "\n", "bin.dat": "a\0b"})
+    r.commit("v2", files={
+        "a.py": "\n".join(OLD[:4] + ["changed"] + OLD[5:]) + "\n",
+        "bin.dat": "a\0c",
+        "new.py": "x = 1\n",
+    })
+    repo = GitRepo(r.path)
+    yield r, repo, base
+    repo.close()
+
+
+class TestDiffCache:
+
+    def test_cached_by_blob_pair(self, pair):
+        _, repo, base = pair
+        cache = DiffCache(BlobCache())
+        old, new = repo.blob_at(base, "a.py"), repo.blob_at("HEAD", "a.py")
+        first = cache.diff(repo, old, new)
+        assert cache.diff(repo, old, new) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_stat_survives_eviction(self, pair):
+        _, repo, base = pair
+        cache = DiffCache(BlobCache(), max_entries=1)
+        old, new = repo.blob_at(base, "a.py"), repo.blob_at("HEAD", "a.py")
+        cache.diff(repo, old, new)
+        cache.diff(repo, None, repo.blob_at("HEAD", "new.py"))
+        assert cache.stat(repo, old, new) == (1, 1, False)
+        assert cache.misses == 2
+
+    def test_binary(self, pair):
+        _, repo, base = pair
+        result = DiffCache(BlobCache()).diff(
+            repo, repo.blob_at(base, "bin.dat"), repo.blob_at("HEAD", "bin.dat"),
+        )
+        assert result.binary and result.lines == ()
+
+    def test_matches_git_numstat(self, pair):
+        r, repo, base = pair
+        cache = DiffCache(BlobCache())
+        for line in r.git("diff", "--numstat", base, "HEAD").splitlines():
+            added, removed, path = line.split("\t")
+            got = cache.stat(repo, repo.blob_at(base, path), repo.blob_at("HEAD", path))
+            if added == "-":
+                assert got[2]
+            else:
+                assert got[:2] == (int(added), int(removed))
+
+
+class TestConnectionFileDiff:
+
+    @pytest.fixture
+    def dcon(self, pair):
+        from fledgling.connection import Connection
+        r, _, base = pair
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        load_sql_matching(raw, "repo.sql", "diff_cache")
+        yield Connection(raw), base
+        raw.close()
+
+    def test_file_diff_columns(self, dcon):
+        con, base = dcon
+        rel = con.file_diff("a.py", base, "HEAD")
+        assert rel.columns == [
+            "seq", "line_type", "content", "hunk", "old_line", "new_line",
+        ]
+        rows = rel.fetchall()
+        assert ("ADDED", "changed", 1, None, 5) in [r[1:] for r in rows]
+        assert [r[0] for r in rows] == list(range(1, len(rows) + 1))
+
+    def test_file_diff_missing_file(self, dcon):
+        con, base = dcon
+        assert con.file_diff("nope.py", base, "HEAD").fetchall() == []
+
+    def test_file_diff_stats(self, dcon):
+        con, base = dcon
+        rows = con.file_diff_stats(base, "HEAD").fetchall()
+        assert rows == [
+            ("a.py", "modified", 1, 1, False),
+            ("bin.dat", "modified", 0, 0, True),
+            ("new.py", "added", 1, 0, False),
+        ]
+
+    def test_file_diff_stats_persisted(self, dcon):
+        con, base = dcon
+        con.file_diff_stats(base, "HEAD").fetchall()
+        assert con.execute("SELECT count(*) FROM diff_cache.stats").fetchone()[0] == 3
+        con._diff_cache = None  # drop the in-memory cache
+        con.file_diff_stats(base, "HEAD").fetchall()
+        assert con._diffs.misses == 0
@@ -0,0 +1,34 @@
+"""Tests for glob matching of repo-relative paths (fledgling.git.pathspec)."""
+
+import pytest
+
+from fledgling.git.pathspec import glob_match, repo_pattern
+
+
+@pytest.mark.parametrize("path,pattern,expected", [
+    ("app.py", "**/*.py", True),
+    ("src/pkg/app.py", "**/*.py", True),
+    ("src/app.py", "*.py", False),
+    ("src/app.py", "src/*.py", True),
+    ("src/pkg/app.py", "src/*.py", False),
+    ("src/pkg/app.py", "src/**/*.py", True),
+    ("src/app.py", "src/**/*.py", True),
+    ("lib/app.py", "src/**/*.py", False),
+    ("src/app.py", "./src/*.py", True),
+    ("a.ts", "?.ts", True),
+    ("ab.ts", "?.ts", False),
+    ("x.c", "*.[ch]", True),
+    ("x.o", "*.[!ch]", True),
+    ("docs/a.md", "docs/**", True),
+])
+def test_glob_match(path, pattern, expected):
+    assert glob_match(path, pattern) is expected
+
+
+@pytest.mark.parametrize("pattern,expected", [
+    ("**/*.py", "**/*.py"),
+    ("/repo/src/**/*.py", "src/**/*.py"),
+    ("/repo/**", "**"),
+])
+def test_repo_pattern(pattern, expected):
+    assert repo_pattern(pattern, "/repo") == expected
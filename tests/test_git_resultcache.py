@@ -0,0 +1,97 @@
+"""Tests for the SHA-keyed on-disk result cache (fledgling.git.resultcache)."""
+
+import os
+
+import duckdb
+import pytest
+
+from conftest import load_sql_matching
+from fledgling.connection import Connection
+from fledgling.git import ResultCache
+
+
+class TestResultCache:
+    def test_roundtrip(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "c"))
+        key = cache.key("review", "a" * 40, "b" * 40, file_pattern="**/*.py")
+        assert cache.get(key) is None
+        cache.put(key, [["Changed Files", "| a |"]])
+        assert cache.get(key) == [["Changed Files", "| a |"]]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_survives_new_instance(self, tmp_path):
+        key = ResultCache.key("review", "a" * 40, "b" * 40)
+        ResultCache(str(tmp_path)).put(key, {"x": 1})
+        assert ResultCache(str(tmp_path)).get(key) == {"x": 1}
+
+    def test_key_depends_on_everything(self):
+        base = ResultCache.key("review", "a" * 40, "b" * 40, top_n=20)
+        assert base != ResultCache.key("review_query", "a" * 40, "b" * 40, top_n=20)
+        assert base != ResultCache.key("review", "c" * 40, "b" * 40, top_n=20)
+        assert base != ResultCache.key("review", "a" * 40, "b" * 40, top_n=10)
+        assert base == ResultCache.key("review", "a" * 40, "b" * 40, top_n=20)
+
+    def test_first_write_wins(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+        cache.put("k", 1)
+        cache.put("k", 2)
+        assert cache.get("k") == 1
+        assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        (tmp_path / "k.json").write_text("{not json")
+        assert ResultCache(str(tmp_path)).get("k") is None
+
+
+class TestReviewQueryCache:
+
+    @pytest.fixture
+    def rcon(self, scratch_repo):
+        r = scratch_repo
+        base = r.commit("base", files={"notes.txt": "a\n"})
+        r.commit("edit", files={"notes.txt": "b\n", "more.txt": "c\n"})
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        for needle in ("SCHEMA IF NOT EXISTS ast_cache", "TABLE IF NOT EXISTS ast_cache",
+                       "MACRO _changed_function_summary_cached"):
+            load_sql_matching(raw, "structural.sql", needle)
+        load_sql_matching(raw, "workflows.sql", "_review_query_cached")
+        yield Connection(raw), r, base
+        raw.close()
+
+    def test_second_call_served_from_disk(self, rcon):
+        con, r, base = rcon
+        first = con.review_query(base, "HEAD").fetchone()[0]
+        assert [c["file_path"] for c in first["changed_files"]] == ["more.txt", "notes.txt"]
+        assert con._results.hits == 0
+        head = r.git("rev-parse", "HEAD")
+        again = con.review_query(base, head).fetchone()[0]  # same SHAs
+        assert again == first
+        assert con._results.hits == 1
+        assert os.listdir(os.path.join(r.path, ".fledgling", "cache", "review"))
+
+    def test_column_type_matches_macro(self, rcon):
+        con, _, base = rcon
+        rel = con.review_query(base, "HEAD")
+        assert rel.columns == ["result"]
+        assert "function_summary" in str(rel.types[0])
+
+    def test_moved_ref_misses(self, rcon):
+        con, r, base = rcon
+        con.review_query(base, "HEAD").fetchall()
+        r.commit("more", files={"notes.txt": "z\n"})
+        con.review_query(base, "HEAD").fetchall()
+        assert con._results.hits == 0
+
+    def test_review_workflow_cached(self, rcon):
+        from fledgling.pro.defaults import ProjectDefaults
+        from fledgling.pro.workflows import review
+        con, _, base = rcon
+        load_sql_matching(con._con, "repo.sql", "diff_cache")
+        first = review(con, ProjectDefaults(), from_rev=base, to_rev="HEAD",
+                       file_pattern="**/*")
+        assert "notes.txt" in first
+        hits = con._results.hits
+        assert review(con, ProjectDefaults(), from_rev=base, to_rev="HEAD",
+                      file_pattern="**/*") == first
+        assert con._results.hits == hits + 1
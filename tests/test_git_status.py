@@ -0,0 +1,160 @@
+"""Tests for the index-based working-tree status engine (fledgling.git.status)."""
+
+import os
+import time
+
+import duckdb
+import pytest
+
+from fledgling.git import GitRepo, StatusEngine, read_index
+from fledgling.git.pathspec import IgnoreRules
+
+
+@pytest.fixture
+def checkout(scratch_repo):
+    r = scratch_repo
+    r.commit("base", files={
+        ".gitignore": "build/\n*.log\n!keep.log\n",
+        "src/app.py": "print(1)\n",
+        "src/util.py": "X = 1\n",
+        "README.md": "readme\n",
+    })
+    # Age the checkout so stat data is not racily clean.
+    old = time.time() - 10
+    for dirpath, _, files in os.walk(r.path):
+        if ".git" in dirpath.split(os.sep):
+            continue
+        for f in files:
+            os.utime(os.path.join(dirpath, f), (old, old))
+        os.utime(dirpath, (old, old))
+    r.git("update-index", "--really-refresh")
+    repo = GitRepo(r.path)
+    yield r, repo
+    repo.close()
+
+
+def _status(repo):
+    return {e.file_path: e.status for e in StatusEngine(repo).status()}
+
+
+class TestReadIndex:
+
+    @pytest.mark.parametrize("version", ["2", "3", "4"])
+    def test_matches_ls_files(self, checkout, version):
+        r, repo = checkout
+        r.git("update-index", "--index-version", version)
+        entries = read_index(os.path.join(repo.git_dir, "index"))
+        expected = [
+            line.split("\t")[1]
+            for line in r.git("ls-files", "-s").splitlines()
+        ]
+        assert [e.path for e in entries] == expected
+        shas = {e.path: e.sha for e in entries}
+        assert shas["README.md"] == r.git("rev-parse", "HEAD:README.md")
+
+
+class TestStatus:
+
+    def test_clean(self, checkout):
+        _, repo = checkout
+        assert _status(repo) == {}
+
+    def test_modified_same_size(self, checkout):
+        r, repo = checkout
+        r.write("src/app.py", "print(2)\n")
+        assert _status(repo) == {"src/app.py": "modified"}
+
+    def test_deleted_and_staged_deletion(self, checkout):
+        r, repo = checkout
+        r.remove("README.md")
+        r.git("rm", "-q", "--cached", "src/util.py")
+        status = _status(repo)
+        assert status["README.md"] == "deleted"
+        assert status["src/util.py"] == "deleted"
+
+    def test_added(self, checkout):
+        r, repo = checkout
+        r.write("src/new.py", "Y = 2\n")
+        r.git("add", "src/new.py")
+        assert _status(repo) == {"src/new.py": "added"}
+
+    def test_untracked_respects_gitignore(self, checkout):
+        r, repo = checkout
+        r.write("notes.txt", "x\n")
+        r.write("build/out/bin.o", "x\n")
+        r.write("debug.log", "x\n")
+        r.write("keep.log", "x\n")
+        status = _status(repo)
+        assert status == {"notes.txt": "untracked", "keep.log": "untracked"}
+
+    def test_exec_bit_is_modification(self, checkout):
+        r, repo = checkout
+        os.chmod(os.path.join(r.path, "src/util.py"), 0o755)
+        assert _status(repo) == {"src/util.py": "modified"}
+
+    def test_sorted_by_status_then_path(self, checkout):
+        r, repo = checkout
+        r.write("z.txt", "z\n")
+        r.write("a.txt", "a\n")
+        r.write("src/app.py", "print(2)\n")
+        rows = [(e.status, e.file_path) for e in StatusEngine(repo).status()]
+        assert rows == sorted(rows)
+
+
+class TestIncremental:
+
+    def test_clean_tree_hashes_nothing(self, checkout):
+        _, repo = checkout
+        engine = StatusEngine(repo)
+        engine.status()
+        assert engine.hashes == 0
+
+    def test_unchanged_directories_not_relisted(self, checkout):
+        _, repo = checkout
+        engine = StatusEngine(repo)
+        engine.status()
+        first = engine.listings
+        engine.status()
+        assert engine.listings == first
+
+    def test_new_file_seen_after_cached_listing(self, checkout):
+        r, repo = checkout
+        engine = StatusEngine(repo)
+        engine.status()
+        r.write("src/fresh.py", "Z = 3\n")
+        assert {e.file_path for e in engine.status()} == {"src/fresh.py"}
+
+
+class TestIgnoreRules:
+
+    def test_anchored_and_nested(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("/top.txt\ndocs/*.tmp\n")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / ".gitignore").write_text("local/\n")
+        rules = IgnoreRules(str(tmp_path))
+        rules.load_dir("")
+        rules.load_dir("sub")
+        assert rules.is_ignored("top.txt")
+        assert not rules.is_ignored("sub/top.txt")
+        assert rules.is_ignored("docs/a.tmp")
+        assert not rules.is_ignored("docs/x/a.tmp")
+        assert rules.is_ignored("sub/local", is_dir=True)
+        assert not rules.is_ignored("local", is_dir=True)
+
+
+class TestConnectionWorkingTreeStatus:
+
+    def test_relation(self, checkout):
+        from fledgling.connection import Connection
+        r, _ = checkout
+        r.write("src/app.py", "print(2)\n")
+        r.write("new.txt", "n\n")
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        rel = Connection(raw).working_tree_status()
+        assert rel.columns == ["file_path", "status"]
+        assert rel.fetchall() == [
+            ("src/app.py", "modified"),
+            ("new.txt", "untracked"),
+        ]
+        raw.close()
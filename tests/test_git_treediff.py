@@ -0,0 +1,170 @@
+"""Tests for the subtree-skipping tree diff engine (fledgling.git.treediff).
+
+These run against scratch repositories and need only git on PATH — no
+DuckDB extensions.
+"""
+
+import os
+
+import duckdb
+import pytest
+
+from fledgling.git import GitRepo, diff_trees
+
+
+@pytest.fixture
+def history(scratch_repo):
+    """Two commits touching added, modified, deleted and nested files."""
+    r = scratch_repo
+    base = r.commit("base", files={
+        "README.md": "hello\n",
+        "src/app.py": "def main():\n    pass\n",
+        "src/util.py": "X = 1\n",
+        "vendor/big/a.txt": "a\n",
+        "vendor/big/b.txt": "b\n",
+        "old.txt": "gone soon\n",
+    })
+    head = r.commit("change", files={
+        "src/app.py": "def main():\n    return 1\n",
+        "src/pkg/new.py": "Y = 2\n",
+        "docs/guide.md": "# Guide\n",
+    }, remove=["old.txt"])
+    return r, base, head
+
+
+class TestGitRepo:
+
+    def test_resolve_symbolic(self, history):
+        r, _, head = history
+        with GitRepo(r.path) as repo:
+            assert repo.resolve("HEAD") == head
+            assert repo.resolve(head) == head
+
+    def test_resolve_unknown_raises(self, history):
+        r, _, _ = history
+        with GitRepo(r.path) as repo:
+            with pytest.raises(ValueError):
+                repo.resolve("no-such-branch")
+
+    def test_blob_at(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            sha = repo.blob_at(head, "src/app.py")
+            assert repo.read_blob(sha) == b"def main():\n    return 1\n"
+            assert repo.blob_at(head, "old.txt") is None
+            assert repo.blob_at(base, "src") is None  # directory
+
+    def test_read_commit(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            commit = repo.read_commit(head)
+            assert commit.parents == (base,)
+            assert commit.author_name == "Test"
+            assert commit.message.strip() == "change"
+
+
+class TestDiffTrees:
+
+    def test_statuses(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            changes = {c.file_path: c.status for c in diff_trees(repo, base, head)}
+        assert changes == {
+            "docs/guide.md": "added",
+            "old.txt": "deleted",
+            "src/app.py": "modified",
+            "src/pkg/new.py": "added",
+        }
+
+    def test_sorted_by_path(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            paths = [c.file_path for c in diff_trees(repo, base, head)]
+        assert paths == sorted(paths)
+
+    def test_sizes(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            by_path = {c.file_path: c for c in diff_trees(repo, base, head)}
+        assert by_path["src/app.py"].old_size == len("def main():\n    pass\n")
+        assert by_path["src/app.py"].new_size == len("def main():\n    return 1\n")
+        assert by_path["old.txt"].new_size is None
+        assert by_path["docs/guide.md"].old_size is None
+
+    def test_unchanged_subtrees_not_read(self, history):
+        r, base, head = history
+        with GitRepo(r.path) as repo:
+            vendor = repo.path_entry(repo.commit_tree(base), "vendor").sha
+            repo._trees.clear()
+            diff_trees(repo, base, head, sizes=False)
+            assert vendor not in repo._trees
+
+    def test_same_revision_is_empty(self, history):
+        r, _, head = history
+        with GitRepo(r.path) as repo:
+            assert diff_trees(repo, head, "HEAD") == []
+
+    def test_file_replaced_by_directory(self, scratch_repo):
+        r = scratch_repo
+        base = r.commit("file", files={"thing": "x\n"})
+        r.remove("thing")
+        head = r.commit("dir", files={"thing/inner.txt": "y\n"})
+        with GitRepo(r.path) as repo:
+            changes = [(c.file_path, c.status) for c in diff_trees(repo, base, head)]
+        assert changes == [("thing", "deleted"), ("thing/inner.txt", "added")]
+
+    def test_submodule_bump_skipped(self, scratch_repo):
+        from conftest import ScratchRepo
+        r = scratch_repo
+        lib = ScratchRepo(os.path.join(r.path, "lib"))
+        lib.commit("v1", files={"lib.py": "V = 1\n"})
+        base = r.commit("add submodule", files={"a.txt": "a\n"})
+        lib.commit("v2", files={"lib.py": "V = 2\n"})
+        head = r.commit("bump submodule", files={"a.txt": "b\n"})
+        with GitRepo(r.path) as repo:
+            assert repo.path_entry(repo.commit_tree(head), "lib").is_submodule
+            changes = [(c.file_path, c.status) for c in diff_trees(repo, base, head)]
+        assert changes == [("a.txt", "modified")]
+
+    def test_read_tree_concurrent(self, history):
+        from concurrent.futures import ThreadPoolExecutor
+        r, base, head = history
+        with GitRepo(r.path, tree_cache_size=2) as repo:
+            trees = [repo.commit_tree(base), repo.commit_tree(head),
+                     repo.path_entry(repo.commit_tree(base), "src").sha,
+                     repo.path_entry(repo.commit_tree(head), "src").sha]
+            with ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(repo.read_tree, trees * 50))
+            assert len(repo._trees) <= 2
+        assert results[:4] == results[4:8]
+
+
+class TestConnectionFileChanges:
+    """Connection.file_changes runs on the engine without duck_tails."""
+
+    @pytest.fixture
+    def fcon(self, history):
+        from fledgling.connection import Connection
+        r, base, head = history
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [r.path])
+        yield Connection(raw), base, head
+        raw.close()
+
+    def test_rows_match_macro_shape(self, fcon):
+        con, base, head = fcon
+        rel = con.file_changes(base, head)
+        assert rel.columns == ["file_path", "status", "old_size", "new_size"]
+        rows = rel.fetchall()
+        assert ("old.txt", "deleted", len("gone soon\n"), None) in rows
+        assert len(rows) == 4
+
+    def test_empty_range(self, fcon):
+        con, _, head = fcon
+        assert con.file_changes(head, head).fetchall() == []
+
+    def test_repo_instance_shared(self, fcon):
+        con, base, head = fcon
+        con.file_changes(base, head)
+        con.file_changes(base, head, repo=".")
+        assert len(con._repos) == 1
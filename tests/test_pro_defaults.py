@@ -6,6 +6,9 @@ from dataclasses import fields
 
 import fledgling
 from fledgling.pro.defaults import ProjectDefaults, TOOL_DEFAULTS, apply_defaults, load_config, infer_defaults
+from fledgling.pro.defaults import (
+    load_cache_config, load_fts_config, load_workspace,
+)
 from conftest import PROJECT_ROOT
 
 
@@ -178,6 +181,63 @@ class TestLoadConfig:
         assert result == {}
 
 
+class TestLoadWorkspace:
+    """load_workspace reads the [workspace] section of config.toml."""
+
+    def test_missing_config_returns_empty(self, tmp_path):
+        assert load_workspace(tmp_path) == {}
+
+    def test_roots_resolve_against_project(self, tmp_path):
+        config_dir = tmp_path / ".fledgling-python"
+        config_dir.mkdir()
+        (config_dir / "config.toml").write_text(
+            '[workspace]\napi = "../api"\nweb = "/src/web"\n'
+        )
+        assert load_workspace(tmp_path) == {
+            "api": str((tmp_path.parent / "api").resolve()),
+            "web": "/src/web",
+        }
+
+
+class TestLoadFtsConfig:
+    """load_fts_config reads the [fts] section of config.toml."""
+
+    def test_missing_config_returns_empty(self, tmp_path):
+        assert load_fts_config(tmp_path) == {}
+
+    def test_index_path_resolves_against_project(self, tmp_path):
+        config_dir = tmp_path / ".fledgling-python"
+        config_dir.mkdir()
+        (config_dir / "config.toml").write_text(
+            '[fts]\nindex = "idx/fts.duckdb"\ncode_glob = "src/**/*.py"\n'
+        )
+        assert load_fts_config(tmp_path) == {
+            "index": str((tmp_path / "idx" / "fts.duckdb").resolve()),
+            "code_glob": "src/**/*.py",
+        }
+
+    def test_index_true_kept(self, tmp_path):
+        config_dir = tmp_path / ".fledgling-python"
+        config_dir.mkdir()
+        (config_dir / "config.toml").write_text("[fts]\nindex = true\n")
+        assert load_fts_config(tmp_path) == {"index": True}
+
+
+class TestLoadCacheConfig:
+    """load_cache_config reads the [cache] section of config.toml."""
+
+    def test_missing_config_returns_empty(self, tmp_path):
+        assert load_cache_config(tmp_path) == {}
+
+    def test_spill_path_resolves_against_project(self, tmp_path):
+        config_dir = tmp_path / ".fledgling-python"
+        config_dir.mkdir()
+        (config_dir / "config.toml").write_text('[cache]\nblob_spill = "blobs"\n')
+        assert load_cache_config(tmp_path) == {
+            "blob_spill": str((tmp_path / "blobs").resolve()),
+        }
+
+
 class TestInferDefaults:
     """infer_defaults queries the project and builds ProjectDefaults."""
 
@@ -87,6 +87,247 @@ class TestSection:
         assert "no data" in content.lower()
 
 
+class TestSections:
+    """Test the _Sections scheduler."""
+
+    @pytest.fixture
+    def con(self, tmp_path):
+        import duckdb
+        from fledgling.connection import Connection
+        raw = duckdb.connect(":memory:")
+        raw.execute("SET VARIABLE session_root = ?", [str(tmp_path)])
+        yield Connection(raw)
+        raw.close()
+
+    def test_order_kept_and_cursors_used(self, con):
+        import time
+        from fledgling.pro.workflows import _Sections
+        seen = []
+        sections = _Sections(con)
+
+        def slow(c):
+            time.sleep(0.05)
+            seen.append(c)
+            return "slow"
+
+        sections.add("A", slow)
+        sections.add("B", lambda c: seen.append(c) or "fast")
+        assert sections.run() == [("A", "slow"), ("B", "fast")]
+        assert len(seen) == 2 and all(c is not con for c in seen)
+
+    def test_sections_overlap(self, con):
+        import threading
+        from fledgling.pro.workflows import _Sections
+        # Each section waits for the other: only completes if concurrent.
+        barrier = threading.Barrier(2, timeout=5)
+        sections = _Sections(con)
+        sections.add("A", lambda c: barrier.wait() is not None and "a")
+        sections.add("B", lambda c: barrier.wait() is not None and "b")
+        assert sections.run() == [("A", "a"), ("B", "b")]
+
+    def test_after_waits_for_dependency(self, con):
+        import time
+        from fledgling.pro.workflows import _Sections
+        rows = []
+
+        def first(c):
+            time.sleep(0.05)
+            rows.append(1)
+            return "first"
+
+        sections = _Sections(con)
+        sections.add("First", first)
+        sections.add("Second", lambda c: f"saw {len(rows)}", after=("First",))
+        assert sections.run() == [("First", "first"), ("Second", "saw 1")]
+
+    def test_unknown_dependency_rejected(self, con):
+        from fledgling.pro.workflows import _Sections
+        with pytest.raises(ValueError, match="unknown"):
+            _Sections(con).add("X", lambda c: "", after=("Nope",))
+
+    def test_timings_and_failures(self, con):
+        from fledgling.pro.workflows import _Sections
+        timings = {}
+        sections = _Sections(con, timings)
+        sections.add("Ok", lambda c: c.execute("SELECT 42").fetchone()[0] and "ok")
+        sections.add("Bad", lambda c: 1 / 0)
+        assert sections.run() == [("Ok", "ok"), ("Bad", "(could not load)")]
+        assert set(timings) == {"Ok", "Bad"}
+        assert all(t >= 0 for t in timings.values())
+
+    def test_budget_cuts_off_slow_sections(self, con):
+        import threading
+        import time
+        from fledgling.pro.workflows import TIMED_OUT, _Sections
+        release = threading.Event()
+        timings = {}
+        sections = _Sections(con, timings, budget=0.2)
+        sections.add("Fast", lambda c: "fast")
+        sections.add("Slow", lambda c: release.wait(5) and "slow")
+        start = time.perf_counter()
+        assert sections.run() == [("Fast", "fast"), ("Slow", TIMED_OUT)]
+        elapsed = time.perf_counter() - start
+        assert elapsed < 2
+        # Timed from the section's own start, just after the briefing's.
+        assert 0.15 <= timings["Slow"] <= elapsed
+        release.set()
+
+    def test_budget_interrupts_queries(self, con):
+        from fledgling.pro.workflows import TIMED_OUT, _Sections
+        sections = _Sections(con, budget=0.2)
+        sections.add("Fast", lambda c: "fast")
+        sections.add("Slow", lambda c: c.execute(
+            "SELECT count(*) FROM range(10000000000) a"
+        ).fetchone())
+        assert sections.run() == [("Fast", "fast"), ("Slow", TIMED_OUT)]
+
+    def test_timed_out_dependent_timed_from_its_start(self, con):
+        import threading
+        import time
+        from fledgling.pro.workflows import TIMED_OUT, _Sections
+        release = threading.Event()
+        timings = {}
+        sections = _Sections(con, timings, budget=0.3)
+        sections.add("First", lambda c: time.sleep(0.2) or "first")
+        sections.add("Then", lambda c: release.wait(5) and "then", after=("First",))
+        assert sections.run() == [("First", "first"), ("Then", TIMED_OUT)]
+        assert timings["Then"] < 0.2
+        release.set()
+
+    def test_after_all_waits_for_late_sections(self, con):
+        import threading
+        from fledgling.pro.workflows import _Sections
+        release = threading.Event()
+        called = threading.Event()
+        seen = []
+        sections = _Sections(con, budget=0.1)
+        sections.add("Fast", lambda c: "fast")
+        sections.add("Slow", lambda c: release.wait(5) and "slow")
+        sections.run()
+        sections.after_all(lambda c: seen.append(c) or called.set())
+        assert not called.is_set()
+        release.set()
+        assert called.wait(5)
+        assert seen[0] is not con
+
+    def test_after_all_runs_now_when_nothing_late(self, con):
+        from fledgling.pro.workflows import _Sections
+        seen = []
+        sections = _Sections(con, budget=5)
+        sections.add("A", lambda c: "a")
+        sections.add("B", lambda c: "b")
+        sections.run()
+        sections.after_all(seen.append)
+        assert seen == [con]
+
+    def test_plain_connection_runs_sequentially(self):
+        import duckdb
+        from fledgling.pro.workflows import _Sections
+        raw = duckdb.connect(":memory:")
+        seen = []
+        sections = _Sections(raw)
+        sections.add("A", lambda c: seen.append(c) or "a")
+        sections.add("B", lambda c: seen.append(c) or "b")
+        assert sections.run() == [("A", "a"), ("B", "b")]
+        assert seen == [raw, raw]
+
+
+class TestReviewCache:
+    """review() caches only briefings with no failed parts."""
+
+    class FakeCon:
+        """Just enough of a Connection for review() to run on."""
+
+        def __init__(self, cache, fail=()):
+            import duckdb
+            self._results = cache
+            self._raw = duckdb.connect(":memory:")
+            self.fail = set(fail)
+
+        def _repo(self, path):
+            class Repo:
+                def resolve(self, rev):
+                    return rev.ljust(40, "0")
+            return Repo()
+
+        def _sql(self, name, sql):
+            if name in self.fail:
+                raise RuntimeError(f"{name} failed")
+            return self._raw.sql(sql)
+
+        def file_changes(self, **kw):
+            return self._sql("file_changes", "SELECT 'a.py' AS file_path, "
+                             "'modified' AS status, 1 AS old_size, 2 AS new_size")
+
+        def changed_function_summary(self, **kw):
+            return self._sql("changed_function_summary", "SELECT 'f' AS name")
+
+        def file_diff_stats(self, **kw):
+            return self._sql("file_diff_stats", "SELECT 'a.py' AS file_path, "
+                             "1 AS lines_added, 0 AS lines_removed")
+
+        def file_diff(self, **kw):
+            return self._sql("file_diff", "SELECT 1 AS seq, 'ADDED' AS line_type, "
+                             "'x' AS content")
+
+    def review(self, tmp_path, fail=()):
+        from fledgling.git import ResultCache
+        from fledgling.pro.defaults import ProjectDefaults
+        from fledgling.pro.workflows import review
+        cache = ResultCache(str(tmp_path / "results"))
+        text = review(self.FakeCon(cache, fail), ProjectDefaults(), "base", "head")
+        key = cache.key("review", "base".ljust(40, "0"), "head".ljust(40, "0"),
+                        file_pattern=ProjectDefaults().code_pattern)
+        return text, cache.get(key)
+
+    def test_complete_review_cached(self, tmp_path):
+        text, cached = self.review(tmp_path)
+        assert "+ x" in text
+        assert cached is not None
+
+    @pytest.mark.parametrize("fail", [
+        "changed_function_summary", "file_diff_stats", "file_diff",
+    ])
+    def test_failed_part_not_cached(self, tmp_path, fail):
+        _, cached = self.review(tmp_path, fail=[fail])
+        assert cached is None
+
+
+class TestFuse:
+    """Test reciprocal rank fusion of search sources."""
+
+    @staticmethod
+    def _hits(*keys):
+        return [{"key": k, "name": str(k)} for k in keys]
+
+    def test_agreement_outranks_single_source(self):
+        from fledgling.pro.workflows import _fuse
+        fused = _fuse({
+            "A": self._hits("x", "y"),
+            "B": self._hits("z", "y"),
+        })
+        assert [e["key"] for e in fused] == ["y", "x", "z"]
+        assert fused[0]["sources"] == ["A", "B"]
+
+    def test_scores_are_reciprocal_ranks(self):
+        from fledgling.pro.workflows import _fuse
+        fused = _fuse({"A": self._hits("x", "y")}, k=10)
+        assert [e["score"] for e in fused] == [1 / 11, 1 / 12]
+
+    def test_duplicates_within_source_count_once(self):
+        from fledgling.pro.workflows import _fuse
+        fused = _fuse({"A": self._hits("x", "x", "y")}, k=10)
+        assert [(e["key"], e["score"]) for e in fused] == [("x", 1 / 11), ("y", 1 / 12)]
+
+    def test_first_source_fields_kept(self):
+        from fledgling.pro.workflows import _fuse
+        fused = _fuse({
+            "A": [{"key": 1, "name": "from A"}],
+            "B": [{"key": 1, "name": "from B"}],
+        })
+        assert fused[0]["name"] == "from A"
+
+
 class TestHasModule:
     """Test the _has_module helper."""
 
@@ -207,6 +448,40 @@ class TestInvestigate:
         assert "investigate" in _tool_names(mcp)
 
 
+@requires_fastmcp
+class TestInvestigateMany:
+    """Test the investigate_many compound tool."""
+
+    @pytest.fixture(scope="class")
+    def text(self, mcp):
+        return _text(_run_async(mcp.call_tool("investigate_many", {
+            "names": ["create_server", "register_workflows", "xyznonexistent999"],
+        })))
+
+    def test_sections_per_symbol(self, text):
+        for name in ("create_server", "register_workflows"):
+            assert f"### {name}: Definition" in text
+            assert f"### {name}: Source" in text
+            assert f"### {name}: Called by" in text
+
+    def test_symbols_in_requested_order(self, text):
+        assert text.index("create_server: Definition") < text.index(
+            "register_workflows: Definition"
+        )
+
+    def test_missing_symbol_noted(self, text):
+        assert "### xyznonexistent999: Definition\n(no data)" in text
+
+    def test_all_unknown_returns_helpful_message(self, mcp):
+        text = _text(_run_async(mcp.call_tool("investigate_many", {
+            "names": ["xyznonexistent999"],
+        })))
+        assert "no definition found" in text.lower()
+
+    def test_tool_is_registered(self, mcp):
+        assert "investigate_many" in _tool_names(mcp)
+
+
 # ── Integration tests: review ──────────────────────────────────────
 
 
@@ -253,6 +528,11 @@ class TestSearch:
     def test_contains_definitions_section(self, text):
         assert "Definitions" in text
 
+    def test_fused_results_first(self, text):
+        assert text.index("### Results") < text.index("### Sources")
+        results = text.split("### Results", 1)[1].split("###", 1)[0]
+        assert "create_server" in results
+
     def test_contains_call_sites_section(self, text):
         assert "Call Sites" in text
 
@@ -0,0 +1,98 @@
+"""Tests for chunked full-body rendering (fledgling.render)."""
+
+import os
+
+import pytest
+
+from fledgling.render import LineIndex, render_chunks
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("def a():\n    return 1\n\n\ndef b():\n    return 2\n")
+    return str(path)
+
+
+def _matches(src, n):
+    return [(src, 1, 2, "python", f"a{i}", "def a():") for i in range(n)]
+
+
+class TestLineIndex:
+    def test_slices_inclusive_lines(self, src):
+        index = LineIndex()
+        assert index.lines(src, 1, 2) == "def a():\n    return 1"
+        assert index.lines(src, 5, 6) == "def b():\n    return 2"
+        assert index.lines(src, 6, 99) == "    return 2"
+        assert index.lines(src, 99, 100) == ""
+
+    def test_file_read_once(self, src):
+        index = LineIndex()
+        for _ in range(3):
+            index.lines(src, 1, 2)
+        assert (index.misses, index.hits) == (1, 2)
+
+    def test_changed_file_reindexed(self, src):
+        index = LineIndex()
+        index.lines(src, 1, 1)
+        with open(src, "w") as f:
+            f.write("def c():\n    pass\n")
+        st = os.stat(src)
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert index.lines(src, 1, 1) == "def c():"
+        assert index.misses == 2
+
+    def test_evicts_least_recent(self, tmp_path):
+        paths = []
+        for i in range(3):
+            p = tmp_path / f"f{i}.txt"
+            p.write_text("x" * 10 + "\n")
+            paths.append(str(p))
+        index = LineIndex(max_bytes=25)
+        for p in paths:
+            index.lines(p, 1, 1)
+        assert len(index) == 2
+        assert index.stats()["bytes"] <= 25
+        index.lines(paths[0], 1, 1)
+        assert index.misses == 4
+
+
+class TestRenderChunks:
+    def test_pss_layout(self, src):
+        (text,) = render_chunks(_matches(src, 1), LineIndex())
+        assert text == (
+            f"# {src}:1-2\n\n```python\ndef a():\n    return 1\n```\n\n"
+        )
+
+    def test_ast_select_layout(self, src):
+        (text,) = render_chunks(
+            _matches(src, 1), LineIndex(), layout="ast_select", selector=".func",
+        )
+        assert text.startswith("# `.func`\n\n## a0 — ")
+        assert "return 1" in text
+
+    def test_chunks_concatenate(self, src):
+        index = LineIndex()
+        chunks = list(render_chunks(_matches(src, 7), index, chunk_size=3))
+        assert len(chunks) == 3
+        assert "".join(chunks) == "".join(
+            render_chunks(_matches(src, 7), index, chunk_size=100)
+        )
+        assert index.misses == 1
+
+    def test_fence_longer_than_body_backticks(self, tmp_path):
+        p = tmp_path / "doc.py"
+        p.write_text('"""\n```\nx\n```\n"""\n')
+        (text,) = render_chunks([(str(p), 1, 5, "python", None, "")], LineIndex())
+        assert "\n````python\n" in text and text.endswith("````\n\n")
+
+    def test_unreadable_file_falls_back_to_peek(self, tmp_path):
+        missing = str(tmp_path / "gone.py")
+        (text,) = render_chunks(
+            [(missing, 1, 2, "python", "f", "def f():")], LineIndex(),
+        )
+        assert "```python\ndef f():\n```" in text
+
+    def test_unknown_layout(self, src):
+        with pytest.raises(ValueError, match="layout"):
+            list(render_chunks(_matches(src, 1), LineIndex(), layout="html"))
@@ -173,3 +173,42 @@ class TestSandboxLockdown:
         """getenv() is disabled after lockdown."""
         with pytest.raises(duckdb.Error):
             sandboxed.execute("SELECT getenv('HOME')")
+
+
+class TestGlobMatch:
+    """_glob_match must agree with fledgling.git.pathspec.glob_match."""
+
+    PATHS = [
+        "a.py", "src/a.py", "src/a/test_b.py", "src/a/b/test_c.py",
+        "src/test_b.py", "srcx/test_b.py", "docs/x.md", "a.b.py",
+    ]
+    PATTERNS = [
+        "*.py", "**/*.py", "src/**/test_*.py", "src/**", "src/*.py",
+        "./src/*.py", "**/test_?.py", "a.b.py", "[!s]*/*.md", "src/**/*",
+    ]
+
+    @pytest.fixture
+    def globcon(self):
+        con = duckdb.connect(":memory:")
+        load_sql(con, "sandbox.sql")
+        yield con
+        con.close()
+
+    def test_literal_segment_after_double_star(self, globcon):
+        rows = globcon.execute(
+            "SELECT p FROM unnest(?) t(p) "
+            "WHERE _glob_match(p, 'src/**/test_*.py') ORDER BY p",
+            [self.PATHS],
+        ).fetchall()
+        assert [r[0] for r in rows] == [
+            "src/a/b/test_c.py", "src/a/test_b.py", "src/test_b.py",
+        ]
+
+    def test_matches_pathspec(self, globcon):
+        from fledgling.git.pathspec import glob_match
+        for pattern in self.PATTERNS:
+            for path in self.PATHS:
+                (got,) = globcon.execute(
+                    "SELECT _glob_match(?, ?)", [path, pattern],
+                ).fetchone()
+                assert got == glob_match(path, pattern), (path, pattern)
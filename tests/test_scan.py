@@ -0,0 +1,59 @@
+"""Tests for shared AST scans (fledgling.scan and the _scan_* macros)."""
+
+import pytest
+from conftest import CONFTEST_PATH
+
+from fledgling.scan import Scan
+
+
+@pytest.fixture
+def scan(code_macros):
+    with Scan(code_macros, CONFTEST_PATH) as s:
+        yield s
+
+
+def _tables(con):
+    return con.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE schema_name = '_scan'"
+    ).fetchall()
+
+
+class TestScan:
+    def test_definitions_match_public_macro(self, code_macros, scan):
+        expected = code_macros.execute(
+            "SELECT * FROM find_definitions(?, 'load%')", [CONFTEST_PATH]
+        ).fetchall()
+        assert scan.definitions(code_macros, "load%").fetchall() == expected
+
+    def test_calls_and_in_ast_match(self, code_macros, scan):
+        assert scan.calls(code_macros, "load_sql").fetchall() == code_macros.execute(
+            "SELECT * FROM find_calls(?, 'load_sql')", [CONFTEST_PATH]
+        ).fetchall()
+        assert scan.in_ast(code_macros, "imports").fetchall() == code_macros.execute(
+            "SELECT * FROM find_in_ast(?, 'imports')", [CONFTEST_PATH]
+        ).fetchall()
+
+    def test_structure_matches(self, code_macros, scan):
+        assert scan.structure(code_macros).fetchall() == code_macros.execute(
+            "SELECT * FROM code_structure(?)", [CONFTEST_PATH]
+        ).fetchall()
+
+    def test_callers_are_enclosing_functions(self, code_macros, scan):
+        rows = scan.callers(code_macros, "load_sql").fetchall()
+        assert [c for _, _, c in rows if c and "macros" in c]
+        assert len(rows) == len({(f, line) for f, line, _ in rows})
+
+    def test_callers_of_several(self, code_macros, scan):
+        rows = scan.callers_of(code_macros, ["load_sql", "load_sql_matching"]).fetchall()
+        for name in ("load_sql", "load_sql_matching"):
+            assert [r[:3] for r in rows if r[3] == name] == (
+                scan.callers(code_macros, name).fetchall()
+            )
+
+    def test_parsed_once_and_dropped(self, code_macros):
+        with Scan(code_macros, CONFTEST_PATH) as s:
+            assert _tables(code_macros) == []
+            s.definitions(code_macros).fetchall()
+            s.calls(code_macros).fetchall()
+            assert len(_tables(code_macros)) == 1
+        assert _tables(code_macros) == []
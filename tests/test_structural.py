@@ -55,6 +55,7 @@ class TestStructuralDiff:
             "name", "kind", "change",
             "old_lines", "new_lines",
             "old_complexity", "new_complexity", "complexity_delta",
+            "old_name",
         ]
 
     def test_unchanged_not_included(self, structural_macros):
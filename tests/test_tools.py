@@ -45,6 +45,14 @@ class TestToSqlLiteral:
     def test_empty_list(self):
         assert _to_sql_literal([]) == "[]"
 
+    def test_dict_is_struct(self):
+        assert _to_sql_literal({"a": 1, "b": None}) == "{'a': 1, 'b': NULL}"
+
+    def test_list_of_dicts(self):
+        lit = _to_sql_literal([{"path": "it's.py"}])
+        assert lit == "[{'path': 'it''s.py'}]"
+        assert duckdb.sql(f"SELECT {lit}[1].path").fetchone()[0] == "it's.py"
+
 
 # ── Tools discovery ──────────────────────────────────────────────────
 
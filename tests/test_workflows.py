@@ -96,6 +96,53 @@ class TestInvestigateQuery:
         assert "load_sql" in names
 
 
+# ── investigate_many_query ───────────────────────────────────────────
+
+
+class TestInvestigateManyQuery:
+    def test_one_entry_per_name_in_order(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        symbols = workflows_macros.execute(
+            "SELECT result.symbols FROM investigate_many_query("
+            "['load_sql_matching', 'load_sql', 'load_sql'], file_pattern := ?)",
+            [pattern],
+        ).fetchone()[0]
+        assert [s["name"] for s in symbols] == ["load_sql_matching", "load_sql"]
+        assert set(symbols[0]) == {"name", "definitions", "callers", "call_sites"}
+
+    def test_matches_investigate_query(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        single = workflows_macros.execute(
+            "SELECT result FROM investigate_query('load_sql', file_pattern := ?)",
+            [pattern],
+        ).fetchone()[0]
+        many = workflows_macros.execute(
+            "SELECT result.symbols[1] FROM investigate_many_query(['load_sql'], file_pattern := ?)",
+            [pattern],
+        ).fetchone()[0]
+        for section in ("definitions", "callers", "call_sites"):
+            assert many[section] == single[section]
+
+    def test_wildcard_name_has_callers(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        wild, exact = workflows_macros.execute(
+            "SELECT result.symbols[1], result.symbols[2] FROM investigate_many_query("
+            "['load_s%', 'load_sql'], file_pattern := ?)",
+            [pattern],
+        ).fetchone()
+        # load_sql is the only load_s* function conftest calls.
+        assert exact["callers"]
+        assert wild["callers"] == exact["callers"]
+
+    def test_unknown_name_has_empty_sections(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        entry = workflows_macros.execute(
+            "SELECT result.symbols[1] FROM investigate_many_query(['xyznonexistent999'], file_pattern := ?)",
+            [pattern],
+        ).fetchone()[0]
+        assert entry["definitions"] is None and entry["callers"] is None
+
+
 # ── review_query ─────────────────────────────────────────────────────
 
 
@@ -152,6 +199,31 @@ class TestSearchQuery:
         assert any("load" in n for n in names)
 
 
+# ── search_ranked ────────────────────────────────────────────────────
+
+
+class TestSearchRanked:
+    def test_scores_descend(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        rows = workflows_macros.execute(
+            "SELECT score FROM search_ranked('load%', file_pattern := ?)",
+            [pattern],
+        ).fetchall()
+        scores = [s for (s,) in rows]
+        assert scores and scores == sorted(scores, reverse=True)
+
+    def test_definition_and_calls_fused(self, workflows_macros):
+        pattern = f"{PROJECT_ROOT}/tests/conftest.py"
+        rows = workflows_macros.execute(
+            "SELECT name, sources FROM search_ranked('load_sql', file_pattern := ?)",
+            [pattern],
+        ).fetchall()
+        sources = {s for _, srcs in rows for s in srcs}
+        assert {"definitions", "call_sites"} <= sources
+        # Closest name ranks first in each source; the definition leads.
+        assert rows[0][0] == "load_sql"
+
+
 # ── pss_render ───────────────────────────────────────────────────────
 
 
@@ -204,6 +276,32 @@ class TestPssRender:
         assert row is not None
 
 
+class TestPssRenderChunks:
+    """pss_render_chunks: pss_render's document split into chunk rows."""
+
+    def test_chunks_concatenate_to_pss_render(self, workflows_macros):
+        path = f"{PROJECT_ROOT}/fledgling/connection.py"
+        whole = workflows_macros.execute(
+            "SELECT * FROM pss_render(?, '.func')", [path],
+        ).fetchone()[0]
+        chunks = workflows_macros.execute(
+            "SELECT chunk, result FROM pss_render_chunks(?, '.func', chunk_size := 5)",
+            [path],
+        ).fetchall()
+        assert len(chunks) > 1
+        assert [c for c, _ in chunks] == list(range(len(chunks)))
+        assert "".join(r for _, r in chunks).split() == whole.split()
+
+    def test_bodies_are_full(self, workflows_macros):
+        path = f"{PROJECT_ROOT}/fledgling/connection.py"
+        text = "".join(r for (r,) in workflows_macros.execute(
+            "SELECT result FROM pss_render_chunks(?, '.func#render_selection') "
+            "ORDER BY chunk",
+            [path],
+        ).fetchall())
+        assert "render_chunks(" in text
+
+
 # ── ast_select_render ────────────────────────────────────────────────
 
 
@@ -240,6 +338,22 @@ class TestAstSelectRender:
         # Sub-heading format: "<symbol> — <file>:<start>-<end>"
         assert "—" in md_text
 
+    def test_python_renderer_uses_same_headings(self, workflows_macros):
+        from fledgling.connection import Connection
+        path = f"{PROJECT_ROOT}/fledgling/render.py"
+        md_text = workflows_macros.execute(
+            "SELECT * FROM ast_select_render(?, '.func')", [path],
+        ).fetchone()[0]
+        streamed = "".join(Connection(workflows_macros).render_selection(
+            path, ".func", layout="ast_select",
+        ))
+
+        def headings(text):
+            return [line for line in text.splitlines() if line.startswith("## ")]
+
+        assert headings(streamed)
+        assert headings(streamed) == headings(md_text)
+
     def test_contains_fenced_code_blocks(self, workflows_macros):
         row = workflows_macros.execute(
             "SELECT * FROM ast_select_render(?, '.func')",
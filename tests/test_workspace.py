@@ -0,0 +1,217 @@
+"""Tests for workspace mode (fledgling.workspace)."""
+
+import os
+
+import duckdb
+import pytest
+
+from conftest import ScratchRepo, load_sql_matching
+from fledgling.connection import Connection
+from fledgling.git import GitRepo
+from fledgling.workspace import Workspace, normalize_roots, snapshot
+
+
+@pytest.fixture
+def repos(tmp_path):
+    api = ScratchRepo(tmp_path / "api")
+    api.commit("init api", files={
+        "src/server.py": "def serve():\n    pass\n",
+        "README.md": "# api\n",
+    })
+    api.commit("add handler", files={"src/handler.py": "def handle():\n    pass\n"})
+    web = ScratchRepo(tmp_path / "web")
+    web.commit("init web", files={
+        "app.ts": "export function render() {}\n",
+        "src/server.py": "def serve():\n    pass\n",  # same blob as api's
+    })
+    return {"api": api, "web": web}
+
+
+def _workspace_con(root):
+    raw = duckdb.connect(":memory:")
+    raw.execute("SET VARIABLE session_root = ?", [root])
+    load_sql_matching(raw, "sandbox.sql", "MACRO _glob_")
+    for needle in ("SCHEMA IF NOT EXISTS ast_cache", "TABLE IF NOT EXISTS ast_cache"):
+        load_sql_matching(raw, "structural.sql", needle)
+    for needle in (
+        "SCHEMA IF NOT EXISTS workspace", "workspace.content_id",
+        "TABLE IF NOT EXISTS workspace", "workspace_definitions",
+        "workspace_commits", "workspace_repos",
+    ):
+        load_sql_matching(raw, "workspace.sql", needle)
+    return raw
+
+
+@pytest.fixture
+def ws(repos, tmp_path):
+    raw = _workspace_con(str(tmp_path))
+    con = Connection(raw)
+    workspace = Workspace(con, {name: r.path for name, r in repos.items()})
+    yield con, workspace
+    raw.close()
+
+
+def _store_all(con, workspace):
+    """Snapshot and store every repo with fake definitions per blob."""
+    for name, root in workspace.roots.items():
+        snap = snapshot(name, root, con._repo(root))
+        for path, sha, language in snap.files:
+            defname = os.path.splitext(os.path.basename(path))[0]
+            con._con.execute(
+                "INSERT INTO ast_cache.blobs (blob_hash, language) "
+                "VALUES (?, ?) ON CONFLICT DO NOTHING", [sha, language],
+            )
+            con._con.execute(
+                "INSERT INTO ast_cache.definitions "
+                "SELECT ?, 1, ?, 'function', 1, 2, 3, 1, 1, NULL "
+                "WHERE NOT EXISTS (SELECT 1 FROM ast_cache.definitions "
+                "                  WHERE blob_hash = ?)",
+                [sha, defname, sha],
+            )
+        workspace.store(snap)
+
+
+class TestRoots:
+    def test_list_named_after_directory(self, tmp_path):
+        roots = normalize_roots([str(tmp_path / "a"), str(tmp_path / "b") + "/"])
+        assert roots == {"a": str(tmp_path / "a"), "b": str(tmp_path / "b")}
+
+    def test_mapping_keeps_names(self, tmp_path):
+        assert normalize_roots({"x": str(tmp_path)}) == {"x": str(tmp_path)}
+
+    def test_duplicate_names_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Duplicate"):
+            normalize_roots([str(tmp_path / "one" / "repo"), str(tmp_path / "two" / "repo")])
+
+
+class TestSnapshot:
+    def test_files_with_languages(self, repos):
+        r = repos["api"]
+        with GitRepo(r.path) as repo:
+            snap = snapshot("api", r.path, repo)
+        assert snap.head == r.git("rev-parse", "HEAD")
+        assert [(p, lang) for p, _, lang in snap.files] == [
+            ("README.md", "markdown"),
+            ("src/handler.py", "python"),
+            ("src/server.py", "python"),
+        ]
+
+    def test_commits_newest_first_and_limited(self, repos):
+        r = repos["api"]
+        with GitRepo(r.path) as repo:
+            snap = snapshot("api", r.path, repo)
+            assert [c.message.strip() for c in snap.commits] == ["add handler", "init api"]
+            assert len(snapshot("api", r.path, repo, max_commits=1).commits) == 1
+
+
+class TestStore:
+    def test_definitions_across_repos(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        rows = con._con.execute(
+            "SELECT repo, file_path, name FROM workspace_definitions(name_pattern := 'serv%')"
+        ).fetchall()
+        assert rows == [("api", "src/server.py", "server"), ("web", "src/server.py", "server")]
+
+    def test_repo_and_pattern_filters(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        rows = con._con.execute(
+            "SELECT repo, name FROM workspace_definitions('**/*.py', repo_filter := 'api')"
+        ).fetchall()
+        assert rows == [("api", "handler"), ("api", "server")]
+
+    def test_pattern_literal_after_double_star(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        rows = con._con.execute(
+            "SELECT repo, file_path FROM workspace_definitions('**/server.py')"
+        ).fetchall()
+        assert rows == [("api", "src/server.py"), ("web", "src/server.py")]
+
+    def test_commits_and_repos(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        assert con._con.execute(
+            "SELECT repo, file_count FROM workspace_repos()"
+        ).fetchall() == [("api", 3), ("web", 2)]
+        summaries = con._con.execute(
+            "SELECT repo, summary FROM workspace_commits(repo_filter := 'api')"
+        ).fetchall()
+        assert sorted(summaries) == [("api", "add handler"), ("api", "init api")]
+
+    def test_search_rows(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        kinds = con._con.execute(
+            "SELECT repo, kind, count(*) FROM workspace.content "
+            "GROUP BY ALL ORDER BY ALL"
+        ).fetchall()
+        assert kinds == [
+            ("api", "commit", 2), ("api", "function", 3),
+            ("web", "commit", 1), ("web", "function", 2),
+        ]
+
+    def test_store_replaces(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        _store_all(con, workspace)
+        assert con._con.execute(
+            "SELECT count(*) FROM workspace.files"
+        ).fetchone() == (5,)
+
+
+class TestIndex:
+    def test_unchanged_heads_skipped(self, ws):
+        con, workspace = ws
+        _store_all(con, workspace)
+        assert workspace.index() == []
+
+
+class TestPersist:
+    @pytest.fixture(autouse=True)
+    def no_bm25(self, monkeypatch):
+        # The fts extension isn't loaded here; skip the BM25 rebuild.
+        monkeypatch.setattr(Workspace, "_reindex", staticmethod(lambda raw: None))
+
+    def test_restart_loads_without_reindexing(self, ws, tmp_path):
+        con, workspace = ws
+        path = str(tmp_path / "ws.duckdb")
+        assert workspace.persist(path) == []
+        _store_all(con, workspace)
+        content = con._con.execute("SELECT count(*) FROM workspace.content").fetchone()
+        con._con.execute("DETACH fledgling_workspace_store")
+
+        raw = _workspace_con(str(tmp_path))
+        try:
+            restarted = Workspace(Connection(raw), workspace.roots)
+            assert restarted.persist(path) == ["api", "web"]
+            assert restarted.index() == []
+            rows = raw.execute(
+                "SELECT repo, name FROM workspace_definitions(name_pattern := 'serv%')"
+            ).fetchall()
+            assert rows == [("api", "server"), ("web", "server")]
+            assert raw.execute(
+                "SELECT count(*) FROM workspace.content"
+            ).fetchone() == content
+        finally:
+            raw.close()
+
+    def test_removed_repo_dropped_from_file(self, ws, tmp_path):
+        con, workspace = ws
+        workspace.persist(str(tmp_path / "ws.duckdb"))
+        _store_all(con, workspace)
+        del workspace.roots["web"]
+        assert workspace.index() == []
+        store = "fledgling_workspace_store"
+        assert con._con.execute(
+            f"SELECT DISTINCT repo FROM {store}.files"
+        ).fetchall() == [("api",)]
+        # web's app.ts blob is referenced by no stored file any more.
+        assert con._con.execute(
+            f"SELECT count(*) FROM {store}.ast_blobs "
+            f"WHERE blob_hash NOT IN (SELECT blob_hash FROM {store}.files)"
+        ).fetchone() == (0,)
+        assert con._con.execute(
+            f"SELECT count(*) FROM {store}.ast_blobs"
+        ).fetchone() == (3,)